@@ -6,7 +6,9 @@ from ...services.facebook_auth.facebook_auth_service import FacebookAuthService
 from ...services.google_auth.google_auth_service import GoogleAuthService
 from ...services.credentials_auth_service import CredentialsAuthService
 from ...utils.oauth2 import get_current_user, oauth2_scheme
-from ...utils.jwt_utils import create_access_token
+from ...utils.jwt_utils import create_access_token, revoke_token
+from ...utils.rate_limit import InMemoryBucketStore, RateLimiter, rate_limit_dependency
+from ...utils.config import get_settings
 from typing import Annotated
 from common.database import get_session
 from cou_user.models.user import User
@@ -18,6 +20,24 @@ import requests
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Token buckets for the endpoints that hash passwords or create users. The limiters
+# share one store; their scopes keep the keys apart.
+_rate_limit_store = InMemoryBucketStore()
+credentials_ip_limiter = RateLimiter(
+    "credentials-ip", settings.AUTH_RATE_LIMIT_IP_BURST, settings.AUTH_RATE_LIMIT_IP_PER_MINUTE, _rate_limit_store
+)
+credentials_email_limiter = RateLimiter(
+    "credentials-email", settings.AUTH_RATE_LIMIT_EMAIL_BURST, settings.AUTH_RATE_LIMIT_EMAIL_PER_MINUTE, _rate_limit_store
+)
+oauth_ip_limiter = RateLimiter(
+    "oauth-ip", settings.AUTH_RATE_LIMIT_IP_BURST, settings.AUTH_RATE_LIMIT_IP_PER_MINUTE, _rate_limit_store
+)
+limit_credentials = rate_limit_dependency(
+    credentials_ip_limiter, credentials_email_limiter, settings.AUTH_RATE_LIMIT_TRUSTED_PROXY_HOPS
+)
+limit_oauth = rate_limit_dependency(oauth_ip_limiter, trusted_proxy_hops=settings.AUTH_RATE_LIMIT_TRUSTED_PROXY_HOPS)
 
 router = APIRouter(
     prefix="/auth",
@@ -29,7 +49,8 @@ router = APIRouter(
     "/github/callback",
     response_model=AuthResponse,
     summary="GitHub OAuth Callback",
-    description="Handle GitHub OAuth callback and return access token"
+    description="Handle GitHub OAuth callback and return access token",
+    dependencies=[Depends(limit_oauth)]
 )
 async def github_callback(
     request: Request,
@@ -79,7 +100,8 @@ async def github_callback(
     "/facebook/callback",
     response_model=AuthResponse,
     summary="Facebook OAuth Callback",
-    description="Handle Facebook OAuth callback and return access token"
+    description="Handle Facebook OAuth callback and return access token",
+    dependencies=[Depends(limit_oauth)]
 )
 async def facebook_callback(
     request: Request,
@@ -114,7 +136,8 @@ async def facebook_callback(
     "/google/callback",
     response_model=AuthResponse,
     summary="Google OAuth Callback",
-    description="Handle Google OAuth callback and return access token"
+    description="Handle Google OAuth callback and return access token",
+    dependencies=[Depends(limit_oauth)]
 )
 async def google_callback(
     request: Request,
@@ -199,6 +222,18 @@ async def get_user_info(
         "last_name": user.last_name
     }
 
+@router.get(
+    "/rate-limit/stats",
+    summary="Rate Limit Stats",
+    description="Allowed and rejected counts for the login/register rate limiters"
+)
+async def rate_limit_stats(user_id: int = Depends(get_current_user)):
+    """Counters of allowed and limited requests per limiter since process start"""
+    return {
+        limiter.scope: limiter.stats()
+        for limiter in (credentials_ip_limiter, credentials_email_limiter, oauth_ip_limiter)
+    }
+
 @router.post(
     "/logout",
     summary="Logout",
@@ -207,9 +242,13 @@ async def get_user_info(
 )
 async def logout(
     response: Response,
-    current_user: int = Depends(get_current_user)  # Verify token is valid
+    current_user: int = Depends(get_current_user),  # Verify token is valid
+    token: str = Depends(oauth2_scheme)
 ):
     """Logout the current user and clear the authentication token"""
+    # Reject the token for the rest of its lifetime
+    revoke_token(token)
+    
     # Clear cookie if you're using cookie-based auth
     response.delete_cookie(
         key="access_token",
@@ -224,7 +263,7 @@ async def logout(
         "user_id": current_user
     }
 
-@router.post("/register")
+@router.post("/register", dependencies=[Depends(limit_credentials)])
 async def register_with_email(
     request: EmailRegisterRequest,
     db: Annotated[Session, Depends(get_session)]
@@ -233,7 +272,7 @@ async def register_with_email(
     service = CredentialsAuthService(db)
     return await service.register(request)
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(limit_credentials)])
 async def login_with_email(
     request: EmailAuthRequest,
     db: Annotated[Session, Depends(get_session)]
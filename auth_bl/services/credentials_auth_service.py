@@ -88,8 +88,7 @@ class CredentialsAuthService:
                 )
                 
                 self.db.add(user)
-                self.db.commit()
-                self.db.refresh(user)
+                self.db.flush()  # assigns user.id via RETURNING
                 logger.info(f"Auto-registered new user with email: {request.email}")
             else:
                 # Verify password for existing user
@@ -172,8 +171,8 @@ class CredentialsAuthService:
                 is_mobile=False
             )
             
+            # Committed together with the user by the request's unit of work
             self.db.add(login_history)
-            self.db.commit()
             logger.info(f"Created login history record for user {user_id}")
             
         except Exception as e:
@@ -198,8 +197,7 @@ class CredentialsAuthService:
             )
             
             self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
+            self.db.flush()  # assigns user.id via RETURNING
             return user
             
         except Exception as e:
@@ -9,9 +9,10 @@ from typing import Optional
 from ...utils.jwt_utils import create_access_token
 from ...schemas.auth_schemas import StateData
 from cou_user.models.user import User
-from cou_user.models.logintype import LoginType
 from cou_user.models.role import Role
 from cou_user.models.loginhistory import LoginHistory
+from cou_user.repositories.user_repository import upsert_user_by_email
+from cou_user.repositories.login_type_repository import get_login_type_id
 from datetime import datetime, timezone
 import base64
 
@@ -119,23 +120,6 @@ class GitHubAuthService:
 
             return user_info
 
-    async def _get_or_create_login_type(self) -> LoginType:
-        """Get or create GitHub login type"""
-        statement = select(LoginType).where(LoginType.name == "GITHUB")
-        login_type = self.db.exec(statement).first()
-        
-        if not login_type:
-            login_type = LoginType(
-                name="GITHUB",
-                created_by=0,
-                updated_by=0
-            )
-            self.db.add(login_type)
-            self.db.commit()
-            self.db.refresh(login_type)
-        
-        return login_type
-
     async def _get_or_create_default_role(self) -> Role:
         """Get or create default user role"""
         statement = select(Role).where(Role.name == "USER")
@@ -149,8 +133,7 @@ class GitHubAuthService:
                 updated_by=0
             )
             self.db.add(role)
-            self.db.commit()
-            self.db.refresh(role)
+            self.db.flush()
         
         return role
 
@@ -199,8 +182,8 @@ class GitHubAuthService:
                 is_mobile=device_type == "mobile"
             )
             
+            # Committed by the request's unit of work
             self.db.add(login_history)
-            self.db.commit()
             logger.info(f"Created login history record for user {user_id}")
             
         except Exception as e:
@@ -219,8 +202,8 @@ class GitHubAuthService:
             # Get user info
             github_user = await self.get_user_info(token_response["access_token"])
             
-            # Get or create login type
-            login_type = await self._get_or_create_login_type()
+            # Login type id is cached per process after the first lookup
+            login_type_id = get_login_type_id(self.db, "GITHUB")
             
             # Use admin role (role_id = 1)
             role_id = 1
@@ -228,7 +211,7 @@ class GitHubAuthService:
             # Find or create user
             user = await self._get_or_create_user(
                 github_user,
-                login_type.id,
+                login_type_id,
                 role_id
             )
             
@@ -273,33 +256,7 @@ class GitHubAuthService:
     ) -> User:
         """Get or create user from GitHub data"""
         email = github_user.get("email")
-        if email:
-            # Try to find user by email
-            statement = select(User).where(
-                (User.work_email == email) | (User.personal_email == email)
-            )
-            user = self.db.exec(statement).first()
-            
-            if user:
-                # Update existing user
-                user.display_name = github_user["login"]
-                user.first_name = github_user.get("name")
-                user.login_type_id = login_type_id
-                user.role_id = 1  # Set as admin
-                user.key = github_user["html_url"]
-                user.updated_at = datetime.now(timezone.utc)
-                user.updated_by = 0
-                
-                # Update profile image
-                if github_user.get("avatar_url"):
-                    await self._update_user_image(user, github_user["avatar_url"])
-                
-                self.db.add(user)
-                self.db.commit()
-                self.db.refresh(user)
-                return user
-        
-        # Create new user
+        current_time = datetime.now(timezone.utc)
         user = User(
             display_name=github_user["login"],
             first_name=github_user.get("name"),
@@ -312,26 +269,39 @@ class GitHubAuthService:
             key=github_user["html_url"],
             currency_id=None,
             country_id=None,
-            affiliate_id=None
+            affiliate_id=None,
+            created_at=current_time,
+            updated_at=current_time
         )
         
         # Set profile image
         if github_user.get("avatar_url"):
-            await self._update_user_image(user, github_user["avatar_url"])
+            user.image = await self._fetch_user_image(github_user["avatar_url"])
+        
+        if email:
+            # Update the account registered under this email (personal or work),
+            # or insert a new one
+            update_fields = [
+                "display_name", "first_name", "login_type_id",
+                "role_id", "key", "updated_at", "updated_by"
+            ]
+            if user.image is not None:
+                update_fields.append("image")
+            return upsert_user_by_email(self.db, user, update_fields, match_work_email=True)
         
+        # Without an email there is nothing to match on, so always create
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
         return user
 
-    async def _update_user_image(self, user: User, image_url: str):
-        """Download and update user's profile image"""
+    async def _fetch_user_image(self, image_url: str) -> Optional[bytes]:
+        """Download the user's profile image"""
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(image_url)
                 if response.status_code == 200:
-                    user.image = response.content
-                else:
-                    print(f"Failed to download profile image from {image_url}: Status {response.status_code}")
+                    return response.content
+                print(f"Failed to download profile image from {image_url}: Status {response.status_code}")
         except Exception as e:
-            print(f"Error downloading profile image from {image_url}: {str(e)}") 
\ No newline at end of file
+            print(f"Error downloading profile image from {image_url}: {str(e)}")
+        return None
@@ -6,8 +6,9 @@ from typing import Optional, Dict, Any
 from ...utils.jwt_utils import create_access_token
 from ...utils.config import get_settings
 from cou_user.models.user import User
-from cou_user.models.logintype import LoginType
 from cou_user.models.loginhistory import LoginHistory
+from cou_user.repositories.user_repository import upsert_user_by_email
+from cou_user.repositories.login_type_repository import get_login_type_id
 from datetime import datetime, timezone
 import base64
 
@@ -62,23 +63,6 @@ class GoogleAuthService:
                 'email_verified': user_info.get('email_verified', False)
             }
 
-    async def _get_or_create_login_type(self) -> LoginType:
-        """Get or create Google login type"""
-        statement = select(LoginType).where(LoginType.name == "GOOGLE")
-        login_type = self.db.exec(statement).first()
-        
-        if not login_type:
-            login_type = LoginType(
-                name="GOOGLE",
-                created_by=0,
-                updated_by=0
-            )
-            self.db.add(login_type)
-            self.db.commit()
-            self.db.refresh(login_type)
-        
-        return login_type
-
     async def _create_login_history(self, user_id: int, role_id: Optional[int] = None) -> None:
         """Create a login history record"""
         try:
@@ -121,16 +105,9 @@ class GoogleAuthService:
                 is_mobile=device_type == "mobile"
             )
             
-            # Add and commit with error handling
-            try:
-                self.db.add(login_history)
-                self.db.commit()
-                self.db.refresh(login_history)
-                logger.info(f"Successfully created login history record id={login_history.id} for user {user_id}")
-            except Exception as commit_error:
-                self.db.rollback()
-                logger.error(f"Database error creating login history: {str(commit_error)}")
-                raise
+            # Committed by the request's unit of work
+            self.db.add(login_history)
+            logger.info(f"Created login history record for user {user_id}")
             
         except Exception as e:
             logger.error(f"Error creating login history for user {user_id}: {str(e)}")
@@ -140,63 +117,47 @@ class GoogleAuthService:
             )
 
     async def _get_or_create_user(self, user_info: dict, login_type_id: int, role_id: int) -> User:
-        """Get existing user or create new one"""
+        """Insert or update the user for this Google account in a single upsert"""
         try:
             if not user_info.get('email'):
                 logger.error("Email not provided by Google")
                 raise HTTPException(status_code=400, detail="Email not provided by Google")
             
-            logger.info(f"Looking up user with email: {user_info['email']}")
-            user_query = select(User).where(User.personal_email == user_info['email'])
-            user = self.db.exec(user_query).first()
+            name_parts = user_info['name'].split(' ', 1)
+            current_time = datetime.now(timezone.utc)
+            user = User(
+                personal_email=user_info['email'],
+                first_name=name_parts[0],
+                last_name=name_parts[1] if len(name_parts) > 1 else "",
+                display_name=user_info['name'],
+                auth_provider="google",
+                role_id=role_id,
+                login_type_id=login_type_id,
+                created_by=0,
+                updated_by=0,
+                active=True,
+                created_at=current_time,
+                updated_at=current_time
+            )
+            update_fields = [
+                "display_name", "first_name", "last_name",
+                "login_type_id", "role_id", "updated_at", "active"
+            ]
+            
+            if user_info.get('picture'):
+                user.image = await self._fetch_user_image(user_info['picture'])
+                if user.image is not None:
+                    update_fields.append("image")
             
             try:
-                if not user:
-                    logger.info(f"Creating new user for email: {user_info['email']}")
-                    name_parts = user_info['name'].split(' ', 1)
-                    first_name = name_parts[0]
-                    last_name = name_parts[1] if len(name_parts) > 1 else ""
-                    
-                    user = User(
-                        personal_email=user_info['email'],
-                        first_name=first_name,
-                        last_name=last_name,
-                        display_name=user_info['name'],
-                        auth_provider="google",
-                        role_id=role_id,
-                        login_type_id=login_type_id,
-                        created_by=0,
-                        updated_by=0,
-                        active=True
-                    )
-                    
-                    if user_info.get('picture'):
-                        await self._update_user_image(user, user_info['picture'])
-                    
-                    self.db.add(user)
-                    self.db.commit()
-                    self.db.refresh(user)
-                    logger.info(f"Successfully created new user with id: {user.id}")
-                else:
-                    logger.info(f"Updating existing user with id: {user.id}")
-                    # Update existing user's display name and other details
-                    user.display_name = user_info['name']
-                    user.first_name = user_info['name'].split(' ', 1)[0]
-                    user.last_name = user_info['name'].split(' ', 1)[1] if len(user_info['name'].split(' ', 1)) > 1 else ""
-                    user.login_type_id = login_type_id
-                    user.role_id = role_id
-                    user.updated_at = datetime.now(timezone.utc)
-                    user.updated_by = user.id
-                    user.active = True
-                    
-                    if user_info.get('picture'):
-                        await self._update_user_image(user, user_info['picture'])
-                    
-                    self.db.add(user)
-                    self.db.commit()
-                    self.db.refresh(user)
-                    logger.info(f"Successfully updated user with id: {user.id}")
-                
+                logger.info(f"Upserting user with email: {user_info['email']}")
+                user = upsert_user_by_email(
+                    self.db,
+                    user,
+                    update_fields,
+                    # Existing users record themselves as the updater
+                    extra_updates={"updated_by": User.__table__.c.id}
+                )
             except Exception as db_error:
                 self.db.rollback()
                 logger.error(f"Database error in user operation: {str(db_error)}")
@@ -206,7 +167,7 @@ class GoogleAuthService:
                 )
             
             logger.info(f"User info from Google: {user_info}")
-            logger.info(f"User details after update/create: id={user.id}, display_name={user.display_name}, email={user.personal_email}")
+            logger.info(f"User details after upsert: id={user.id}, display_name={user.display_name}, email={user.personal_email}")
             
             return user
             
@@ -219,15 +180,16 @@ class GoogleAuthService:
                 detail=f"Error in user operation: {str(e)}"
             )
 
-    async def _update_user_image(self, user: User, image_url: str):
-        """Update user's profile image"""
+    async def _fetch_user_image(self, image_url: str) -> Optional[bytes]:
+        """Download the user's profile image"""
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(image_url)
                 if response.status_code == 200:
-                    user.image = response.content
+                    return response.content
         except Exception as e:
             logger.error(f"Failed to download profile picture: {str(e)}")
+        return None
 
     async def authenticate(self, code: str, redirect_uri: str, state: Optional[str] = None) -> dict:
         """Complete Google authentication flow"""
@@ -242,14 +204,14 @@ class GoogleAuthService:
             if not user_info.get('email_verified'):
                 raise HTTPException(status_code=400, detail="Email not verified")
             
-            # Get or create login type
-            login_type = await self._get_or_create_login_type()
+            # Login type id is cached per process after the first lookup
+            login_type_id = get_login_type_id(self.db, "GOOGLE")
             
             # Use admin role (role_id = 1)
             role_id = 1
             
             # Find or create user
-            user = await self._get_or_create_user(user_info, login_type.id, role_id)
+            user = await self._get_or_create_user(user_info, login_type_id, role_id)
             
             # Create login history record
             await self._create_login_history(user.id, role_id)
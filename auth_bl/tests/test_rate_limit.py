@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from auth_bl.utils.rate_limit import InMemoryBucketStore, RateLimiter, client_ip, rate_limit_dependency
+
+
+class FakeRequest:
+    """Minimal stand-in for a Starlette request."""
+
+    def __init__(self, ip="10.0.0.1", body=None, forwarded_for=None):
+        self.headers = {"x-forwarded-for": forwarded_for} if forwarded_for else {}
+        self.client = type("Address", (), {"host": ip})()
+        self.url = type("URL", (), {"path": "/api/v1/auth/login"})()
+        self._body = body
+
+    async def json(self):
+        return self._body
+
+
+def test_bucket_allows_burst_then_limits():
+    """A bucket allows `capacity` requests and then reports a retry delay."""
+    limiter = RateLimiter("test", capacity=3, per_minute=60)
+
+    assert [limiter.hit("a") for _ in range(3)] == [0, 0, 0]
+    assert limiter.hit("a") > 0
+    assert limiter.stats() == {"allowed": 3, "limited": 1}
+
+
+def test_keys_have_separate_buckets():
+    """Exhausting one key does not affect another."""
+    limiter = RateLimiter("test", capacity=1, per_minute=1)
+    limiter.hit("a")
+
+    assert limiter.hit("a") > 0
+    assert limiter.hit("b") == 0
+
+
+def test_store_is_bounded():
+    """The store drops the least recently used buckets past max_keys."""
+    store = InMemoryBucketStore(max_keys=2)
+    for key in ("a", "b", "c"):
+        store.take(key, 1, 1)
+
+    assert list(store._buckets) == ["b", "c"]
+
+
+def test_dependency_limits_by_email():
+    """The email limiter applies across IPs and raises 429 with Retry-After."""
+    dependency = rate_limit_dependency(
+        RateLimiter("ip", capacity=10, per_minute=10),
+        RateLimiter("email", capacity=1, per_minute=1)
+    )
+    asyncio.run(dependency(FakeRequest("10.0.0.1", {"email": "User@Example.com"})))
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(dependency(FakeRequest("10.0.0.2", {"email": "user@example.com"})))
+    assert exc.value.status_code == 429
+    assert int(exc.value.headers["Retry-After"]) >= 1
+
+
+def test_client_ip_ignores_forwarded_for_without_trusted_proxies():
+    """A client-supplied X-Forwarded-For does not change the rate limit key."""
+    request = FakeRequest("10.0.0.1", forwarded_for="1.2.3.4")
+
+    assert client_ip(request) == "10.0.0.1"
+
+
+def test_client_ip_takes_hop_added_by_trusted_proxy():
+    """Only the right-most hops, appended by our own proxies, are believed."""
+    request = FakeRequest("172.16.0.9", forwarded_for="1.2.3.4, 203.0.113.7")
+
+    assert client_ip(request, trusted_proxy_hops=1) == "203.0.113.7"
+    assert client_ip(request, trusted_proxy_hops=2) == "1.2.3.4"
+    assert client_ip(FakeRequest("172.16.0.9"), trusted_proxy_hops=1) == "172.16.0.9"
+
+
+def test_spoofed_forwarded_for_does_not_bypass_ip_limit():
+    dependency = rate_limit_dependency(RateLimiter("ip", capacity=1, per_minute=1), trusted_proxy_hops=1)
+    asyncio.run(dependency(FakeRequest("172.16.0.9", forwarded_for="9.9.9.1, 203.0.113.7")))
+
+    with pytest.raises(HTTPException):
+        asyncio.run(dependency(FakeRequest("172.16.0.9", forwarded_for="9.9.9.2, 203.0.113.7")))
@@ -0,0 +1,56 @@
+import time
+import pytest
+from auth_bl.utils.token_cache import VerifiedTokenCache
+
+
+@pytest.fixture
+def cache():
+    """Fixture to provide a small token cache."""
+    return VerifiedTokenCache(max_entries=2, skew_seconds=5)
+
+
+def test_put_and_get_returns_claims(cache):
+    """Verified claims are returned for the same token."""
+    claims = {"sub": "1", "exp": time.time() + 600}
+    cache.put("token-a", claims)
+
+    assert cache.get("token-a") == claims
+    assert cache.stats()["hits"] == 1
+
+
+def test_entry_expires_before_exp(cache):
+    """Claims are not served within the skew window before exp."""
+    cache.put("token-a", {"sub": "1", "exp": time.time() + 3})
+
+    assert cache.get("token-a") is None
+
+
+def test_tokens_without_exp_are_not_cached(cache):
+    """Only tokens with an expiry are cached."""
+    cache.put("token-a", {"sub": "1"})
+
+    assert cache.get("token-a") is None
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    """The cache never grows past max_entries."""
+    exp = time.time() + 600
+    cache.put("token-a", {"sub": "1", "exp": exp})
+    cache.put("token-b", {"sub": "2", "exp": exp})
+    cache.get("token-a")
+    cache.put("token-c", {"sub": "3", "exp": exp})
+
+    assert cache.get("token-b") is None
+    assert cache.get("token-a") is not None
+    assert cache.get("token-c") is not None
+
+
+def test_revoke_drops_entry_and_blocks_token(cache):
+    """A revoked token is removed from the cache and reported as revoked."""
+    exp = time.time() + 600
+    cache.put("token-a", {"sub": "1", "exp": exp})
+    cache.revoke("token-a", exp)
+
+    assert cache.get("token-a") is None
+    assert cache.is_revoked("token-a")
+    assert not cache.is_revoked("token-b")
@@ -1,9 +1,10 @@
-from .jwt_utils import create_access_token, verify_token
+from .jwt_utils import create_access_token, verify_token, revoke_token
 from .oauth2 import get_current_user, oauth2_scheme
 
 __all__ = [
     'create_access_token',
     'verify_token',
+    'revoke_token',
     'get_current_user',
     'oauth2_scheme'
 ] 
\ No newline at end of file
@@ -38,6 +38,16 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Login/register rate limits (token bucket: burst size and refill per minute)
+    AUTH_RATE_LIMIT_IP_BURST: int = 20
+    AUTH_RATE_LIMIT_IP_PER_MINUTE: int = 20
+    AUTH_RATE_LIMIT_EMAIL_BURST: int = 5
+    AUTH_RATE_LIMIT_EMAIL_PER_MINUTE: int = 5
+    # Proxies in front of the app that append to X-Forwarded-For (e.g. 1 on Vercel);
+    # 0 keys the IP limit on the connection's peer address
+    AUTH_RATE_LIMIT_TRUSTED_PROXY_HOPS: int = 0
     
     class Config:
         env_file = ".env"
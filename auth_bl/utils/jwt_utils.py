@@ -1,11 +1,14 @@
-3.
-
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from .config import get_settings
+from .token_cache import VerifiedTokenCache
 
 settings = get_settings()
 
+# Verified claims are reused until shortly before `exp`, so repeated calls from the
+# frontend (/auth/verify, /auth/user) skip the signature check.
+token_cache = VerifiedTokenCache(max_entries=settings.JWT_CACHE_MAX_ENTRIES)
+
 def create_access_token(user_id: int) -> str:
     expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     expire = datetime.now(timezone.utc) + expires_delta
@@ -19,8 +22,26 @@ def create_access_token(user_id: int) -> str:
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
 def verify_token(token: str) -> dict:
+    if token_cache.is_revoked(token):
+        raise ValueError("Token has been revoked")
+
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        return payload
     except JWTError:
-        raise ValueError("Invalid token or expired signature") 
\ No newline at end of file
+        raise ValueError("Invalid token or expired signature")
+
+    token_cache.put(token, payload)
+    return payload
+
+def revoke_token(token: str) -> None:
+    """Reject this token in verify_token until it expires"""
+    expires_at = None
+    try:
+        expires_at = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        pass
+    token_cache.revoke(token, expires_at)
@@ -0,0 +1,112 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException, Request, status
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryBucketStore:
+    """
+    Token-bucket state kept in process memory.
+
+    One store can be shared by several limiters (keys are namespaced by the
+    limiter scope). A cross-process store only has to provide the same `take`
+    method. The number of tracked keys is bounded; the least recently used
+    buckets are dropped first, which at worst hands a key a full bucket again.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Consume one token. Returns 0 when allowed, otherwise seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+            if tokens >= 1:
+                retry_after = 0.0
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RateLimiter:
+    """Token bucket of `capacity` requests refilled at `per_minute` requests per minute, per key"""
+
+    def __init__(self, scope: str, capacity: int, per_minute: int, store: Optional[InMemoryBucketStore] = None):
+        self.scope = scope
+        self.capacity = capacity
+        self.refill_per_second = per_minute / 60.0
+        self.store = store or InMemoryBucketStore()
+        self.allowed = 0
+        self.limited = 0
+
+    def hit(self, key: str) -> float:
+        retry_after = self.store.take(f"{self.scope}:{key}", self.capacity, self.refill_per_second)
+        if retry_after:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    def stats(self) -> Dict[str, int]:
+        return {"allowed": self.allowed, "limited": self.limited}
+
+
+def client_ip(request: Request, trusted_proxy_hops: int = 0) -> str:
+    """
+    Client IP to rate limit on. X-Forwarded-For is set by the client, so only the
+    hops appended by our own `trusted_proxy_hops` proxies are believed: the entry
+    that many places from the right is the address the first proxy saw. With no
+    trusted proxies (or behind uvicorn --proxy-headers, which already resolves it)
+    the socket peer address is used.
+    """
+    if trusted_proxy_hops > 0:
+        hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if len(hops) >= trusted_proxy_hops:
+            return hops[-trusted_proxy_hops]
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit_dependency(ip_limiter: RateLimiter, email_limiter: Optional[RateLimiter] = None, trusted_proxy_hops: int = 0):
+    """
+    Build a FastAPI dependency that rejects the request with 429 before the
+    endpoint runs (and therefore before any password hashing or DB access).
+    The email limiter reads `email` from the JSON body, which FastAPI has
+    already parsed and cached on the request.
+    """
+    async def dependency(request: Request) -> None:
+        retry_after = ip_limiter.hit(client_ip(request, trusted_proxy_hops))
+        limiter = ip_limiter
+
+        if not retry_after and email_limiter is not None:
+            try:
+                body = await request.json()
+            except Exception:
+                body = None
+            email = body.get("email") if isinstance(body, dict) else None
+            if isinstance(email, str) and email:
+                retry_after = email_limiter.hit(email.strip().lower())
+                limiter = email_limiter
+
+        if retry_after:
+            logger.debug(f"Rate limited {request.url.path} ({limiter.scope})")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, please try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    return dependency
@@ -0,0 +1,97 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified JWT claims.
+
+    Entries are keyed by the SHA-256 digest of the raw token (the token itself is
+    never stored) and are served until `skew_seconds` before the token's `exp`.
+    Revoked digests are kept in a dict until their own expiry, so the revocation
+    check is a single O(1) lookup.
+    """
+
+    def __init__(self, max_entries: int = 10000, skew_seconds: int = 5):
+        self.max_entries = max_entries
+        self.skew_seconds = skew_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._revoked: Dict[bytes, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return cached claims for a still-valid token, or None on a miss"""
+        key = self.digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            valid_until, claims = entry
+            if valid_until <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        """Cache verified claims; tokens without `exp` are never cached"""
+        exp = claims.get("exp")
+        if exp is None:
+            return
+        valid_until = float(exp) - self.skew_seconds
+        if valid_until <= time.time():
+            return
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (valid_until, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def revoke(self, token: str, expires_at: Optional[float] = None) -> None:
+        """
+        Revoke a token until `expires_at` (its `exp`). When not given, the expiry
+        of the cached entry is used, falling back to one day.
+        """
+        key = self.digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if expires_at is None:
+                expires_at = entry[0] + self.skew_seconds if entry else now + 86400
+            self._revoked[key] = expires_at
+            # Opportunistically drop revocations for tokens that expired anyway
+            if len(self._revoked) > self.max_entries:
+                self._revoked = {k: v for k, v in self._revoked.items() if v > now}
+
+    def is_revoked(self, token: str) -> bool:
+        expires_at = self._revoked.get(self.digest(token))
+        return expires_at is not None and expires_at > time.time()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "revoked": len(self._revoked),
+            "hits": self.hits,
+            "misses": self.misses
+        }
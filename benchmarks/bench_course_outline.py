@@ -0,0 +1,111 @@
+"""
+Course outline cost for a large course: building the tree from its fixed set of
+queries, then serving it from the per-version cache. Uses an in-memory SQLite copy
+of the cou_course tables, so no database server is needed.
+
+Usage:
+    python benchmarks/bench_course_outline.py [topics] [components_per_topic] [iterations]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import event, insert  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+# Every class reachable through the model relationships must be mapped before first use
+import cou_user.models.user  # noqa: E402,F401
+import cou_course.models.course  # noqa: E402,F401
+import cou_course.models.question  # noqa: E402,F401
+import cou_course.models.memory_game_pair  # noqa: E402,F401
+from cou_course.models.topic import Topic  # noqa: E402
+from cou_course.models.lesson import Lesson  # noqa: E402
+from cou_course.models.quiz import Quiz  # noqa: E402
+from cou_course.models.flashcard import Flashcard  # noqa: E402
+from cou_course.models.mindmap import Mindmap  # noqa: E402
+from cou_course.models.memory_game import MemoryGame  # noqa: E402
+from cou_course.models.lesson_order import LessonOrder, ComponentType  # noqa: E402
+from cou_course.services.course_outline import CourseOutlineCache, build_outline  # noqa: E402
+from cou_course.repositories.course_outline_repository import CourseOutlineRepository  # noqa: E402
+
+COURSE_ID = 1
+TABLES = [model.__table__ for model in (Topic, Lesson, Quiz, Flashcard, Mindmap, MemoryGame, LessonOrder)]
+
+
+def make_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, _):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS cou_course")
+
+    SQLModel.metadata.create_all(engine, tables=TABLES)
+    return engine
+
+
+def seed(engine, topics: int, components: int) -> None:
+    with Session(engine) as session:
+        session.execute(insert(Topic), [
+            {"id": t, "course_id": COURSE_ID, "title": f"Topic {t}", "topic_order": t, "created_by": 1}
+            for t in range(1, topics + 1)
+        ])
+        lessons, quizzes, cards, orders = [], [], [], []
+        ref = 0
+        for t in range(1, topics + 1):
+            for c in range(components):
+                ref += 1
+                if c % 3 == 2:
+                    quizzes.append({"id": ref, "topic_id": t, "course_id": COURSE_ID, "title": f"Quiz {ref}", "created_by": 1})
+                    component_type = ComponentType.QUIZ
+                elif c % 3 == 1:
+                    cards.extend({"topic_id": t, "course_id": COURSE_ID, "flashcard_set_id": ref, "front": "f",
+                                  "back": "b", "created_by": 1} for _ in range(5))
+                    component_type = ComponentType.FLASHCARDS
+                else:
+                    lessons.append({"id": ref, "topic_id": t, "course_id": COURSE_ID, "title": f"Lesson {ref}", "created_by": 1})
+                    component_type = ComponentType.LESSON
+                orders.append({"course_id": COURSE_ID, "topic_id": t, "component_type": component_type,
+                               "lesson_ref_id": ref, "sort_order": c, "created_by": 1})
+        session.execute(insert(Lesson), lessons)
+        session.execute(insert(Quiz), quizzes)
+        session.execute(insert(Flashcard), cards)
+        session.execute(insert(LessonOrder), orders)
+        session.commit()
+
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def run(topics: int, components: int, iterations: int) -> None:
+    engine = make_engine()
+    seed(engine, topics, components)
+    cache = CourseOutlineCache()
+
+    with Session(engine) as session:
+        version = CourseOutlineRepository.get_version(session, COURSE_ID)
+        build = timed(lambda: build_outline(session, COURSE_ID, version), iterations)
+        cache.get(session, COURSE_ID)
+        cached = timed(lambda: cache.get(session, COURSE_ID), iterations)
+        outline = cache.get(session, COURSE_ID).outline
+        serialize = timed(lambda: outline.model_dump_json(), iterations)
+
+    print(f"topics:            {topics} x {components} components")
+    print(f"build (uncached):  {build * 1e3:8.2f} ms")
+    print(f"cached (version):  {cached * 1e3:8.2f} ms")
+    print(f"serialize (once):  {serialize * 1e3:8.2f} ms")
+    print(f"cache stats:       {cache.stats()}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 200,
+        int(args[1]) if len(args) > 1 else 10,
+        int(args[2]) if len(args) > 2 else 20
+    )
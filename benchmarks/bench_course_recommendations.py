@@ -0,0 +1,63 @@
+"""
+Recommendation job cost for a large synthetic catalog: building the course feature
+matrix, the batched top-k cosine search and turning the neighbours into table rows.
+Pure NumPy, so no database is needed.
+
+Usage:
+    python benchmarks/bench_course_recommendations.py [courses] [k]
+"""
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cou_course.services.course_recommendations import build_features, recommendation_rows, top_k  # noqa: E402
+
+
+def make_rows(courses: int):
+    rng = np.random.default_rng(0)
+    levels = ["beginner", "intermediate", "advanced", None]
+    subcategories = rng.integers(1, 400, courses)
+    return [
+        SimpleNamespace(
+            id=i + 1, category_id=int(subcategories[i] // 20), subcategory_id=int(subcategories[i]),
+            course_type_id=int(rng.integers(1, 4)), language_id=int(rng.integers(1, 30)),
+            Course_level=levels[i % 4], IT=bool(i % 3), Coding_Required=bool(i % 5),
+            price=float(rng.choice([0, 9.99, 29.99, 79.99, 149.99, 499.0]))
+        )
+        for i in range(courses)
+    ]
+
+
+def run(courses: int, k: int) -> None:
+    rows = make_rows(courses)
+
+    start = time.perf_counter()
+    features = build_features(rows)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    neighbours, scores = top_k(features, k)
+    search = time.perf_counter() - start
+
+    start = time.perf_counter()
+    recommendations = recommendation_rows(np.array([row.id for row in rows]), neighbours, scores)
+    output = time.perf_counter() - start
+
+    print(f"courses:           {courses} x {features.shape[1]} features, k={k}")
+    print(f"features:          {build:8.2f} s")
+    print(f"top-k search:      {search:8.2f} s")
+    print(f"table rows:        {output:8.2f} s, {len(recommendations)} rows")
+    print(f"total (no db):     {build + search + output:8.2f} s")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 20000,
+        int(args[1]) if len(args) > 1 else 20
+    )
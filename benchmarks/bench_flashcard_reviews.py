@@ -0,0 +1,114 @@
+"""
+Spaced-repetition scheduler at scale: "next cards due" over a million review states,
+batched review submission and raw SM-2 throughput. Uses an in-memory SQLite copy of
+the cou_course tables, so no database server is needed.
+
+Usage:
+    python benchmarks/bench_flashcard_reviews.py [learners] [cards_per_learner] [queries]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import event, insert, text  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+# Every class reachable through the model relationships must be mapped before first use
+import cou_user.models.user  # noqa: E402,F401
+import cou_course.models.course  # noqa: E402,F401
+import cou_course.models.question  # noqa: E402,F401
+import cou_course.models.memory_game_pair  # noqa: E402,F401
+import cou_course.models.topic  # noqa: E402,F401
+import cou_course.models.lesson  # noqa: E402,F401
+import cou_course.models.quiz  # noqa: E402,F401
+import cou_course.models.mindmap  # noqa: E402,F401
+import cou_course.models.memory_game  # noqa: E402,F401
+from cou_course.models.flashcard import Flashcard  # noqa: E402
+from cou_course.models.flashcard_review import FlashcardReviewState, FlashcardReviewLog  # noqa: E402
+from cou_course.services.spaced_repetition import Schedule, due_cards, sm2, submit_reviews  # noqa: E402
+
+COURSE_ID = 1
+TABLES = [Flashcard.__table__, FlashcardReviewState.__table__, FlashcardReviewLog.__table__]
+
+
+def make_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, _):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS cou_course")
+
+    SQLModel.metadata.create_all(engine, tables=TABLES)
+    return engine
+
+
+def seed(engine, learners: int, cards: int) -> None:
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        session.execute(insert(Flashcard), [
+            {"id": card, "course_id": COURSE_ID, "topic_id": 1, "flashcard_set_id": card // 20, "front": "f",
+             "back": "b", "card_order": card % 20, "created_by": 1}
+            for card in range(1, cards + 1)
+        ])
+        for user_id in range(1, learners + 1):
+            session.execute(insert(FlashcardReviewState), [
+                {"user_id": user_id, "flashcard_id": card, "course_id": COURSE_ID, "ease_factor": 2.5,
+                 "interval_days": 6, "repetitions": 2, "lapses": 0,
+                 "due_at": now + timedelta(hours=rng.randint(-72, 24 * 30)), "last_reviewed_at": now, "created_at": now}
+                for card in range(1, cards + 1)
+            ])
+        session.commit()
+
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return (time.perf_counter() - start) / iterations
+
+
+def run(learners: int, cards: int, queries: int) -> None:
+    engine = make_engine()
+    start = time.perf_counter()
+    seed(engine, learners, cards)
+    seeding = time.perf_counter() - start
+    rng = random.Random(1)
+
+    with Session(engine) as session:
+        plan = session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT flashcard_id FROM cou_course.flashcard_review_state "
+            "WHERE user_id = 1 AND course_id = 1 AND due_at <= '2100-01-01' ORDER BY due_at LIMIT 20"
+        )).all()
+        due = timed(lambda i: due_cards(session, 1 + rng.randrange(learners), COURSE_ID, 20, 0), queries)
+        due_new = timed(lambda i: due_cards(session, 1 + rng.randrange(learners), COURSE_ID, 20, 10), queries)
+        batch = timed(lambda i: submit_reviews(session, 1 + rng.randrange(learners), [
+            (1 + rng.randrange(cards), rng.randint(0, 5), None) for _ in range(50)
+        ]), max(queries // 10, 1))
+        session.rollback()
+
+    schedule = Schedule()
+    start = time.perf_counter()
+    for i in range(200000):
+        schedule = sm2(schedule, 3 + i % 3)
+    scheduling = (time.perf_counter() - start) / 200000
+
+    print(f"review states:     {learners * cards} ({learners} learners x {cards} cards), seeded in {seeding:.1f} s")
+    print(f"due query plan:    {plan[-1][-1]}")
+    print(f"next due (20):     {due * 1e3:8.3f} ms")
+    print(f"due + new (20+10): {due_new * 1e3:8.3f} ms")
+    print(f"submit 50 reviews: {batch * 1e3:8.3f} ms")
+    print(f"sm2 step:          {scheduling * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 2000,
+        int(args[1]) if len(args) > 1 else 500,
+        int(args[2]) if len(args) > 2 else 200
+    )
@@ -0,0 +1,67 @@
+"""
+Per-request JWT verification cost with and without the verified-token cache.
+
+Usage:
+    python benchmarks/bench_jwt_verify.py [iterations]
+"""
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from jose import jwt  # noqa: E402
+from auth_bl.utils.token_cache import VerifiedTokenCache  # noqa: E402
+
+SECRET = "benchmark-secret"
+ALGORITHM = "HS256"
+
+
+def make_token(user_id: int) -> str:
+    now = datetime.now(timezone.utc)
+    return jwt.encode(
+        {"sub": str(user_id), "exp": now + timedelta(minutes=30), "iat": now},
+        SECRET,
+        algorithm=ALGORITHM
+    )
+
+
+def verify_uncached(token: str) -> dict:
+    return jwt.decode(token, SECRET, algorithms=[ALGORITHM])
+
+
+def verify_cached(cache: VerifiedTokenCache, token: str) -> dict:
+    if cache.is_revoked(token):
+        raise ValueError("revoked")
+    claims = cache.get(token)
+    if claims is None:
+        claims = jwt.decode(token, SECRET, algorithms=[ALGORITHM])
+        cache.put(token, claims)
+    return claims
+
+
+def run(iterations: int) -> None:
+    # A small pool of active users issuing repeated requests
+    tokens = [make_token(user_id) for user_id in range(100)]
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        verify_uncached(tokens[i % len(tokens)])
+    uncached = (time.perf_counter() - start) / iterations
+
+    cache = VerifiedTokenCache()
+    start = time.perf_counter()
+    for i in range(iterations):
+        verify_cached(cache, tokens[i % len(tokens)])
+    cached = (time.perf_counter() - start) / iterations
+
+    print(f"iterations:        {iterations}")
+    print(f"jwt.decode:        {uncached * 1e6:8.2f} us/request")
+    print(f"cached verify:     {cached * 1e6:8.2f} us/request")
+    print(f"speedup:           {uncached / cached:8.1f}x")
+    print(f"cache stats:       {cache.stats()}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
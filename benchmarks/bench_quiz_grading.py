@@ -0,0 +1,67 @@
+"""
+Quiz grading throughput on one core: whole submissions graded against precompiled
+answer keys, as the attempts endpoint does after its cache lookup. The quiz mixes
+every auto-graded question type; submissions are half right, half wrong.
+
+Usage:
+    python benchmarks/bench_quiz_grading.py [questions] [submissions]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cou_course.models.question import QuestionType  # noqa: E402
+from cou_course.services.quiz_engine import CompiledQuiz, compile_answer_key, grade  # noqa: E402
+
+# (type, answers JSON, right answer, wrong answer)
+TEMPLATES = [
+    (QuestionType.SINGLE, [{"id": "a", "is_correct": True}, {"id": "b"}, {"id": "c"}], "a", "b"),
+    (QuestionType.MULTIPLE, [{"id": 1, "is_correct": True}, {"id": 2}, {"id": 3, "is_correct": True}], [1, 3], [1, 2]),
+    (QuestionType.TRUE_FALSE, {"correct": True}, True, False),
+    (QuestionType.FILL_BLANK, {"blanks": [["New York", "NYC"], "Hudson"]}, ["nyc", "Hudson"], ["Boston", "Charles"]),
+    (QuestionType.SORT_ANSWER, {"order": ["one", "two", "three", "four"]}, ["one", "two", "three", "four"],
+     ["two", "one", "three", "four"]),
+    (QuestionType.MATCHING_TEXT, {"pairs": {"H2O": "water", "NaCl": "salt", "CO2": "gas"}},
+     {"H2O": "water", "NaCl": "salt", "CO2": "gas"}, {"H2O": "salt", "NaCl": "water", "CO2": "gas"}),
+]
+
+
+def make_quiz(questions: int):
+    keys, right, wrong = {}, {}, {}
+    for question_id in range(1, questions + 1):
+        question_type, answers, right_answer, wrong_answer = TEMPLATES[question_id % len(TEMPLATES)]
+        keys[question_id] = compile_answer_key(question_id, question_type, 1, answers)
+        right[question_id] = right_answer
+        wrong[question_id] = wrong_answer
+    return CompiledQuiz(1, "bench", 70, None, None, keys, {}), right, wrong
+
+
+def run(questions: int, submissions: int) -> None:
+    quiz, right, wrong = make_quiz(questions)
+    rng = random.Random(0)
+    batch = [
+        {question_id: (right if rng.random() < 0.5 else wrong)[question_id] for question_id in quiz.keys}
+        for _ in range(1000)
+    ]
+
+    start = time.perf_counter()
+    for i in range(submissions):
+        grade(quiz, batch[i % len(batch)])
+    elapsed = time.perf_counter() - start
+
+    print(f"questions:         {questions}")
+    print(f"submissions:       {submissions}")
+    print(f"total:             {elapsed * 1e3:8.2f} ms")
+    print(f"per submission:    {elapsed / submissions * 1e6:8.2f} us")
+    print(f"throughput:        {submissions / elapsed:8.0f} submissions/s")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(
+        int(args[0]) if len(args) > 0 else 20,
+        int(args[1]) if len(args) > 1 else 50000
+    )
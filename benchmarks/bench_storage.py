@@ -0,0 +1,82 @@
+"""
+Listing and streaming throughput of the storage backends.
+
+The local backend is benchmarked against a generated tree of lesson folders in a
+temporary directory (no network needed). Pass `azure` to run the same read-only
+measurements against the container in AZURE_STORAGE_CONNECTION_STRING.
+
+Usage:
+    python benchmarks/bench_storage.py [local|azure] [lessons] [segments_per_lesson] [segment_kib]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cou_course.services.blob_storage import init_blob_storage  # noqa: E402
+from cou_course.services.local_storage import LocalFileStorage  # noqa: E402
+
+
+def generate_tree(root: str, lessons: int, segments: int, segment_kib: int) -> None:
+    payload = os.urandom(segment_kib * 1024)
+    for lesson in range(lessons):
+        folder = Path(root) / f"lesson-{lesson:04d}" / "720p"
+        folder.mkdir(parents=True)
+        (folder.parent / "master.m3u8").write_text("#EXTM3U\n720p/index.m3u8\n")
+        for segment in range(segments):
+            (folder / f"seg{segment:04d}.ts").write_bytes(payload)
+
+
+async def measure(storage) -> None:
+    start = time.perf_counter()
+    folders = [prefix async for prefix in storage.list_prefixes()]
+    prefixes = time.perf_counter() - start
+
+    start = time.perf_counter()
+    blobs = [blob async for blob in storage.list_blobs()]
+    listing = time.perf_counter() - start
+
+    streamed = [blob for blob in blobs if blob.name.endswith(".ts")][:200] or blobs[:200]
+    start = time.perf_counter()
+    total = 0
+    for blob in streamed:
+        async for chunk in storage.open_range(blob.name, 0, blob.size):
+            total += len(chunk)
+    streaming = time.perf_counter() - start
+
+    print(f"backend:           {storage.source}")
+    print(f"list folders:      {len(folders):8d} in {prefixes * 1e3:8.2f} ms")
+    print(f"list blobs:        {len(blobs):8d} in {listing * 1e3:8.2f} ms, {len(blobs) / max(listing, 1e-9):10.0f} blobs/s")
+    print(f"stream:            {total / 2**20:8.1f} MiB from {len(streamed)} blobs in {streaming * 1e3:8.2f} ms, "
+          f"{total / 2**20 / max(streaming, 1e-9):8.1f} MiB/s")
+
+
+async def run(backend: str, lessons: int, segments: int, segment_kib: int) -> None:
+    if backend == "azure":
+        storage = await init_blob_storage(backend="azure")
+        if storage is None:
+            print("AZURE_STORAGE_CONNECTION_STRING is not set or the container is unreachable")
+            return
+        try:
+            await measure(storage)
+        finally:
+            await storage.close()
+        return
+
+    with tempfile.TemporaryDirectory() as root:
+        generate_tree(root, lessons, segments, segment_kib)
+        await measure(LocalFileStorage(root))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(run(
+        args[0] if len(args) > 0 else "local",
+        int(args[1]) if len(args) > 1 else 200,
+        int(args[2]) if len(args) > 2 else 20,
+        int(args[3]) if len(args) > 3 else 256
+    ))
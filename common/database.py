@@ -1,3 +1,4 @@
+import logging
 from sqlmodel import create_engine, Session, SQLModel
 from common.config import settings
 from cou_admin.models.currency import Currency
@@ -22,10 +23,163 @@ engine = create_engine(
     }
 )
 
+# Indexes/constraints on tables that already exist in the database. create_all only
+# creates missing tables, so these are applied idempotently, in order, on startup.
+SCHEMA_PATCHES = [
+    # ON CONFLICT (personal_email) target for the OAuth user upserts. Accounts sharing an
+    # email are resolved by scripts/dedupe_personal_emails.py, never at startup; until then
+    # the startup stops here (checked only while the index does not exist yet)
+    """DO $$
+    BEGIN
+        IF to_regclass('cou_user.user_personal_email_key') IS NULL AND EXISTS (
+            SELECT 1 FROM cou_user."user" WHERE personal_email IS NOT NULL
+            GROUP BY personal_email HAVING count(*) > 1
+        ) THEN
+            RAISE EXCEPTION 'Accounts share a personal_email; run scripts/dedupe_personal_emails.py before starting the application';
+        END IF;
+    END
+    $$""",
+    'CREATE UNIQUE INDEX IF NOT EXISTS user_personal_email_key ON cou_user."user" (personal_email)',
+    # OAuth logins also match accounts registered under a work email
+    'CREATE INDEX IF NOT EXISTS user_work_email_idx ON cou_user."user" (work_email)',
+    # Lessons take part in the LessonOrder sequence alongside the other components
+    "ALTER TYPE componenttype ADD VALUE IF NOT EXISTS 'LESSON'",
+    # Course sequence lookups (ordered components of a course)
+    'CREATE INDEX IF NOT EXISTS lesson_order_course_idx ON cou_course."LessonOrder" (course_id, topic_id, sort_order)',
+    # Stable bit positions for the learner progress bitsets
+    'ALTER TABLE cou_course."LessonOrder" ADD COLUMN IF NOT EXISTS progress_bit INTEGER',
+    'CREATE UNIQUE INDEX IF NOT EXISTS lesson_order_progress_bit_key ON cou_course."LessonOrder" (course_id, progress_bit)',
+    # Per-course content lookups (course outline and its version query) and changes since
+    # an updated_at watermark (content sync); these replace the earlier (course_id) indexes
+    *[
+        statement
+        for table in ("topic", "lesson", "quiz", "flashcard", "mindmap", "memory_game")
+        for statement in (
+            f"CREATE INDEX IF NOT EXISTS {table}_course_updated_idx ON cou_course.{table} (course_id, updated_at)",
+            f"DROP INDEX IF EXISTS cou_course.{table}_course_id_idx",
+        )
+    ],
+    "CREATE INDEX IF NOT EXISTS memory_game_pair_game_updated_idx ON cou_course.memory_game_pair (memory_game_id, updated_at)",
+    # Content sync watermark: every content row records the (64-bit) id of the transaction
+    # that last wrote it, assigned by the database whatever the writer
+    """CREATE OR REPLACE FUNCTION cou_course.set_change_xid() RETURNS trigger AS $$
+    BEGIN
+        NEW.change_xid := txid_current();
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql""",
+    *[
+        statement
+        for table, parent_id in (
+            ("topic", "course_id"), ("lesson", "course_id"), ("quiz", "course_id"), ("flashcard", "course_id"),
+            ("mindmap", "course_id"), ("memory_game", "course_id"), ("question", "quiz_id"), ("memory_game_pair", "memory_game_id"),
+        )
+        for statement in (
+            f"ALTER TABLE cou_course.{table} ADD COLUMN IF NOT EXISTS change_xid BIGINT",
+            f"CREATE INDEX IF NOT EXISTS {table}_change_xid_idx ON cou_course.{table} ({parent_id}, change_xid)",
+            # Only created when missing: an existing trigger is left alone, so a restart
+            # takes no ACCESS EXCLUSIVE lock on the content tables
+            f"""DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_trigger WHERE tgname = '{table}_change_xid' AND tgrelid = 'cou_course.{table}'::regclass
+                ) THEN
+                    CREATE TRIGGER {table}_change_xid BEFORE INSERT OR UPDATE ON cou_course.{table}
+                    FOR EACH ROW EXECUTE FUNCTION cou_course.set_change_xid();
+                END IF;
+            END
+            $$""",
+        )
+    ],
+    # Question pool of a quiz when its answer keys are compiled; question changes for content sync
+    "CREATE INDEX IF NOT EXISTS question_quiz_id_idx ON cou_course.question (quiz_id, updated_at)",
+    # Bumped with every question write, so the compiled answer keys are versioned by the quiz row alone
+    "ALTER TABLE cou_course.quiz ADD COLUMN IF NOT EXISTS questions_version INTEGER NOT NULL DEFAULT 0",
+    # Running rating aggregates, updated atomically with each rating submission
+    "ALTER TABLE cou_course.course ADD COLUMN IF NOT EXISTS rating_sum BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE cou_course.course ADD COLUMN IF NOT EXISTS rating_count INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE cou_course.course ADD COLUMN IF NOT EXISTS rating_average DOUBLE PRECISION",
+    # Ratings entered before ratings were collected stay visible until a course gets its first one
+    "UPDATE cou_course.course SET rating_average = ratings WHERE rating_count = 0 AND rating_average IS NULL AND ratings > 0",
+    "CREATE INDEX IF NOT EXISTS course_rating_idx ON cou_course.course (rating_average DESC NULLS LAST, rating_count DESC)",
+    # Denormalized enrollment counters (rolled up from cou_course.enrollment_counter_shard)
+    "ALTER TABLE cou_course.course ADD COLUMN IF NOT EXISTS total_enrollments INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE cou_mentor.mentor ADD COLUMN IF NOT EXISTS total_students INTEGER NOT NULL DEFAULT 0",
+    # Catalog cards in one narrow relation (see cou_course.models.course_catalog); the unique
+    # index on id is what REFRESH MATERIALIZED VIEW CONCURRENTLY requires
+    """CREATE MATERIALIZED VIEW IF NOT EXISTS cou_course.course_catalog AS
+    SELECT c.id, c.title, c.description,
+           c.category_id, cc.name AS category_name,
+           c.subcategory_id, cs.name AS subcategory_name,
+           c.course_type_id, c.sells_type_id, c.language_id, c.mentor_id,
+           c.is_flagship, c.active, c.price, c.ratings,
+           c.rating_average, c.rating_count, c.total_enrollments,
+           (SELECT count(t.id) FROM cou_course.topic t WHERE t.course_id = c.id AND t.active) AS topic_count,
+           (SELECT count(l.id) FROM cou_course.lesson l WHERE l.course_id = c.id AND l.active) AS lesson_count,
+           c."IT", c."Coding_Required", c."Avg_Completion_TIme" AS "Avg_Completion_Time", c."Course_level",
+           c.created_at, c.updated_at,
+           m.user_id AS instructor_id,
+           COALESCE(NULLIF(u.display_name, ''),
+                    NULLIF(TRIM(COALESCE(u.first_name, '') || ' ' || COALESCE(u.last_name, '')), '')) AS instructor_name,
+           m.designation AS instructor_profession
+    FROM cou_course.course c
+    LEFT JOIN cou_mentor.mentor m ON m.user_id = c.mentor_id
+    LEFT JOIN cou_user."user" u ON u.id = m.user_id
+    LEFT JOIN cou_course.course_category cc ON cc.id = c.category_id
+    LEFT JOIN cou_course.course_subcategory cs ON cs.id = c.subcategory_id""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS course_catalog_id_key ON cou_course.course_catalog (id)",
+    "CREATE INDEX IF NOT EXISTS course_catalog_category_idx ON cou_course.course_catalog (category_id, id)",
+    "CREATE INDEX IF NOT EXISTS course_catalog_subcategory_idx ON cou_course.course_catalog (subcategory_id, id)",
+    "CREATE INDEX IF NOT EXISTS course_catalog_rating_idx ON cou_course.course_catalog (rating_average DESC NULLS LAST, rating_count DESC)",
+]
+
+# Session-level advisory lock held while patching, so that workers starting together
+# apply the patches one after another
+SCHEMA_PATCH_LOCK_ID = 7311001
+
+def apply_schema_patches():
+    """
+    Apply SCHEMA_PATCHES, each in its own transaction. A failing patch raises, so the
+    application does not start against a schema its models do not match.
+    """
+    with engine.connect() as connection:
+        connection.exec_driver_sql(f"SELECT pg_advisory_lock({SCHEMA_PATCH_LOCK_ID})")
+        connection.commit()
+        try:
+            for statement in SCHEMA_PATCHES:
+                with connection.begin():
+                    connection.exec_driver_sql(statement)
+        finally:
+            connection.exec_driver_sql(f"SELECT pg_advisory_unlock({SCHEMA_PATCH_LOCK_ID})")
+            connection.commit()
+    logging.info(f"Applied {len(SCHEMA_PATCHES)} schema patches")
+
 # Create all tables
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+    apply_schema_patches()
+
+def new_session() -> Session:
+    return Session(engine, expire_on_commit=False)
+
+def get_session_factory():
+    """
+    FastAPI dependency for async endpoints that must not hold a connection while
+    awaiting (e.g. a streamed upload): they open short sessions of their own, in
+    the threadpool, and commit them.
+    """
+    return new_session
 
 def get_session():
-    with Session(engine) as session:
-        yield session
+    """
+    Request-scoped unit of work. Repositories only flush; the session commits once
+    after the endpoint returns and rolls back if it raised. Objects are not expired
+    on commit, so building the response does not reload them.
+    """
+    with Session(engine, expire_on_commit=False) as session:
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
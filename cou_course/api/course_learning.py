@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlmodel import Session
 from sqlalchemy import text
 from typing import List, Optional
-from common.database import get_session
+from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+from common.database import get_session, get_session_factory
+from auth_bl.utils import get_current_user
 from cou_course.models.lesson import Lesson
 from cou_course.models.quiz import Quiz
 from cou_course.models.question import Question
@@ -21,78 +25,46 @@ from cou_course.schemas.mindmap_schema import MindmapCreate, MindmapRead, Mindma
 from cou_course.schemas.memory_game_schema import MemoryGameCreate, MemoryGameRead, MemoryGameUpdate
 from cou_course.schemas.topic_schema import TopicCreate, TopicRead, TopicUpdate
 from cou_course.schemas.course_schema import CourseDetailsRead
+from cou_course.schemas.courselearning_schema import LearningContentSummary
+from cou_course.schemas.content_sync_schema import ContentChanges
+from cou_course.schemas.course_import_schema import CourseContentImport, CourseContentImportResult
+from cou_course.schemas.lesson_order_schema import ComponentSequenceRead, SequenceComponent
+from cou_course.schemas.course_outline_schema import CourseOutlineRead
+from cou_course.schemas.learner_progress_schema import ProgressUpdate, CourseProgressRead, LearnerProgressRead
+from cou_course.schemas.flashcard_review_schema import ReviewBatch, ReviewBatchResult, DueCardsRead
+from cou_course.schemas.quiz_attempt_schema import AttemptQuestions, QuizSubmission, QuizAttemptResult, QuizAttemptRead
 from cou_course.models.question import QuestionType
 from cou_course.repositories.lesson_repository import LessonRepository
 from cou_course.repositories.quiz_repository import QuizRepository
-from cou_course.repositories.question_repository import QuestionRepository
+from cou_course.repositories.question_repository import QuestionRepository, QUESTION_TYPE_MAPPING
 from cou_course.repositories.flashcard_repository import FlashcardRepository
 from cou_course.repositories.mindmap_repository import MindmapRepository
 from cou_course.repositories.memory_game_repository import MemoryGameRepository
 from cou_course.repositories.topic_repository import TopicRepository
 from cou_course.repositories.course_repository import CourseRepository
-
-
-
-
-# Azure Blob Storage setup - make it conditional for Vercel
-import os
+from cou_course.repositories.course_import_repository import CourseImportRepository
+from cou_course.repositories.video_asset_repository import VideoAssetRepository
+from cou_course.repositories.lesson_order_repository import LessonOrderRepository
+from cou_course.repositories.course_content_counter_repository import CourseContentCounterRepository
+from cou_course.services.blob_storage import get_blob_storage
+from cou_course.services.storage_backend import StorageBackend
+from cou_course.services.hls_lesson_index import LessonFolderIndex, get_lesson_folder_index
+from cou_course.services.video_streaming import parse_byte_range
+from cou_course.services.hls_manifest import HlsManifestService, get_hls_manifest_service
+from cou_course.services import learner_progress, spaced_repetition, content_sync
+from cou_course.services.course_outline import CourseOutlineCache, get_course_outline_cache
+from cou_course.services.quiz_engine import QuizCache, get_quiz_cache
+from cou_course.services import quiz_attempts
+from cou_course.services.quiz_attempts import AttemptSubmittedError, AttemptExpiredError
+from cou_course.services.video_upload import (
+    VideoUploader, VideoUploadError, UploadOffsetError, get_video_uploader, valid_filename, valid_upload_token
+)
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Azure Blob Storage setup - make it conditional for Vercel
-AZURE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-CONTAINER_NAME = "lessons"  # You can change this to your preferred container name
-
-# Initialize Azure services only if connection string is available
-blob_service_client = None
-container_client = None
-
-def _init_azure_services():
-    """Initialize Azure services if connection string is available"""
-    global blob_service_client, container_client
-    
-    if not AZURE_CONNECTION_STRING:
-        logger.warning("AZURE_STORAGE_CONNECTION_STRING not set, Azure features will be disabled")
-        return False
-    
-    try:
-        # Import Azure modules only when needed - moved inside function to avoid module-level import errors
-        import importlib.util
-        
-        # Check if azure module is available
-        azure_spec = importlib.util.find_spec("azure.storage.blob")
-        if not azure_spec:
-            logger.warning("Azure modules not available")
-            return False
-            
-        from azure.storage.blob import BlobServiceClient
-        from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
-        
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
-        # Get the container client
-        container_client = blob_service_client.get_container_client(CONTAINER_NAME)
-        # Verify container exists
-        if not container_client.exists():
-            logger.warning(f"Container '{CONTAINER_NAME}' does not exist in Azure Storage")
-            container_client = None
-            return False
-        
-        logger.info("Azure Blob Service Client initialized successfully")
-        return True
-        
-    except ImportError as e:
-        logger.warning(f"Azure modules not available: {e}")
-        return False
-    except Exception as e:
-        logger.warning(f"Failed to initialize Azure Blob Service Client: {str(e)}")
-        return False
-
-# Try to initialize Azure services
-_init_azure_services()
-
 router = APIRouter(
     prefix="/course-learning",
     tags=["Course Learning"]
@@ -101,73 +73,113 @@ router = APIRouter(
 # ==================== VIDEO URL APIs ====================
 
 @router.get("/videos/", response_model=VideoListResponse)
-def fetch_videos():
-    """Get all videos from Azure Blob Storage"""
-    if not container_client or not blob_service_client:
+def fetch_videos(
+    lesson_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    cursor: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    session: Session = Depends(get_session),
+    storage: Optional[StorageBackend] = Depends(get_blob_storage)
+):
+    """Get videos from the catalog synced from Azure Blob Storage, optionally filtered by lesson or course"""
+    if not storage:
         logger.warning("Azure services not available, returning empty video list")
         return VideoListResponse(videos=[])
     
     try:
-        video_list = []
-        
-        # List all blobs in the container
-        blob_list = container_client.list_blobs()
-        
-        for blob in blob_list:
-            # Generate a URL for each blob
-            video_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{CONTAINER_NAME}/{blob.name}"
-            video_info = VideoInfo(
-                name=blob.name,
-                url=video_url,
-                content_type=blob.content_settings.content_type,
-                size=blob.size
+        # One indexed query; the catalog is kept in sync by the video catalog reconciler
+        assets = VideoAssetRepository.list_videos(session, lesson_id, course_id, cursor, limit)
+        urls = storage.signed_urls([asset.name for asset in assets])
+        video_list = [
+            VideoInfo(
+                name=asset.name,
+                url=url,
+                content_type=asset.content_type or "application/octet-stream",
+                size=asset.size
             )
-            video_list.append(video_info)
+            for asset, url in zip(assets, urls)
+        ]
+        next_cursor = assets[-1].id if len(assets) == limit else None
 
-        return VideoListResponse(videos=video_list)
+        return VideoListResponse(videos=video_list, next_cursor=next_cursor)
     except Exception as e:
         logger.error(f"Failed to fetch videos: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch videos: {str(e)}")
 
 @router.get("/videos/{video_path:path}", response_model=VideoInfo)
-def get_video_by_path(video_path: str):
+async def get_video_by_path(video_path: str, storage: Optional[StorageBackend] = Depends(get_blob_storage)):
     """Get a specific video by its path/filename from Azure Blob Storage"""
-    if not container_client or not blob_service_client:
+    if not storage:
         logger.warning("Azure services not available")
         raise HTTPException(status_code=503, detail="Video service temporarily unavailable")
     
     try:
-        # Get the blob client for the specific video
-        blob_client = container_client.get_blob_client(video_path)
-        
-        # Check if blob exists
-        if not blob_client.exists():
+        # A single properties request; a missing blob comes back as None
+        blob_properties = await storage.get_properties(video_path)
+        if blob_properties is None:
             raise HTTPException(status_code=404, detail=f"Video '{video_path}' not found")
         
-        # Get blob properties
-        blob_properties = blob_client.get_blob_properties()
-        
-        # Generate URL
-        video_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{CONTAINER_NAME}/{video_path}"
-        
-        video_info = VideoInfo(
+        return VideoInfo(
             name=video_path,
-            url=video_url,
+            url=storage.signed_url(video_path),
             content_type=blob_properties.content_settings.content_type,
             size=blob_properties.size
         )
-        
-        return video_info
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to get video '{video_path}': {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get video: {str(e)}")
 
+@router.get("/stream/{video_path:path}")
+async def stream_video(video_path: str, request: Request, storage: Optional[StorageBackend] = Depends(get_blob_storage)):
+    """
+    Stream a video through the API (works for private containers), honouring HTTP Range
+    requests. Bytes are proxied chunk by chunk, so memory per stream stays constant.
+    """
+    if not storage:
+        logger.warning("Azure services not available")
+        raise HTTPException(status_code=503, detail="Video service temporarily unavailable")
+    
+    blob_properties = await storage.get_properties(video_path)
+    if blob_properties is None:
+        raise HTTPException(status_code=404, detail=f"Video '{video_path}' not found")
+    
+    size = blob_properties.size
+    byte_range = parse_byte_range(request.headers.get("range"), size)
+    start, end = byte_range if byte_range else (0, size - 1)
+    length = end - start + 1
+    
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(length),
+    }
+    if blob_properties.etag:
+        headers["ETag"] = blob_properties.etag
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    
+    # The ASGI server pulls the next chunk only after the previous one was sent
+    body = storage.open_range(video_path, start, length) if length > 0 else iter(())
+    return StreamingResponse(
+        body,
+        status_code=206 if byte_range else 200,
+        headers=headers,
+        media_type=blob_properties.content_settings.content_type or "application/octet-stream"
+    )
+
 @router.get("/hls/{lesson_folder}/master.m3u8", response_model=VideoInfo)
-def get_hls_master_playlist(lesson_folder: str):
-    """Get the master.m3u8 file for a specific lesson folder - for HLS player"""
-    if not container_client or not blob_service_client:
+async def get_hls_master_playlist(
+    lesson_folder: str,
+    storage: Optional[StorageBackend] = Depends(get_blob_storage),
+    manifests: HlsManifestService = Depends(get_hls_manifest_service)
+):
+    """
+    Get the master.m3u8 file for a specific lesson folder - for HLS player. The URL is
+    the rewritten playlist, whose variant and segment URIs carry their own signatures
+    (a SAS on the master blob alone does not cover its relative URIs).
+    """
+    if not storage:
         logger.warning("Azure services not available")
         raise HTTPException(status_code=503, detail="Video service temporarily unavailable")
     
@@ -175,65 +187,92 @@ def get_hls_master_playlist(lesson_folder: str):
         # Construct the path to master.m3u8 in the lesson folder
         master_playlist_path = f"{lesson_folder}/master.m3u8"
         
-        # Get the blob client for the master playlist
-        blob_client = container_client.get_blob_client(master_playlist_path)
-        
-        # Check if blob exists
-        if not blob_client.exists():
+        blob_properties = await storage.get_properties(master_playlist_path)
+        if blob_properties is None:
             raise HTTPException(status_code=404, detail=f"Master playlist not found for lesson '{lesson_folder}'")
         
-        # Get blob properties
-        blob_properties = blob_client.get_blob_properties()
-        
-        # Generate URL for HLS player
-        master_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{CONTAINER_NAME}/{master_playlist_path}"
-        
-        video_info = VideoInfo(
-            name=f"{lesson_folder}/master.m3u8",
-            url=master_url,
+        return VideoInfo(
+            name=master_playlist_path,
+            url=manifests.playlist_url(master_playlist_path),
             content_type=blob_properties.content_settings.content_type,
             size=blob_properties.size
         )
-        
-        return video_info
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to get HLS master playlist for '{lesson_folder}': {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get HLS master playlist: {str(e)}")
 
+@router.get("/hls/{lesson_folder}/playlist/{playlist_path:path}")
+async def get_hls_playlist(
+    lesson_folder: str,
+    playlist_path: str,
+    request: Request,
+    storage: Optional[StorageBackend] = Depends(get_blob_storage),
+    manifests: HlsManifestService = Depends(get_hls_manifest_service)
+):
+    """
+    Serve an HLS playlist with its URIs rewritten for playback: nested playlists point
+    back here and segments get signed (or CDN) URLs. Cached in memory and by clients.
+    """
+    if not storage:
+        logger.warning("Azure services not available")
+        raise HTTPException(status_code=503, detail="Video service temporarily unavailable")
+    if not playlist_path.endswith(".m3u8"):
+        raise HTTPException(status_code=404, detail="Only .m3u8 playlists are served here")
+    
+    try:
+        entry = await manifests.get(storage, f"{lesson_folder}/{playlist_path}")
+    except Exception as e:
+        logger.error(f"Failed to build HLS playlist '{lesson_folder}/{playlist_path}': {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get HLS playlist: {str(e)}")
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Playlist '{playlist_path}' not found for lesson '{lesson_folder}'")
+    
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={manifests.max_age(entry)}"
+    }
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.text, media_type="application/vnd.apple.mpegurl", headers=headers)
+
 @router.get("/hls/lessons/", response_model=dict)
-def get_all_hls_lessons():
-    """Get all lesson folders that contain HLS videos"""
-    if not container_client or not blob_service_client:
+async def get_all_hls_lessons(
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    storage: Optional[StorageBackend] = Depends(get_blob_storage),
+    index: LessonFolderIndex = Depends(get_lesson_folder_index),
+    manifests: HlsManifestService = Depends(get_hls_manifest_service)
+):
+    """Get lesson folders that contain HLS videos, optionally paged with skip/limit"""
+    if not storage:
         logger.warning("Azure services not available, returning empty lesson list")
         return {"lessons": []}
     
     try:
-        lesson_folders = set()
+        # Served from the cached folder index (one delimiter listing per refresh)
+        lesson_folders = await index.get_folders(storage)
+        page = lesson_folders[skip:skip + limit] if limit is not None else lesson_folders[skip:]
         
-        # List all blobs in the container
-        blob_list = container_client.list_blobs()
-        
-        for blob in blob_list:
-            # Extract lesson folder name from blob path
-            if "/" in blob.name:
-                lesson_folder = blob.name.split("/")[0]
-                lesson_folders.add(lesson_folder)
-        
-        # Get master playlist URLs for each lesson
+        # Master playlist blob URLs for each lesson, signed in one local batch. Players
+        # get the rewritten playlist: the blob SAS does not cover its relative URIs
+        master_urls = storage.signed_urls([f"{folder}/master.m3u8" for folder in page])
         lessons_info = []
-        for folder in sorted(lesson_folders):
-            master_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{CONTAINER_NAME}/{folder}/master.m3u8"
+        for folder, master_url in zip(page, master_urls):
+            playback_url = manifests.playlist_url(f"{folder}/master.m3u8")
             lessons_info.append({
                 "lesson_folder": folder,
                 "master_playlist_url": master_url,
-                "hls_player_url": master_url  # Direct URL for HLS player
+                "hls_player_url": playback_url,
+                "playback_url": playback_url  # Rewritten, cacheable playlist
             })
 
         return {
             "lessons": lessons_info,
-            "total_lessons": len(lessons_info)
+            "total_lessons": len(lesson_folders),
+            "skip": skip,
+            "limit": limit
         }
     except Exception as e:
         logger.error(f"Failed to get all HLS lessons: {str(e)}")
@@ -292,6 +331,109 @@ def get_course_details(course_id: int, session: Session = Depends(get_session)):
         logger.error(f"Failed to get course details for course {course_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get course details: {str(e)}")
 
+# ==================== COURSE SEQUENCE APIs ====================
+
+@router.get("/courses/{course_id}/sequence", response_model=ComponentSequenceRead)
+def get_course_sequence(
+    course_id: int,
+    after: Optional[int] = Query(None, description="LessonOrder id of the current component; omit to start at the beginning"),
+    count: int = Query(3, ge=1, le=20),
+    session: Session = Depends(get_session)
+):
+    """Next `count` components of the course after the current one, fully hydrated for prefetching"""
+    try:
+        sequence = LessonOrderRepository.get_course_sequence(session, course_id)
+        start = 0
+        if after is not None:
+            positions = {order.id: position for position, order in enumerate(sequence)}
+            if after not in positions:
+                raise HTTPException(status_code=404, detail="Current component not found in this course")
+            start = positions[after] + 1
+
+        window = sequence[start:start + count]
+        content = LessonOrderRepository.hydrate_components(session, window)
+        components = [
+            SequenceComponent(
+                order_id=order.id,
+                topic_id=order.topic_id,
+                component_type=order.component_type.value,
+                ref_id=order.lesson_ref_id,
+                sort_order=order.sort_order,
+                content=content.get((order.component_type, order.lesson_ref_id))
+            )
+            for order in window
+        ]
+        next_after = window[-1].id if start + count < len(sequence) else None
+        return ComponentSequenceRead(course_id=course_id, components=components, next_after=next_after)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get course sequence for course {course_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get course sequence: {str(e)}")
+
+@router.get("/courses/{course_id}/outline", response_model=CourseOutlineRead)
+def get_course_outline(
+    course_id: int,
+    request: Request,
+    session: Session = Depends(get_session),
+    outlines: CourseOutlineCache = Depends(get_course_outline_cache)
+):
+    """Topics with their ordered components as one tree, cached per course version"""
+    try:
+        cached = outlines.get(session, course_id)
+    except Exception as e:
+        logger.error(f"Failed to get course outline for course {course_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get course outline: {str(e)}")
+
+    etag = f'"{cached.version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    # Pre-serialized body; response_model only documents the shape
+    return Response(content=cached.body, media_type="application/json", headers={"ETag": etag})
+
+# ==================== LEARNER PROGRESS APIs ====================
+
+@router.get("/progress", response_model=LearnerProgressRead)
+def get_learner_progress(
+    course_ids: List[int] = Query(..., min_length=1, max_length=200),
+    user_id: int = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """Completion percentage of several courses for the signed-in learner"""
+    try:
+        courses = learner_progress.get_progress_summaries(session, user_id, list(dict.fromkeys(course_ids)))
+        return LearnerProgressRead(user_id=user_id, courses=courses)
+    except Exception as e:
+        logger.error(f"Failed to get progress for user {user_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get progress: {str(e)}")
+
+@router.get("/progress/courses/{course_id}", response_model=CourseProgressRead)
+def get_course_progress(course_id: int, user_id: int = Depends(get_current_user), session: Session = Depends(get_session)):
+    """Completed components of one course for the signed-in learner"""
+    try:
+        return learner_progress.get_course_progress(session, user_id, course_id)
+    except Exception as e:
+        logger.error(f"Failed to get progress for user {user_id} in course {course_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get course progress: {str(e)}")
+
+@router.put("/progress/courses/{course_id}", response_model=CourseProgressRead)
+def update_course_progress(
+    course_id: int,
+    progress: ProgressUpdate,
+    user_id: int = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """Mark a batch of components (LessonOrder ids) as completed or not completed"""
+    try:
+        return learner_progress.update_course_progress(
+            session, user_id, course_id, progress.completed, progress.uncompleted
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Components not in course {course_id}: {e.args[0]}")
+    except Exception as e:
+        logger.error(f"Failed to update progress for user {user_id} in course {course_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to update course progress: {str(e)}")
+
 # ==================== LESSON APIs ====================
 
 @router.post("/lessons/", response_model=LessonRead)
@@ -400,6 +542,105 @@ def delete_lesson(lesson_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=404, detail="Lesson not found")
     return {"message": "Lesson deleted successfully"}
 
+@router.get("/lessons/{lesson_id}/video/upload", response_model=dict)
+async def get_lesson_video_upload_status(
+    lesson_id: int,
+    filename: str,
+    upload_token: str,
+    total_size: Optional[int] = Query(None, ge=1),
+    storage: Optional[StorageBackend] = Depends(get_blob_storage),
+    uploader: VideoUploader = Depends(get_video_uploader)
+):
+    """Where an interrupted upload (same file name, size and upload token) should resume"""
+    if not storage:
+        raise HTTPException(status_code=503, detail="Video service temporarily unavailable")
+    if not valid_filename(filename):
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    if not valid_upload_token(upload_token):
+        raise HTTPException(status_code=400, detail="Invalid upload token")
+
+    video_path = f"lesson-{lesson_id}/{filename}"
+    return {
+        "video_path": video_path,
+        "block_size": uploader.block_size,
+        "offset": await uploader.resume_offset(storage, video_path, total_size, upload_token)
+    }
+
+def _lesson_exists(new_session, lesson_id: int) -> bool:
+    with new_session() as session:
+        return LessonRepository.get_lesson_by_id(session, lesson_id) is not None
+
+def _set_lesson_video(new_session, lesson_id: int, video_path: str, filename: str, source: str, updated_by: Optional[int]) -> bool:
+    with new_session() as session:
+        lesson = LessonRepository.set_video(session, lesson_id, video_path, filename, source, updated_by)
+        session.commit()
+        return lesson is not None
+
+@router.put("/lessons/{lesson_id}/video", response_model=dict)
+async def upload_lesson_video(
+    lesson_id: int,
+    filename: str,
+    request: Request,
+    total_size: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    upload_token: Optional[str] = None,
+    updated_by: Optional[int] = None,
+    new_session=Depends(get_session_factory),
+    storage: Optional[StorageBackend] = Depends(get_blob_storage),
+    uploader: VideoUploader = Depends(get_video_uploader),
+    index: LessonFolderIndex = Depends(get_lesson_folder_index)
+):
+    """
+    Upload a lesson video from the raw request body (streamed, never buffered whole).
+    With `total_size`, a shorter body is staged without committing and the upload can
+    be resumed from the returned `offset` by sending the same client-chosen `upload_token`
+    (8-64 URL-safe characters, new for every file); once the file is complete the lesson
+    points at it.
+    The lookup and the final UPDATE use short sessions of their own, so no connection is
+    held while the body streams in.
+    """
+    if not storage:
+        raise HTTPException(status_code=503, detail="Video service temporarily unavailable")
+    if not valid_filename(filename):
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    if upload_token is not None and not valid_upload_token(upload_token):
+        raise HTTPException(status_code=400, detail="Invalid upload token")
+    if not await run_in_threadpool(_lesson_exists, new_session, lesson_id):
+        raise HTTPException(status_code=404, detail="Lesson not found")
+
+    lesson_folder = f"lesson-{lesson_id}"
+    video_path = f"{lesson_folder}/{filename}"
+    try:
+        result = await uploader.upload(
+            storage, video_path, request.stream(), total_size=total_size, offset=offset, upload_token=upload_token
+        )
+    except UploadOffsetError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except VideoUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to upload video '{video_path}': {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to upload video: {str(e)}")
+
+    response = {
+        "lesson_id": lesson_id,
+        "video_path": video_path,
+        "committed": result.committed,
+        "offset": result.offset,
+        "blocks_staged": result.blocks_staged,
+        "blocks_skipped": result.blocks_skipped
+    }
+    if not result.committed:
+        return response
+
+    # Single UPDATE on the lesson, committed right away
+    if not await run_in_threadpool(_set_lesson_video, new_session, lesson_id, video_path, filename, storage.source, updated_by):
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    if filename == "master.m3u8":
+        # The folder now serves an HLS master playlist; list it without waiting for a refresh
+        index.add_folder(lesson_folder)
+    return response
+
 # ==================== QUIZ APIs ====================
 
 @router.post("/quizzes/", response_model=QuizRead)
@@ -484,6 +725,65 @@ def delete_quiz(quiz_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=404, detail="Quiz not found")
     return {"message": "Quiz deleted successfully"}
 
+def _compiled_quiz(session: Session, quizzes: QuizCache, quiz_id: int):
+    try:
+        quiz = quizzes.get(session, quiz_id)
+    except Exception as e:
+        logger.error(f"Failed to load answer keys for quiz {quiz_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to load quiz: {str(e)}")
+    if quiz is None:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    return quiz
+
+@router.post("/quizzes/{quiz_id}/attempts", response_model=AttemptQuestions)
+def start_quiz_attempt(
+    quiz_id: int,
+    user_id: int = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    quizzes: QuizCache = Depends(get_quiz_cache)
+):
+    """Start an attempt: a sample of max_questions drawn and stored by the server, returned without answer keys"""
+    quiz = _compiled_quiz(session, quizzes, quiz_id)
+    return quiz_attempts.start_attempt(session, quiz, user_id)
+
+@router.get("/quizzes/{quiz_id}/attempts/{attempt_id}", response_model=QuizAttemptRead)
+def get_quiz_attempt(
+    quiz_id: int,
+    attempt_id: int,
+    user_id: int = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    quizzes: QuizCache = Depends(get_quiz_cache)
+):
+    """One of the learner's attempts: its questions, and its grade once submitted"""
+    quiz = _compiled_quiz(session, quizzes, quiz_id)
+    attempt = quiz_attempts.get_attempt(session, quiz, attempt_id, user_id)
+    if attempt is None:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+    return attempt
+
+@router.post("/quizzes/{quiz_id}/attempts/{attempt_id}/submit", response_model=QuizAttemptResult)
+def submit_quiz_attempt(
+    quiz_id: int,
+    attempt_id: int,
+    submission: QuizSubmission,
+    user_id: int = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    quizzes: QuizCache = Depends(get_quiz_cache)
+):
+    """Grade the answers (question id -> answer) against the attempt's stored questions; the result is final"""
+    quiz = _compiled_quiz(session, quizzes, quiz_id)
+    try:
+        result = quiz_attempts.submit_attempt(session, quiz, attempt_id, user_id, submission.answers)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Questions not in this attempt: {e.args[0]}")
+    except AttemptSubmittedError:
+        raise HTTPException(status_code=409, detail="Attempt already submitted")
+    except AttemptExpiredError:
+        raise HTTPException(status_code=409, detail="Attempt time limit exceeded")
+    if result is None:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+    return result
+
 # ==================== QUESTION APIs ====================
 
 @router.post("/questions/", response_model=QuestionRead)
@@ -523,37 +823,9 @@ def get_quiz_questions(quiz_id: int, session: Session = Depends(get_session)):
             for row in result.fetchall():
                 current_time = datetime.now(timezone.utc)
                 
-                # Map database question_type values to enum values
-                question_type_mapping = {
-                    "True/False": QuestionType.TRUE_FALSE,
-                    "true/false": QuestionType.TRUE_FALSE,
-                    "TRUE_FALSE": QuestionType.TRUE_FALSE,
-                    "Multiple Choice": QuestionType.MULTIPLE,
-                    "multiple_choice": QuestionType.MULTIPLE,
-                    "MULTIPLE": QuestionType.MULTIPLE,
-                    "Single Choice": QuestionType.SINGLE,
-                    "single_choice": QuestionType.SINGLE,
-                    "SINGLE": QuestionType.SINGLE,
-                    "Fill in the Blank": QuestionType.FILL_BLANK,
-                    "fill_blank": QuestionType.FILL_BLANK,
-                    "FILL_BLANK": QuestionType.FILL_BLANK,
-                    "Open Ended": QuestionType.OPEN_ENDED,
-                    "open_ended": QuestionType.OPEN_ENDED,
-                    "OPEN_ENDED": QuestionType.OPEN_ENDED,
-                    "Matching Text": QuestionType.MATCHING_TEXT,
-                    "matching_text": QuestionType.MATCHING_TEXT,
-                    "MATCHING_TEXT": QuestionType.MATCHING_TEXT,
-                    "Matching Image": QuestionType.MATCHING_IMAGE,
-                    "matching_image": QuestionType.MATCHING_IMAGE,
-                    "MATCHING_IMAGE": QuestionType.MATCHING_IMAGE,
-                    "Sort Answer": QuestionType.SORT_ANSWER,
-                    "sort_answer": QuestionType.SORT_ANSWER,
-                    "SORT_ANSWER": QuestionType.SORT_ANSWER
-                }
-                
                 # Get the mapped question type or default to SINGLE
                 db_question_type = row[3] or "SINGLE"
-                mapped_question_type = question_type_mapping.get(db_question_type, QuestionType.SINGLE)
+                mapped_question_type = QUESTION_TYPE_MAPPING.get(db_question_type, QuestionType.SINGLE)
                 
                 # Debug logging
                 logger.info(f"Database question_type: '{db_question_type}', Mapped to: '{mapped_question_type}'")
@@ -686,6 +958,41 @@ def delete_flashcard(flashcard_id: int, session: Session = Depends(get_session))
         raise HTTPException(status_code=404, detail="Flashcard not found")
     return {"message": "Flashcard deleted successfully"}
 
+# ==================== FLASHCARD REVIEW APIs ====================
+
+@router.post("/reviews", response_model=ReviewBatchResult)
+def submit_flashcard_reviews(
+    batch: ReviewBatch,
+    user_id: int = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """Record a batch of the signed-in learner's flashcard reviews and reschedule the cards (SM-2)"""
+    try:
+        schedules = spaced_repetition.submit_reviews(
+            session, user_id, [(review.flashcard_id, review.grade, review.reviewed_at) for review in batch.reviews]
+        )
+        return {"user_id": user_id, "schedules": schedules}
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Unknown flashcards: {e.args[0]}")
+    except Exception as e:
+        logger.error(f"Failed to submit reviews for user {user_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to submit reviews: {str(e)}")
+
+@router.get("/reviews/due", response_model=DueCardsRead)
+def get_due_flashcards(
+    course_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=200),
+    new_count: int = Query(0, ge=0, le=100),
+    user_id: int = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """The signed-in learner's cards due for review, earliest first, plus never-reviewed cards of the course when new_count is set"""
+    try:
+        return spaced_repetition.due_cards(session, user_id, course_id, limit, new_count)
+    except Exception as e:
+        logger.error(f"Failed to get due flashcards for user {user_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get due flashcards: {str(e)}")
+
 # ==================== MINDMAP APIs ====================
 
 @router.post("/mindmaps/", response_model=MindmapRead)
@@ -929,6 +1236,23 @@ def delete_topic(topic_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=404, detail="Topic not found")
     return {"message": "Topic deleted successfully"}
 
+# ==================== BULK IMPORT ====================
+
+@router.post("/courses/{course_id}/import", response_model=CourseContentImportResult)
+def import_course_content(course_id: int, document: CourseContentImport, session: Session = Depends(get_session)):
+    """
+    Import a nested topics -> lessons/quizzes/questions/flashcards/mindmaps/memory games
+    document for a course. The whole document is validated before anything is written,
+    and all rows are inserted in one transaction (nothing is kept if any insert fails).
+    """
+    if not session.get(Course, course_id):
+        raise HTTPException(status_code=404, detail="Course not found")
+    try:
+        return CourseImportRepository.import_course_content(session, course_id, document)
+    except Exception as e:
+        logger.error(f"Failed to import content for course {course_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to import course content: {str(e)}")
+
 # ==================== COURSE LEARNING OVERVIEW ====================
 
 @router.get("/courses/{course_id}/learning-content/")
@@ -1023,3 +1347,34 @@ def get_course_learning_content(course_id: int, session: Session = Depends(get_s
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving learning content: {str(e)}")
+
+@router.get("/courses/{course_id}/content-summary", response_model=LearningContentSummary)
+def get_course_content_summary(course_id: int, session: Session = Depends(get_session)):
+    """Active lesson, quiz, flashcard, mindmap, memory game and topic counts of a course (one row read)"""
+    if not CourseRepository.course_exists(session, course_id):
+        raise HTTPException(status_code=404, detail="Course not found")
+    try:
+        return CourseContentCounterRepository.get_summary(session, course_id)
+    except Exception as e:
+        logger.error(f"Failed to get content summary for course {course_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get content summary: {str(e)}")
+
+@router.get("/courses/{course_id}/changes", response_model=ContentChanges)
+def get_course_content_changes(
+    course_id: int,
+    since: Optional[str] = Query(None, description="Watermark from the previous sync; omit for a full snapshot"),
+    session: Session = Depends(get_session)
+):
+    """
+    Topics, lessons, quizzes, questions, flashcards, mindmaps, memory games and pairs
+    of a course changed after `since`, with tombstones for deactivated rows
+    """
+    if not CourseRepository.course_exists(session, course_id):
+        raise HTTPException(status_code=404, detail="Course not found")
+    try:
+        return content_sync.get_changes(session, course_id, since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark; omit `since` for a full snapshot")
+    except Exception as e:
+        logger.error(f"Failed to get content changes for course {course_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get content changes: {str(e)}")
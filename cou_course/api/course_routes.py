@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 from typing import List
-from cou_course.schemas.course_schema import CourseRead, SubcategorySummary
+from cou_course.schemas.course_schema import CourseRead, CatalogCourseRead, SubcategorySummary
+from cou_course.schemas.course_rating_schema import RatingSubmit, CourseRatingSummary
+from cou_course.schemas.enrollment_schema import EnrollmentRead, EnrollmentCount
+from cou_course.schemas.course_recommendation_schema import RelatedCourseRead
 from cou_course.repositories.course_repository import CourseRepository
+from cou_course.repositories.enrollment_repository import EnrollmentRepository
+from cou_course.repositories.course_recommendation_repository import CourseRecommendationRepository
+from cou_course.services import course_ratings, enrollments
 from common.database import get_session
+from auth_bl.utils import get_current_user
 from typing import Optional, List
 from fastapi import Query
 import logging
@@ -27,7 +34,7 @@ def get_unique_subcategories(session: Session = Depends(get_session)):
 def get_courses_by_subcategory_id(subcategory_id: int, session: Session = Depends(get_session), skip: int = 0, limit: int = 10):
     return CourseRepository.get_courses_by_subcategory_id(session, subcategory_id, skip, limit)
 
-@router.get("/categories/{category_id}", response_model=List[CourseRead])
+@router.get("/categories/{category_id}", response_model=List[CatalogCourseRead])
 def get_courses_by_category_id(category_id: int, session: Session = Depends(get_session), skip: int = 0, limit: int = 10):
     """
     Get all courses that belong to the specified category.
@@ -42,7 +49,7 @@ def get_courses_by_category_id(category_id: int, session: Session = Depends(get_
     """
     return CourseRepository.get_courses_by_category_id(session, category_id, skip, limit)
 
-@router.get("/", response_model=List[CourseRead])
+@router.get("/", response_model=List[CatalogCourseRead])
 def get_all_courses(session: Session = Depends(get_session), skip: int = 0, limit: int = 10):
     return CourseRepository.get_all_courses(session , skip , limit)
 
@@ -74,6 +81,59 @@ def search_courses(q: str = Query(..., min_length=1), session: Session = Depends
         # Perform text-based search
         return CourseRepository.search_courses_by_title(session, q, skip, limit)
 
+@router.put("/{course_id}/ratings", response_model=CourseRatingSummary)
+def rate_course(
+    course_id: int,
+    submission: RatingSubmit,
+    user_id: int = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Submit or change the signed-in learner's rating (1-5). The course's running sum, count and
+    average are updated in the same transaction.
+    """
+    try:
+        return course_ratings.submit_rating(session, course_id, user_id, submission.rating, submission.review)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Course not found")
+
+@router.delete("/{course_id}/ratings", response_model=CourseRatingSummary)
+def delete_course_rating(course_id: int, user_id: int = Depends(get_current_user), session: Session = Depends(get_session)):
+    """Withdraw the signed-in learner's rating"""
+    summary = course_ratings.remove_rating(session, course_id, user_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Rating not found")
+    return summary
+
+@router.put("/{course_id}/enrollments", response_model=EnrollmentRead)
+def enroll_in_course(course_id: int, user_id: int = Depends(get_current_user), session: Session = Depends(get_session)):
+    """Enroll the signed-in learner in a course (idempotent)"""
+    try:
+        return enrollments.enroll(session, course_id, user_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Course not found")
+
+@router.delete("/{course_id}/enrollments", response_model=EnrollmentRead)
+def unenroll_from_course(course_id: int, user_id: int = Depends(get_current_user), session: Session = Depends(get_session)):
+    """Withdraw the signed-in learner's enrollment"""
+    result = enrollments.unenroll(session, course_id, user_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Enrollment not found")
+    return result
+
+@router.get("/{course_id}/enrollments/count", response_model=EnrollmentCount)
+def get_enrollment_count(course_id: int, session: Session = Depends(get_session)):
+    """Exact number of active enrollments (rolled-up total plus pending counter shards)"""
+    return {"course_id": course_id, "total_enrollments": EnrollmentRepository.get_enrollment_count(session, course_id)}
+
+@router.get("/{course_id}/recommendations", response_model=List[RelatedCourseRead])
+def get_course_recommendations(course_id: int, limit: int = Query(10, ge=1, le=50), session: Session = Depends(get_session)):
+    """Related courses, precomputed by the recommendation job (best match first)"""
+    return [
+        {**CourseRead.model_validate(course).model_dump(), "score": score}
+        for course, score in CourseRecommendationRepository.get_recommendations(session, course_id, limit)
+    ]
+
 @router.get("/count")
 def get_course_count(session: Session = Depends(get_session)):
     """
@@ -0,0 +1,20 @@
+import hmac
+from fastapi import APIRouter, Header, HTTPException
+from typing import Any, Dict, Optional
+from cou_course.services import background_jobs
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"]
+)
+
+@router.get("/run-due")
+async def run_due_jobs(authorization: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    """
+    Run the periodic jobs that are due (cron trigger for deployments without
+    background tasks). Requires `Authorization: Bearer <CRON_SECRET>`.
+    """
+    secret = background_jobs.CRON_SECRET
+    if not secret or not authorization or not hmac.compare_digest(authorization, f"Bearer {secret}"):
+        raise HTTPException(status_code=401, detail="Invalid cron credentials")
+    return await background_jobs.run_due_jobs()
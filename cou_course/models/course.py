@@ -36,7 +36,13 @@ class Course(SQLModel, table=True):
     updated_by: Optional[int] = None
     is_flagship: Optional[bool] = Field(default=False)
     active: Optional[bool] = Field(default=True)
-    ratings: Optional[int] = Field(default=0)
+    ratings: Optional[int] = Field(default=0)  # Rounded average, kept for existing clients
+    # Running aggregates of cou_course.course_rating, maintained per submission
+    rating_sum: int = Field(default=0)
+    rating_count: int = Field(default=0)
+    rating_average: Optional[float] = None
+    # Active enrollments as of the last counter rollup (see EnrollmentCounterShard)
+    total_enrollments: int = Field(default=0)
     price: Optional[float] = Field(default=0.0)
     mentor_id: Optional[int] = Field(default=None, foreign_key="cou_user.user.id")
     IT: Optional[bool] = Field(default=None, sa_column_kwargs={"name": "IT"})
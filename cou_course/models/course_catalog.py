@@ -0,0 +1,40 @@
+from sqlalchemy import Table, Column, MetaData, Integer, String, Text, Boolean, Float, DateTime
+
+# The materialized view is created by SCHEMA_PATCHES, not by create_all, so it
+# lives outside SQLModel.metadata.
+catalog_metadata = MetaData()
+
+course_catalog = Table(
+    "course_catalog",
+    catalog_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String),
+    Column("description", Text),
+    Column("category_id", Integer),
+    Column("category_name", String),
+    Column("subcategory_id", Integer),
+    Column("subcategory_name", String),
+    Column("course_type_id", Integer),
+    Column("sells_type_id", Integer),
+    Column("language_id", Integer),
+    Column("mentor_id", Integer),
+    Column("is_flagship", Boolean),
+    Column("active", Boolean),
+    Column("price", Float),
+    Column("ratings", Integer),
+    Column("rating_average", Float),
+    Column("rating_count", Integer),
+    Column("total_enrollments", Integer),
+    Column("topic_count", Integer),
+    Column("lesson_count", Integer),
+    Column("IT", Boolean),
+    Column("Coding_Required", Boolean),
+    Column("Avg_Completion_Time", Integer),
+    Column("Course_level", String),
+    Column("created_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True)),
+    Column("instructor_id", Integer),
+    Column("instructor_name", String),
+    Column("instructor_profession", String),
+    schema="cou_course",
+)
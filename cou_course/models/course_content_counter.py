@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+
+class CourseContentCounter(SQLModel, table=True):
+    """Active content rows per course, kept in step by the content repositories' create/update/delete"""
+    __tablename__ = "course_content_counter"
+    __table_args__ = {"schema": "cou_course"}
+
+    course_id: int = Field(foreign_key="cou_course.course.id", primary_key=True)
+    total_lessons: int = Field(default=0)
+    total_quizzes: int = Field(default=0)
+    total_flashcards: int = Field(default=0)
+    total_mindmaps: int = Field(default=0)
+    total_memory_games: int = Field(default=0)
+    total_topics: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class VideoInfo(BaseModel):
     name : str
@@ -8,4 +8,5 @@ class VideoInfo(BaseModel):
     size : int
 
 class VideoListResponse(BaseModel):
-    videos : List[VideoInfo]
\ No newline at end of file
+    videos : List[VideoInfo]
+    next_cursor : Optional[int] = None  # Pass as `cursor` to get the next page
\ No newline at end of file
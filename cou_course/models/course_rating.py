@@ -0,0 +1,20 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime, timezone
+from sqlalchemy import UniqueConstraint
+
+class CourseRating(SQLModel, table=True):
+    """One rating (1-5) per learner and course; Course.rating_sum/rating_count aggregate them"""
+    __tablename__ = "course_rating"
+    __table_args__ = (
+        UniqueConstraint("user_id", "course_id", name="course_rating_user_course_key"),
+        {"schema": "cou_course"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="cou_user.user.id")
+    course_id: int = Field(foreign_key="cou_course.course.id", index=True)
+    rating: int
+    review: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,13 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+
+class CourseRecommendation(SQLModel, table=True):
+    """Precomputed nearest neighbours of a course; (course_id, rank) serves a course's list in one range scan"""
+    __tablename__ = "course_recommendation"
+    __table_args__ = {"schema": "cou_course"}
+
+    course_id: int = Field(foreign_key="cou_course.course.id", primary_key=True)
+    rank: int = Field(primary_key=True)
+    related_course_id: int = Field(foreign_key="cou_course.course.id")
+    score: float
+    computed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -8,7 +8,7 @@ class CourseSubcategory(SQLModel, table=True):
     __table_args__ = {"schema": "cou_course"}
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    category_id: int = Field(foreign_key="cou_course.coursecategory.id")
+    category_id: int = Field(foreign_key="cou_course.course_category.id")
     name: str = Field(max_length=255)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
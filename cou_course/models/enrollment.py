@@ -0,0 +1,32 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime, timezone
+from sqlalchemy import UniqueConstraint
+
+class Enrollment(SQLModel, table=True):
+    """A learner's enrollment in a course; unenrolling deactivates the row"""
+    __tablename__ = "enrollment"
+    __table_args__ = (
+        UniqueConstraint("user_id", "course_id", name="enrollment_user_course_key"),
+        {"schema": "cou_course"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="cou_user.user.id")
+    course_id: int = Field(foreign_key="cou_course.course.id", index=True)
+    enrolled_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    active: bool = Field(default=True)
+
+class EnrollmentCounterShard(SQLModel, table=True):
+    """
+    Enrollment changes not yet rolled up into Course.total_enrollments. Each course
+    spreads its pending delta over several shard rows, so concurrent enrollments in
+    a popular course rarely wait on the same row lock.
+    """
+    __tablename__ = "enrollment_counter_shard"
+    __table_args__ = {"schema": "cou_course"}
+
+    course_id: int = Field(foreign_key="cou_course.course.id", primary_key=True)
+    shard: int = Field(primary_key=True)
+    delta: int = Field(default=0)
@@ -0,0 +1,45 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime, timezone
+from sqlalchemy import Index, UniqueConstraint
+
+class FlashcardReviewState(SQLModel, table=True):
+    """
+    Spaced-repetition state of one card for one learner (SM-2). `due_at` is indexed
+    per learner (and per learner and course), so the cards due next are a range scan.
+    """
+    __tablename__ = "flashcard_review_state"
+    __table_args__ = (
+        UniqueConstraint("user_id", "flashcard_id", name="flashcard_review_state_user_card_key"),
+        Index("flashcard_review_state_due_idx", "user_id", "due_at"),
+        Index("flashcard_review_state_course_due_idx", "user_id", "course_id", "due_at"),
+        {"schema": "cou_course"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="cou_user.user.id")
+    flashcard_id: int = Field(foreign_key="cou_course.flashcard.id")
+    course_id: int = Field(foreign_key="cou_course.course.id")
+    ease_factor: float = Field(default=2.5)
+    interval_days: int = Field(default=0)
+    repetitions: int = Field(default=0)  # Consecutive successful reviews
+    lapses: int = Field(default=0)
+    due_at: datetime
+    last_reviewed_at: datetime
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class FlashcardReviewLog(SQLModel, table=True):
+    """Append-only log of every review (grade 0-5) with the schedule it produced"""
+    __tablename__ = "flashcard_review_log"
+    __table_args__ = (
+        Index("flashcard_review_log_user_card_idx", "user_id", "flashcard_id", "reviewed_at"),
+        {"schema": "cou_course"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="cou_user.user.id")
+    flashcard_id: int = Field(foreign_key="cou_course.flashcard.id")
+    grade: int
+    reviewed_at: datetime
+    interval_days: int
+    ease_factor: float
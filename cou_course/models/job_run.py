@@ -0,0 +1,12 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+from typing import Optional
+
+class JobRun(SQLModel, table=True):
+    """Last completed run of each periodic job, shared by every worker (see services/periodic_job)"""
+    __tablename__ = "job_run"
+    __table_args__ = {"schema": "cou_course"}
+
+    name: str = Field(primary_key=True, max_length=100)
+    last_run_at: datetime
+    last_duration_seconds: Optional[float] = Field(default=None)
@@ -0,0 +1,22 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime, timezone
+from sqlalchemy import Column, LargeBinary, UniqueConstraint
+
+class LearnerProgress(SQLModel, table=True):
+    """
+    One row per (learner, course). Completion is a bitset: bit N is set when the
+    component whose LessonOrder.progress_bit is N has been completed by the learner.
+    """
+    __tablename__ = "learner_progress"
+    __table_args__ = (
+        UniqueConstraint("user_id", "course_id", name="learner_progress_user_course_key"),
+        {"schema": "cou_course"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="cou_user.user.id")
+    course_id: int = Field(foreign_key="cou_course.course.id")
+    completed_bits: bytes = Field(default=b"", sa_column=Column(LargeBinary, nullable=False, default=b""))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
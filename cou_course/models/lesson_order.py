@@ -8,6 +8,7 @@ if TYPE_CHECKING:
     from cou_course.models.topic import Topic
 
 class ComponentType(str, Enum):
+    LESSON = "lesson"
     FLASHCARDS = "flashcards"
     MINDMAP = "mindmap"
     QUIZ = "quiz"
@@ -21,8 +22,9 @@ class LessonOrder(SQLModel, table=True):
     course_id: int = Field(foreign_key="cou_course.course.id")
     topic_id: int = Field(foreign_key="cou_course.topic.id")
     component_type: ComponentType
-    lesson_ref_id: int
+    lesson_ref_id: int  # Id of the lesson/quiz/mindmap/memory game; flashcard_set_id for flashcards
     sort_order: Optional[int] = None
+    progress_bit: Optional[int] = None  # Stable position in the learners' progress bitsets, assigned on first use
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     created_by: int
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -19,6 +19,7 @@ class Quiz(SQLModel, table=True):
     time_limit_minutes: Optional[int] = None
     max_questions: Optional[int] = None
     passing_grade_percent: Optional[int] = None
+    questions_version: int = Field(default=0)  # Bumped on every write to the quiz's questions
     is_completed: bool = Field(default=False)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     created_by: int
@@ -0,0 +1,30 @@
+from sqlmodel import SQLModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from sqlalchemy import JSON, Column, Index
+
+class QuizAttempt(SQLModel, table=True):
+    """
+    One learner's attempt at a quiz: the questions drawn for it when it started, and
+    once submitted (final) the answers and their grade. Grading only ever reads the
+    draw stored here, never one sent by the client.
+    """
+    __tablename__ = "quiz_attempt"
+    __table_args__ = (
+        Index("quiz_attempt_user_quiz_idx", "user_id", "quiz_id", "started_at"),
+        {"schema": "cou_course"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    quiz_id: int = Field(foreign_key="cou_course.quiz.id")
+    user_id: int = Field(foreign_key="cou_user.user.id")
+    seed: int  # Issued by the server; draws question_ids from the quiz's pool
+    question_ids: List[int] = Field(sa_column=Column(JSON, nullable=False))
+    started_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    submitted_at: Optional[datetime] = None
+    answers: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    score: Optional[int] = None
+    max_score: Optional[int] = None
+    percent: Optional[float] = None
+    passed: Optional[bool] = None
+    results: Optional[List[Dict[str, Any]]] = Field(default=None, sa_column=Column(JSON))
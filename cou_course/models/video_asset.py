@@ -0,0 +1,26 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime, timezone
+from sqlalchemy import Index
+
+class VideoAsset(SQLModel, table=True):
+    """Catalog row per blob in the lessons container, kept in sync by the video catalog reconciler"""
+    __tablename__ = "video_asset"
+    __table_args__ = (
+        # Cursor pagination (id > cursor) within a lesson or course
+        Index("ix_video_asset_lesson_id_id", "lesson_id", "id"),
+        Index("ix_video_asset_course_id_id", "course_id", "id"),
+        {"schema": "cou_course"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(max_length=1024, unique=True)  # Blob name (path inside the container)
+    size: int
+    content_type: Optional[str] = Field(default=None, max_length=255)
+    etag: str = Field(max_length=255)
+    last_modified: Optional[datetime] = None
+    lesson_id: Optional[int] = Field(default=None, foreign_key="cou_course.lesson.id")
+    course_id: Optional[int] = Field(default=None, foreign_key="cou_course.course.id")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    active: bool = Field(default=True)
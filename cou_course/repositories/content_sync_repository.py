@@ -0,0 +1,93 @@
+from sqlmodel import Session, select
+from sqlalchemy import BigInteger, func, literal_column
+from cou_course.models.topic import Topic
+from cou_course.models.lesson import Lesson
+from cou_course.models.quiz import Quiz
+from cou_course.models.question import Question
+from cou_course.models.flashcard import Flashcard
+from cou_course.models.mindmap import Mindmap
+from cou_course.models.memory_game import MemoryGame
+from cou_course.models.memory_game_pair import MemoryGamePair
+from cou_course.services.quiz_engine import public_answers
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Kind -> content model with a course_id
+COURSE_CONTENT = {
+    "topics": Topic,
+    "lessons": Lesson,
+    "quizzes": Quiz,
+    "flashcards": Flashcard,
+    "mindmaps": Mindmap,
+    "memory_games": MemoryGame,
+}
+# Kind -> (model, parent foreign key, parent model) for content reached through its parent
+CHILD_CONTENT = {
+    "questions": (Question, Question.quiz_id, Quiz),
+    "memory_game_pairs": (MemoryGamePair, MemoryGamePair.memory_game_id, MemoryGame),
+}
+
+Changes = Dict[str, List[Dict[str, Any]]]
+Deleted = Dict[str, List[int]]
+
+def _change_xid(model):
+    # Postgres only: maintained by the set_change_xid trigger (see common/database.py), not mapped
+    return literal_column(f"{model.__table__.fullname}.change_xid", BigInteger)
+
+class ContentSyncRepository:
+    @staticmethod
+    def tracks_transactions(session: Session) -> bool:
+        """Whether content rows carry the id of the transaction that last wrote them"""
+        return session.get_bind().dialect.name == "postgresql"
+
+    @staticmethod
+    def get_xid_watermark(session: Session) -> int:
+        """
+        Oldest transaction id that may still be in flight: every transaction before it
+        has committed (or rolled back), so its writes are visible to later reads.
+        """
+        return session.exec(select(func.txid_snapshot_xmin(func.txid_current_snapshot()))).one()
+
+    @staticmethod
+    def get_changes(session: Session, course_id: int, since: Union[int, datetime, None],
+                    until: Optional[datetime] = None) -> Tuple[Changes, Deleted]:
+        """
+        Content rows of a course changed since the watermark: written by a transaction
+        id >= `since` (an int, see get_xid_watermark), served by the (parent_id,
+        change_xid) indexes; or, without transaction ids, with updated_at in (since, until]
+        over the (parent_id, updated_at) indexes. Active rows come back whole (questions
+        with their public answers, never the answer key); deactivated ones only as ids
+        (tombstones). Without `since`, every active row is returned (a full snapshot
+        needs no tombstones).
+        """
+        changes: Changes = {}
+        deleted: Deleted = {}
+
+        def window(statement, model):
+            if since is None:
+                return statement.where(model.active == True)
+            if isinstance(since, int):
+                return statement.where(_change_xid(model) >= since)
+            return statement.where(model.updated_at > since, model.updated_at <= until)
+
+        statements = {
+            kind: window(select(model).where(model.course_id == course_id), model)
+            for kind, model in COURSE_CONTENT.items()
+        }
+        for kind, (model, parent_id, parent) in CHILD_CONTENT.items():
+            statements[kind] = window(
+                select(model).join(parent, parent.id == parent_id).where(parent.course_id == course_id), model
+            )
+
+        for kind, statement in statements.items():
+            model = COURSE_CONTENT.get(kind) or CHILD_CONTENT[kind][0]
+            changes[kind], deleted[kind] = [], []
+            for row in session.exec(statement.order_by(model.updated_at, model.id)):
+                if row.active:
+                    data = row.dict()
+                    if model is Question:
+                        data["answers"] = public_answers(row.type, row.answers)
+                    changes[kind].append(data)
+                else:
+                    deleted[kind].append(row.id)
+        return changes, deleted
@@ -0,0 +1,67 @@
+from sqlmodel import Session, select
+from sqlalchemy import func, literal
+from cou_user.models.user import User
+from cou_course.models.course import Course
+from cou_course.models.topic import Topic
+from cou_course.models.lesson import Lesson
+from cou_course.models.coursecategory import CourseCategory
+from cou_course.models.coursesubcategory import CourseSubcategory
+from cou_course.models.course_catalog import course_catalog
+from cou_mentor.models.mentor import Mentor
+from typing import Any, Dict
+
+def _live_catalog():
+    """The view's query over the base tables, for databases without the materialized view"""
+    topic_count = select(func.count(Topic.id)).where(Topic.course_id == Course.id, Topic.active == True).scalar_subquery()
+    lesson_count = select(func.count(Lesson.id)).where(Lesson.course_id == Course.id, Lesson.active == True).scalar_subquery()
+    full_name = func.trim(func.coalesce(User.first_name, literal("")) + literal(" ") + func.coalesce(User.last_name, literal("")))
+    return select(
+        Course.id, Course.title, Course.description,
+        Course.category_id, CourseCategory.name.label("category_name"),
+        Course.subcategory_id, CourseSubcategory.name.label("subcategory_name"),
+        Course.course_type_id, Course.sells_type_id, Course.language_id, Course.mentor_id,
+        Course.is_flagship, Course.active, Course.price, Course.ratings,
+        Course.rating_average, Course.rating_count, Course.total_enrollments,
+        topic_count.label("topic_count"), lesson_count.label("lesson_count"),
+        Course.IT, Course.Coding_Required, Course.Avg_Completion_Time.label("Avg_Completion_Time"), Course.Course_level,
+        Course.created_at, Course.updated_at,
+        Mentor.user_id.label("instructor_id"),
+        func.coalesce(func.nullif(User.display_name, ""), func.nullif(full_name, "")).label("instructor_name"),
+        Mentor.designation.label("instructor_profession"),
+    ).select_from(Course).outerjoin(
+        Mentor, Mentor.user_id == Course.mentor_id
+    ).outerjoin(
+        User, User.id == Mentor.user_id
+    ).outerjoin(
+        CourseCategory, CourseCategory.id == Course.category_id
+    ).outerjoin(
+        CourseSubcategory, CourseSubcategory.id == Course.subcategory_id
+    ).subquery("course_catalog")
+
+class CourseCatalogRepository:
+    @staticmethod
+    def source(session: Session):
+        """
+        The relation catalog pages read from: the cou_course.course_catalog materialized
+        view on PostgreSQL, the equivalent live query elsewhere. Both have the same columns.
+        """
+        if session.get_bind().dialect.name == "postgresql":
+            return course_catalog
+        return _live_catalog()
+
+    @staticmethod
+    def to_entry(row) -> Dict[str, Any]:
+        """A catalog row as a course card, with the instructor nested like CourseRead expects"""
+        entry = dict(row._mapping)
+        instructor_id = entry.pop("instructor_id")
+        name, profession = entry.pop("instructor_name"), entry.pop("instructor_profession")
+        entry["instructor"] = {"id": instructor_id, "name": name, "profession": profession} if instructor_id is not None else None
+        return entry
+
+    @staticmethod
+    def refresh(session: Session) -> bool:
+        """Refresh the materialized view without blocking readers; False where there is none"""
+        if session.get_bind().dialect.name != "postgresql":
+            return False
+        session.connection().exec_driver_sql("REFRESH MATERIALIZED VIEW CONCURRENTLY cou_course.course_catalog")
+        return True
@@ -0,0 +1,105 @@
+from sqlmodel import Session, select, update
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from cou_course.models.course_content_counter import CourseContentCounter
+from cou_course.models.topic import Topic
+from cou_course.models.lesson import Lesson
+from cou_course.models.quiz import Quiz
+from cou_course.models.flashcard import Flashcard
+from cou_course.models.mindmap import Mindmap
+from cou_course.models.memory_game import MemoryGame
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Content model -> its counter column
+COUNTER_COLUMNS = {
+    Lesson: "total_lessons",
+    Quiz: "total_quizzes",
+    Flashcard: "total_flashcards",
+    Mindmap: "total_mindmaps",
+    MemoryGame: "total_memory_games",
+    Topic: "total_topics",
+}
+# Fields whose update can move a row in or out of a course's counts
+COUNTED_FIELDS = {"course_id", "active"}
+
+class CourseContentCounterRepository:
+    @staticmethod
+    def get_summary(session: Session, course_id: int) -> Dict[str, int]:
+        """The course's content counts: one primary-key row fetch (counted once on first read)"""
+        columns = [getattr(CourseContentCounter, column) for column in COUNTER_COLUMNS.values()]
+        statement = select(*columns).where(CourseContentCounter.course_id == course_id)
+        row = session.exec(statement).first()
+        if row is None:
+            CourseContentCounterRepository.recount(session, [course_id])
+            row = session.exec(statement).one()
+        return dict(zip(COUNTER_COLUMNS.values(), row))
+
+    @staticmethod
+    def add(session: Session, course_id: int, **deltas: int) -> None:
+        """
+        Add to a course's counters (e.g. `total_lessons=1`) in the caller's transaction.
+        A course without a counter row yet is counted from scratch instead.
+        """
+        deltas = {column: delta for column, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        values = {column: getattr(CourseContentCounter, column) + delta for column, delta in deltas.items()}
+        statement = update(CourseContentCounter).where(CourseContentCounter.course_id == course_id).values(
+            **values, updated_at=datetime.now(timezone.utc)
+        )
+        if session.exec(statement).rowcount == 0:
+            CourseContentCounterRepository.recount(session, [course_id])
+
+    @staticmethod
+    def get_state(session: Session, model, row_id: int) -> Optional[Tuple[int, bool]]:
+        """(course_id, active) of a content row, to compare before and after an update"""
+        return session.exec(select(model.course_id, model.active).where(model.id == row_id)).first()
+
+    @staticmethod
+    def move(session: Session, model, before: Optional[Tuple[int, bool]], after: Optional[Tuple[int, bool]]) -> None:
+        """Counter changes for a content row whose (course_id, active) went from `before` to `after`"""
+        if before is None or after is None or tuple(before) == tuple(after):
+            return
+        column = COUNTER_COLUMNS[model]
+        if before[1]:
+            CourseContentCounterRepository.add(session, before[0], **{column: -1})
+        if after[1]:
+            CourseContentCounterRepository.add(session, after[0], **{column: 1})
+
+    @staticmethod
+    def recount(session: Session, course_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recompute the counters from the content tables, for the given courses or all of
+        them, and write the rows that differ. Returns how many rows were written.
+        """
+        ids: Optional[List[int]] = list(course_ids) if course_ids is not None else None
+        counts: Dict[int, Dict[str, int]] = {course_id: {} for course_id in ids or []}
+        for model, column in COUNTER_COLUMNS.items():
+            statement = select(model.course_id, func.count(model.id)).where(model.active == True).group_by(model.course_id)
+            if ids is not None:
+                statement = statement.where(model.course_id.in_(ids))
+            for course_id, count in session.exec(statement):
+                counts.setdefault(course_id, {})[column] = count
+
+        columns = list(COUNTER_COLUMNS.values())
+        statement = select(CourseContentCounter.course_id, *(getattr(CourseContentCounter, c) for c in columns))
+        if ids is not None:
+            statement = statement.where(CourseContentCounter.course_id.in_(ids))
+        stored = {row[0]: tuple(row[1:]) for row in session.exec(statement)}
+
+        now = datetime.now(timezone.utc)
+        changed = []
+        for course_id in counts.keys() | stored.keys():
+            values = tuple(counts.get(course_id, {}).get(column, 0) for column in columns)
+            if stored.get(course_id) != values:
+                changed.append({"course_id": course_id, **dict(zip(columns, values)), "updated_at": now})
+        if changed:
+            insert = sqlite_insert if session.get_bind().dialect.name == "sqlite" else pg_insert
+            statement = insert(CourseContentCounter)
+            session.execute(statement.on_conflict_do_update(
+                index_elements=["course_id"],
+                set_={column: statement.excluded[column] for column in [*columns, "updated_at"]}
+            ), changed)
+        return len(changed)
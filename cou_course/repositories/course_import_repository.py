@@ -0,0 +1,133 @@
+from sqlmodel import Session, insert
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+from cou_course.models.topic import Topic
+from cou_course.models.lesson import Lesson
+from cou_course.models.quiz import Quiz
+from cou_course.models.question import Question
+from cou_course.models.flashcard import Flashcard
+from cou_course.models.mindmap import Mindmap
+from cou_course.models.memory_game import MemoryGame
+from cou_course.models.memory_game_pair import MemoryGamePair
+from cou_course.repositories.course_content_counter_repository import CourseContentCounterRepository
+from cou_course.schemas.course_import_schema import CourseContentImport, CourseContentImportResult
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CourseImportRepository:
+    @staticmethod
+    def import_course_content(session: Session, course_id: int, document: CourseContentImport) -> CourseContentImportResult:
+        """
+        Insert a whole course content document level by level: topics, then the
+        topic children, then questions and memory game pairs. Each level is one
+        batched INSERT (multi-row VALUES via executemany), and parent ids come back
+        from RETURNING in input order, so foreign keys are resolved in memory.
+        Nothing is committed here; the request's unit of work commits it all at once.
+        """
+        now = datetime.now(timezone.utc)
+        audit = {
+            "created_at": now,
+            "created_by": document.created_by,
+            "updated_at": now,
+            "updated_by": document.created_by,
+            "active": True,
+        }
+
+        topic_ids = CourseImportRepository._insert_returning_ids(session, Topic, [
+            {
+                "course_id": course_id,
+                "title": topic.title,
+                "topic_order": topic.topic_order if topic.topic_order is not None else position,
+                "image_path": topic.image_path,
+                "is_expanded": topic.is_expanded,
+                **audit,
+            }
+            for position, topic in enumerate(document.topics, start=1)
+        ])
+
+        lessons: List[Dict[str, Any]] = []
+        quizzes: List[Dict[str, Any]] = []
+        flashcards: List[Dict[str, Any]] = []
+        mindmaps: List[Dict[str, Any]] = []
+        memory_games: List[Dict[str, Any]] = []
+        for topic_id, topic in zip(topic_ids, document.topics):
+            parent = {"course_id": course_id, "topic_id": topic_id, "is_completed": False, **audit}
+            lessons.extend({**lesson.dict(), **parent} for lesson in topic.lessons)
+            quizzes.extend({**quiz.dict(exclude={"questions"}), **parent} for quiz in topic.quizzes)
+            flashcards.extend(
+                {
+                    **flashcard.dict(),
+                    "card_order": flashcard.card_order if flashcard.card_order is not None else position,
+                    **parent,
+                }
+                for position, flashcard in enumerate(topic.flashcards, start=1)
+            )
+            mindmaps.extend({**mindmap.dict(), **parent} for mindmap in topic.mindmaps)
+            memory_games.extend({**game.dict(exclude={"pairs"}), **parent} for game in topic.memory_games)
+
+        CourseImportRepository._insert_many(session, Lesson, lessons)
+        CourseImportRepository._insert_many(session, Flashcard, flashcards)
+        CourseImportRepository._insert_many(session, Mindmap, mindmaps)
+        quiz_ids = CourseImportRepository._insert_returning_ids(session, Quiz, quizzes)
+        memory_game_ids = CourseImportRepository._insert_returning_ids(session, MemoryGame, memory_games)
+
+        all_quizzes = [quiz for topic in document.topics for quiz in topic.quizzes]
+        questions = [
+            {
+                **question.dict(),
+                "quiz_id": quiz_id,
+                "question_order": question.question_order if question.question_order is not None else position,
+                **audit,
+            }
+            for quiz_id, quiz in zip(quiz_ids, all_quizzes)
+            for position, question in enumerate(quiz.questions, start=1)
+        ]
+        CourseImportRepository._insert_many(session, Question, questions)
+
+        all_games = [game for topic in document.topics for game in topic.memory_games]
+        pairs = [
+            {
+                **pair.dict(),
+                "memory_game_id": game_id,
+                "pair_order": pair.pair_order if pair.pair_order is not None else position,
+                **audit,
+            }
+            for game_id, game in zip(memory_game_ids, all_games)
+            for position, pair in enumerate(game.pairs, start=1)
+        ]
+        CourseImportRepository._insert_many(session, MemoryGamePair, pairs)
+        CourseContentCounterRepository.add(
+            session, course_id,
+            total_topics=len(topic_ids), total_lessons=len(lessons), total_quizzes=len(quizzes),
+            total_flashcards=len(flashcards), total_mindmaps=len(mindmaps), total_memory_games=len(memory_games)
+        )
+
+        logger.info(
+            f"Imported course {course_id}: {len(topic_ids)} topics, {len(lessons)} lessons, "
+            f"{len(quizzes)} quizzes, {len(questions)} questions"
+        )
+        return CourseContentImportResult(
+            course_id=course_id,
+            topic_ids=topic_ids,
+            total_topics=len(topic_ids),
+            total_lessons=len(lessons),
+            total_quizzes=len(quizzes),
+            total_questions=len(questions),
+            total_flashcards=len(flashcards),
+            total_mindmaps=len(mindmaps),
+            total_memory_games=len(memory_games),
+            total_memory_game_pairs=len(pairs),
+        )
+
+    @staticmethod
+    def _insert_many(session: Session, model, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            session.execute(insert(model), rows)
+
+    @staticmethod
+    def _insert_returning_ids(session: Session, model, rows: List[Dict[str, Any]]) -> List[int]:
+        if not rows:
+            return []
+        statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+        return list(session.scalars(statement, rows))
@@ -0,0 +1,71 @@
+import hashlib
+from sqlmodel import Session, select
+from sqlalchemy import Row, func
+from cou_course.models.lesson_order import LessonOrder, ComponentType
+from cou_course.models.topic import Topic
+from cou_course.models.lesson import Lesson
+from cou_course.models.quiz import Quiz
+from cou_course.models.flashcard import Flashcard
+from cou_course.models.mindmap import Mindmap
+from cou_course.models.memory_game import MemoryGame
+from typing import Dict, List, Optional, Tuple
+
+# Tables whose rows make up a course outline
+OUTLINE_MODELS = [Topic, LessonOrder, Lesson, Quiz, Flashcard, Mindmap, MemoryGame]
+
+# (component type, ref id) -> (topic id, title, item count)
+ComponentSummaries = Dict[Tuple[ComponentType, int], Tuple[int, Optional[str], Optional[int]]]
+
+class CourseOutlineRepository:
+    @staticmethod
+    def get_version(session: Session, course_id: int) -> str:
+        """
+        Version of a course's outline content in one query: row count and latest
+        updated_at per table. Creates, updates and soft deletes all change it.
+        """
+        columns = []
+        for model in OUTLINE_MODELS:
+            columns.append(select(func.count()).select_from(model).where(model.course_id == course_id).scalar_subquery())
+            columns.append(select(func.max(model.updated_at)).where(model.course_id == course_id).scalar_subquery())
+        values = ":".join(str(value) for value in session.exec(select(*columns)).one())
+        return hashlib.sha256(values.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def get_topics(session: Session, course_id: int) -> List[Row]:
+        """Outline columns of the active topics, in topic_order (plain rows, no ORM identity map)"""
+        statement = select(Topic.id, Topic.title, Topic.topic_order, Topic.image_path, Topic.is_expanded).where(Topic.course_id == course_id, Topic.active == True).order_by(
+            Topic.topic_order.is_(None), Topic.topic_order, Topic.id
+        )
+        return list(session.exec(statement))
+
+    @staticmethod
+    def get_orders(session: Session, course_id: int) -> List[Row]:
+        statement = select(
+            LessonOrder.id, LessonOrder.topic_id, LessonOrder.component_type, LessonOrder.lesson_ref_id, LessonOrder.sort_order
+        ).where(LessonOrder.course_id == course_id, LessonOrder.active == True).order_by(
+            LessonOrder.sort_order.is_(None), LessonOrder.sort_order, LessonOrder.id
+        )
+        return list(session.exec(statement))
+
+    @staticmethod
+    def get_component_summaries(session: Session, course_id: int) -> ComponentSummaries:
+        """Title-level summary of every active component of a course, one query per component table"""
+        summaries: ComponentSummaries = {}
+        titled = [
+            (ComponentType.LESSON, Lesson, Lesson.title),
+            (ComponentType.QUIZ, Quiz, Quiz.title),
+            (ComponentType.MINDMAP, Mindmap, None),
+            (ComponentType.MEMORY_GAME, MemoryGame, MemoryGame.description),
+        ]
+        for component_type, model, title in titled:
+            columns = [model.id, model.topic_id] + ([title] if title is not None else [])
+            statement = select(*columns).where(model.course_id == course_id, model.active == True)
+            for row in session.exec(statement):
+                summaries[(component_type, row[0])] = (row[1], row[2] if title is not None else None, None)
+
+        statement = select(Flashcard.flashcard_set_id, func.min(Flashcard.topic_id), func.count()).where(
+            Flashcard.course_id == course_id, Flashcard.active == True
+        ).group_by(Flashcard.flashcard_set_id)
+        for set_id, topic_id, cards in session.exec(statement):
+            summaries[(ComponentType.FLASHCARDS, set_id)] = (topic_id, None, cards)
+        return summaries
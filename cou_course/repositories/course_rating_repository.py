@@ -0,0 +1,70 @@
+from sqlmodel import Session, select, update, delete
+from sqlalchemy import Float, Row, cast, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from cou_course.models.course import Course
+from cou_course.models.course_rating import CourseRating
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+class CourseRatingRepository:
+    @staticmethod
+    def upsert_rating(session: Session, user_id: int, course_id: int, rating: int, review: Optional[str]) -> Tuple[int, int]:
+        """Insert or replace a learner's rating; returns the (sum, count) change for the course aggregates"""
+        insert = sqlite_insert if session.get_bind().dialect.name == "sqlite" else pg_insert
+        now = datetime.now(timezone.utc)
+        inserted = session.execute(
+            insert(CourseRating).values(
+                user_id=user_id, course_id=course_id, rating=rating, review=review, created_at=now, updated_at=now
+            ).on_conflict_do_nothing(index_elements=["user_id", "course_id"])
+        ).rowcount
+        if inserted:
+            return rating, 1
+
+        rating_id, previous = session.exec(
+            select(CourseRating.id, CourseRating.rating).where(
+                CourseRating.user_id == user_id, CourseRating.course_id == course_id
+            ).with_for_update()
+        ).one()
+        session.execute(update(CourseRating).where(CourseRating.id == rating_id).values(rating=rating, review=review, updated_at=now))
+        return rating - previous, 0
+
+    @staticmethod
+    def delete_rating(session: Session, user_id: int, course_id: int) -> Optional[int]:
+        """Remove a learner's rating; returns the removed value, or None if there was none"""
+        statement = delete(CourseRating).where(
+            CourseRating.user_id == user_id, CourseRating.course_id == course_id
+        ).returning(CourseRating.rating)
+        return session.execute(statement).scalar()
+
+    @staticmethod
+    def apply_to_course(session: Session, course_id: int, sum_delta: int, count_delta: int) -> Optional[Row]:
+        """
+        Add a rating change to the course's running aggregates in one UPDATE ... RETURNING
+        (rating_average, rating_count). The row lock serializes concurrent submissions, and
+        every SET expression reads the pre-update values, so the average matches the new sum.
+        """
+        rating_sum = Course.rating_sum + sum_delta
+        rating_count = Course.rating_count + count_delta
+        average = cast(rating_sum, Float) / func.nullif(rating_count, 0)
+        statement = update(Course).where(Course.id == course_id).values(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating_average=average,
+            ratings=func.coalesce(func.round(average), 0)
+        ).returning(Course.rating_average, Course.rating_count)
+        return session.execute(statement).first()
+
+    @staticmethod
+    def reconcile(session: Session) -> int:
+        """Recompute the aggregates of every course that drifted from its ratings; returns the courses fixed"""
+        sums = select(func.coalesce(func.sum(CourseRating.rating), 0)).where(CourseRating.course_id == Course.id).scalar_subquery()
+        counts = select(func.count(CourseRating.id)).where(CourseRating.course_id == Course.id).scalar_subquery()
+        average = cast(sums, Float) / func.nullif(counts, 0)
+        statement = update(Course).where(or_(Course.rating_sum != sums, Course.rating_count != counts)).values(
+            rating_sum=sums,
+            rating_count=counts,
+            rating_average=average,
+            ratings=func.coalesce(func.round(average), 0)
+        )
+        return session.execute(statement).rowcount
@@ -0,0 +1,41 @@
+from sqlmodel import Session, select, delete
+from sqlalchemy import func, insert
+from cou_course.models.course import Course
+from cou_course.models.course_recommendation import CourseRecommendation
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+INSERT_CHUNK = 10000
+
+class CourseRecommendationRepository:
+    @staticmethod
+    def get_feature_rows(session: Session) -> List[Any]:
+        """The columns course features are built from, for every active course"""
+        statement = select(
+            Course.id, Course.category_id, Course.subcategory_id, Course.course_type_id, Course.language_id,
+            Course.Course_level, Course.IT, Course.Coding_Required, Course.price
+        ).where(Course.active == True).order_by(Course.id)
+        return session.exec(statement).all()
+
+    @staticmethod
+    def get_last_computed(session: Session) -> Optional[datetime]:
+        return session.exec(select(func.max(CourseRecommendation.computed_at))).first()
+
+    @staticmethod
+    def replace_all(session: Session, rows: List[Dict[str, Any]]) -> None:
+        """Swap in a new set of recommendations; readers see the previous set until commit"""
+        session.execute(delete(CourseRecommendation))
+        for start in range(0, len(rows), INSERT_CHUNK):
+            session.execute(insert(CourseRecommendation), rows[start:start + INSERT_CHUNK])
+
+    @staticmethod
+    def get_recommendations(session: Session, course_id: int, limit: int) -> List[Tuple[Course, float]]:
+        """Related active courses with their similarity, best first"""
+        statement = (
+            select(Course, CourseRecommendation.score)
+            .join(CourseRecommendation, CourseRecommendation.related_course_id == Course.id)
+            .where(CourseRecommendation.course_id == course_id, Course.active == True)
+            .order_by(CourseRecommendation.rank)
+            .limit(limit)
+        )
+        return session.exec(statement).all()
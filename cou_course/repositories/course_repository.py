@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from sqlmodel import Session, select
 from sqlalchemy import func
 from cou_user.models.user import User
@@ -8,6 +8,7 @@ import logging
 from cou_course.models.coursecategory import CourseCategory
 from cou_course.models.coursesubcategory import CourseSubcategory
 from cou_course.models.coursetype import CourseType
+from cou_course.repositories.course_catalog_repository import CourseCatalogRepository
 
 class CourseRepository:
     @staticmethod
@@ -27,14 +28,15 @@ class CourseRepository:
         return session.exec(statement).first()
 
     @staticmethod
-    def get_all_courses(session: Session , skip: int , limit: int) -> List[Course]:
-        statement = (
-            select(Course)
-            .outerjoin(Mentor, Course.mentor_id == Mentor.user_id)
-            .offset(skip)
-            .limit(limit)
-        )
-        return session.exec(statement).all()
+    def course_exists(session: Session, course_id: int) -> bool:
+        return session.exec(select(Course.id).where(Course.id == course_id, Course.active == True)).first() is not None
+
+    @staticmethod
+    def get_all_courses(session: Session , skip: int , limit: int) -> List[Dict[str, Any]]:
+        """A page of catalog cards (instructor included), read from the course catalog"""
+        catalog = CourseCatalogRepository.source(session)
+        statement = select(catalog).order_by(catalog.c.id).offset(skip).limit(limit)
+        return [CourseCatalogRepository.to_entry(row) for row in session.execute(statement)]
 
     @staticmethod
     def update_course(session: Session, course_id: int, updates: dict) -> Optional[Course]:
@@ -142,56 +144,59 @@ class CourseRepository:
         level: Optional[str] = None,
         price_type: Optional[str] = None,
         completion_time: Optional[str] = None,
+        sort_by_rating: bool = False,
         skip: int = 0,
         limit: int = 10
-    ) -> List[Course]:
+    ) -> List[Dict[str, Any]]:
         """
         Enhanced filter courses based on all available filter options.
+        Reads catalog cards from the course catalog (one scan, no per-row loads).
         """
-        query = select(Course)
+        catalog = CourseCatalogRepository.source(session)
+        query = select(catalog)
 
         # Basic filters
         if category_id is not None:
-            query = query.where(Course.category_id == category_id)
+            query = query.where(catalog.c.category_id == category_id)
         if subcategory_id is not None:
-            query = query.where(Course.subcategory_id == subcategory_id)
+            query = query.where(catalog.c.subcategory_id == subcategory_id)
         if course_type_id is not None:
-            query = query.where(Course.course_type_id == course_type_id)
+            query = query.where(catalog.c.course_type_id == course_type_id)
         if sells_type_id is not None:
-            query = query.where(Course.sells_type_id == sells_type_id)
+            query = query.where(catalog.c.sells_type_id == sells_type_id)
         if language_id is not None:
-            query = query.where(Course.language_id == language_id)
+            query = query.where(catalog.c.language_id == language_id)
         if mentor_id is not None:
-            query = query.where(Course.mentor_id == mentor_id)
+            query = query.where(catalog.c.mentor_id == mentor_id)
         if is_flagship is not None:
-            query = query.where(Course.is_flagship == is_flagship)
+            query = query.where(catalog.c.is_flagship == is_flagship)
         if active is not None:
-            query = query.where(Course.active == active)
+            query = query.where(catalog.c.active == active)
 
         # IT/Non-IT filter - now using the IT boolean field directly
         if it_non_it:
-            query = query.where(Course.IT == it_non_it)
+            query = query.where(catalog.c.IT == it_non_it)
 
         # Coding/Non-Coding filter - now using the Coding_Required boolean field directly
         if coding_non_coding:
-            query = query.where(Course.Coding_Required == coding_non_coding)
+            query = query.where(catalog.c.Coding_Required == coding_non_coding)
 
         # Level filter - now using the Course_level field directly
         if level:
             print(level)
-            query = query.where(Course.Course_level == level.lower())
+            query = query.where(catalog.c.Course_level == level.lower())
 
         # Price type filter
         if price_type == "free":
-            query = query.where(Course.price == 0)
+            query = query.where(catalog.c.price == 0)
         elif price_type == "paid":
-            query = query.where(Course.price > 0)
+            query = query.where(catalog.c.price > 0)
 
         # Price range filter
         if min_price is not None:
-            query = query.where(Course.price >= min_price)
+            query = query.where(catalog.c.price >= min_price)
         if max_price is not None:
-            query = query.where(Course.price <= max_price)
+            query = query.where(catalog.c.price <= max_price)
 
         # Completion time filter - now using Avg_Completion_Time field directly
         if completion_time:
@@ -203,17 +208,20 @@ class CourseRepository:
             }
             if completion_time in time_ranges:
                 min_time, max_time = time_ranges[completion_time]
-                query = query.where(Course.Avg_Completion_Time >= min_time)
-                query = query.where(Course.Avg_Completion_Time <= max_time)
+                query = query.where(catalog.c.Avg_Completion_Time >= min_time)
+                query = query.where(catalog.c.Avg_Completion_Time <= max_time)
 
-        # Rating filters
+        # Rating filters and sort (course_catalog_rating_idx on the running average)
         if min_ratings is not None:
-            query = query.where(Course.ratings >= min_ratings)
+            query = query.where(catalog.c.rating_average >= min_ratings)
         if max_ratings is not None:
-            query = query.where(Course.ratings <= max_ratings)
+            query = query.where(catalog.c.rating_average <= max_ratings)
+        if sort_by_rating:
+            query = query.order_by(catalog.c.rating_average.desc().nulls_last(), catalog.c.rating_count.desc())
+        query = query.order_by(catalog.c.id)
 
-        results = session.exec(query.offset(skip).limit(limit))
-        return results.all()
+        results = session.execute(query.offset(skip).limit(limit))
+        return [CourseCatalogRepository.to_entry(row) for row in results]
     
     @staticmethod
     def get_course_details_by_id(session: Session, course_id: int) -> Optional[Course]:
@@ -255,17 +263,19 @@ class CourseRepository:
         return session.exec(statement).all()
 
     @staticmethod
-    def get_courses_by_category_id(session: Session, category_id: int, skip: int = 0, limit: int = 10) -> List[Course]:
+    def get_courses_by_category_id(session: Session, category_id: int, skip: int = 0, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        Fetch courses that belong to the given category id.
+        Fetch catalog cards of the courses that belong to the given category id.
         """
+        catalog = CourseCatalogRepository.source(session)
         statement = (
-            select(Course)
-            .where(Course.category_id == category_id)
+            select(catalog)
+            .where(catalog.c.category_id == category_id)
+            .order_by(catalog.c.id)
             .offset(skip)
             .limit(limit)
         )
-        return session.exec(statement).all()
+        return [CourseCatalogRepository.to_entry(row) for row in session.execute(statement)]
 
     @staticmethod
     def get_course_count(session: Session) -> dict:
@@ -0,0 +1,123 @@
+from sqlmodel import Session, select, update, delete
+from sqlalchemy import bindparam, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from cou_course.models.course import Course
+from cou_course.models.enrollment import Enrollment, EnrollmentCounterShard
+from cou_mentor.models.mentor import Mentor
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+_course = Course.__table__
+_mentor = Mentor.__table__
+
+class EnrollmentRepository:
+    @staticmethod
+    def _insert(session: Session):
+        return sqlite_insert if session.get_bind().dialect.name == "sqlite" else pg_insert
+
+    @staticmethod
+    def enroll(session: Session, user_id: int, course_id: int) -> bool:
+        """Enroll (or re-enroll) a learner; False if they already were enrolled"""
+        now = datetime.now(timezone.utc)
+        insert = EnrollmentRepository._insert(session)
+        inserted = session.execute(
+            insert(Enrollment).values(
+                user_id=user_id, course_id=course_id, enrolled_at=now, updated_at=now, active=True
+            ).on_conflict_do_nothing(index_elements=["user_id", "course_id"])
+        ).rowcount
+        if inserted:
+            return True
+        statement = update(Enrollment).where(
+            Enrollment.user_id == user_id, Enrollment.course_id == course_id, Enrollment.active == False
+        ).values(active=True, enrolled_at=now, updated_at=now)
+        return session.execute(statement).rowcount > 0
+
+    @staticmethod
+    def unenroll(session: Session, user_id: int, course_id: int) -> bool:
+        """Deactivate an enrollment; False if the learner was not enrolled"""
+        statement = update(Enrollment).where(
+            Enrollment.user_id == user_id, Enrollment.course_id == course_id, Enrollment.active == True
+        ).values(active=False, updated_at=datetime.now(timezone.utc))
+        return session.execute(statement).rowcount > 0
+
+    @staticmethod
+    def add_to_shard(session: Session, course_id: int, shard: int, delta: int) -> None:
+        """Add to one pending-delta row of the course (INSERT ... ON CONFLICT DO UPDATE)"""
+        insert = EnrollmentRepository._insert(session)
+        statement = insert(EnrollmentCounterShard).values(course_id=course_id, shard=shard, delta=delta)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=["course_id", "shard"],
+            set_={"delta": EnrollmentCounterShard.delta + statement.excluded.delta}
+        ))
+
+    @staticmethod
+    def get_enrollment_count(session: Session, course_id: int) -> int:
+        """Exact active enrollments: the rolled-up total plus the course's pending shard deltas"""
+        pending = select(func.coalesce(func.sum(EnrollmentCounterShard.delta), 0)).where(
+            EnrollmentCounterShard.course_id == course_id
+        ).scalar_subquery()
+        return session.exec(select(Course.total_enrollments + pending).where(Course.id == course_id)).first() or 0
+
+    @staticmethod
+    def drain_shards(session: Session) -> Dict[int, int]:
+        """Take (lock and delete) every pending shard row; returns the summed delta per course"""
+        rows = session.execute(delete(EnrollmentCounterShard).returning(
+            EnrollmentCounterShard.course_id, EnrollmentCounterShard.delta
+        )).all()
+        deltas: Dict[int, int] = {}
+        for course_id, delta in rows:
+            deltas[course_id] = deltas.get(course_id, 0) + delta
+        return {course_id: delta for course_id, delta in deltas.items() if delta}
+
+    @staticmethod
+    def get_course_mentors(session: Session, course_ids: List[int]) -> Dict[int, int]:
+        statement = select(Course.id, Course.mentor_id).where(Course.id.in_(course_ids), Course.mentor_id.is_not(None))
+        return dict(session.exec(statement).all())
+
+    @staticmethod
+    def apply_deltas(session: Session, course_deltas: List[Tuple[int, int]], mentor_deltas: List[Tuple[int, int]]) -> None:
+        """Add the deltas to Course.total_enrollments and Mentor.total_students (one executemany each)"""
+        if course_deltas:
+            session.execute(
+                _course.update().where(_course.c.id == bindparam("b_id")).values(
+                    total_enrollments=_course.c.total_enrollments + bindparam("b_delta")
+                ),
+                [{"b_id": course_id, "b_delta": delta} for course_id, delta in course_deltas]
+            )
+        if mentor_deltas:
+            session.execute(
+                _mentor.update().where(_mentor.c.user_id == bindparam("b_user_id")).values(
+                    total_students=_mentor.c.total_students + bindparam("b_delta")
+                ),
+                [{"b_user_id": user_id, "b_delta": delta} for user_id, delta in mentor_deltas]
+            )
+
+    @staticmethod
+    def recount(session: Session) -> Tuple[int, int]:
+        """
+        Recompute every course total from the enrollment table and every mentor total
+        from their courses, dropping pending shard deltas. Returns the (courses, mentors) changed.
+
+        On Postgres the shard table is locked (EXCLUSIVE: reads go on, writes wait) until
+        the caller commits. Every enrollment change writes a shard row in its own
+        transaction, so none can commit between dropping the deltas and counting: it
+        is either already counted with its delta dropped, or waits and leaves a delta
+        for the next rollup. Rollups wait as well.
+        """
+        if session.get_bind().dialect.name == "postgresql":
+            session.execute(text("LOCK TABLE cou_course.enrollment_counter_shard IN EXCLUSIVE MODE"))
+        session.execute(delete(EnrollmentCounterShard))
+        enrolled = select(func.count(Enrollment.id)).where(
+            Enrollment.course_id == Course.id, Enrollment.active == True
+        ).scalar_subquery()
+        courses = session.execute(
+            update(Course).where(Course.total_enrollments != enrolled).values(total_enrollments=enrolled)
+        ).rowcount
+        students = select(func.coalesce(func.sum(Course.total_enrollments), 0)).where(
+            Course.mentor_id == Mentor.user_id
+        ).scalar_subquery()
+        mentors = session.execute(
+            update(Mentor).where(Mentor.total_students != students).values(total_students=students)
+        ).rowcount
+        return courses, mentors
@@ -1,6 +1,8 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
 from cou_course.models.flashcard import Flashcard
+from cou_course.repositories.course_content_counter_repository import CourseContentCounterRepository, COUNTED_FIELDS
 from cou_course.schemas.flashcard_schema import FlashcardCreate, FlashcardUpdate
+from datetime import datetime, timezone
 from typing import List, Optional
 
 class FlashcardRepository:
@@ -8,8 +10,9 @@ class FlashcardRepository:
     def create_flashcard(session: Session, flashcard: FlashcardCreate) -> Flashcard:
         db_flashcard = Flashcard(**flashcard.dict())
         session.add(db_flashcard)
-        session.commit()
-        session.refresh(db_flashcard)
+        session.flush()  # INSERT ... RETURNING id; committed by the request's unit of work
+        if db_flashcard.active:
+            CourseContentCounterRepository.add(session, db_flashcard.course_id, total_flashcards=1)
         return db_flashcard
 
     @staticmethod
@@ -23,26 +26,28 @@ class FlashcardRepository:
 
     @staticmethod
     def update_flashcard(session: Session, flashcard_id: int, flashcard_update: FlashcardUpdate) -> Optional[Flashcard]:
-        db_flashcard = session.get(Flashcard, flashcard_id)
-        if not db_flashcard:
-            return None
-        
         update_data = flashcard_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_flashcard, field, value)
-        
-        session.add(db_flashcard)
-        session.commit()
-        session.refresh(db_flashcard)
-        return db_flashcard
+        if not update_data:
+            return session.get(Flashcard, flashcard_id)
+
+        # Moving or (de)activating the row changes the course content counters
+        before = CourseContentCounterRepository.get_state(session, Flashcard, flashcard_id) if COUNTED_FIELDS & update_data.keys() else None
+        update_data.setdefault("updated_at", datetime.now(timezone.utc))
+        # One UPDATE ... RETURNING instead of SELECT + UPDATE + refresh SELECT
+        statement = update(Flashcard).where(Flashcard.id == flashcard_id).values(**update_data).returning(Flashcard)
+        updated = session.exec(statement).scalars().first()
+        if before is not None and updated is not None:
+            CourseContentCounterRepository.move(session, Flashcard, before, (updated.course_id, updated.active))
+        return updated
 
     @staticmethod
     def delete_flashcard(session: Session, flashcard_id: int) -> bool:
-        db_flashcard = session.get(Flashcard, flashcard_id)
-        if not db_flashcard:
-            return False
-        
-        db_flashcard.active = False
-        session.add(db_flashcard)
-        session.commit()
+        statement = update(Flashcard).where(Flashcard.id == flashcard_id, Flashcard.active == True).values(
+            active=False, updated_at=datetime.now(timezone.utc)
+        ).returning(Flashcard.course_id)
+        course_id = session.exec(statement).scalars().first()
+        if course_id is None:
+            # Missing, or already deleted (which still counts as deleted)
+            return session.exec(select(Flashcard.id).where(Flashcard.id == flashcard_id)).first() is not None
+        CourseContentCounterRepository.add(session, course_id, total_flashcards=-1)
         return True 
\ No newline at end of file
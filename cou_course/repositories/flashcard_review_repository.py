@@ -0,0 +1,77 @@
+from sqlmodel import Session, select, update
+from sqlalchemy import Row, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from cou_course.models.flashcard import Flashcard
+from cou_course.models.flashcard_review import FlashcardReviewState, FlashcardReviewLog
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+class FlashcardReviewRepository:
+    @staticmethod
+    def get_card_courses(session: Session, flashcard_ids: List[int]) -> Dict[int, int]:
+        """course_id of each active card among the given ids"""
+        statement = select(Flashcard.id, Flashcard.course_id).where(Flashcard.id.in_(flashcard_ids), Flashcard.active == True)
+        return dict(session.exec(statement).all())
+
+    @staticmethod
+    def create_missing_states(session: Session, user_id: int, card_courses: Dict[int, int], now: datetime) -> None:
+        """
+        Insert a fresh (never reviewed) state for each card the learner has none for, in one
+        INSERT ... ON CONFLICT DO NOTHING: concurrent batches on a new card both end up
+        updating the one row instead of racing on the (user_id, flashcard_id) key.
+        """
+        insert_ = sqlite_insert if session.get_bind().dialect.name == "sqlite" else pg_insert
+        session.execute(
+            insert_(FlashcardReviewState).values([
+                {"user_id": user_id, "flashcard_id": flashcard_id, "course_id": course_id,
+                 "due_at": now, "last_reviewed_at": now, "created_at": now}
+                for flashcard_id, course_id in card_courses.items()
+            ]).on_conflict_do_nothing(index_elements=["user_id", "flashcard_id"])
+        )
+
+    @staticmethod
+    def get_states(session: Session, user_id: int, flashcard_ids: List[int]) -> Dict[int, Row]:
+        """Review state rows (id, ease_factor, interval_days, repetitions, lapses) of a learner's cards, locked for update"""
+        statement = select(
+            FlashcardReviewState.flashcard_id, FlashcardReviewState.id, FlashcardReviewState.ease_factor,
+            FlashcardReviewState.interval_days, FlashcardReviewState.repetitions, FlashcardReviewState.lapses
+        ).where(
+            FlashcardReviewState.user_id == user_id, FlashcardReviewState.flashcard_id.in_(flashcard_ids)
+        ).order_by(FlashcardReviewState.id).with_for_update()
+        return {row[0]: row for row in session.exec(statement)}
+
+    @staticmethod
+    def save_reviews(session: Session, changed_states: List[Dict[str, Any]], logs: List[Dict[str, Any]]) -> None:
+        """Bulk UPDATE the states by primary key and append the review log"""
+        if changed_states:
+            session.execute(update(FlashcardReviewState), changed_states)
+        if logs:
+            session.execute(insert(FlashcardReviewLog), logs)
+
+    @staticmethod
+    def get_due(session: Session, user_id: int, now: datetime, limit: int, course_id: Optional[int] = None) -> List[Row]:
+        """
+        (flashcard_id, front, back, clue, due_at, interval_days) of the cards due by `now`,
+        earliest first: a range scan of the (user_id[, course_id], due_at) index.
+        """
+        statement = select(
+            FlashcardReviewState.flashcard_id, Flashcard.front, Flashcard.back, Flashcard.clue,
+            FlashcardReviewState.due_at, FlashcardReviewState.interval_days
+        ).join(Flashcard, Flashcard.id == FlashcardReviewState.flashcard_id).where(
+            FlashcardReviewState.user_id == user_id, FlashcardReviewState.due_at <= now, Flashcard.active == True
+        )
+        if course_id is not None:
+            statement = statement.where(FlashcardReviewState.course_id == course_id)
+        return list(session.exec(statement.order_by(FlashcardReviewState.due_at).limit(limit)))
+
+    @staticmethod
+    def get_new_cards(session: Session, user_id: int, course_id: int, limit: int) -> List[Row]:
+        """(flashcard_id, front, back, clue) of a course's cards the learner has never reviewed, in set order"""
+        reviewed = select(FlashcardReviewState.id).where(
+            FlashcardReviewState.user_id == user_id, FlashcardReviewState.flashcard_id == Flashcard.id
+        ).exists()
+        statement = select(Flashcard.id, Flashcard.front, Flashcard.back, Flashcard.clue).where(
+            Flashcard.course_id == course_id, Flashcard.active == True, ~reviewed
+        ).order_by(Flashcard.flashcard_set_id, Flashcard.card_order.is_(None), Flashcard.card_order, Flashcard.id).limit(limit)
+        return list(session.exec(statement))
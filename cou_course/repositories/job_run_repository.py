@@ -0,0 +1,20 @@
+from sqlmodel import Session, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from cou_course.models.job_run import JobRun
+from datetime import datetime
+from typing import Optional
+
+class JobRunRepository:
+    @staticmethod
+    def get_last_run(session: Session, name: str) -> Optional[datetime]:
+        return session.exec(select(JobRun.last_run_at).where(JobRun.name == name)).first()
+
+    @staticmethod
+    def record_run(session: Session, name: str, run_at: datetime, duration_seconds: float) -> None:
+        insert = sqlite_insert if session.get_bind().dialect.name == "sqlite" else pg_insert
+        values = {"last_run_at": run_at, "last_duration_seconds": duration_seconds}
+        statement = insert(JobRun).values(name=name, **values).on_conflict_do_update(
+            index_elements=[JobRun.name], set_=values
+        )
+        session.exec(statement)
@@ -0,0 +1,87 @@
+from sqlmodel import Session, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from cou_course.models.learner_progress import LearnerProgress
+from cou_course.models.lesson_order import LessonOrder
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# course_id -> {LessonOrder id: progress bit} for the active components (None: no bit yet)
+CourseSlots = Dict[int, Dict[int, Optional[int]]]
+
+class LearnerProgressRepository:
+    @staticmethod
+    def get_course_slots(session: Session, course_ids: List[int], assign_missing: bool = False) -> CourseSlots:
+        """
+        Progress bit of every active component of the given courses, in one query.
+        A component without a bit cannot have been completed yet; with `assign_missing`
+        (writers only, it locks and updates LessonOrder) such components get the next
+        free bits. Bits are never reused, so existing bitsets stay valid when components
+        are added, moved or removed.
+        """
+        statement = select(LessonOrder.id, LessonOrder.course_id, LessonOrder.progress_bit, LessonOrder.active).where(
+            LessonOrder.course_id.in_(course_ids)
+        )
+        rows = session.exec(statement).all()
+        unassigned = {course_id for _, course_id, bit, _ in rows if bit is None}
+        if unassigned and assign_missing:
+            LearnerProgressRepository._assign_bits(session, sorted(unassigned))
+            rows = session.exec(statement).all()
+
+        slots: CourseSlots = {course_id: {} for course_id in course_ids}
+        for order_id, course_id, bit, active in rows:
+            if active:
+                slots[course_id][order_id] = bit
+        return slots
+
+    @staticmethod
+    def _assign_bits(session: Session, course_ids: List[int]) -> None:
+        # Lock the courses' LessonOrder rows so concurrent first reads hand out the same bits once
+        statement = select(LessonOrder.id, LessonOrder.course_id, LessonOrder.progress_bit).where(
+            LessonOrder.course_id.in_(course_ids)
+        ).order_by(LessonOrder.id).with_for_update()
+        next_bit: Dict[int, int] = {}
+        pending: List[Tuple[int, int]] = []
+        rows = session.exec(statement).all()
+        for _, course_id, bit in rows:
+            if bit is not None:
+                next_bit[course_id] = max(next_bit.get(course_id, 0), bit + 1)
+        for order_id, course_id, bit in rows:
+            if bit is None:
+                pending.append((order_id, next_bit.get(course_id, 0)))
+                next_bit[course_id] = next_bit.get(course_id, 0) + 1
+        if pending:
+            # Bulk UPDATE by primary key (executemany)
+            session.execute(update(LessonOrder), [{"id": order_id, "progress_bit": bit} for order_id, bit in pending])
+
+    @staticmethod
+    def get_bitsets(session: Session, user_id: int, course_ids: List[int]) -> Dict[int, int]:
+        """Completion bitsets of a learner for many courses (missing rows mean nothing completed)"""
+        statement = select(LearnerProgress.course_id, LearnerProgress.completed_bits).where(
+            LearnerProgress.user_id == user_id, LearnerProgress.course_id.in_(course_ids)
+        )
+        return {course_id: int.from_bytes(bits, "little") for course_id, bits in session.exec(statement)}
+
+    @staticmethod
+    def update_bitset(session: Session, user_id: int, course_id: int, set_mask: int, clear_mask: int) -> int:
+        """Set and clear bits of a learner's course bitset under a row lock; returns the new bitset"""
+        insert = sqlite_insert if session.get_bind().dialect.name == "sqlite" else pg_insert
+        now = datetime.now(timezone.utc)
+        session.execute(
+            insert(LearnerProgress).values(
+                user_id=user_id, course_id=course_id, completed_bits=b"", created_at=now, updated_at=now
+            ).on_conflict_do_nothing(index_elements=["user_id", "course_id"])
+        )
+        statement = select(LearnerProgress.id, LearnerProgress.completed_bits).where(
+            LearnerProgress.user_id == user_id, LearnerProgress.course_id == course_id
+        ).with_for_update()
+        progress_id, bits = session.exec(statement).one()
+
+        bitset = (int.from_bytes(bits, "little") | set_mask) & ~clear_mask
+        session.execute(
+            update(LearnerProgress).where(LearnerProgress.id == progress_id).values(
+                completed_bits=bitset.to_bytes((bitset.bit_length() + 7) // 8, "little"),
+                updated_at=now
+            )
+        )
+        return bitset
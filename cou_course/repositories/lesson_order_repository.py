@@ -0,0 +1,88 @@
+from sqlmodel import Session, select
+from cou_course.models.lesson_order import LessonOrder, ComponentType
+from cou_course.models.topic import Topic
+from cou_course.models.lesson import Lesson
+from cou_course.models.quiz import Quiz
+from cou_course.models.question import Question
+from cou_course.models.flashcard import Flashcard
+from cou_course.models.mindmap import Mindmap
+from cou_course.models.memory_game import MemoryGame
+from cou_course.models.memory_game_pair import MemoryGamePair
+from cou_course.services.quiz_engine import public_answers
+from typing import Any, Dict, List, Tuple
+
+# Components whose lesson_ref_id is the primary key of a single row
+COMPONENT_MODELS = {
+    ComponentType.LESSON: Lesson,
+    ComponentType.QUIZ: Quiz,
+    ComponentType.MINDMAP: Mindmap,
+    ComponentType.MEMORY_GAME: MemoryGame,
+}
+
+class LessonOrderRepository:
+    @staticmethod
+    def get_course_sequence(session: Session, course_id: int) -> List[LessonOrder]:
+        """Active components of a course in learning order: by topic_order, then sort_order"""
+        statement = (
+            select(LessonOrder)
+            .join(Topic, Topic.id == LessonOrder.topic_id)
+            .where(LessonOrder.course_id == course_id, LessonOrder.active == True, Topic.active == True)
+            .order_by(
+                Topic.topic_order.is_(None), Topic.topic_order, Topic.id,
+                LessonOrder.sort_order.is_(None), LessonOrder.sort_order, LessonOrder.id
+            )
+        )
+        return list(session.exec(statement))
+
+    @staticmethod
+    def hydrate_components(session: Session, orders: List[LessonOrder]) -> Dict[Tuple[ComponentType, int], Dict[str, Any]]:
+        """
+        Content of the referenced components keyed by (component_type, lesson_ref_id).
+        One IN query per component type present, plus one each for quiz questions and
+        memory game pairs, however many components are requested. Quiz questions carry
+        only their public answers, never the answer key.
+        """
+        ref_ids: Dict[ComponentType, set] = {}
+        for order in orders:
+            ref_ids.setdefault(ComponentType(order.component_type), set()).add(order.lesson_ref_id)
+
+        content: Dict[Tuple[ComponentType, int], Dict[str, Any]] = {}
+        for component_type, model in COMPONENT_MODELS.items():
+            if component_type not in ref_ids:
+                continue
+            statement = select(model).where(model.id.in_(ref_ids[component_type]), model.active == True)
+            for row in session.exec(statement):
+                content[(component_type, row.id)] = row.dict()
+
+        quiz_ids = [ref_id for (component_type, ref_id) in content if component_type == ComponentType.QUIZ]
+        if quiz_ids:
+            for quiz_id in quiz_ids:
+                content[(ComponentType.QUIZ, quiz_id)]["questions"] = []
+            statement = select(Question).where(Question.quiz_id.in_(quiz_ids), Question.active == True).order_by(
+                Question.quiz_id, Question.question_order.is_(None), Question.question_order, Question.id
+            )
+            for question in session.exec(statement):
+                question_data = question.dict()
+                question_data["answers"] = public_answers(question.type, question.answers)
+                content[(ComponentType.QUIZ, question.quiz_id)]["questions"].append(question_data)
+
+        game_ids = [ref_id for (component_type, ref_id) in content if component_type == ComponentType.MEMORY_GAME]
+        if game_ids:
+            for game_id in game_ids:
+                content[(ComponentType.MEMORY_GAME, game_id)]["pairs"] = []
+            statement = select(MemoryGamePair).where(
+                MemoryGamePair.memory_game_id.in_(game_ids), MemoryGamePair.active == True
+            ).order_by(MemoryGamePair.memory_game_id, MemoryGamePair.pair_order.is_(None), MemoryGamePair.pair_order, MemoryGamePair.id)
+            for pair in session.exec(statement):
+                content[(ComponentType.MEMORY_GAME, pair.memory_game_id)]["pairs"].append(pair.dict())
+
+        if ComponentType.FLASHCARDS in ref_ids:
+            # A flashcards component is a whole set of cards
+            statement = select(Flashcard).where(
+                Flashcard.flashcard_set_id.in_(ref_ids[ComponentType.FLASHCARDS]), Flashcard.active == True
+            ).order_by(Flashcard.flashcard_set_id, Flashcard.card_order.is_(None), Flashcard.card_order, Flashcard.id)
+            for card in session.exec(statement):
+                key = (ComponentType.FLASHCARDS, card.flashcard_set_id)
+                content.setdefault(key, {"flashcard_set_id": card.flashcard_set_id, "cards": []})["cards"].append(card.dict())
+
+        return content
@@ -1,15 +1,18 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
 from cou_course.models.lesson import Lesson
+from cou_course.repositories.course_content_counter_repository import CourseContentCounterRepository, COUNTED_FIELDS
 from cou_course.schemas.lesson_schema import LessonCreate, LessonUpdate
 from typing import List, Optional
+from datetime import datetime, timezone
 
 class LessonRepository:
     @staticmethod
     def create_lesson(session: Session, lesson: LessonCreate) -> Lesson:
         db_lesson = Lesson(**lesson.dict())
         session.add(db_lesson)
-        session.commit()
-        session.refresh(db_lesson)
+        session.flush()  # INSERT ... RETURNING id; committed by the request's unit of work
+        if db_lesson.active:
+            CourseContentCounterRepository.add(session, db_lesson.course_id, total_lessons=1)
         return db_lesson
 
     @staticmethod
@@ -23,26 +26,41 @@ class LessonRepository:
 
     @staticmethod
     def update_lesson(session: Session, lesson_id: int, lesson_update: LessonUpdate) -> Optional[Lesson]:
-        db_lesson = session.get(Lesson, lesson_id)
-        if not db_lesson:
-            return None
-        
         update_data = lesson_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_lesson, field, value)
-        
-        session.add(db_lesson)
-        session.commit()
-        session.refresh(db_lesson)
-        return db_lesson
+        if not update_data:
+            return session.get(Lesson, lesson_id)
+
+        # Moving or (de)activating the row changes the course content counters
+        before = CourseContentCounterRepository.get_state(session, Lesson, lesson_id) if COUNTED_FIELDS & update_data.keys() else None
+        update_data.setdefault("updated_at", datetime.now(timezone.utc))
+        # One UPDATE ... RETURNING instead of SELECT + UPDATE + refresh SELECT
+        statement = update(Lesson).where(Lesson.id == lesson_id).values(**update_data).returning(Lesson)
+        updated = session.exec(statement).scalars().first()
+        if before is not None and updated is not None:
+            CourseContentCounterRepository.move(session, Lesson, before, (updated.course_id, updated.active))
+        return updated
+
+    @staticmethod
+    def set_video(session: Session, lesson_id: int, video_path: str, video_filename: str,
+                  video_source: str, updated_by: Optional[int] = None) -> Optional[Lesson]:
+        """Point a lesson at an uploaded video in one UPDATE ... RETURNING"""
+        statement = update(Lesson).where(Lesson.id == lesson_id, Lesson.active == True).values(
+            video_path=video_path,
+            video_filename=video_filename,
+            video_source=video_source,
+            updated_by=updated_by,
+            updated_at=datetime.now(timezone.utc)
+        ).returning(Lesson)
+        return session.exec(statement).scalars().first()
 
     @staticmethod
     def delete_lesson(session: Session, lesson_id: int) -> bool:
-        db_lesson = session.get(Lesson, lesson_id)
-        if not db_lesson:
-            return False
-        
-        db_lesson.active = False
-        session.add(db_lesson)
-        session.commit()
+        statement = update(Lesson).where(Lesson.id == lesson_id, Lesson.active == True).values(
+            active=False, updated_at=datetime.now(timezone.utc)
+        ).returning(Lesson.course_id)
+        course_id = session.exec(statement).scalars().first()
+        if course_id is None:
+            # Missing, or already deleted (which still counts as deleted)
+            return session.exec(select(Lesson.id).where(Lesson.id == lesson_id)).first() is not None
+        CourseContentCounterRepository.add(session, course_id, total_lessons=-1)
         return True 
\ No newline at end of file
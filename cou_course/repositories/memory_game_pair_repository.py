@@ -1,6 +1,7 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
 from cou_course.models.memory_game_pair import MemoryGamePair
 from cou_course.schemas.memory_game_pair_schema import MemoryGamePairCreate, MemoryGamePairUpdate
+from datetime import datetime, timezone
 from typing import List, Optional
 
 class MemoryGamePairRepository:
@@ -8,8 +9,7 @@ class MemoryGamePairRepository:
     def create_memory_game_pair(session: Session, memory_game_pair: MemoryGamePairCreate) -> MemoryGamePair:
         db_memory_game_pair = MemoryGamePair(**memory_game_pair.dict())
         session.add(db_memory_game_pair)
-        session.commit()
-        session.refresh(db_memory_game_pair)
+        session.flush()  # INSERT ... RETURNING id; committed by the request's unit of work
         return db_memory_game_pair
 
     @staticmethod
@@ -31,29 +31,19 @@ class MemoryGamePairRepository:
 
     @staticmethod
     def update_memory_game_pair(session: Session, memory_game_pair_id: int, memory_game_pair_update: MemoryGamePairUpdate) -> Optional[MemoryGamePair]:
-        db_memory_game_pair = session.get(MemoryGamePair, memory_game_pair_id)
-        if not db_memory_game_pair:
-            return None
-        
         update_data = memory_game_pair_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_memory_game_pair, field, value)
-        
-        session.add(db_memory_game_pair)
-        session.commit()
-        session.refresh(db_memory_game_pair)
-        return db_memory_game_pair
+        if not update_data:
+            return session.get(MemoryGamePair, memory_game_pair_id)
+
+        update_data.setdefault("updated_at", datetime.now(timezone.utc))
+        # One UPDATE ... RETURNING instead of SELECT + UPDATE + refresh SELECT
+        statement = update(MemoryGamePair).where(MemoryGamePair.id == memory_game_pair_id).values(**update_data).returning(MemoryGamePair)
+        return session.exec(statement).scalars().first()
 
     @staticmethod
     def delete_memory_game_pair(session: Session, memory_game_pair_id: int) -> bool:
-        db_memory_game_pair = session.get(MemoryGamePair, memory_game_pair_id)
-        if not db_memory_game_pair:
-            return False
-        
-        db_memory_game_pair.active = False
-        session.add(db_memory_game_pair)
-        session.commit()
-        return True
+        statement = update(MemoryGamePair).where(MemoryGamePair.id == memory_game_pair_id).values(active=False, updated_at=datetime.now(timezone.utc))
+        return session.exec(statement).rowcount > 0
 
     @staticmethod
     def get_memory_game_pairs_by_term(session: Session, term: str) -> List[MemoryGamePair]:
@@ -1,6 +1,8 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
 from cou_course.models.memory_game import MemoryGame
+from cou_course.repositories.course_content_counter_repository import CourseContentCounterRepository, COUNTED_FIELDS
 from cou_course.schemas.memory_game_schema import MemoryGameCreate, MemoryGameUpdate
+from datetime import datetime, timezone
 from typing import List, Optional
 
 class MemoryGameRepository:
@@ -8,8 +10,9 @@ class MemoryGameRepository:
     def create_memory_game(session: Session, memory_game: MemoryGameCreate) -> MemoryGame:
         db_memory_game = MemoryGame(**memory_game.dict())
         session.add(db_memory_game)
-        session.commit()
-        session.refresh(db_memory_game)
+        session.flush()  # INSERT ... RETURNING id; committed by the request's unit of work
+        if db_memory_game.active:
+            CourseContentCounterRepository.add(session, db_memory_game.course_id, total_memory_games=1)
         return db_memory_game
 
     @staticmethod
@@ -23,26 +26,28 @@ class MemoryGameRepository:
 
     @staticmethod
     def update_memory_game(session: Session, memory_game_id: int, memory_game_update: MemoryGameUpdate) -> Optional[MemoryGame]:
-        db_memory_game = session.get(MemoryGame, memory_game_id)
-        if not db_memory_game:
-            return None
-        
         update_data = memory_game_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_memory_game, field, value)
-        
-        session.add(db_memory_game)
-        session.commit()
-        session.refresh(db_memory_game)
-        return db_memory_game
+        if not update_data:
+            return session.get(MemoryGame, memory_game_id)
+
+        # Moving or (de)activating the row changes the course content counters
+        before = CourseContentCounterRepository.get_state(session, MemoryGame, memory_game_id) if COUNTED_FIELDS & update_data.keys() else None
+        update_data.setdefault("updated_at", datetime.now(timezone.utc))
+        # One UPDATE ... RETURNING instead of SELECT + UPDATE + refresh SELECT
+        statement = update(MemoryGame).where(MemoryGame.id == memory_game_id).values(**update_data).returning(MemoryGame)
+        updated = session.exec(statement).scalars().first()
+        if before is not None and updated is not None:
+            CourseContentCounterRepository.move(session, MemoryGame, before, (updated.course_id, updated.active))
+        return updated
 
     @staticmethod
     def delete_memory_game(session: Session, memory_game_id: int) -> bool:
-        db_memory_game = session.get(MemoryGame, memory_game_id)
-        if not db_memory_game:
-            return False
-        
-        db_memory_game.active = False
-        session.add(db_memory_game)
-        session.commit()
+        statement = update(MemoryGame).where(MemoryGame.id == memory_game_id, MemoryGame.active == True).values(
+            active=False, updated_at=datetime.now(timezone.utc)
+        ).returning(MemoryGame.course_id)
+        course_id = session.exec(statement).scalars().first()
+        if course_id is None:
+            # Missing, or already deleted (which still counts as deleted)
+            return session.exec(select(MemoryGame.id).where(MemoryGame.id == memory_game_id)).first() is not None
+        CourseContentCounterRepository.add(session, course_id, total_memory_games=-1)
         return True 
\ No newline at end of file
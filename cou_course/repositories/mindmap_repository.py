@@ -1,6 +1,8 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
 from cou_course.models.mindmap import Mindmap
+from cou_course.repositories.course_content_counter_repository import CourseContentCounterRepository, COUNTED_FIELDS
 from cou_course.schemas.mindmap_schema import MindmapCreate, MindmapUpdate
+from datetime import datetime, timezone
 from typing import List, Optional
 
 class MindmapRepository:
@@ -8,8 +10,9 @@ class MindmapRepository:
     def create_mindmap(session: Session, mindmap: MindmapCreate) -> Mindmap:
         db_mindmap = Mindmap(**mindmap.dict())
         session.add(db_mindmap)
-        session.commit()
-        session.refresh(db_mindmap)
+        session.flush()  # INSERT ... RETURNING id; committed by the request's unit of work
+        if db_mindmap.active:
+            CourseContentCounterRepository.add(session, db_mindmap.course_id, total_mindmaps=1)
         return db_mindmap
 
     @staticmethod
@@ -23,26 +26,28 @@ class MindmapRepository:
 
     @staticmethod
     def update_mindmap(session: Session, mindmap_id: int, mindmap_update: MindmapUpdate) -> Optional[Mindmap]:
-        db_mindmap = session.get(Mindmap, mindmap_id)
-        if not db_mindmap:
-            return None
-        
         update_data = mindmap_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_mindmap, field, value)
-        
-        session.add(db_mindmap)
-        session.commit()
-        session.refresh(db_mindmap)
-        return db_mindmap
+        if not update_data:
+            return session.get(Mindmap, mindmap_id)
+
+        # Moving or (de)activating the row changes the course content counters
+        before = CourseContentCounterRepository.get_state(session, Mindmap, mindmap_id) if COUNTED_FIELDS & update_data.keys() else None
+        update_data.setdefault("updated_at", datetime.now(timezone.utc))
+        # One UPDATE ... RETURNING instead of SELECT + UPDATE + refresh SELECT
+        statement = update(Mindmap).where(Mindmap.id == mindmap_id).values(**update_data).returning(Mindmap)
+        updated = session.exec(statement).scalars().first()
+        if before is not None and updated is not None:
+            CourseContentCounterRepository.move(session, Mindmap, before, (updated.course_id, updated.active))
+        return updated
 
     @staticmethod
     def delete_mindmap(session: Session, mindmap_id: int) -> bool:
-        db_mindmap = session.get(Mindmap, mindmap_id)
-        if not db_mindmap:
-            return False
-        
-        db_mindmap.active = False
-        session.add(db_mindmap)
-        session.commit()
+        statement = update(Mindmap).where(Mindmap.id == mindmap_id, Mindmap.active == True).values(
+            active=False, updated_at=datetime.now(timezone.utc)
+        ).returning(Mindmap.course_id)
+        course_id = session.exec(statement).scalars().first()
+        if course_id is None:
+            # Missing, or already deleted (which still counts as deleted)
+            return session.exec(select(Mindmap.id).where(Mindmap.id == mindmap_id)).first() is not None
+        CourseContentCounterRepository.add(session, course_id, total_mindmaps=-1)
         return True 
\ No newline at end of file
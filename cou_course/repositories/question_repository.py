@@ -1,18 +1,58 @@
-from sqlmodel import Session, select, text
+from sqlmodel import Session, select, update, text
+from sqlalchemy import Row, String, type_coerce
 from cou_course.models.question import Question, QuestionType
+from cou_course.models.quiz import Quiz
 from cou_course.schemas.question_schema import QuestionCreate, QuestionUpdate
+from datetime import datetime, timezone
 from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Stored question type labels (legacy display names included) -> QuestionType
+QUESTION_TYPE_MAPPING = {
+    "True/False": QuestionType.TRUE_FALSE,
+    "true/false": QuestionType.TRUE_FALSE,
+    "TRUE_FALSE": QuestionType.TRUE_FALSE,
+    "Multiple Choice": QuestionType.MULTIPLE,
+    "multiple_choice": QuestionType.MULTIPLE,
+    "MULTIPLE": QuestionType.MULTIPLE,
+    "Single Choice": QuestionType.SINGLE,
+    "single_choice": QuestionType.SINGLE,
+    "SINGLE": QuestionType.SINGLE,
+    "Fill in the Blank": QuestionType.FILL_BLANK,
+    "fill_blank": QuestionType.FILL_BLANK,
+    "FILL_BLANK": QuestionType.FILL_BLANK,
+    "Open Ended": QuestionType.OPEN_ENDED,
+    "open_ended": QuestionType.OPEN_ENDED,
+    "OPEN_ENDED": QuestionType.OPEN_ENDED,
+    "Matching Text": QuestionType.MATCHING_TEXT,
+    "matching_text": QuestionType.MATCHING_TEXT,
+    "MATCHING_TEXT": QuestionType.MATCHING_TEXT,
+    "Matching Image": QuestionType.MATCHING_IMAGE,
+    "matching_image": QuestionType.MATCHING_IMAGE,
+    "MATCHING_IMAGE": QuestionType.MATCHING_IMAGE,
+    "Sort Answer": QuestionType.SORT_ANSWER,
+    "sort_answer": QuestionType.SORT_ANSWER,
+    "SORT_ANSWER": QuestionType.SORT_ANSWER
+}
+
 class QuestionRepository:
+    @staticmethod
+    def _bump_quiz_version(session: Session, quiz_id) -> None:
+        # Every question write bumps its quiz's questions_version, which versions the compiled answer keys
+        session.execute(update(Quiz).where(Quiz.id == quiz_id).values(questions_version=Quiz.questions_version + 1))
+
+    @staticmethod
+    def _quiz_of(question_id: int):
+        return select(Question.quiz_id).where(Question.id == question_id).scalar_subquery()
+
     @staticmethod
     def create_question(session: Session, question: QuestionCreate) -> Question:
         db_question = Question(**question.dict())
         session.add(db_question)
-        session.commit()
-        session.refresh(db_question)
+        session.flush()  # INSERT ... RETURNING id; committed by the request's unit of work
+        QuestionRepository._bump_quiz_version(session, db_question.quiz_id)
         return db_question
 
     @staticmethod
@@ -30,41 +70,11 @@ class QuestionRepository:
         if not row:
             return None
         
-        from datetime import datetime, timezone
-        
-        # Question type mapping
-        question_type_mapping = {
-            "True/False": QuestionType.TRUE_FALSE,
-            "true/false": QuestionType.TRUE_FALSE,
-            "TRUE_FALSE": QuestionType.TRUE_FALSE,
-            "Multiple Choice": QuestionType.MULTIPLE,
-            "multiple_choice": QuestionType.MULTIPLE,
-            "MULTIPLE": QuestionType.MULTIPLE,
-            "Single Choice": QuestionType.SINGLE,
-            "single_choice": QuestionType.SINGLE,
-            "SINGLE": QuestionType.SINGLE,
-            "Fill in the Blank": QuestionType.FILL_BLANK,
-            "fill_blank": QuestionType.FILL_BLANK,
-            "FILL_BLANK": QuestionType.FILL_BLANK,
-            "Open Ended": QuestionType.OPEN_ENDED,
-            "open_ended": QuestionType.OPEN_ENDED,
-            "OPEN_ENDED": QuestionType.OPEN_ENDED,
-            "Matching Text": QuestionType.MATCHING_TEXT,
-            "matching_text": QuestionType.MATCHING_TEXT,
-            "MATCHING_TEXT": QuestionType.MATCHING_TEXT,
-            "Matching Image": QuestionType.MATCHING_IMAGE,
-            "matching_image": QuestionType.MATCHING_IMAGE,
-            "MATCHING_IMAGE": QuestionType.MATCHING_IMAGE,
-            "Sort Answer": QuestionType.SORT_ANSWER,
-            "sort_answer": QuestionType.SORT_ANSWER,
-            "SORT_ANSWER": QuestionType.SORT_ANSWER
-        }
-        
         current_time = datetime.now(timezone.utc)
         
         # Map database question_type to enum
         db_question_type = row[3] or "SINGLE"
-        mapped_question_type = question_type_mapping.get(db_question_type, QuestionType.SINGLE)
+        mapped_question_type = QUESTION_TYPE_MAPPING.get(db_question_type, QuestionType.SINGLE)
         
         question_data = {
             "id": row[0],
@@ -101,42 +111,12 @@ class QuestionRepository:
         """), {"quiz_id": quiz_id})
         
         questions = []
-        from datetime import datetime, timezone
-        
-        # Question type mapping
-        question_type_mapping = {
-            "True/False": QuestionType.TRUE_FALSE,
-            "true/false": QuestionType.TRUE_FALSE,
-            "TRUE_FALSE": QuestionType.TRUE_FALSE,
-            "Multiple Choice": QuestionType.MULTIPLE,
-            "multiple_choice": QuestionType.MULTIPLE,
-            "MULTIPLE": QuestionType.MULTIPLE,
-            "Single Choice": QuestionType.SINGLE,
-            "single_choice": QuestionType.SINGLE,
-            "SINGLE": QuestionType.SINGLE,
-            "Fill in the Blank": QuestionType.FILL_BLANK,
-            "fill_blank": QuestionType.FILL_BLANK,
-            "FILL_BLANK": QuestionType.FILL_BLANK,
-            "Open Ended": QuestionType.OPEN_ENDED,
-            "open_ended": QuestionType.OPEN_ENDED,
-            "OPEN_ENDED": QuestionType.OPEN_ENDED,
-            "Matching Text": QuestionType.MATCHING_TEXT,
-            "matching_text": QuestionType.MATCHING_TEXT,
-            "MATCHING_TEXT": QuestionType.MATCHING_TEXT,
-            "Matching Image": QuestionType.MATCHING_IMAGE,
-            "matching_image": QuestionType.MATCHING_IMAGE,
-            "MATCHING_IMAGE": QuestionType.MATCHING_IMAGE,
-            "Sort Answer": QuestionType.SORT_ANSWER,
-            "sort_answer": QuestionType.SORT_ANSWER,
-            "SORT_ANSWER": QuestionType.SORT_ANSWER
-        }
-        
         for row in result.fetchall():
             current_time = datetime.now(timezone.utc)
             
             # Map database question_type to enum
             db_question_type = row[3] or "SINGLE"
-            mapped_question_type = question_type_mapping.get(db_question_type, QuestionType.SINGLE)
+            mapped_question_type = QUESTION_TYPE_MAPPING.get(db_question_type, QuestionType.SINGLE)
             
             question_data = {
                 "id": row[0],
@@ -163,28 +143,34 @@ class QuestionRepository:
         
         return questions
 
+    @staticmethod
+    def get_answer_rows(session: Session, quiz_id: int) -> List[Row]:
+        """
+        (id, type label, question_text, points, answers, question_order) of a quiz's active
+        questions in question order. The type is read as its stored label (see QUESTION_TYPE_MAPPING).
+        """
+        statement = select(
+            Question.id, type_coerce(Question.type, String), Question.question_text,
+            Question.points, Question.answers, Question.question_order
+        ).where(Question.quiz_id == quiz_id, Question.active == True).order_by(
+            Question.question_order.is_(None), Question.question_order, Question.id
+        )
+        return list(session.exec(statement))
+
     @staticmethod
     def update_question(session: Session, question_id: int, question_update: QuestionUpdate) -> Optional[Question]:
-        db_question = session.get(Question, question_id)
-        if not db_question:
-            return None
-        
         update_data = question_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_question, field, value)
-        
-        session.add(db_question)
-        session.commit()
-        session.refresh(db_question)
-        return db_question
+        if not update_data:
+            return session.get(Question, question_id)
+
+        update_data.setdefault("updated_at", datetime.now(timezone.utc))
+        QuestionRepository._bump_quiz_version(session, QuestionRepository._quiz_of(question_id))
+        # One UPDATE ... RETURNING instead of SELECT + UPDATE + refresh SELECT
+        statement = update(Question).where(Question.id == question_id).values(**update_data).returning(Question)
+        return session.exec(statement).scalars().first()
 
     @staticmethod
     def delete_question(session: Session, question_id: int) -> bool:
-        db_question = session.get(Question, question_id)
-        if not db_question:
-            return False
-        
-        db_question.active = False
-        session.add(db_question)
-        session.commit()
-        return True 
\ No newline at end of file
+        QuestionRepository._bump_quiz_version(session, QuestionRepository._quiz_of(question_id))
+        statement = update(Question).where(Question.id == question_id).values(active=False, updated_at=datetime.now(timezone.utc))
+        return session.exec(statement).rowcount > 0 
\ No newline at end of file
@@ -0,0 +1,36 @@
+from sqlmodel import Session, select, update
+from cou_course.models.quiz_attempt import QuizAttempt
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+class QuizAttemptRepository:
+    @staticmethod
+    def create_attempt(session: Session, quiz_id: int, user_id: int, seed: int, question_ids: List[int],
+                       started_at: datetime) -> QuizAttempt:
+        attempt = QuizAttempt(quiz_id=quiz_id, user_id=user_id, seed=seed, question_ids=question_ids, started_at=started_at)
+        session.add(attempt)
+        session.flush()
+        return attempt
+
+    @staticmethod
+    def get_attempt(session: Session, attempt_id: int, quiz_id: int, user_id: int) -> Optional[QuizAttempt]:
+        """The learner's attempt at the quiz; None for another learner's or another quiz's attempt"""
+        statement = select(QuizAttempt).where(
+            QuizAttempt.id == attempt_id, QuizAttempt.quiz_id == quiz_id, QuizAttempt.user_id == user_id
+        )
+        return session.exec(statement).first()
+
+    @staticmethod
+    def finish_attempt(session: Session, attempt_id: int, submitted_at: datetime, answers: Dict[str, Any],
+                       result: Dict[str, Any]) -> bool:
+        """
+        Store the graded submission, once: a single conditional UPDATE, so of two concurrent
+        submissions of the same attempt only one is recorded. False if it was already submitted.
+        """
+        statement = update(QuizAttempt).where(
+            QuizAttempt.id == attempt_id, QuizAttempt.submitted_at.is_(None)
+        ).values(
+            submitted_at=submitted_at, answers=answers, score=result["score"], max_score=result["max_score"],
+            percent=result["percent"], passed=result["passed"], results=result["results"]
+        )
+        return session.execute(statement).rowcount > 0
@@ -1,6 +1,9 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
+from sqlalchemy import Row
 from cou_course.models.quiz import Quiz
+from cou_course.repositories.course_content_counter_repository import CourseContentCounterRepository, COUNTED_FIELDS
 from cou_course.schemas.quiz_schema import QuizCreate, QuizUpdate
+from datetime import datetime, timezone
 from typing import List, Optional
 
 class QuizRepository:
@@ -8,8 +11,9 @@ class QuizRepository:
     def create_quiz(session: Session, quiz: QuizCreate) -> Quiz:
         db_quiz = Quiz(**quiz.dict())
         session.add(db_quiz)
-        session.commit()
-        session.refresh(db_quiz)
+        session.flush()  # INSERT ... RETURNING id; committed by the request's unit of work
+        if db_quiz.active:
+            CourseContentCounterRepository.add(session, db_quiz.course_id, total_quizzes=1)
         return db_quiz
 
     @staticmethod
@@ -21,28 +25,43 @@ class QuizRepository:
         statement = select(Quiz).where(Quiz.course_id == course_id, Quiz.active == True)
         return list(session.exec(statement))
 
+    @staticmethod
+    def get_grading_settings(session: Session, quiz_id: int) -> Optional[Row]:
+        """
+        (updated_at, passing_grade_percent, max_questions, time_limit_minutes, questions_version)
+        of an active quiz, a primary key lookup - together they version the quiz's answer key.
+        None if the quiz does not exist or is inactive.
+        """
+        statement = select(
+            Quiz.updated_at, Quiz.passing_grade_percent, Quiz.max_questions, Quiz.time_limit_minutes,
+            Quiz.questions_version
+        ).where(Quiz.id == quiz_id, Quiz.active == True)
+        return session.exec(statement).first()
+
     @staticmethod
     def update_quiz(session: Session, quiz_id: int, quiz_update: QuizUpdate) -> Optional[Quiz]:
-        db_quiz = session.get(Quiz, quiz_id)
-        if not db_quiz:
-            return None
-        
         update_data = quiz_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_quiz, field, value)
-        
-        session.add(db_quiz)
-        session.commit()
-        session.refresh(db_quiz)
-        return db_quiz
+        if not update_data:
+            return session.get(Quiz, quiz_id)
+
+        # Moving or (de)activating the row changes the course content counters
+        before = CourseContentCounterRepository.get_state(session, Quiz, quiz_id) if COUNTED_FIELDS & update_data.keys() else None
+        update_data.setdefault("updated_at", datetime.now(timezone.utc))
+        # One UPDATE ... RETURNING instead of SELECT + UPDATE + refresh SELECT
+        statement = update(Quiz).where(Quiz.id == quiz_id).values(**update_data).returning(Quiz)
+        updated = session.exec(statement).scalars().first()
+        if before is not None and updated is not None:
+            CourseContentCounterRepository.move(session, Quiz, before, (updated.course_id, updated.active))
+        return updated
 
     @staticmethod
     def delete_quiz(session: Session, quiz_id: int) -> bool:
-        db_quiz = session.get(Quiz, quiz_id)
-        if not db_quiz:
-            return False
-        
-        db_quiz.active = False
-        session.add(db_quiz)
-        session.commit()
+        statement = update(Quiz).where(Quiz.id == quiz_id, Quiz.active == True).values(
+            active=False, updated_at=datetime.now(timezone.utc)
+        ).returning(Quiz.course_id)
+        course_id = session.exec(statement).scalars().first()
+        if course_id is None:
+            # Missing, or already deleted (which still counts as deleted)
+            return session.exec(select(Quiz.id).where(Quiz.id == quiz_id)).first() is not None
+        CourseContentCounterRepository.add(session, course_id, total_quizzes=-1)
         return True 
\ No newline at end of file
@@ -1,6 +1,8 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
 from cou_course.models.topic import Topic
+from cou_course.repositories.course_content_counter_repository import CourseContentCounterRepository, COUNTED_FIELDS
 from cou_course.schemas.topic_schema import TopicCreate, TopicUpdate
+from datetime import datetime, timezone
 from typing import List, Optional
 
 class TopicRepository:
@@ -8,8 +10,9 @@ class TopicRepository:
     def create_topic(session: Session, topic: TopicCreate) -> Topic:
         db_topic = Topic(**topic.dict())
         session.add(db_topic)
-        session.commit()
-        session.refresh(db_topic)
+        session.flush()  # INSERT ... RETURNING id; committed by the request's unit of work
+        if db_topic.active:
+            CourseContentCounterRepository.add(session, db_topic.course_id, total_topics=1)
         return db_topic
 
     @staticmethod
@@ -23,26 +26,28 @@ class TopicRepository:
 
     @staticmethod
     def update_topic(session: Session, topic_id: int, topic_update: TopicUpdate) -> Optional[Topic]:
-        db_topic = session.get(Topic, topic_id)
-        if not db_topic:
-            return None
-        
         update_data = topic_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_topic, field, value)
-        
-        session.add(db_topic)
-        session.commit()
-        session.refresh(db_topic)
-        return db_topic
+        if not update_data:
+            return session.get(Topic, topic_id)
+
+        # Moving or (de)activating the row changes the course content counters
+        before = CourseContentCounterRepository.get_state(session, Topic, topic_id) if COUNTED_FIELDS & update_data.keys() else None
+        update_data.setdefault("updated_at", datetime.now(timezone.utc))
+        # One UPDATE ... RETURNING instead of SELECT + UPDATE + refresh SELECT
+        statement = update(Topic).where(Topic.id == topic_id).values(**update_data).returning(Topic)
+        updated = session.exec(statement).scalars().first()
+        if before is not None and updated is not None:
+            CourseContentCounterRepository.move(session, Topic, before, (updated.course_id, updated.active))
+        return updated
 
     @staticmethod
     def delete_topic(session: Session, topic_id: int) -> bool:
-        db_topic = session.get(Topic, topic_id)
-        if not db_topic:
-            return False
-        
-        db_topic.active = False
-        session.add(db_topic)
-        session.commit()
+        statement = update(Topic).where(Topic.id == topic_id, Topic.active == True).values(
+            active=False, updated_at=datetime.now(timezone.utc)
+        ).returning(Topic.course_id)
+        course_id = session.exec(statement).scalars().first()
+        if course_id is None:
+            # Missing, or already deleted (which still counts as deleted)
+            return session.exec(select(Topic.id).where(Topic.id == topic_id)).first() is not None
+        CourseContentCounterRepository.add(session, course_id, total_topics=-1)
         return True 
\ No newline at end of file
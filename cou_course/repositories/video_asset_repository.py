@@ -0,0 +1,46 @@
+from sqlmodel import Session, select, insert, update
+from cou_course.models.video_asset import VideoAsset
+from cou_course.models.lesson import Lesson
+from typing import Any, Dict, List, Optional, Tuple
+
+class VideoAssetRepository:
+    @staticmethod
+    def list_videos(session: Session, lesson_id: Optional[int] = None, course_id: Optional[int] = None,
+                    cursor: Optional[int] = None, limit: int = 100) -> List[VideoAsset]:
+        """One page of active videos ordered by id; `cursor` is the last id of the previous page"""
+        statement = select(VideoAsset).where(VideoAsset.active == True)
+        if lesson_id is not None:
+            statement = statement.where(VideoAsset.lesson_id == lesson_id)
+        if course_id is not None:
+            statement = statement.where(VideoAsset.course_id == course_id)
+        if cursor is not None:
+            statement = statement.where(VideoAsset.id > cursor)
+        return list(session.exec(statement.order_by(VideoAsset.id).limit(limit)))
+
+    @staticmethod
+    def get_catalog(session: Session) -> Dict[str, VideoAsset]:
+        """Every catalog row (active or not) keyed by blob name"""
+        return {asset.name: asset for asset in session.exec(select(VideoAsset))}
+
+    @staticmethod
+    def get_lesson_links(session: Session) -> Dict[str, Tuple[int, int]]:
+        """Map of lesson video_path -> (lesson_id, course_id) for active lessons"""
+        statement = select(Lesson.video_path, Lesson.id, Lesson.course_id).where(
+            Lesson.video_path.is_not(None), Lesson.active == True
+        )
+        return {video_path: (lesson_id, course_id) for video_path, lesson_id, course_id in session.exec(statement)}
+
+    @staticmethod
+    def apply_changes(session: Session, inserts: List[Dict[str, Any]], updates: List[Dict[str, Any]],
+                      deactivate_ids: List[int]) -> None:
+        """Write a reconciliation diff with one batched statement per kind of change"""
+        if inserts:
+            session.execute(insert(VideoAsset), inserts)
+        if updates:
+            # Bulk UPDATE by primary key (executemany)
+            session.execute(update(VideoAsset), updates)
+        if deactivate_ids:
+            session.execute(
+                update(VideoAsset).where(VideoAsset.id.in_(deactivate_ids)).values(active=False),
+                execution_options={"synchronize_session": False}
+            )
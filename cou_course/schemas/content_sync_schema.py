@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+class ContentChanges(BaseModel):
+    course_id: int
+    since: Optional[str] = None
+    watermark: str  # Opaque; pass as `since` on the next sync
+    changes: Dict[str, List[Dict[str, Any]]]  # Kind -> changed active rows
+    deleted: Dict[str, List[int]]  # Kind -> ids of deactivated rows (tombstones)
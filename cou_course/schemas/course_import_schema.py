@@ -0,0 +1,79 @@
+from typing import Optional, Dict, Any, Union, List
+from pydantic import BaseModel, Field
+from cou_course.models.question import QuestionType
+
+# Nested course content document for the bulk import endpoint. Parent ids are not
+# part of the document; they are resolved while inserting.
+
+class QuestionImport(BaseModel):
+    type: QuestionType = QuestionType.SINGLE
+    question_text: str = Field(..., min_length=1)
+    points: int = Field(default=1, ge=1)
+    answers: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None
+    question_order: Optional[int] = None  # Defaults to the position in the list
+
+class QuizImport(BaseModel):
+    title: str = Field(..., min_length=1, max_length=500)
+    description: Optional[str] = None
+    time_limit_minutes: Optional[int] = Field(None, ge=1)
+    max_questions: Optional[int] = Field(None, ge=1)
+    passing_grade_percent: Optional[int] = Field(None, ge=0, le=100)
+    questions: List[QuestionImport] = []
+
+class LessonImport(BaseModel):
+    title: str = Field(..., min_length=1, max_length=500)
+    content: Optional[str] = None
+    video_source: Optional[str] = None
+    video_path: Optional[str] = None
+    video_filename: Optional[str] = None
+    image_path: Optional[str] = None
+    code: Optional[str] = None
+    code_language: Optional[str] = None
+    code_output: Optional[str] = None
+
+class FlashcardImport(BaseModel):
+    flashcard_set_id: int
+    front: str = Field(..., min_length=1)
+    back: str = Field(..., min_length=1)
+    clue: Optional[str] = None
+    card_order: Optional[int] = None  # Defaults to the position in the list
+
+class MindmapImport(BaseModel):
+    mindmap_mermaid: Optional[str] = None
+    mindmap_json: Optional[Union[Dict[str, Any], List[Any], str]] = None
+
+class MemoryGamePairImport(BaseModel):
+    term: str = Field(..., min_length=1)
+    term_description: str = Field(..., min_length=1)
+    pair_order: Optional[int] = None  # Defaults to the position in the list
+
+class MemoryGameImport(BaseModel):
+    description: str = Field(..., min_length=1)
+    pairs: List[MemoryGamePairImport] = []
+
+class TopicImport(BaseModel):
+    title: str = Field(..., min_length=1, max_length=500)
+    topic_order: Optional[int] = None  # Defaults to the position in the document
+    image_path: Optional[str] = None
+    is_expanded: bool = False
+    lessons: List[LessonImport] = []
+    quizzes: List[QuizImport] = []
+    flashcards: List[FlashcardImport] = []
+    mindmaps: List[MindmapImport] = []
+    memory_games: List[MemoryGameImport] = []
+
+class CourseContentImport(BaseModel):
+    created_by: int
+    topics: List[TopicImport] = Field(..., min_length=1)
+
+class CourseContentImportResult(BaseModel):
+    course_id: int
+    topic_ids: List[int]
+    total_topics: int
+    total_lessons: int
+    total_quizzes: int
+    total_questions: int
+    total_flashcards: int
+    total_mindmaps: int
+    total_memory_games: int
+    total_memory_game_pairs: int
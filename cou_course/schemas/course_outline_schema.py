@@ -0,0 +1,24 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from cou_course.schemas.lesson_order_schema import ComponentType
+
+class OutlineComponent(BaseModel):
+    order_id: Optional[int] = None  # LessonOrder id; None for components not placed in the sequence
+    component_type: ComponentType
+    ref_id: int
+    title: Optional[str] = None
+    sort_order: Optional[int] = None
+    item_count: Optional[int] = None  # Cards in a flashcard set
+
+class OutlineTopic(BaseModel):
+    id: int
+    title: str
+    topic_order: Optional[int] = None
+    image_path: Optional[str] = None
+    is_expanded: bool = False
+    components: List[OutlineComponent]
+
+class CourseOutlineRead(BaseModel):
+    course_id: int
+    version: str
+    topics: List[OutlineTopic]
@@ -0,0 +1,12 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class RatingSubmit(BaseModel):
+    rating: int = Field(..., ge=1, le=5)
+    review: Optional[str] = None
+
+class CourseRatingSummary(BaseModel):
+    course_id: int
+    rating_average: Optional[float] = None
+    rating_count: int
+    user_rating: Optional[int] = None  # The learner's rating after this request
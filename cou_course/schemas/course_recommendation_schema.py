@@ -0,0 +1,4 @@
+from cou_course.schemas.course_schema import CourseRead
+
+class RelatedCourseRead(CourseRead):
+    score: float  # Cosine similarity of the course features, 0-1
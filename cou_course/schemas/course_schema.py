@@ -50,12 +50,23 @@ class CourseRead(CourseBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    rating_average: Optional[float] = None
+    rating_count: Optional[int] = 0
     instructor: Optional[InstructorInfo] = None
 
     class Config:
         from_attributes = True
 
 
+class CatalogCourseRead(CourseRead):
+    """A course card from the course catalog"""
+    category_name: Optional[str] = None
+    subcategory_name: Optional[str] = None
+    total_enrollments: int = 0
+    topic_count: int = 0
+    lesson_count: int = 0
+
+
 class SubcategorySummary(BaseModel):
     id: int
     name: str
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+class EnrollmentRead(BaseModel):
+    course_id: int
+    user_id: int
+    enrolled: bool
+    changed: bool  # False when the request did not change the enrollment (already enrolled)
+    total_enrollments: int
+
+class EnrollmentCount(BaseModel):
+    course_id: int
+    total_enrollments: int
@@ -0,0 +1,38 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+class CardReview(BaseModel):
+    flashcard_id: int
+    grade: int = Field(..., ge=0, le=5)  # SM-2 grade: 0 blackout .. 5 perfect recall
+    reviewed_at: Optional[datetime] = None  # Defaults to now; lets offline clients replay reviews
+
+class ReviewBatch(BaseModel):
+    reviews: List[CardReview] = Field(..., min_length=1, max_length=500)
+
+class CardSchedule(BaseModel):
+    flashcard_id: int
+    ease_factor: float
+    interval_days: int
+    repetitions: int
+    lapses: int
+    due_at: datetime
+    last_reviewed_at: datetime
+
+class ReviewBatchResult(BaseModel):
+    user_id: int
+    schedules: List[CardSchedule]
+
+class ReviewCard(BaseModel):
+    flashcard_id: int
+    front: str
+    back: str
+    clue: Optional[str] = None
+    due_at: Optional[datetime] = None  # None for cards never reviewed
+    interval_days: Optional[int] = None
+
+class DueCardsRead(BaseModel):
+    user_id: int
+    course_id: Optional[int] = None
+    due: List[ReviewCard]
+    new: List[ReviewCard]
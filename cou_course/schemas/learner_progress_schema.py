@@ -0,0 +1,20 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+class ProgressUpdate(BaseModel):
+    completed: List[int] = Field(default_factory=list)  # LessonOrder ids to mark as completed
+    uncompleted: List[int] = Field(default_factory=list)  # LessonOrder ids to mark as not completed
+
+class CourseProgressSummary(BaseModel):
+    course_id: int
+    completed_count: int
+    total_components: int
+    completion_percentage: float
+
+class CourseProgressRead(CourseProgressSummary):
+    user_id: int
+    completed_order_ids: List[int]
+
+class LearnerProgressRead(BaseModel):
+    user_id: int
+    courses: List[CourseProgressSummary]
@@ -1,9 +1,9 @@
-from typing import Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 from datetime import datetime
 from pydantic import BaseModel, Field
 
 # Define valid component types
-ComponentType = Literal['flashcards', 'mindmap', 'quiz', 'memory_game']
+ComponentType = Literal['lesson', 'flashcards', 'mindmap', 'quiz', 'memory_game']
 
 class LessonOrderBase(BaseModel):
     course_id: int
@@ -31,4 +31,17 @@ class LessonOrderRead(LessonOrderBase):
     updated_by: Optional[int] = None
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+class SequenceComponent(BaseModel):
+    order_id: int  # LessonOrder id, used as the position in the course sequence
+    topic_id: int
+    component_type: ComponentType
+    ref_id: int
+    sort_order: Optional[int] = None
+    content: Optional[Dict[str, Any]] = None  # None if the referenced item is missing or inactive
+
+class ComponentSequenceRead(BaseModel):
+    course_id: int
+    components: List[SequenceComponent]
+    next_after: Optional[int] = None  # Pass as `after` to prefetch the following components
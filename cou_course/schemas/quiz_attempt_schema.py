@@ -0,0 +1,49 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+from cou_course.models.question import QuestionType
+
+class AttemptQuestion(BaseModel):
+    id: int
+    type: QuestionType
+    question_text: str
+    points: int
+    question_order: Optional[int] = None
+    answers: Any = None  # Options / blanks / items to arrange, without the answer key
+
+class AttemptQuestions(BaseModel):
+    attempt_id: int  # Submit the answers to this attempt
+    quiz_id: int
+    started_at: datetime
+    time_limit_minutes: Optional[int] = None
+    expires_at: Optional[datetime] = None  # Submissions after this (plus a short grace) are rejected
+    questions: List[AttemptQuestion]
+
+class QuizSubmission(BaseModel):
+    answers: Dict[int, Any] = Field(default_factory=dict)  # question id -> submitted answer
+
+class QuestionResult(BaseModel):
+    question_id: int
+    correct: Optional[bool] = None  # None for manually graded questions
+    points_awarded: int
+
+class QuizAttemptResult(BaseModel):
+    attempt_id: int
+    quiz_id: int
+    user_id: int
+    started_at: datetime
+    submitted_at: datetime
+    score: int
+    max_score: int
+    percent: float
+    passed: Optional[bool] = None  # None when the quiz has no passing grade
+    results: List[QuestionResult]
+
+class QuizAttemptRead(AttemptQuestions):
+    # Set once the attempt is submitted (final); None while it is in progress
+    submitted_at: Optional[datetime] = None
+    score: Optional[int] = None
+    max_score: Optional[int] = None
+    percent: Optional[float] = None
+    passed: Optional[bool] = None
+    results: Optional[List[QuestionResult]] = None
@@ -0,0 +1,49 @@
+import os
+import logging
+from typing import Any, Dict
+from cou_course.services.course_ratings import course_rating_reconciler
+from cou_course.services.enrollments import enrollment_counter_rollup, enrollment_counter_recount
+from cou_course.services.course_recommendations import course_recommendation_job
+from cou_course.services.course_catalog import course_catalog_refresher
+from cou_course.services.course_content_counters import course_content_counter_repair
+from cou_course.services.video_catalog import video_catalog_reconciler
+
+logger = logging.getLogger(__name__)
+
+# Serverless deployments (Vercel sets VERCEL=1) freeze the process between requests, so
+# the lifespan does not start the job loops there; the cron endpoint runs due jobs instead
+BACKGROUND_JOBS_ENABLED = os.getenv("BACKGROUND_JOBS_ENABLED", "false" if os.getenv("VERCEL") else "true").lower() == "true"
+# Bearer token the cron endpoint requires (Vercel Cron sends CRON_SECRET this way)
+CRON_SECRET = os.getenv("CRON_SECRET")
+
+BACKGROUND_JOBS = (
+    course_rating_reconciler,
+    enrollment_counter_rollup,
+    enrollment_counter_recount,
+    course_recommendation_job,
+    course_catalog_refresher,
+    course_content_counter_repair,
+    video_catalog_reconciler,
+)
+
+def start_background_jobs() -> None:
+    if not BACKGROUND_JOBS_ENABLED:
+        logger.info("Background jobs disabled; run them through the cron endpoint")
+        return
+    for job in BACKGROUND_JOBS:
+        job.start()
+
+async def stop_background_jobs() -> None:
+    for job in reversed(BACKGROUND_JOBS):
+        await job.stop()
+
+async def run_due_jobs() -> Dict[str, Any]:
+    """Run every job that is due, one after another; the result per job name (None when skipped)"""
+    results: Dict[str, Any] = {}
+    for job in BACKGROUND_JOBS:
+        try:
+            results[job.name] = await job.run_if_due()
+        except Exception as e:
+            logger.warning(f"Periodic job {job.name} failed: {str(e)}")
+            results[job.name] = {"error": str(e)}
+    return results
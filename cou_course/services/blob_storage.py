@@ -0,0 +1,200 @@
+import os
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from cou_course.services.local_storage import LocalFileStorage, LOCAL_VIDEO_ROOT, STREAM_CHUNK_SIZE
+from cou_course.services.sas_signing import SasUrlSigner
+from cou_course.services.storage_backend import StorageBackend, VIDEO_STORAGE_BACKEND
+
+logger = logging.getLogger(__name__)
+
+AZURE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+CONTAINER_NAME = "lessons"
+
+class BlobStorage:
+    """
+    Async access to the lessons container. One instance (and its HTTP connection
+    pool) is shared by all requests; it is created and closed by the app lifespan.
+
+    Works with any container client exposing the `azure.storage.blob.aio.ContainerClient`
+    methods used here, e.g. one pointed at Azurite.
+    """
+
+    source = "azure"  # Recorded as Lesson.video_source for uploads
+
+    def __init__(self, container_client: Any, service_client: Any = None, signer: Optional[SasUrlSigner] = None):
+        self.container_client = container_client
+        self.service_client = service_client
+        self.signer = signer
+
+    def url(self, blob_name: str) -> str:
+        """Public URL of a blob in the container"""
+        return f"{self.container_client.url}/{blob_name}"
+
+    def signed_url(self, blob_name: str) -> str:
+        """URL with a read SAS token (plain URL when no account key is available)"""
+        return self.signed_urls([blob_name])[0]
+
+    def signed_urls(self, blob_names: List[str]) -> List[str]:
+        """Signed URLs for many blobs, minted locally in one batch"""
+        if not self.signer:
+            return [self.url(blob_name) for blob_name in blob_names]
+        tokens = self.signer.tokens(blob_names)
+        return [f"{self.url(blob_name)}?{tokens[blob_name]}" for blob_name in blob_names]
+
+    async def get_properties(self, blob_name: str) -> Optional[Any]:
+        """Blob properties in a single request, or None if the blob does not exist"""
+        from azure.core.exceptions import ResourceNotFoundError
+
+        blob_client = self.container_client.get_blob_client(blob_name)
+        try:
+            return await blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+
+    def list_blobs(self, name_starts_with: Optional[str] = None) -> AsyncIterator[Any]:
+        return self.container_client.list_blobs(name_starts_with=name_starts_with)
+
+    async def list_prefixes(self, name_starts_with: Optional[str] = None) -> AsyncIterator[str]:
+        """Names of the virtual folders directly under `name_starts_with` (one listing entry per folder)"""
+        async for item in self.container_client.walk_blobs(name_starts_with=name_starts_with, delimiter="/"):
+            # walk_blobs yields BlobPrefix entries for folders and BlobProperties for plain blobs
+            if item.name.endswith("/"):
+                yield item.name
+
+    async def list_folder(self, name_starts_with: Optional[str] = None) -> AsyncIterator[Any]:
+        """Blobs directly under `name_starts_with`; deeper folders are not listed"""
+        async for item in self.container_client.walk_blobs(name_starts_with=name_starts_with, delimiter="/"):
+            if not item.name.endswith("/"):
+                yield item
+
+    async def download(self, blob_name: str) -> Optional[Tuple[bytes, str]]:
+        """Whole blob content and its ETag (for small files such as playlists), or None if missing"""
+        from azure.core.exceptions import ResourceNotFoundError
+
+        blob_client = self.container_client.get_blob_client(blob_name)
+        try:
+            downloader = await blob_client.download_blob()
+            return await downloader.readall(), downloader.properties.etag
+        except ResourceNotFoundError:
+            return None
+
+    async def open_range(self, blob_name: str, offset: int, length: int) -> AsyncIterator[bytes]:
+        """
+        Yield `length` bytes starting at `offset`. The client is configured so every
+        ranged GET is at most STREAM_CHUNK_SIZE, and the next one is only issued once
+        the previous chunk has been consumed.
+        """
+        blob_client = self.container_client.get_blob_client(blob_name)
+        downloader = await blob_client.download_blob(offset=offset, length=length)
+        async for chunk in downloader.chunks():
+            yield chunk
+
+    async def put(self, blob_name: str, data: bytes, content_type: Optional[str] = None) -> str:
+        """Create or replace a small blob in one request; returns the new ETag"""
+        from azure.storage.blob import ContentSettings
+
+        blob_client = self.container_client.get_blob_client(blob_name)
+        result = await blob_client.upload_blob(
+            data,
+            overwrite=True,
+            content_settings=ContentSettings(content_type=content_type) if content_type else None
+        )
+        return result["etag"]
+
+    async def get_staged_blocks(self, blob_name: str) -> Dict[str, int]:
+        """Uncommitted block ids (and their sizes) of a blob being uploaded"""
+        from azure.core.exceptions import ResourceNotFoundError
+
+        blob_client = self.container_client.get_blob_client(blob_name)
+        try:
+            _, uncommitted = await blob_client.get_block_list("uncommitted")
+        except ResourceNotFoundError:
+            return {}
+        return {block.id: block.size for block in uncommitted}
+
+    async def stage_block(self, blob_name: str, block_id: str, data: bytes) -> None:
+        blob_client = self.container_client.get_blob_client(blob_name)
+        await blob_client.stage_block(block_id, data, length=len(data))
+
+    async def commit_blocks(self, blob_name: str, block_ids: List[str], content_type: Optional[str] = None) -> None:
+        """Make the staged blocks the blob content; readers see the old blob or the new one, never a mix"""
+        from azure.storage.blob import BlobBlock, ContentSettings
+
+        blob_client = self.container_client.get_blob_client(blob_name)
+        await blob_client.commit_block_list(
+            [BlobBlock(block_id=block_id) for block_id in block_ids],
+            content_settings=ContentSettings(content_type=content_type) if content_type else None
+        )
+
+    async def close(self) -> None:
+        await self.container_client.close()
+        if self.service_client is not None:
+            await self.service_client.close()
+
+blob_storage: Optional[StorageBackend] = None
+
+async def init_blob_storage(connection_string: Optional[str] = AZURE_CONNECTION_STRING,
+                            container_name: str = CONTAINER_NAME,
+                            backend: str = VIDEO_STORAGE_BACKEND,
+                            local_root: Optional[str] = LOCAL_VIDEO_ROOT) -> Optional[StorageBackend]:
+    """
+    Create the shared storage backend selected by VIDEO_STORAGE_BACKEND. Video features
+    stay disabled (with a warning) if the selected backend is not configured or reachable.
+    """
+    global blob_storage
+
+    if backend == "local" or (backend == "auto" and not connection_string and local_root):
+        if not local_root or not os.path.isdir(local_root):
+            logger.warning(f"LOCAL_VIDEO_ROOT '{local_root}' is not a directory, video features will be disabled")
+            return None
+        logger.info(f"Serving videos from local directory {local_root}")
+        blob_storage = LocalFileStorage(local_root)
+        return blob_storage
+    if backend not in ("azure", "auto"):
+        logger.warning(f"Unknown VIDEO_STORAGE_BACKEND '{backend}', video features will be disabled")
+        return None
+    if not connection_string:
+        logger.warning("AZURE_STORAGE_CONNECTION_STRING not set, Azure features will be disabled")
+        return None
+
+    try:
+        from azure.storage.blob.aio import BlobServiceClient
+    except ImportError as e:
+        logger.warning(f"Azure modules not available: {e}")
+        return None
+
+    # Small single/chunk GET sizes keep memory per video stream bounded
+    service_client = BlobServiceClient.from_connection_string(
+        connection_string,
+        max_single_get_size=STREAM_CHUNK_SIZE,
+        max_chunk_get_size=STREAM_CHUNK_SIZE
+    )
+    container_client = service_client.get_container_client(container_name)
+    try:
+        if not await container_client.exists():
+            logger.warning(f"Container '{container_name}' does not exist in Azure Storage")
+            await container_client.close()
+            await service_client.close()
+            return None
+    except Exception as e:
+        logger.warning(f"Failed to initialize Azure Blob Service Client: {str(e)}")
+        await container_client.close()
+        await service_client.close()
+        return None
+
+    # SAS tokens need the account key; connection strings with a SAS or no key get plain URLs
+    account_key = getattr(service_client.credential, "account_key", None)
+    signer = SasUrlSigner(service_client.account_name, account_key, container_name) if account_key else None
+    blob_storage = BlobStorage(container_client, service_client, signer)
+    logger.info("Azure Blob Service Client initialized successfully")
+    return blob_storage
+
+async def close_blob_storage() -> None:
+    global blob_storage
+    if blob_storage is not None:
+        await blob_storage.close()
+        blob_storage = None
+
+def get_blob_storage() -> Optional[StorageBackend]:
+    """FastAPI dependency returning the shared storage backend, or None when video storage is disabled"""
+    return blob_storage
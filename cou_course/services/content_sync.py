@@ -0,0 +1,39 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from sqlmodel import Session
+from cou_course.repositories.content_sync_repository import ContentSyncRepository
+
+# Without transaction ids (SQLite in tests) the watermark is an updated_at time: changes
+# newer than this are left for the next sync, so rows written by transactions still in
+# flight (updated_at is set before commit) are usually not skipped. Postgres does not
+# rely on it - its watermark is commit-safe.
+CONTENT_SYNC_SETTLE_SECONDS = float(os.getenv("CONTENT_SYNC_SETTLE_SECONDS", "2"))
+
+def get_changes(session: Session, course_id: int, since: Optional[str]) -> Dict[str, Any]:
+    """
+    Content changes of a course after the `since` watermark (a full snapshot without
+    one), with the watermark to send next time. Watermarks are opaque to clients; an
+    unreadable one raises ValueError.
+
+    On Postgres the watermark is the oldest transaction id that may still be in flight
+    when the sync starts, and rows are matched by the id of the transaction that last
+    wrote them. A transaction that commits after the sync read its rows has an id at or
+    above the watermark, so the next sync returns its rows: nothing is skipped however
+    long it ran, and a row may come twice (clients upsert by id).
+    """
+    if ContentSyncRepository.tracks_transactions(session):
+        # Taken before the rows are read: whatever is not visible yet is at or above it
+        watermark = ContentSyncRepository.get_xid_watermark(session)
+        after = int(since) if since is not None else None
+        changes, deleted = ContentSyncRepository.get_changes(session, course_id, after)
+        return {"course_id": course_id, "since": since, "watermark": str(watermark), "changes": changes, "deleted": deleted}
+
+    after = datetime.fromisoformat(since) if since is not None else None
+    if after is not None and after.tzinfo is None:
+        after = after.replace(tzinfo=timezone.utc)
+    until = datetime.now(timezone.utc) - timedelta(seconds=CONTENT_SYNC_SETTLE_SECONDS)
+    if after is not None and after >= until:
+        until = after  # Nothing has settled since the last sync
+    changes, deleted = ContentSyncRepository.get_changes(session, course_id, after, until)
+    return {"course_id": course_id, "since": since, "watermark": until.isoformat(), "changes": changes, "deleted": deleted}
@@ -0,0 +1,64 @@
+import os
+import logging
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from common.database import new_session
+from cou_course.models.course import Course
+from cou_course.models.coursecategory import CourseCategory
+from cou_course.models.coursesubcategory import CourseSubcategory
+from cou_course.repositories.course_catalog_repository import CourseCatalogRepository
+from cou_course.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+COURSE_CATALOG_REFRESH_SECONDS = int(os.getenv("COURSE_CATALOG_REFRESH_SECONDS", "300"))
+# How long after a course write the catalog is refreshed (writes in between share one refresh)
+COURSE_CATALOG_WRITE_DELAY_SECONDS = int(os.getenv("COURSE_CATALOG_WRITE_DELAY_SECONDS", "15"))
+
+# ORM writes to these models schedule an early refresh; counters updated in bulk
+# (ratings, enrollments) and instructor profiles wait for the periodic one
+CATALOG_SOURCES = (Course, CourseCategory, CourseSubcategory)
+
+class CourseCatalogRefresher(PeriodicJob):
+    """
+    Keeps the cou_course.course_catalog materialized view fresh: a concurrent refresh
+    every `COURSE_CATALOG_REFRESH_SECONDS`, and within `COURSE_CATALOG_WRITE_DELAY_SECONDS`
+    of a course write committed by this worker. Readers are never blocked by a refresh.
+    """
+
+    name = "course_catalog_refresh"
+
+    def __init__(self, session_factory=new_session,
+                 interval_seconds: int = COURSE_CATALOG_REFRESH_SECONDS,
+                 check_seconds: int = COURSE_CATALOG_WRITE_DELAY_SECONDS):
+        super().__init__(interval_seconds, session_factory, check_seconds)
+        self.dirty = False
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+
+    def pending(self) -> bool:
+        return self.dirty
+
+    def run_now(self) -> bool:
+        self.dirty = False
+        with self.session_factory() as session:
+            refreshed = CourseCatalogRepository.refresh(session)
+            session.commit()
+        return refreshed
+
+course_catalog_refresher = CourseCatalogRefresher()
+
+@event.listens_for(OrmSession, "after_flush")
+def _note_catalog_writes(session, _flush_context):
+    if any(isinstance(obj, CATALOG_SOURCES) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["course_catalog_dirty"] = True
+
+@event.listens_for(OrmSession, "after_commit")
+def _schedule_catalog_refresh(session):
+    if session.info.pop("course_catalog_dirty", False):
+        course_catalog_refresher.mark_dirty()
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_catalog_writes(session):
+    session.info.pop("course_catalog_dirty", None)
@@ -0,0 +1,35 @@
+import os
+import logging
+from typing import Optional
+from common.database import new_session
+from cou_course.repositories.course_content_counter_repository import CourseContentCounterRepository
+from cou_course.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+COURSE_CONTENT_COUNTER_REPAIR_SECONDS = int(os.getenv("COURSE_CONTENT_COUNTER_REPAIR_SECONDS", "21600"))
+
+class CourseContentCounterRepair(PeriodicJob):
+    """
+    Recounts every course's content counters from the content tables, correcting
+    rows that drifted (bulk SQL edits, or two first writes to a course racing).
+    Runs every `COURSE_CONTENT_COUNTER_REPAIR_SECONDS`.
+    """
+
+    name = "course_content_counter_repair"
+
+    def __init__(self, session_factory=new_session,
+                 interval_seconds: int = COURSE_CONTENT_COUNTER_REPAIR_SECONDS):
+        super().__init__(interval_seconds, session_factory)
+        self.last_fixed: Optional[int] = None
+
+    def run_now(self) -> int:
+        with self.session_factory() as session:
+            fixed = CourseContentCounterRepository.recount(session)
+            session.commit()
+        self.last_fixed = fixed
+        if fixed:
+            logger.warning(f"Course content counters repaired for {fixed} courses")
+        return fixed
+
+course_content_counter_repair = CourseContentCounterRepair()
@@ -0,0 +1,107 @@
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List
+from sqlmodel import Session
+from cou_course.models.lesson_order import ComponentType
+from cou_course.repositories.course_outline_repository import CourseOutlineRepository
+from cou_course.schemas.course_outline_schema import CourseOutlineRead, OutlineComponent, OutlineTopic
+
+logger = logging.getLogger(__name__)
+
+_TYPE_RANK = {component_type: rank for rank, component_type in enumerate(ComponentType)}
+
+def build_outline(session: Session, course_id: int, version: str) -> CourseOutlineRead:
+    """
+    Topic tree of a course from a fixed number of queries (topics, LessonOrder and one
+    per component table). Components listed in LessonOrder come first in sort_order;
+    components not yet placed follow, grouped by type.
+    """
+    topics = CourseOutlineRepository.get_topics(session, course_id)
+    orders = CourseOutlineRepository.get_orders(session, course_id)
+    summaries = CourseOutlineRepository.get_component_summaries(session, course_id)
+
+    children: Dict[int, List[OutlineComponent]] = {topic.id: [] for topic in topics}
+    placed = set()
+    for order_id, topic_id, component_type, ref_id, sort_order in orders:
+        key = (component_type, ref_id)
+        if key not in summaries or topic_id not in children or key in placed:
+            continue
+        placed.add(key)
+        _, title, item_count = summaries[key]
+        children[topic_id].append(OutlineComponent(
+            order_id=order_id, component_type=component_type.value, ref_id=ref_id,
+            title=title, sort_order=sort_order, item_count=item_count
+        ))
+
+    unplaced = sorted((key for key in summaries if key not in placed), key=lambda key: (_TYPE_RANK[key[0]], key[1]))
+    for component_type, ref_id in unplaced:
+        topic_id, title, item_count = summaries[(component_type, ref_id)]
+        if topic_id in children:
+            children[topic_id].append(OutlineComponent(
+                component_type=component_type.value, ref_id=ref_id, title=title, item_count=item_count
+            ))
+
+    return CourseOutlineRead(
+        course_id=course_id,
+        version=version,
+        topics=[
+            OutlineTopic(
+                id=topic.id, title=topic.title, topic_order=topic.topic_order,
+                image_path=topic.image_path, is_expanded=topic.is_expanded,
+                components=children[topic.id]
+            )
+            for topic in topics
+        ]
+    )
+
+@dataclass
+class CachedOutline:
+    outline: CourseOutlineRead
+    body: bytes  # Serialized once, so cache hits skip response validation and encoding
+
+    @property
+    def version(self) -> str:
+        return self.outline.version
+
+class CourseOutlineCache:
+    """
+    Built and serialized outlines per course, reused while the course version (one
+    aggregate query) is unchanged. Bounded LRU, safe to share between worker threads.
+    """
+
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self._outlines: "OrderedDict[int, CachedOutline]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, session: Session, course_id: int) -> CachedOutline:
+        version = CourseOutlineRepository.get_version(session, course_id)
+        with self._lock:
+            cached = self._outlines.get(course_id)
+            if cached and cached.version == version:
+                self._outlines.move_to_end(course_id)
+                self.hits += 1
+                return cached
+
+        outline = build_outline(session, course_id, version)
+        cached = CachedOutline(outline, outline.model_dump_json().encode())
+        with self._lock:
+            self._outlines[course_id] = cached
+            self._outlines.move_to_end(course_id)
+            while len(self._outlines) > self.max_entries:
+                self._outlines.popitem(last=False)
+            self.builds += 1
+        return cached
+
+    def stats(self) -> dict:
+        return {"entries": len(self._outlines), "hits": self.hits, "builds": self.builds}
+
+course_outline_cache = CourseOutlineCache()
+
+def get_course_outline_cache() -> CourseOutlineCache:
+    """FastAPI dependency returning the shared outline cache"""
+    return course_outline_cache
@@ -0,0 +1,65 @@
+import os
+import logging
+from typing import Any, Dict, Optional
+from sqlmodel import Session
+from common.database import new_session
+from cou_course.repositories.course_repository import CourseRepository
+from cou_course.repositories.course_rating_repository import CourseRatingRepository
+from cou_course.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+COURSE_RATING_RECONCILE_SECONDS = int(os.getenv("COURSE_RATING_RECONCILE_SECONDS", "3600"))
+
+def _summary(course_id: int, aggregates, user_rating: Optional[int]) -> Dict[str, Any]:
+    rating_average, rating_count = aggregates
+    return {
+        "course_id": course_id,
+        "rating_average": round(rating_average, 2) if rating_average is not None else None,
+        "rating_count": rating_count,
+        "user_rating": user_rating,
+    }
+
+def submit_rating(session: Session, course_id: int, user_id: int, rating: int, review: Optional[str]) -> Dict[str, Any]:
+    """
+    Store a learner's rating and fold the change into the course's running sum and
+    count: O(1) per submission, whatever the number of ratings. Unknown courses raise KeyError.
+    """
+    if not CourseRepository.course_exists(session, course_id):
+        raise KeyError(course_id)
+    sum_delta, count_delta = CourseRatingRepository.upsert_rating(session, user_id, course_id, rating, review)
+    aggregates = CourseRatingRepository.apply_to_course(session, course_id, sum_delta, count_delta)
+    return _summary(course_id, aggregates, rating)
+
+def remove_rating(session: Session, course_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+    """Withdraw a learner's rating; None if they had not rated the course"""
+    previous = CourseRatingRepository.delete_rating(session, user_id, course_id)
+    if previous is None:
+        return None
+    aggregates = CourseRatingRepository.apply_to_course(session, course_id, -previous, -1)
+    return _summary(course_id, aggregates, None)
+
+class CourseRatingReconciler(PeriodicJob):
+    """
+    Periodically recomputes the course rating aggregates from the ratings table, so
+    a missed or manual change cannot leave a course's average wrong for long. Only
+    courses whose sum or count drifted are written.
+    """
+
+    name = "course_rating_reconcile"
+
+    def __init__(self, session_factory=new_session,
+                 interval_seconds: int = COURSE_RATING_RECONCILE_SECONDS):
+        super().__init__(interval_seconds, session_factory)
+        self.last_fixed: Optional[int] = None
+
+    def run_now(self) -> int:
+        with self.session_factory() as session:
+            fixed = CourseRatingRepository.reconcile(session)
+            session.commit()
+        self.last_fixed = fixed
+        if fixed:
+            logger.warning(f"Course rating aggregates reconciled for {fixed} courses")
+        return fixed
+
+course_rating_reconciler = CourseRatingReconciler()
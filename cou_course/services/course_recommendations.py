@@ -0,0 +1,145 @@
+import os
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlmodel import Session
+from common.database import new_session
+from cou_course.repositories.course_recommendation_repository import CourseRecommendationRepository
+from cou_course.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+COURSE_RECOMMENDATIONS_K = int(os.getenv("COURSE_RECOMMENDATIONS_K", "20"))
+COURSE_RECOMMENDATION_SECONDS = int(os.getenv("COURSE_RECOMMENDATION_SECONDS", "86400"))
+
+# Each categorical feature is one-hot encoded with this weight, which is its
+# contribution to the dot product of two courses that share the value.
+FEATURE_WEIGHTS = {
+    "subcategory_id": 3.0,
+    "category_id": 2.0,
+    "Course_level": 1.0,
+    "course_type_id": 0.5,
+    "language_id": 1.0,
+    "IT": 0.5,
+    "Coding_Required": 0.5,
+    "price_band": 1.0,
+}
+# Upper bounds of the price bands (free, up to 20, 50, 100, 200, more)
+PRICE_BANDS = np.array([0.0, 20.0, 50.0, 100.0, 200.0])
+# Similarity scores held in memory at once: rows per batch * courses
+BATCH_CELLS = 1 << 24
+
+def _feature_values(rows: Sequence[Any], name: str) -> List[Any]:
+    if name == "price_band":
+        prices = np.array([row.price if row.price is not None else np.nan for row in rows], dtype=np.float64)
+        bands = np.searchsorted(PRICE_BANDS, prices, side="left")
+        return [None if np.isnan(price) else int(band) for price, band in zip(prices, bands)]
+    return [getattr(row, name) for row in rows]
+
+def build_features(rows: Sequence[Any]) -> np.ndarray:
+    """
+    L2-normalized float32 feature matrix, one row per course: the weighted one-hot
+    blocks of FEATURE_WEIGHTS side by side. Missing values leave their block empty.
+    """
+    n = len(rows)
+    blocks = []
+    for name, weight in FEATURE_WEIGHTS.items():
+        index: Dict[Any, int] = {}
+        codes = np.fromiter(
+            (index.setdefault(value, len(index)) if value is not None else -1 for value in _feature_values(rows, name)),
+            dtype=np.int64, count=n
+        )
+        block = np.zeros((n, len(index)), dtype=np.float32)
+        present = np.nonzero(codes >= 0)[0]
+        block[present, codes[present]] = np.sqrt(weight)
+        blocks.append(block)
+
+    features = np.hstack(blocks) if blocks else np.zeros((n, 0), dtype=np.float32)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return features / norms
+
+def top_k(features: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The k most cosine-similar other rows of every row: (neighbour indices, scores),
+    both (n, k) and best first. Similarities are computed a batch of rows at a
+    time as one matrix product against the whole matrix.
+    """
+    n = features.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.zeros((n, 0), dtype=np.int64), np.zeros((n, 0), dtype=np.float32)
+
+    neighbours = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype=np.float32)
+    batch = max(1, BATCH_CELLS // n)
+    for start in range(0, n, batch):
+        stop = min(start + batch, n)
+        rows = np.arange(stop - start)
+        sims = features[start:stop] @ features.T
+        sims[rows, start + rows] = -np.inf  # never recommend a course for itself
+        candidates = np.argpartition(sims, n - k, axis=1)[:, n - k:]
+        candidate_scores = sims[rows[:, None], candidates]
+        order = np.lexsort((candidates, -candidate_scores), axis=1)
+        neighbours[start:stop] = np.take_along_axis(candidates, order, axis=1)
+        scores[start:stop] = np.take_along_axis(candidate_scores, order, axis=1)
+    return neighbours, scores
+
+def recommendation_rows(ids: np.ndarray, neighbours: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+    """Table rows (course_id, rank, related_course_id, score) for the top-k result of courses `ids`"""
+    now = datetime.now(timezone.utc)
+    recommendations = []
+    for i, course_id in enumerate(ids.tolist()):
+        related = ids[neighbours[i]].tolist()
+        for rank, (related_id, score) in enumerate(zip(related, scores[i].tolist())):
+            if score <= 0:
+                break  # nothing in common with this or any later neighbour
+            recommendations.append({
+                "course_id": course_id, "rank": rank, "related_course_id": related_id,
+                "score": round(score, 6), "computed_at": now
+            })
+    return recommendations
+
+def compute_recommendations(rows: Sequence[Any], k: int) -> List[Dict[str, Any]]:
+    """Recommendation rows of the k nearest neighbours of every course"""
+    if not rows:
+        return []
+    ids = np.array([row.id for row in rows], dtype=np.int64)
+    neighbours, scores = top_k(build_features(rows), k)
+    return recommendation_rows(ids, neighbours, scores)
+
+class CourseRecommendationJob(PeriodicJob):
+    """
+    Rebuilds the related-course table from the course catalog whenever the stored
+    recommendations are `COURSE_RECOMMENDATION_SECONDS` old.
+    """
+
+    name = "course_recommendations"
+
+    def __init__(self, session_factory=new_session, k: int = COURSE_RECOMMENDATIONS_K,
+                 interval_seconds: int = COURSE_RECOMMENDATION_SECONDS):
+        super().__init__(interval_seconds, session_factory)
+        self.k = k
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    def run_now(self) -> Dict[str, Any]:
+        started = datetime.now(timezone.utc)
+        with self.session_factory() as session:
+            rows = CourseRecommendationRepository.get_feature_rows(session)
+            recommendations = compute_recommendations(rows, self.k)
+            CourseRecommendationRepository.replace_all(session, recommendations)
+            session.commit()
+        self.last_run = {
+            "courses": len(rows),
+            "recommendations": len(recommendations),
+            "seconds": round((datetime.now(timezone.utc) - started).total_seconds(), 3),
+        }
+        logger.info(f"Course recommendations rebuilt: {self.last_run}")
+        return self.last_run
+
+    def last_run_at(self, session: Session) -> Optional[datetime]:
+        # The stored rows carry their own build time
+        return CourseRecommendationRepository.get_last_computed(session)
+
+course_recommendation_job = CourseRecommendationJob()
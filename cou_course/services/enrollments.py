@@ -0,0 +1,100 @@
+import os
+import logging
+from typing import Any, Dict, Optional
+from sqlmodel import Session
+from common.database import new_session
+from cou_course.repositories.course_repository import CourseRepository
+from cou_course.repositories.enrollment_repository import EnrollmentRepository
+from cou_course.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+ENROLLMENT_COUNTER_SHARDS = int(os.getenv("ENROLLMENT_COUNTER_SHARDS", "16"))
+ENROLLMENT_ROLLUP_SECONDS = int(os.getenv("ENROLLMENT_ROLLUP_SECONDS", "60"))
+ENROLLMENT_RECOUNT_SECONDS = int(os.getenv("ENROLLMENT_RECOUNT_SECONDS", "3600"))
+
+def _shard(user_id: int) -> int:
+    return user_id % ENROLLMENT_COUNTER_SHARDS
+
+def enroll(session: Session, course_id: int, user_id: int) -> Dict[str, Any]:
+    """Enroll a learner; a new enrollment adds 1 to one of the course's counter shards. Unknown courses raise KeyError."""
+    if not CourseRepository.course_exists(session, course_id):
+        raise KeyError(course_id)
+    changed = EnrollmentRepository.enroll(session, user_id, course_id)
+    if changed:
+        EnrollmentRepository.add_to_shard(session, course_id, _shard(user_id), 1)
+    return {
+        "course_id": course_id,
+        "user_id": user_id,
+        "enrolled": True,
+        "changed": changed,
+        "total_enrollments": EnrollmentRepository.get_enrollment_count(session, course_id),
+    }
+
+def unenroll(session: Session, course_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+    """Withdraw an enrollment; None if the learner was not enrolled"""
+    if not EnrollmentRepository.unenroll(session, user_id, course_id):
+        return None
+    EnrollmentRepository.add_to_shard(session, course_id, _shard(user_id), -1)
+    return {
+        "course_id": course_id,
+        "user_id": user_id,
+        "enrolled": False,
+        "changed": True,
+        "total_enrollments": EnrollmentRepository.get_enrollment_count(session, course_id),
+    }
+
+class EnrollmentCounterRollup(PeriodicJob):
+    """
+    Folds the pending shard deltas into Course.total_enrollments and, through each
+    course's mentor, Mentor.total_students. A rollup only touches courses that had
+    enrollment changes since the previous one.
+    """
+
+    name = "enrollment_counter_rollup"
+
+    def __init__(self, session_factory=new_session,
+                 interval_seconds: int = ENROLLMENT_ROLLUP_SECONDS):
+        super().__init__(interval_seconds, session_factory)
+        self.last_run: Optional[Dict[str, int]] = None
+
+    def run_now(self) -> Dict[str, int]:
+        with self.session_factory() as session:
+            course_deltas = EnrollmentRepository.drain_shards(session)
+            mentors = EnrollmentRepository.get_course_mentors(session, list(course_deltas))
+            mentor_deltas: Dict[int, int] = {}
+            for course_id, delta in course_deltas.items():
+                if course_id in mentors:
+                    mentor_deltas[mentors[course_id]] = mentor_deltas.get(mentors[course_id], 0) + delta
+            EnrollmentRepository.apply_deltas(
+                session, sorted(course_deltas.items()), sorted((m, d) for m, d in mentor_deltas.items() if d)
+            )
+            session.commit()
+        self.last_run = {"courses": len(course_deltas), "mentors": len(mentor_deltas)}
+        return self.last_run
+
+class EnrollmentCounterRecount(PeriodicJob):
+    """
+    Recounts every course and mentor total from the enrollment table, repairing drift:
+    manual edits, and mentor totals left behind when a course changes mentor. Runs
+    every `ENROLLMENT_RECOUNT_SECONDS`.
+    """
+
+    name = "enrollment_counter_recount"
+
+    def __init__(self, session_factory=new_session,
+                 interval_seconds: int = ENROLLMENT_RECOUNT_SECONDS):
+        super().__init__(interval_seconds, session_factory)
+        self.last_run: Optional[Dict[str, int]] = None
+
+    def run_now(self) -> Dict[str, int]:
+        with self.session_factory() as session:
+            courses, mentors = EnrollmentRepository.recount(session)
+            session.commit()
+        if courses or mentors:
+            logger.warning(f"Enrollment counters recounted: {courses} courses, {mentors} mentors corrected")
+        self.last_run = {"courses": courses, "mentors": mentors}
+        return self.last_run
+
+enrollment_counter_rollup = EnrollmentCounterRollup()
+enrollment_counter_recount = EnrollmentCounterRecount()
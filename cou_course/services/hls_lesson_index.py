@@ -0,0 +1,86 @@
+import asyncio
+import bisect
+import os
+import time
+import logging
+from typing import List, Optional
+from cou_course.services.storage_backend import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+HLS_INDEX_REFRESH_SECONDS = int(os.getenv("HLS_INDEX_REFRESH_SECONDS", "300"))
+
+class LessonFolderIndex:
+    """
+    Sorted list of the top-level lesson folders in the lessons container.
+
+    The folders are listed with a "/" delimiter, so storage returns one prefix per
+    lesson instead of every .ts segment. The list is refreshed by a background task
+    (or lazily once it is older than `max_age_seconds`), and uploads can register
+    a new folder immediately with `add_folder`.
+    """
+
+    def __init__(self, max_age_seconds: int = HLS_INDEX_REFRESH_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._folders: List[str] = []
+        self._refreshed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def is_stale(self) -> bool:
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.max_age_seconds
+
+    async def refresh(self, storage: StorageBackend) -> List[str]:
+        async with self._lock:
+            return await self._load(storage)
+
+    async def get_folders(self, storage: StorageBackend) -> List[str]:
+        if self.is_stale():
+            async with self._lock:
+                # Callers that waited on the lock reuse the refresh that just finished
+                if self.is_stale():
+                    await self._load(storage)
+        return self._folders
+
+    async def _load(self, storage: StorageBackend) -> List[str]:
+        folders = [prefix.rstrip("/") async for prefix in storage.list_prefixes()]
+        self._folders = sorted(folders)
+        self._refreshed_at = time.monotonic()
+        logger.info(f"Indexed {len(self._folders)} HLS lesson folders")
+        return self._folders
+
+    def add_folder(self, folder: str) -> None:
+        """Register a folder created by an upload without waiting for the next refresh"""
+        position = bisect.bisect_left(self._folders, folder)
+        if position == len(self._folders) or self._folders[position] != folder:
+            self._folders = self._folders[:position] + [folder] + self._folders[position:]
+
+    def invalidate(self) -> None:
+        self._refreshed_at = None
+
+    def start(self, storage: StorageBackend, interval_seconds: int = HLS_INDEX_REFRESH_SECONDS) -> None:
+        """Refresh the index now and then every `interval_seconds` until `stop`"""
+        async def refresh_forever():
+            while True:
+                try:
+                    await self.refresh(storage)
+                except Exception as e:
+                    logger.warning(f"HLS lesson index refresh failed: {str(e)}")
+                await asyncio.sleep(interval_seconds)
+
+        self._task = asyncio.create_task(refresh_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+lesson_folder_index = LessonFolderIndex()
+
+def get_lesson_folder_index() -> LessonFolderIndex:
+    """FastAPI dependency returning the shared lesson folder index"""
+    return lesson_folder_index
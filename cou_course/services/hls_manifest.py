@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import math
+import os
+import posixpath
+import re
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+from cou_course.services.storage_backend import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+HLS_CDN_BASE_URL = os.getenv("HLS_CDN_BASE_URL")  # e.g. https://cdn.example.com/lessons
+HLS_MANIFEST_MAX_AGE_SECONDS = int(os.getenv("HLS_MANIFEST_MAX_AGE_SECONDS", "86400"))
+HLS_PLAYLIST_ROUTE = "/api/v1/course-learning/hls"
+
+_URI_ATTRIBUTE = re.compile(r'URI="([^"]*)"')
+
+def rewrite_playlist(text: str, rewrite_uri: Callable[[str], str]) -> str:
+    """
+    Apply `rewrite_uri` to every URI in an m3u8 playlist: the URI lines (variant
+    playlists and segments) and URI="..." attributes (EXT-X-MAP, EXT-X-KEY, EXT-X-MEDIA,
+    EXT-X-I-FRAME-STREAM-INF). Everything else is kept as is.
+    """
+    lines = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            lines.append(line)
+        elif stripped.startswith("#"):
+            lines.append(_URI_ATTRIBUTE.sub(lambda match: f'URI="{rewrite_uri(match.group(1))}"', line))
+        else:
+            lines.append(rewrite_uri(stripped))
+    return "\n".join(lines) + "\n"
+
+def playlist_uris(text: str) -> List[str]:
+    """Every URI referenced by a playlist, in order"""
+    uris: List[str] = []
+    rewrite_playlist(text, lambda uri: uris.append(uri) or uri)
+    return uris
+
+def _is_absolute(uri: str) -> bool:
+    return "://" in uri or uri.startswith("/")
+
+@dataclass
+class ManifestEntry:
+    text: str
+    etag: str
+    blob_etag: str
+    checked_at: float
+    valid_until: float  # Signed URLs in the text are re-minted after this
+
+class HlsManifestService:
+    """
+    Serves HLS playlists with their URIs rewritten for playback from private storage.
+
+    Nested playlists point back at the playlist endpoint; segments, keys and init
+    sections get signed storage URLs (or `cdn_base_url` URLs). The master playlist and
+    its variants are downloaded and rewritten together once, then served from memory.
+    Cached entries are revalidated against the blob ETag every `revalidate_seconds`
+    and rebuilt before the SAS tokens they embed are rotated.
+    """
+
+    def __init__(self, cdn_base_url: Optional[str] = HLS_CDN_BASE_URL,
+                 max_age_seconds: int = HLS_MANIFEST_MAX_AGE_SECONDS,
+                 revalidate_seconds: int = 60, max_entries: int = 2000,
+                 route_prefix: str = HLS_PLAYLIST_ROUTE):
+        self.cdn_base_url = cdn_base_url.rstrip("/") if cdn_base_url else None
+        self.max_age_seconds = max_age_seconds
+        self.revalidate_seconds = revalidate_seconds
+        self.max_entries = max_entries
+        self.route_prefix = route_prefix
+        self._entries: "OrderedDict[str, ManifestEntry]" = OrderedDict()
+        self.hits = 0
+        self.builds = 0
+
+    def playlist_url(self, blob_name: str) -> str:
+        """Endpoint URL serving the rewritten playlist `{lesson_folder}/{path}`"""
+        lesson_folder, _, playlist_path = blob_name.partition("/")
+        return f"{self.route_prefix}/{lesson_folder}/playlist/{playlist_path}"
+
+    def max_age(self, entry: ManifestEntry) -> int:
+        """Cache lifetime for clients and CDNs, never beyond the embedded tokens"""
+        return max(0, min(self.max_age_seconds, math.ceil(entry.valid_until - time.time())))
+
+    async def get(self, storage: StorageBackend, blob_name: str) -> Optional[ManifestEntry]:
+        now = time.time()
+        entry = self._entries.get(blob_name)
+        if entry and now < entry.valid_until:
+            if now - entry.checked_at < self.revalidate_seconds:
+                self._entries.move_to_end(blob_name)
+                self.hits += 1
+                return entry
+            # One HEAD instead of a download while the blob is unchanged
+            properties = await storage.get_properties(blob_name)
+            if properties is not None and properties.etag == entry.blob_etag:
+                entry.checked_at = now
+                self.hits += 1
+                return entry
+        return await self._build(storage, blob_name)
+
+    async def _build(self, storage: StorageBackend, blob_name: str) -> Optional[ManifestEntry]:
+        downloaded = await storage.download(blob_name)
+        if downloaded is None:
+            self._entries.pop(blob_name, None)
+            return None
+        content, blob_etag = downloaded
+        text = content.decode("utf-8-sig")
+
+        directory = posixpath.dirname(blob_name)
+        resolved = {
+            uri: posixpath.normpath(posixpath.join(directory, uri.split("?")[0]))
+            for uri in playlist_uris(text) if not _is_absolute(uri)
+        }
+        nested = sorted({name for name in resolved.values() if name.endswith(".m3u8")})
+        segments = sorted({name for name in resolved.values() if not name.endswith(".m3u8")})
+
+        valid_until = time.time() + self.max_age_seconds
+        if self.cdn_base_url:
+            segment_urls = {name: f"{self.cdn_base_url}/{name}" for name in segments}
+        else:
+            segment_urls = dict(zip(segments, storage.signed_urls(segments)))
+            signer = getattr(storage, "signer", None)
+            if signer and segments:
+                valid_until = min(valid_until, signer.refresh_at(segments))
+
+        def rewrite_uri(uri: str) -> str:
+            name = resolved.get(uri)
+            if name is None:
+                return uri
+            return self.playlist_url(name) if name in nested else segment_urls[name]
+
+        rewritten = rewrite_playlist(text, rewrite_uri)
+        entry = ManifestEntry(
+            text=rewritten,
+            etag=f'"{hashlib.sha256(rewritten.encode()).hexdigest()[:32]}"',
+            blob_etag=blob_etag,
+            checked_at=time.time(),
+            valid_until=valid_until
+        )
+        self._entries[blob_name] = entry
+        self._entries.move_to_end(blob_name)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.builds += 1
+
+        # Warm the variant playlists the player will request next
+        missing = [name for name in nested if name not in self._entries and name != blob_name]
+        if missing:
+            await asyncio.gather(*(self._build(storage, name) for name in missing), return_exceptions=True)
+        return entry
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "builds": self.builds}
+
+hls_manifest_service = HlsManifestService()
+
+def get_hls_manifest_service() -> HlsManifestService:
+    """FastAPI dependency returning the shared manifest cache"""
+    return hls_manifest_service
@@ -0,0 +1,62 @@
+from typing import Dict, List, Optional
+from sqlmodel import Session
+from cou_course.repositories.learner_progress_repository import LearnerProgressRepository
+from cou_course.schemas.learner_progress_schema import CourseProgressRead, CourseProgressSummary
+
+def mask_of(bits: List[Optional[int]]) -> int:
+    mask = 0
+    for bit in bits:
+        if bit is not None:
+            mask |= 1 << bit
+    return mask
+
+def summarize(course_id: int, bitset: int, slots: Dict[int, Optional[int]]) -> CourseProgressSummary:
+    """
+    Completion of the active components by popcount; bits of removed components are
+    ignored, components without a bit yet count as not completed
+    """
+    active_mask = mask_of(list(slots.values()))
+    completed = (bitset & active_mask).bit_count()
+    total = len(slots)
+    return CourseProgressSummary(
+        course_id=course_id,
+        completed_count=completed,
+        total_components=total,
+        completion_percentage=round(100 * completed / total, 2) if total else 0.0
+    )
+
+def course_progress(user_id: int, course_id: int, bitset: int, slots: Dict[int, Optional[int]]) -> CourseProgressRead:
+    summary = summarize(course_id, bitset, slots)
+    return CourseProgressRead(
+        **summary.model_dump(),
+        user_id=user_id,
+        completed_order_ids=sorted(order_id for order_id, bit in slots.items() if bit is not None and bitset >> bit & 1)
+    )
+
+def get_course_progress(session: Session, user_id: int, course_id: int) -> CourseProgressRead:
+    slots = LearnerProgressRepository.get_course_slots(session, [course_id])[course_id]
+    bitset = LearnerProgressRepository.get_bitsets(session, user_id, [course_id]).get(course_id, 0)
+    return course_progress(user_id, course_id, bitset, slots)
+
+def get_progress_summaries(session: Session, user_id: int, course_ids: List[int]) -> List[CourseProgressSummary]:
+    """Completion of many courses from two queries, whatever the number of courses"""
+    slots = LearnerProgressRepository.get_course_slots(session, course_ids)
+    bitsets = LearnerProgressRepository.get_bitsets(session, user_id, course_ids)
+    return [summarize(course_id, bitsets.get(course_id, 0), slots[course_id]) for course_id in course_ids]
+
+def update_course_progress(session: Session, user_id: int, course_id: int,
+                           completed: List[int], uncompleted: List[int]) -> CourseProgressRead:
+    """
+    Apply a batch of completions in one locked read-modify-write; unknown components raise KeyError.
+    The only path that hands out progress bits, so reads never lock or update LessonOrder.
+    """
+    slots = LearnerProgressRepository.get_course_slots(session, [course_id], assign_missing=True)[course_id]
+    unknown = [order_id for order_id in completed + uncompleted if order_id not in slots]
+    if unknown:
+        raise KeyError(unknown)
+    bitset = LearnerProgressRepository.update_bitset(
+        session, user_id, course_id,
+        set_mask=mask_of([slots[order_id] for order_id in completed]),
+        clear_mask=mask_of([slots[order_id] for order_id in uncompleted])
+    )
+    return course_progress(user_id, course_id, bitset, slots)
@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import mimetypes
+import mmap
+import os
+import re
+import shutil
+import logging
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LOCAL_VIDEO_ROOT = os.getenv("LOCAL_VIDEO_ROOT")
+STREAM_CHUNK_SIZE = int(os.getenv("VIDEO_STREAM_CHUNK_SIZE", str(1024 * 1024)))
+UPLOADS_DIR = ".uploads"  # Staged blocks, hidden from listings
+
+_BLOCK_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+class LocalFileStorage:
+    """
+    Serves the lessons container layout from a local directory (development and
+    on-prem installs and load tests without network). Implements StorageBackend like
+    BlobStorage, so the video routes work unchanged. Byte ranges are read through mmap, one bounded chunk at a time;
+    upload blocks are staged as files under `.uploads/` until they are committed. Every
+    filesystem call (stat, read, scandir, write) runs in a worker thread, off the event loop.
+    """
+
+    source = "local"
+
+    def __init__(self, root: str, base_url: str = "/api/v1/course-learning/stream",
+                 chunk_size: int = STREAM_CHUNK_SIZE):
+        self.root = os.path.realpath(root)
+        self.base_url = base_url.rstrip("/")
+        self.chunk_size = chunk_size
+
+    def _path(self, blob_name: str) -> Optional[str]:
+        """Absolute path of a blob, or None if the name escapes the root"""
+        path = os.path.realpath(os.path.join(self.root, blob_name))
+        if os.path.commonpath([self.root, path]) != self.root:
+            return None
+        return path
+
+    def url(self, blob_name: str) -> str:
+        return f"{self.base_url}/{blob_name}"
+
+    def signed_url(self, blob_name: str) -> str:
+        return self.url(blob_name)
+
+    def signed_urls(self, blob_names: List[str]) -> List[str]:
+        return [self.url(blob_name) for blob_name in blob_names]
+
+    def _properties(self, blob_name: str, stat: os.stat_result) -> Any:
+        content_type, _ = mimetypes.guess_type(blob_name)
+        return SimpleNamespace(
+            name=blob_name,
+            size=stat.st_size,
+            etag=f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+            last_modified=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            content_settings=SimpleNamespace(content_type=content_type or "application/octet-stream")
+        )
+
+    def _file_properties(self, blob_name: str) -> Optional[Any]:
+        path = self._path(blob_name)
+        if path is None or not os.path.isfile(path):
+            return None
+        return self._properties(blob_name, os.stat(path))
+
+    async def get_properties(self, blob_name: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._file_properties, blob_name)
+
+    async def download(self, blob_name: str) -> Optional[Tuple[bytes, str]]:
+        def read():
+            properties = self._file_properties(blob_name)
+            if properties is None:
+                return None
+            with open(self._path(blob_name), "rb") as file:
+                return file.read(), properties.etag
+
+        return await asyncio.to_thread(read)
+
+    async def open_range(self, blob_name: str, offset: int, length: int) -> AsyncIterator[bytes]:
+        """Yield `length` bytes starting at `offset`, at most `chunk_size` bytes per chunk"""
+        path = self._path(blob_name)
+        if path is None:
+            raise FileNotFoundError(blob_name)
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            end = offset + length
+            position = offset
+            while position < end:
+                chunk_end = min(position + self.chunk_size, end)
+                # Page faults on a cold file can block; read each chunk off the event loop
+                yield await asyncio.to_thread(mapped.__getitem__, slice(position, chunk_end))
+                position = chunk_end
+
+    async def put(self, blob_name: str, data: bytes, content_type: Optional[str] = None) -> str:
+        path = self._path(blob_name)
+        if path is None:
+            raise ValueError(f"Invalid blob name '{blob_name}'")
+
+        def write():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.uploading")
+            with open(partial, "wb") as file:
+                file.write(data)
+            os.replace(partial, path)
+            return self._properties(blob_name, os.stat(path)).etag
+
+        return await asyncio.to_thread(write)
+
+    def _staging_dir(self, blob_name: str) -> str:
+        return os.path.join(self.root, UPLOADS_DIR, hashlib.sha256(blob_name.encode()).hexdigest()[:32])
+
+    async def get_staged_blocks(self, blob_name: str) -> Dict[str, int]:
+        directory = self._staging_dir(blob_name)
+
+        def scan():
+            if not os.path.isdir(directory):
+                return {}
+            return {entry.name: entry.stat().st_size for entry in os.scandir(directory) if entry.is_file()}
+
+        return await asyncio.to_thread(scan)
+
+    async def stage_block(self, blob_name: str, block_id: str, data: bytes) -> None:
+        if not _BLOCK_ID.match(block_id) or self._path(blob_name) is None:
+            raise ValueError(f"Invalid block '{block_id}' for '{blob_name}'")
+        directory = self._staging_dir(blob_name)
+
+        def write():
+            os.makedirs(directory, exist_ok=True)
+            partial = os.path.join(directory, f".{block_id}.part")
+            with open(partial, "wb") as file:
+                file.write(data)
+            os.replace(partial, os.path.join(directory, block_id))
+
+        await asyncio.to_thread(write)
+
+    async def commit_blocks(self, blob_name: str, block_ids: List[str], content_type: Optional[str] = None) -> None:
+        """Concatenate the staged blocks into a temporary file and rename it into place"""
+        path = self._path(blob_name)
+        if path is None:
+            raise ValueError(f"Invalid blob name '{blob_name}'")
+        directory = self._staging_dir(blob_name)
+
+        def commit():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.uploading")
+            with open(partial, "wb") as target:
+                for block_id in block_ids:
+                    with open(os.path.join(directory, block_id), "rb") as block:
+                        shutil.copyfileobj(block, target, self.chunk_size)
+            os.replace(partial, path)
+            shutil.rmtree(directory, ignore_errors=True)
+
+        await asyncio.to_thread(commit)
+
+    async def list_blobs(self, name_starts_with: Optional[str] = None) -> AsyncIterator[Any]:
+        """Files under the root in blob name order (as Azure lists them), skipping hidden entries"""
+        prefix = name_starts_with or ""
+
+        def walk():
+            return [
+                self._properties(blob_name, os.stat(path))
+                for blob_name, path in self._walk(self.root, "") if blob_name.startswith(prefix)
+            ]
+
+        for properties in await asyncio.to_thread(walk):
+            yield properties
+
+    def _walk(self, directory: str, name_prefix: str):
+        # A folder sorts as "name/", so "a/b" comes after "a-b" just like in a flat blob listing
+        entries = [entry for entry in os.scandir(directory) if not entry.name.startswith(".")]
+        for entry in sorted(entries, key=lambda entry: entry.name + "/" if entry.is_dir() else entry.name):
+            if entry.is_dir():
+                yield from self._walk(entry.path, f"{name_prefix}{entry.name}/")
+            elif entry.is_file():
+                yield f"{name_prefix}{entry.name}", entry.path
+
+    def _scan_folder(self, prefix: str, folders: bool) -> List[Any]:
+        """Subfolder names (`folders`) or file properties directly in a folder, in name order, skipping hidden entries"""
+        path = self._path(prefix) if prefix else self.root
+        if path is None or not os.path.isdir(path):
+            return []
+        entries = [entry for entry in os.scandir(path) if not entry.name.startswith(".")]
+        entries.sort(key=lambda entry: entry.name)
+        if folders:
+            return [entry.name for entry in entries if entry.is_dir()]
+        return [self._properties(f"{prefix}{entry.name}", entry.stat()) for entry in entries if entry.is_file()]
+
+    async def list_prefixes(self, name_starts_with: Optional[str] = None) -> AsyncIterator[str]:
+        prefix = name_starts_with or ""
+        for folder in await asyncio.to_thread(self._scan_folder, prefix, True):
+            yield f"{prefix}{folder}/"
+
+    async def list_folder(self, name_starts_with: Optional[str] = None) -> AsyncIterator[Any]:
+        prefix = name_starts_with or ""
+        for properties in await asyncio.to_thread(self._scan_folder, prefix, False):
+            yield properties
+
+    async def close(self) -> None:
+        pass
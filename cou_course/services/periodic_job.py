@@ -0,0 +1,152 @@
+import asyncio
+import os
+import logging
+import time
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Optional
+from sqlmodel import Session
+from common.database import new_session
+from cou_course.repositories.job_run_repository import JobRunRepository
+
+logger = logging.getLogger(__name__)
+
+# Shortest wait between two checks of a job that is not done yet (another worker holds
+# it, or its last run failed), so the loop never spins
+JOB_RETRY_SECONDS = int(os.getenv("JOB_RETRY_SECONDS", "60"))
+
+class JobLock:
+    """
+    Postgres session-level advisory lock named after a job, held on a dedicated
+    connection for the length of a run; a worker that cannot take it skips the run.
+    Databases without advisory locks (SQLite in tests) always acquire it.
+    """
+
+    def __init__(self, bind, name: str):
+        self.bind = bind
+        self.key = zlib.crc32(f"job:{name}".encode())
+        self._connection = None
+
+    def acquire(self) -> bool:
+        if self.bind.dialect.name != "postgresql":
+            return True
+        connection = self.bind.connect()
+        try:
+            acquired = connection.exec_driver_sql(f"SELECT pg_try_advisory_lock({self.key})").scalar()
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    def release(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            self._connection.exec_driver_sql(f"SELECT pg_advisory_unlock({self.key})")
+            self._connection.commit()
+        except Exception:
+            # Drop the connection (and with it the lock) rather than pool it locked
+            self._connection.invalidate()
+            raise
+        finally:
+            self._connection.close()
+            self._connection = None
+
+class PeriodicJob(ABC):
+    """
+    Base of the background jobs that keep derived data in line with its source
+    tables. Subclasses set `name` and implement `run_now`.
+
+    A job runs at most once per `interval_seconds` across all workers: a check takes
+    the job's advisory lock (workers that miss it skip), and runs only when the last
+    run recorded in cou_course.job_run is that old, or `pending()` asks for an early
+    run. The app lifespan starts a loop per job; where background tasks cannot run,
+    the cron endpoint calls `run_if_due` instead (see services/background_jobs).
+    """
+
+    name = "job"
+
+    def __init__(self, interval_seconds: int, session_factory=new_session, check_seconds: Optional[int] = None):
+        self.interval_seconds = interval_seconds
+        self.check_seconds = check_seconds or interval_seconds
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    def run_now(self) -> Any:
+        """One run of the job, regardless of schedule and lock"""
+
+    async def execute(self) -> Any:
+        # run_now does synchronous database (or CPU-bound) work; keep it off the event loop
+        return await asyncio.to_thread(self.run_now)
+
+    def pending(self) -> bool:
+        """Whether this worker wants a run before the interval is up"""
+        return False
+
+    def last_run_at(self, session: Session) -> Optional[datetime]:
+        return JobRunRepository.get_last_run(session, self.name)
+
+    def seconds_until_due(self) -> float:
+        if self.pending():
+            return 0.0
+        with self.session_factory() as session:
+            last = self.last_run_at(session)
+        if last is None:
+            return 0.0
+        if last.tzinfo is None:
+            last = last.replace(tzinfo=timezone.utc)
+        return max(0.0, self.interval_seconds - (datetime.now(timezone.utc) - last).total_seconds())
+
+    def _lock(self) -> JobLock:
+        with self.session_factory() as session:
+            return JobLock(session.get_bind(), self.name)
+
+    def _record_run(self, run_at: datetime, duration_seconds: float) -> None:
+        with self.session_factory() as session:
+            JobRunRepository.record_run(session, self.name, run_at, round(duration_seconds, 3))
+            session.commit()
+
+    async def run_if_due(self) -> Optional[Any]:
+        """Run the job if it is due and no other worker is running it; None when skipped"""
+        lock = await asyncio.to_thread(self._lock)
+        if not await asyncio.to_thread(lock.acquire):
+            return None
+        try:
+            if await asyncio.to_thread(self.seconds_until_due) > 0:
+                return None
+            run_at, started = datetime.now(timezone.utc), time.monotonic()
+            result = await self.execute()
+            await asyncio.to_thread(self._record_run, run_at, time.monotonic() - started)
+            return result
+        finally:
+            await asyncio.to_thread(lock.release)
+
+    def start(self) -> None:
+        """Run whenever due, checking at least every `check_seconds`, until `stop`"""
+        async def run_forever():
+            while True:
+                try:
+                    await self.run_if_due()
+                    delay = await asyncio.to_thread(self.seconds_until_due)
+                except Exception as e:
+                    logger.warning(f"Periodic job {self.name} failed: {str(e)}")
+                    delay = self.check_seconds
+                await asyncio.sleep(min(max(delay, JOB_RETRY_SECONDS), self.check_seconds))
+
+        self._task = asyncio.create_task(run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,90 @@
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Mapping, Optional
+from sqlmodel import Session
+from cou_course.models.quiz_attempt import QuizAttempt
+from cou_course.repositories.quiz_attempt_repository import QuizAttemptRepository
+from cou_course.services.quiz_engine import CompiledQuiz, draw_questions, grade
+
+# Allowance past a quiz's time limit for the submission to reach the server
+QUIZ_SUBMIT_GRACE_SECONDS = int(os.getenv("QUIZ_SUBMIT_GRACE_SECONDS", "30"))
+
+class QuizAttemptError(ValueError):
+    """The attempt cannot take a submission"""
+
+class AttemptSubmittedError(QuizAttemptError):
+    """The attempt was already submitted; its result is final"""
+
+class AttemptExpiredError(QuizAttemptError):
+    """The quiz's time limit ran out before the attempt was submitted"""
+
+def expires_at(quiz: CompiledQuiz, attempt: QuizAttempt) -> Optional[datetime]:
+    """End of the attempt's time limit, counted from its stored start; None when the quiz has no limit"""
+    if not quiz.time_limit_minutes:
+        return None
+    started_at = attempt.started_at
+    if started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=timezone.utc)
+    return started_at + timedelta(minutes=quiz.time_limit_minutes)
+
+def attempt_questions(quiz: CompiledQuiz, attempt: QuizAttempt) -> Dict[str, Any]:
+    """The attempt's drawn questions, without answer keys (questions removed since it started are left out)"""
+    return {
+        "attempt_id": attempt.id,
+        "quiz_id": quiz.quiz_id,
+        "started_at": attempt.started_at,
+        "time_limit_minutes": quiz.time_limit_minutes,
+        "expires_at": expires_at(quiz, attempt),
+        "questions": [quiz.questions[question_id] for question_id in attempt.question_ids if question_id in quiz.questions],
+    }
+
+def start_attempt(session: Session, quiz: CompiledQuiz, user_id: int) -> Dict[str, Any]:
+    """Draw the questions of a new attempt with a server-issued seed and store the draw"""
+    seed = secrets.randbelow(2**31)
+    attempt = QuizAttemptRepository.create_attempt(
+        session, quiz.quiz_id, user_id, seed, draw_questions(quiz, seed), datetime.now(timezone.utc)
+    )
+    return attempt_questions(quiz, attempt)
+
+def get_attempt(session: Session, quiz: CompiledQuiz, attempt_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+    """
+    An attempt of the learner: its questions, plus the grade once it was submitted.
+    Per-question correctness is only ever returned for a final attempt.
+    """
+    attempt = QuizAttemptRepository.get_attempt(session, attempt_id, quiz.quiz_id, user_id)
+    if attempt is None:
+        return None
+    read = attempt_questions(quiz, attempt)
+    if attempt.submitted_at is not None:
+        read.update(
+            submitted_at=attempt.submitted_at, score=attempt.score, max_score=attempt.max_score,
+            percent=attempt.percent, passed=attempt.passed, results=attempt.results
+        )
+    return read
+
+def submit_attempt(session: Session, quiz: CompiledQuiz, attempt_id: int, user_id: int,
+                   answers: Mapping[int, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Grade the learner's answers against the questions stored with the attempt and make
+    the attempt final. None if the attempt is not the learner's; answers to questions
+    outside the draw raise KeyError, a second submission AttemptSubmittedError and one
+    after the time limit (plus QUIZ_SUBMIT_GRACE_SECONDS) AttemptExpiredError.
+    """
+    attempt = QuizAttemptRepository.get_attempt(session, attempt_id, quiz.quiz_id, user_id)
+    if attempt is None:
+        return None
+    if attempt.submitted_at is not None:
+        raise AttemptSubmittedError(attempt_id)
+    submitted_at = datetime.now(timezone.utc)
+    deadline = expires_at(quiz, attempt)
+    if deadline is not None and submitted_at > deadline + timedelta(seconds=QUIZ_SUBMIT_GRACE_SECONDS):
+        raise AttemptExpiredError(attempt_id)
+
+    # Questions removed from the quiz since the attempt started are no longer graded
+    result = grade(quiz, answers, [question_id for question_id in attempt.question_ids if question_id in quiz.keys])
+    stored_answers = {str(question_id): answer for question_id, answer in answers.items()}
+    if not QuizAttemptRepository.finish_attempt(session, attempt.id, submitted_at, stored_answers, result):
+        raise AttemptSubmittedError(attempt_id)
+    result.update(attempt_id=attempt.id, user_id=user_id, started_at=attempt.started_at, submitted_at=submitted_at)
+    return result
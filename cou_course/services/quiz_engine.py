@@ -0,0 +1,310 @@
+import hashlib
+import random
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Dict, FrozenSet, List, Mapping, Optional, Tuple
+from sqlmodel import Session
+from cou_course.models.question import QuestionType
+from cou_course.repositories.question_repository import QuestionRepository, QUESTION_TYPE_MAPPING
+from cou_course.repositories.quiz_repository import QuizRepository
+
+logger = logging.getLogger(__name__)
+
+# How a compiled key compares a submitted answer
+ONE = "one"            # any of the accepted tokens
+SET = "set"            # exactly the set of correct tokens
+TEXT = "text"          # one accepted text per blank
+SEQUENCE = "sequence"  # tokens in the correct order
+PAIRS = "pairs"        # exactly the set of (left, right) matches
+MANUAL = "manual"      # not auto-gradable (open ended or no answer key); not scored
+
+def token(value: Any) -> str:
+    """Comparable form of an option id, label or boolean"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value).strip().casefold()
+
+def normalize_text(value: Any) -> str:
+    """Comparable form of free text: case-folded with whitespace collapsed"""
+    return " ".join(str(value).split()).casefold()
+
+@dataclass(frozen=True)
+class AnswerKey:
+    question_id: int
+    points: int
+    kind: str
+    expected: Any
+
+def _option_token(option: Any) -> str:
+    if isinstance(option, dict):
+        for field in ("id", "value", "text", "label", "answer"):
+            if field in option:
+                return token(option[field])
+    return token(option)
+
+def _is_correct(option: Any) -> bool:
+    return isinstance(option, dict) and bool(option.get("is_correct", option.get("correct", False)))
+
+def _correct_tokens(answers: Any) -> List[str]:
+    """Correct options of a choice question: flagged options, or an explicit `correct` value/list"""
+    if isinstance(answers, dict):
+        for field in ("correct", "correct_answer", "correct_answers"):
+            if field in answers:
+                value = answers[field]
+                return [token(v) for v in value] if isinstance(value, list) else [token(value)]
+        answers = answers.get("options", [])
+    return [_option_token(option) for option in answers if _is_correct(option)]
+
+def _blanks(answers: Any) -> Tuple[FrozenSet[str], ...]:
+    if isinstance(answers, dict):
+        if "blanks" in answers:
+            return tuple(
+                frozenset(normalize_text(v) for v in (blank if isinstance(blank, list) else [blank]))
+                for blank in answers["blanks"]
+            )
+        accepted = answers.get("accepted", answers.get("correct", answers.get("correct_answer")))
+        if accepted is None:
+            return ()
+        return (frozenset(normalize_text(v) for v in (accepted if isinstance(accepted, list) else [accepted])),)
+    # A list of accepted texts, or of options where the flagged ones are accepted
+    flagged = [option for option in answers if _is_correct(option)]
+    texts = [option.get("text", option.get("answer")) if isinstance(option, dict) else option for option in flagged or answers]
+    accepted = frozenset(normalize_text(text) for text in texts if text is not None)
+    return (accepted,) if accepted else ()
+
+def _sequence(answers: Any) -> Tuple[str, ...]:
+    items = answers.get("order", answers.get("items", [])) if isinstance(answers, dict) else answers
+    if items and all(isinstance(item, dict) and ("order" in item or "position" in item) for item in items):
+        items = sorted(items, key=lambda item: item.get("order", item.get("position")))
+    return tuple(_option_token(item) for item in items)
+
+def _pair_list(value: Any) -> Optional[List[Tuple[Any, Any]]]:
+    """(left, right) matches from a {left: right} dict or a list of {left, right} / [left, right]"""
+    if isinstance(value, dict):
+        return list(value.items())
+    if isinstance(value, list):
+        pairs = []
+        for pair in value:
+            if isinstance(pair, dict) and "left" in pair and "right" in pair:
+                pairs.append((pair["left"], pair["right"]))
+            elif isinstance(pair, (list, tuple)) and len(pair) == 2:
+                pairs.append((pair[0], pair[1]))
+            else:
+                return None
+        return pairs
+    return None
+
+def _key_pairs(answers: Any) -> List[Tuple[Any, Any]]:
+    return _pair_list(answers.get("pairs", answers) if isinstance(answers, dict) else answers) or []
+
+def _pairs(answers: Any) -> FrozenSet[Tuple[str, str]]:
+    return frozenset((token(left), token(right)) for left, right in _key_pairs(answers))
+
+def _submitted_pairs(value: Any) -> Optional[FrozenSet[Tuple[str, str]]]:
+    pairs = _pair_list(value)
+    return None if pairs is None else frozenset((token(left), token(right)) for left, right in pairs)
+
+def compile_answer_key(question_id: int, question_type: QuestionType, points: int, answers: Any) -> AnswerKey:
+    """
+    Precompute the comparable form of a question's `answers` JSON. Choice questions
+    accept a list of options flagged `is_correct` or a dict with `options`/`correct`;
+    FILL_BLANK takes `blanks` (accepted texts per blank) or `accepted`; SORT_ANSWER
+    takes `order` (or items with an `order`/`position`); matching takes `pairs`.
+    Questions whose answers carry no key are graded manually.
+    """
+    points = points or 0
+    if not answers or question_type == QuestionType.OPEN_ENDED:
+        return AnswerKey(question_id, points, MANUAL, None)
+
+    if question_type in (QuestionType.SINGLE, QuestionType.TRUE_FALSE):
+        correct = _correct_tokens(answers)
+        return AnswerKey(question_id, points, ONE, frozenset(correct)) if correct else AnswerKey(question_id, points, MANUAL, None)
+    if question_type == QuestionType.MULTIPLE:
+        correct = _correct_tokens(answers)
+        return AnswerKey(question_id, points, SET, frozenset(correct)) if correct else AnswerKey(question_id, points, MANUAL, None)
+    if question_type == QuestionType.FILL_BLANK:
+        blanks = _blanks(answers)
+        return AnswerKey(question_id, points, TEXT, blanks) if blanks else AnswerKey(question_id, points, MANUAL, None)
+    if question_type == QuestionType.SORT_ANSWER:
+        sequence = _sequence(answers)
+        return AnswerKey(question_id, points, SEQUENCE, sequence) if sequence else AnswerKey(question_id, points, MANUAL, None)
+    if question_type in (QuestionType.MATCHING_TEXT, QuestionType.MATCHING_IMAGE):
+        pairs = _pairs(answers)
+        return AnswerKey(question_id, points, PAIRS, pairs) if pairs else AnswerKey(question_id, points, MANUAL, None)
+    return AnswerKey(question_id, points, MANUAL, None)
+
+# Option fields that reveal the answer key
+_KEY_FIELDS = {"is_correct", "correct", "order", "position"}
+
+def _strip_option(option: Any) -> Any:
+    return {field: value for field, value in option.items() if field not in _KEY_FIELDS} if isinstance(option, dict) else option
+
+def public_answers(question_type: QuestionType, answers: Any) -> Any:
+    """
+    What a learner may see of a question's `answers`: choice options without their
+    correctness flags, the number of blanks, sort items and matching sides in a fixed
+    (alphabetical) order. Open ended answers (model answers, rubrics) are withheld.
+    """
+    if not answers or question_type == QuestionType.OPEN_ENDED:
+        return None
+    if question_type in (QuestionType.SINGLE, QuestionType.MULTIPLE, QuestionType.TRUE_FALSE):
+        options = answers.get("options") if isinstance(answers, dict) else answers
+        return [_strip_option(option) for option in options] if options else None
+    if question_type == QuestionType.FILL_BLANK:
+        return {"blanks": len(_blanks(answers))}
+    if question_type == QuestionType.SORT_ANSWER:
+        items = answers.get("order", answers.get("items", [])) if isinstance(answers, dict) else answers
+        return sorted((_strip_option(item) for item in items), key=_option_token)
+    if question_type in (QuestionType.MATCHING_TEXT, QuestionType.MATCHING_IMAGE):
+        pairs = _key_pairs(answers)
+        return {"left": sorted({left for left, _ in pairs}, key=token), "right": sorted({right for _, right in pairs}, key=token)}
+    return None
+
+def _check_one(expected: FrozenSet[str], submitted: Any) -> bool:
+    return not isinstance(submitted, (list, dict)) and token(submitted) in expected
+
+def _check_set(expected: FrozenSet[str], submitted: Any) -> bool:
+    if not isinstance(submitted, list):
+        submitted = [submitted]
+    return frozenset(token(value) for value in submitted) == expected
+
+def _check_text(expected: Tuple[FrozenSet[str], ...], submitted: Any) -> bool:
+    if not isinstance(submitted, list):
+        submitted = [submitted]
+    return len(submitted) == len(expected) and all(
+        normalize_text(value) in accepted for value, accepted in zip(submitted, expected)
+    )
+
+def _check_sequence(expected: Tuple[str, ...], submitted: Any) -> bool:
+    return isinstance(submitted, list) and tuple(token(value) for value in submitted) == expected
+
+def _check_pairs(expected: FrozenSet[Tuple[str, str]], submitted: Any) -> bool:
+    return _submitted_pairs(submitted) == expected
+
+_CHECKS: Dict[str, Callable[[Any, Any], bool]] = {
+    ONE: _check_one,
+    SET: _check_set,
+    TEXT: _check_text,
+    SEQUENCE: _check_sequence,
+    PAIRS: _check_pairs,
+}
+
+@dataclass
+class CompiledQuiz:
+    quiz_id: int
+    version: str
+    passing_grade_percent: Optional[int]
+    max_questions: Optional[int]
+    time_limit_minutes: Optional[int]
+    keys: Dict[int, AnswerKey]  # question id -> key, in question order
+    questions: Dict[int, Dict[str, Any]]  # question id -> learner-facing question (no answer key)
+
+def draw_questions(quiz: CompiledQuiz, seed: int) -> List[int]:
+    """
+    Question ids of one attempt: a random sample of `max_questions` determined by the
+    seed (the whole pool when the quiz has no limit), kept in question order.
+    """
+    question_ids = list(quiz.keys)
+    if not quiz.max_questions or quiz.max_questions >= len(question_ids):
+        return question_ids
+    drawn = set(random.Random(seed).sample(question_ids, quiz.max_questions))
+    return [question_id for question_id in question_ids if question_id in drawn]
+
+def grade(quiz: CompiledQuiz, answers: Mapping[int, Any], question_ids: Optional[Collection[int]] = None) -> Dict[str, Any]:
+    """
+    Grade a whole submission against the compiled keys in one pass, over the drawn
+    `question_ids` or the whole quiz. Unanswered questions score 0; manually graded
+    ones are reported with `correct` None and excluded from the maximum score.
+    Raises KeyError for answers to questions outside the graded set.
+    """
+    keys = quiz.keys if question_ids is None else {question_id: quiz.keys[question_id] for question_id in question_ids}
+    unknown = [question_id for question_id in answers if question_id not in keys]
+    if unknown:
+        raise KeyError(unknown)
+
+    score = max_score = 0
+    results = []
+    for question_id, key in keys.items():
+        if key.kind == MANUAL:
+            results.append({"question_id": question_id, "correct": None, "points_awarded": 0})
+            continue
+        max_score += key.points
+        submitted = answers.get(question_id)
+        correct = submitted is not None and _CHECKS[key.kind](key.expected, submitted)
+        if correct:
+            score += key.points
+        results.append({"question_id": question_id, "correct": correct, "points_awarded": key.points if correct else 0})
+
+    percent = round(score * 100 / max_score, 2) if max_score else 0.0
+    return {
+        "quiz_id": quiz.quiz_id,
+        "score": score,
+        "max_score": max_score,
+        "percent": percent,
+        "passed": percent >= quiz.passing_grade_percent if quiz.passing_grade_percent is not None else None,
+        "results": results,
+    }
+
+def compile_quiz(session: Session, quiz_id: int, settings, version: str) -> CompiledQuiz:
+    """Answer keys and the learner-facing question pool of a quiz, from one question query"""
+    keys, questions = {}, {}
+    for question_id, type_label, question_text, points, answers, question_order in QuestionRepository.get_answer_rows(session, quiz_id):
+        question_type = QUESTION_TYPE_MAPPING.get(type_label or "SINGLE", QuestionType.SINGLE)
+        keys[question_id] = compile_answer_key(question_id, question_type, points, answers)
+        questions[question_id] = {
+            "id": question_id,
+            "type": question_type,
+            "question_text": question_text,
+            "points": points,
+            "question_order": question_order,
+            "answers": public_answers(question_type, answers),
+        }
+    _, passing_grade_percent, max_questions, time_limit_minutes, _ = settings
+    return CompiledQuiz(quiz_id, version, passing_grade_percent, max_questions, time_limit_minutes, keys, questions)
+
+class QuizCache:
+    """
+    Compiled answer keys and question pools per quiz, reused while the quiz version (the quiz row's
+    settings and questions_version, read by primary key) is unchanged. Bounded LRU, safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._quizzes: "OrderedDict[int, CompiledQuiz]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, session: Session, quiz_id: int) -> Optional[CompiledQuiz]:
+        """The compiled quiz, or None if it does not exist or is inactive"""
+        settings = QuizRepository.get_grading_settings(session, quiz_id)
+        if settings is None:
+            return None
+        version = hashlib.sha256(repr(tuple(settings)).encode()).hexdigest()[:16]
+        with self._lock:
+            cached = self._quizzes.get(quiz_id)
+            if cached and cached.version == version:
+                self._quizzes.move_to_end(quiz_id)
+                self.hits += 1
+                return cached
+
+        compiled = compile_quiz(session, quiz_id, settings, version)
+        with self._lock:
+            self._quizzes[quiz_id] = compiled
+            self._quizzes.move_to_end(quiz_id)
+            while len(self._quizzes) > self.max_entries:
+                self._quizzes.popitem(last=False)
+            self.builds += 1
+        logger.info(f"Compiled answer keys for quiz {quiz_id}: {len(compiled.keys)} questions")
+        return compiled
+
+    def stats(self) -> dict:
+        return {"entries": len(self._quizzes), "hits": self.hits, "builds": self.builds}
+
+quiz_cache = QuizCache()
+
+def get_quiz_cache() -> QuizCache:
+    """FastAPI dependency returning the shared compiled-quiz cache"""
+    return quiz_cache
@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+VIDEO_SAS_TTL_SECONDS = int(os.getenv("VIDEO_SAS_TTL_SECONDS", "3600"))
+
+class SasUrlSigner:
+    """
+    Mints short-lived read-only SAS tokens for blobs in one container.
+
+    Tokens are HMAC-signed locally with the account key (no storage request) and
+    cached per blob path until `refresh_margin_seconds` before they expire, so the
+    same playlist keeps the same URL (and stays cacheable by players and CDNs)
+    for most of the token lifetime.
+    """
+
+    def __init__(self, account_name: str, account_key: str, container_name: str,
+                 ttl_seconds: int = VIDEO_SAS_TTL_SECONDS, refresh_margin_seconds: int = 300,
+                 max_entries: int = 100000):
+        self.account_name = account_name
+        self.account_key = account_key
+        self.container_name = container_name
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = min(refresh_margin_seconds, ttl_seconds // 2)
+        self.max_entries = max_entries
+        self._tokens: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.minted = 0
+        self.hits = 0
+
+    def token(self, blob_name: str) -> str:
+        return self.tokens([blob_name])[blob_name]
+
+    def tokens(self, blob_names: Iterable[str]) -> Dict[str, str]:
+        """SAS tokens for many blobs; tokens minted together share one expiry"""
+        from azure.storage.blob import BlobSasPermissions, generate_blob_sas
+
+        now = time.time()
+        result: Dict[str, str] = {}
+        missing = []
+        with self._lock:
+            for blob_name in blob_names:
+                cached = self._tokens.get(blob_name)
+                if cached and cached[0] - self.refresh_margin_seconds > now:
+                    self._tokens.move_to_end(blob_name)
+                    result[blob_name] = cached[1]
+                    self.hits += 1
+                else:
+                    missing.append(blob_name)
+
+        if missing:
+            expires_at = now + self.ttl_seconds
+            expiry = datetime.fromtimestamp(expires_at, timezone.utc)
+            permission = BlobSasPermissions(read=True)
+            minted = {
+                blob_name: generate_blob_sas(
+                    self.account_name,
+                    self.container_name,
+                    blob_name,
+                    account_key=self.account_key,
+                    permission=permission,
+                    expiry=expiry
+                )
+                for blob_name in missing
+            }
+            with self._lock:
+                for blob_name, token in minted.items():
+                    self._tokens[blob_name] = (expires_at, token)
+                    self._tokens.move_to_end(blob_name)
+                while len(self._tokens) > self.max_entries:
+                    self._tokens.popitem(last=False)
+                self.minted += len(minted)
+            result.update(minted)
+        return result
+
+    def refresh_at(self, blob_names: Iterable[str]) -> float:
+        """Earliest time (epoch seconds) at which any of these cached tokens gets re-minted"""
+        with self._lock:
+            expiries = [self._tokens[name][0] for name in blob_names if name in self._tokens]
+        return min(expiries, default=time.time()) - self.refresh_margin_seconds
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._tokens), "minted": self.minted, "hits": self.hits}
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlmodel import Session
+from cou_course.repositories.flashcard_review_repository import FlashcardReviewRepository
+
+MIN_EASE_FACTOR = 1.3
+PASSING_GRADE = 3  # Grades 0-2 are lapses: the card starts over
+MAX_INTERVAL_DAYS = 36500
+
+@dataclass(frozen=True)
+class Schedule:
+    ease_factor: float = 2.5
+    interval_days: int = 0
+    repetitions: int = 0
+    lapses: int = 0
+
+def sm2(schedule: Schedule, grade: int) -> Schedule:
+    """Next SM-2 schedule after a review graded 0 (blackout) to 5 (perfect recall)"""
+    if grade >= PASSING_GRADE:
+        if schedule.repetitions == 0:
+            interval = 1
+        elif schedule.repetitions == 1:
+            interval = 6
+        else:
+            interval = min(round(schedule.interval_days * schedule.ease_factor), MAX_INTERVAL_DAYS)
+        repetitions, lapses = schedule.repetitions + 1, schedule.lapses
+    else:
+        interval, repetitions, lapses = 1, 0, schedule.lapses + 1
+    miss = 5 - grade
+    ease_factor = max(MIN_EASE_FACTOR, schedule.ease_factor + 0.1 - miss * (0.08 + miss * 0.02))
+    return Schedule(round(ease_factor, 4), interval, repetitions, lapses)
+
+def submit_reviews(session: Session, user_id: int, reviews: List[Tuple[int, int, Optional[datetime]]]) -> List[Dict[str, Any]]:
+    """
+    Apply a batch of (flashcard_id, grade, reviewed_at) reviews in order: the states are
+    read under a row lock, fresh ones are inserted for never-reviewed cards (ON CONFLICT
+    DO NOTHING, then read locked too), and all are updated and logged with one bulk write
+    each. Returns the resulting schedule per card; unknown cards raise KeyError.
+    """
+    now = datetime.now(timezone.utc)
+    flashcard_ids = list(dict.fromkeys(flashcard_id for flashcard_id, _, _ in reviews))
+    courses = FlashcardReviewRepository.get_card_courses(session, flashcard_ids)
+    unknown = [flashcard_id for flashcard_id in flashcard_ids if flashcard_id not in courses]
+    if unknown:
+        raise KeyError(unknown)
+
+    rows = FlashcardReviewRepository.get_states(session, user_id, flashcard_ids)
+    missing = {flashcard_id: courses[flashcard_id] for flashcard_id in flashcard_ids if flashcard_id not in rows}
+    if missing:
+        # A concurrent batch may create the same states first; its rows are kept and used
+        FlashcardReviewRepository.create_missing_states(session, user_id, missing, now)
+        rows.update(FlashcardReviewRepository.get_states(session, user_id, list(missing)))
+    schedules = {
+        flashcard_id: Schedule(ease_factor, interval_days, repetitions, lapses)
+        for flashcard_id, _, ease_factor, interval_days, repetitions, lapses in rows.values()
+    }
+    reviewed: Dict[int, datetime] = {}
+    logs = []
+    for flashcard_id, grade, reviewed_at in reviews:
+        if reviewed_at is None:
+            reviewed_at = now
+        elif reviewed_at.tzinfo is None:
+            reviewed_at = reviewed_at.replace(tzinfo=timezone.utc)  # Naive client timestamps are UTC
+        schedule = sm2(schedules[flashcard_id], grade)
+        schedules[flashcard_id] = schedule
+        reviewed[flashcard_id] = reviewed_at
+        logs.append({
+            "user_id": user_id, "flashcard_id": flashcard_id, "grade": grade, "reviewed_at": reviewed_at,
+            "interval_days": schedule.interval_days, "ease_factor": schedule.ease_factor
+        })
+
+    changed_states, results = [], []
+    for flashcard_id, reviewed_at in reviewed.items():
+        schedule = schedules[flashcard_id]
+        values = {
+            "ease_factor": schedule.ease_factor, "interval_days": schedule.interval_days,
+            "repetitions": schedule.repetitions, "lapses": schedule.lapses,
+            "due_at": reviewed_at + timedelta(days=schedule.interval_days), "last_reviewed_at": reviewed_at
+        }
+        changed_states.append({"id": rows[flashcard_id][1], **values})
+        results.append({"flashcard_id": flashcard_id, **values})
+
+    FlashcardReviewRepository.save_reviews(session, changed_states, logs)
+    return results
+
+def due_cards(session: Session, user_id: int, course_id: Optional[int], limit: int, new_count: int) -> Dict[str, Any]:
+    """Cards due for review (earliest first) and, for a course, up to `new_count` never-reviewed cards"""
+    now = datetime.now(timezone.utc)
+    due = [
+        {"flashcard_id": flashcard_id, "front": front, "back": back, "clue": clue, "due_at": due_at, "interval_days": interval}
+        for flashcard_id, front, back, clue, due_at, interval in FlashcardReviewRepository.get_due(session, user_id, now, limit, course_id)
+    ]
+    new = []
+    if course_id is not None and new_count:
+        new = [
+            {"flashcard_id": flashcard_id, "front": front, "back": back, "clue": clue}
+            for flashcard_id, front, back, clue in FlashcardReviewRepository.get_new_cards(session, user_id, course_id, new_count)
+        ]
+    return {"user_id": user_id, "course_id": course_id, "due": due, "new": new}
@@ -0,0 +1,45 @@
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Tuple, runtime_checkable
+
+# "azure", "local", or "auto" (Azure when a connection string is set, else LOCAL_VIDEO_ROOT)
+VIDEO_STORAGE_BACKEND = os.getenv("VIDEO_STORAGE_BACKEND", "auto").lower()
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """
+    What the video, HLS and upload features need from the lessons storage.
+
+    Implemented by BlobStorage (Azure Blob Storage, or Azurite) and LocalFileStorage
+    (a local directory). Blob names are "/"-separated paths relative to the container;
+    `get_properties` and `download` return None for missing blobs.
+    """
+
+    source: str  # Recorded as Lesson.video_source for uploads
+
+    def url(self, blob_name: str) -> str: ...
+
+    def signed_url(self, blob_name: str) -> str: ...
+
+    def signed_urls(self, blob_names: List[str]) -> List[str]: ...
+
+    async def get_properties(self, blob_name: str) -> Optional[Any]: ...
+
+    async def download(self, blob_name: str) -> Optional[Tuple[bytes, str]]: ...
+
+    def open_range(self, blob_name: str, offset: int, length: int) -> AsyncIterator[bytes]: ...
+
+    def list_blobs(self, name_starts_with: Optional[str] = None) -> AsyncIterator[Any]: ...
+
+    def list_prefixes(self, name_starts_with: Optional[str] = None) -> AsyncIterator[str]: ...
+
+    def list_folder(self, name_starts_with: Optional[str] = None) -> AsyncIterator[Any]: ...
+
+    async def put(self, blob_name: str, data: bytes, content_type: Optional[str] = None) -> str: ...
+
+    async def get_staged_blocks(self, blob_name: str) -> Dict[str, int]: ...
+
+    async def stage_block(self, blob_name: str, block_id: str, data: bytes) -> None: ...
+
+    async def commit_blocks(self, blob_name: str, block_ids: List[str], content_type: Optional[str] = None) -> None: ...
+
+    async def close(self) -> None: ...
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from common.database import new_session
+from cou_course.services.storage_backend import StorageBackend
+from cou_course.services.blob_storage import get_blob_storage
+from cou_course.services.periodic_job import PeriodicJob
+from cou_course.repositories.video_asset_repository import VideoAssetRepository
+
+logger = logging.getLogger(__name__)
+
+VIDEO_CATALOG_SYNC_SECONDS = int(os.getenv("VIDEO_CATALOG_SYNC_SECONDS", "600"))
+VIDEO_EXTENSIONS = (".mp4", ".m4v", ".mov", ".webm", ".mkv")
+# An HLS video is cataloged by its master playlist; variant playlists and segments are not videos
+HLS_MASTER_PLAYLIST = "master.m3u8"
+
+def is_video(blob_name: str) -> bool:
+    return blob_name.lower().endswith(VIDEO_EXTENSIONS) or blob_name.rsplit("/", 1)[-1] == HLS_MASTER_PLAYLIST
+
+class VideoCatalogReconciler(PeriodicJob):
+    """
+    Keeps the `video_asset` table in sync with the lessons container.
+
+    Videos live at the top of the container or directly in a lesson folder
+    (`lesson-<id>/`), so a run lists just those levels, one delimited listing per
+    folder: HLS rendition folders, which hold the segments, are never listed. The
+    result is diffed against the table by ETag, so only new, changed or removed
+    videos (and lessons whose video_path changed) are written. Videos that
+    disappeared are deactivated rather than deleted.
+    """
+
+    name = "video_catalog_sync"
+
+    def __init__(self, session_factory=new_session,
+                 interval_seconds: int = VIDEO_CATALOG_SYNC_SECONDS):
+        super().__init__(interval_seconds, session_factory)
+        self.storage: Optional[StorageBackend] = None  # The app's storage backend unless set
+        self.last_run: Optional[Dict[str, int]] = None
+
+    async def list_videos(self, storage: StorageBackend) -> Dict[str, Dict[str, Any]]:
+        blobs = {}
+        folders = [None] + [prefix async for prefix in storage.list_prefixes()]
+        for folder in folders:
+            async for blob in storage.list_folder(folder):
+                if is_video(blob.name):
+                    blobs[blob.name] = {
+                        "name": blob.name,
+                        "size": blob.size,
+                        "content_type": blob.content_settings.content_type,
+                        "etag": blob.etag,
+                        "last_modified": blob.last_modified,
+                    }
+        return blobs
+
+    async def reconcile(self, storage: StorageBackend) -> Dict[str, int]:
+        blobs = await self.list_videos(storage)
+        self.last_run = await asyncio.to_thread(self._apply, blobs)
+        logger.info(f"Video catalog reconciled: {self.last_run}")
+        return self.last_run
+
+    def _apply(self, blobs: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        now = datetime.now(timezone.utc)
+        with self.session_factory() as session:
+            catalog = VideoAssetRepository.get_catalog(session)
+            links = VideoAssetRepository.get_lesson_links(session)
+
+            inserts, updates = [], []
+            for name, blob in blobs.items():
+                lesson_id, course_id = links.get(name, (None, None))
+                row = {**blob, "lesson_id": lesson_id, "course_id": course_id, "active": True, "updated_at": now}
+                asset = catalog.get(name)
+                if asset is None:
+                    inserts.append({**row, "created_at": now})
+                elif (asset.etag, asset.lesson_id, asset.course_id, asset.active) != (blob["etag"], lesson_id, course_id, True):
+                    updates.append({**row, "id": asset.id})
+
+            deactivate_ids = [asset.id for name, asset in catalog.items() if asset.active and name not in blobs]
+
+            VideoAssetRepository.apply_changes(session, inserts, updates, deactivate_ids)
+            session.commit()
+
+        return {"inserted": len(inserts), "updated": len(updates), "deactivated": len(deactivate_ids)}
+
+    def run_now(self) -> Optional[Dict[str, int]]:
+        """One blocking run, for callers outside the event loop (the schedule awaits `execute`); None without storage"""
+        storage = self.storage or get_blob_storage()
+        if storage is None:
+            return None
+        return asyncio.run(self.reconcile(storage))
+
+    async def execute(self) -> Dict[str, int]:
+        return await self.reconcile(self.storage)
+
+    async def run_if_due(self) -> Optional[Dict[str, int]]:
+        if self.storage is None:
+            self.storage = get_blob_storage()
+            if self.storage is None:
+                return None  # Video storage is not configured
+        return await super().run_if_due()
+
+video_catalog_reconciler = VideoCatalogReconciler()
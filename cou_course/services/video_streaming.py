@@ -0,0 +1,42 @@
+import re
+from typing import Optional, Tuple
+from fastapi import HTTPException
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `Range: bytes=...` header into an inclusive (start, end) pair.
+
+    Returns None when the whole file should be sent: no header, or one that RFC 9110
+    says to ignore (malformed, a last position before the first, or a multi-range
+    request, which servers may ignore). Raises 416 when a valid range cannot be satisfied.
+    """
+    if not range_header:
+        return None
+    match = _RANGE_PATTERN.match(range_header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise _unsatisfiable(size)
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None  # Invalid range-spec
+    if start >= size:
+        raise _unsatisfiable(size)
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+def _unsatisfiable(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=416,
+        detail="Requested range not satisfiable",
+        headers={"Content-Range": f"bytes */{size}"}
+    )
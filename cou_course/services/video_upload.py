@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import mimetypes
+import os
+import re
+import secrets
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional, Set
+from cou_course.services.storage_backend import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+VIDEO_UPLOAD_BLOCK_SIZE = int(os.getenv("VIDEO_UPLOAD_BLOCK_SIZE", str(8 * 1024 * 1024)))
+VIDEO_UPLOAD_CONCURRENCY = int(os.getenv("VIDEO_UPLOAD_CONCURRENCY", "4"))
+
+_FILENAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,254}$")
+_UPLOAD_TOKEN = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+class VideoUploadError(ValueError):
+    """The upload cannot be staged or committed as requested (size mismatch, empty body)"""
+
+class UploadOffsetError(VideoUploadError):
+    """The requested resume offset is not covered by the staged blocks"""
+
+def valid_filename(filename: str) -> bool:
+    return bool(_FILENAME.match(filename)) and ".." not in filename
+
+def valid_upload_token(upload_token: str) -> bool:
+    return bool(_UPLOAD_TOKEN.match(upload_token))
+
+def upload_id(blob_name: str, total_size: Optional[int], upload_token: Optional[str]) -> str:
+    """
+    Same blob, size and client upload token -> same upload id, so a retried upload finds
+    its staged blocks. Without a token every upload gets a fresh id: another file of the
+    same name and size never reuses (splices in) blocks staged for a different one.
+    """
+    if upload_token is None:
+        return secrets.token_hex(8)
+    return hashlib.sha256(f"{blob_name}:{total_size}:{upload_token}".encode()).hexdigest()[:16]
+
+def block_id(upload: str, index: int) -> str:
+    # Every block id of a blob must have the same length
+    return f"{upload}-{index:08d}"
+
+async def rechunk(stream: AsyncIterator[bytes], block_size: int) -> AsyncIterator[bytes]:
+    """Regroup a request body (arbitrary chunk sizes) into `block_size` blocks; only the last may be shorter"""
+    buffer = bytearray()
+    async for chunk in stream:
+        buffer += chunk
+        while len(buffer) >= block_size:
+            yield bytes(buffer[:block_size])
+            del buffer[:block_size]
+    if buffer:
+        yield bytes(buffer)
+
+@dataclass
+class UploadResult:
+    blob_name: str
+    committed: bool
+    offset: int  # Bytes of the file staged so far (where a resumed upload continues)
+    blocks_staged: int
+    blocks_skipped: int
+
+class VideoUploader:
+    """
+    Streams an upload into storage as fixed-size blocks.
+
+    Up to `concurrency` blocks are staged in parallel; reading the request body pauses
+    while all slots are busy, so memory per upload stays around (concurrency + 1) blocks.
+    Block ids are derived from the blob name, file size, the client's upload token and
+    the block index: a retried or resumed upload (same token) skips the blocks storage
+    already has, and the block list is only committed once the whole file is staged.
+    """
+
+    def __init__(self, block_size: int = VIDEO_UPLOAD_BLOCK_SIZE, concurrency: int = VIDEO_UPLOAD_CONCURRENCY):
+        self.block_size = block_size
+        self.concurrency = concurrency
+
+    async def resume_offset(self, storage: StorageBackend, blob_name: str, total_size: Optional[int],
+                            upload_token: Optional[str]) -> int:
+        """Bytes of the upload already staged as consecutive full blocks from the start of the file"""
+        if upload_token is None:
+            return 0
+        staged = await storage.get_staged_blocks(blob_name)
+        return self._staged_prefix(staged, upload_id(blob_name, total_size, upload_token)) * self.block_size
+
+    def _staged_prefix(self, staged: Dict[str, int], upload: str) -> int:
+        count = 0
+        while staged.get(block_id(upload, count)) == self.block_size:
+            count += 1
+        return count
+
+    async def upload(self, storage: StorageBackend, blob_name: str, stream: AsyncIterator[bytes],
+                     total_size: Optional[int] = None, offset: int = 0, upload_token: Optional[str] = None) -> UploadResult:
+        """
+        Stage the body (the file from `offset` on) and commit the block list once the
+        file is complete: when the body ends and `total_size` is unknown or reached.
+        Only an upload with an `upload_token` can be resumed.
+        """
+        upload = upload_id(blob_name, total_size, upload_token)
+        staged = await storage.get_staged_blocks(blob_name)
+        if offset % self.block_size or offset > self._staged_prefix(staged, upload) * self.block_size:
+            raise UploadOffsetError(f"Cannot resume at byte {offset}; query the upload status for the resume offset")
+
+        index = offset // self.block_size
+        blocks_staged = blocks_skipped = received = 0
+        slots = asyncio.Semaphore(self.concurrency)
+        pending: Set[asyncio.Task] = set()
+
+        async def stage(block_index: int, data: bytes) -> None:
+            try:
+                await storage.stage_block(blob_name, block_id(upload, block_index), data)
+            finally:
+                slots.release()
+
+        try:
+            async for data in rechunk(stream, self.block_size):
+                received += len(data)
+                if total_size is not None and offset + received > total_size:
+                    raise VideoUploadError(f"The body is larger than the declared {total_size} bytes")
+                if staged.get(block_id(upload, index)) == len(data):
+                    blocks_skipped += 1
+                else:
+                    await slots.acquire()
+                    # Surface a failed block before reading more of the body
+                    failed = [task for task in pending if task.done() and task.exception()]
+                    if failed:
+                        slots.release()
+                        raise failed[0].exception()
+                    pending = {task for task in pending if not task.done()}
+                    pending.add(asyncio.create_task(stage(index, data)))
+                    blocks_staged += 1
+                index += 1
+            if pending:
+                await asyncio.gather(*pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise
+
+        size = offset + received
+        if total_size is not None and size < total_size:
+            # A trailing partial block is staged again when the upload resumes
+            return UploadResult(blob_name, False, size - size % self.block_size, blocks_staged, blocks_skipped)
+        if size == 0:
+            raise VideoUploadError("The upload body is empty")
+
+        content_type, _ = mimetypes.guess_type(blob_name)
+        await storage.commit_blocks(blob_name, [block_id(upload, i) for i in range(index)], content_type)
+        logger.info(f"Committed upload '{blob_name}': {index} blocks ({blocks_skipped} already staged)")
+        return UploadResult(blob_name, True, size, blocks_staged, blocks_skipped)
+
+video_uploader = VideoUploader()
+
+def get_video_uploader() -> VideoUploader:
+    """FastAPI dependency returning the shared uploader"""
+    return video_uploader
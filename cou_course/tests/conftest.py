@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, create_engine
+import main  # noqa: F401 - configures all mappers
+# Targets of Course's foreign keys, which the app itself never imports
+import cou_admin.models.language  # noqa: F401
+import cou_course.models.coursetype  # noqa: F401
+import cou_course.models.sellstype  # noqa: F401
+from cou_course.models.topic import Topic
+from cou_course.models.lesson import Lesson
+from cou_course.models.quiz import Quiz
+from cou_course.models.question import Question
+from cou_course.models.flashcard import Flashcard
+from cou_course.models.mindmap import Mindmap
+from cou_course.models.memory_game import MemoryGame
+from cou_course.models.memory_game_pair import MemoryGamePair
+from cou_course.models.video_asset import VideoAsset
+from cou_course.models.lesson_order import LessonOrder
+from cou_course.models.learner_progress import LearnerProgress
+from cou_course.models.flashcard_review import FlashcardReviewState, FlashcardReviewLog
+from cou_course.models.course import Course
+from cou_course.models.course_rating import CourseRating
+from cou_course.models.enrollment import Enrollment, EnrollmentCounterShard
+from cou_course.models.course_recommendation import CourseRecommendation
+from cou_course.models.course_content_counter import CourseContentCounter
+from cou_course.models.job_run import JobRun
+from cou_course.models.quiz_attempt import QuizAttempt
+from cou_course.models.coursecategory import CourseCategory
+from cou_course.models.coursesubcategory import CourseSubcategory
+from cou_mentor.models.mentor import Mentor
+from cou_user.models.user import User
+
+CONTENT_TABLES = [
+    Topic.__table__, Lesson.__table__, Quiz.__table__, Question.__table__,
+    Flashcard.__table__, Mindmap.__table__, MemoryGame.__table__, MemoryGamePair.__table__,
+    VideoAsset.__table__, LessonOrder.__table__, LearnerProgress.__table__,
+    FlashcardReviewState.__table__, FlashcardReviewLog.__table__, Course.__table__, CourseRating.__table__,
+    Enrollment.__table__, EnrollmentCounterShard.__table__, CourseRecommendation.__table__, CourseContentCounter.__table__, JobRun.__table__,
+    QuizAttempt.__table__,
+    CourseCategory.__table__, CourseSubcategory.__table__, Mentor.__table__, User.__table__,
+]
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine with the cou_course, cou_mentor and cou_user schemas attached and their tables created."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, _):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS cou_course")
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS cou_mentor")
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS cou_user")
+
+    SQLModel.metadata.create_all(engine, tables=CONTENT_TABLES)
+    return engine
@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from azure.core.exceptions import ResourceNotFoundError
+
+
+def fake_blob(name, content=None, etag="0x1"):
+    """BlobProperties-like object for the in-memory container."""
+    content = name.encode() if content is None else content
+    return SimpleNamespace(
+        name=name,
+        size=len(content),
+        etag=etag,
+        last_modified=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        content=content,
+        content_settings=SimpleNamespace(content_type="application/x-mpegURL")
+    )
+
+
+class FakeBlobClient:
+    def __init__(self, container, name):
+        self.container = container
+        self.name = name
+
+    async def get_blob_properties(self):
+        self.container.calls.append(("get_blob_properties", self.name))
+        if self.name not in self.container.blobs:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return self.container.blobs[self.name]
+
+    async def download_blob(self, offset=0, length=None):
+        self.container.calls.append(("download_blob", self.name, offset, length))
+        end = None if length is None else offset + length
+        blob = self.container.blobs.get(self.name)
+        if blob is None:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return FakeDownloader(blob.content[offset:end], self.container.chunk_size, blob.etag)
+
+
+    async def upload_blob(self, data, overwrite=False, content_settings=None):
+        self.container.calls.append(("upload_blob", self.name))
+        etag = f"0x{len(self.container.calls)}"
+        self.container.blobs[self.name] = fake_blob(self.name, bytes(data), etag=etag)
+        return {"etag": etag}
+
+    async def get_block_list(self, block_list_type="committed"):
+        self.container.calls.append(("get_block_list", self.name))
+        staged = self.container.staged.get(self.name)
+        if staged is None and self.name not in self.container.blobs:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        uncommitted = [SimpleNamespace(id=block_id, size=len(data)) for block_id, data in (staged or {}).items()]
+        return [], uncommitted
+
+    async def stage_block(self, block_id, data, length=None):
+        self.container.calls.append(("stage_block", self.name, block_id))
+        if self.container.fail_stage_block == block_id:
+            raise IOError("Injected stage_block failure")
+        self.container.staged.setdefault(self.name, {})[block_id] = bytes(data)
+
+    async def commit_block_list(self, block_list, content_settings=None):
+        self.container.calls.append(("commit_block_list", self.name, len(block_list)))
+        staged = self.container.staged.pop(self.name)
+        content = b"".join(staged[block.id] for block in block_list)
+        self.container.blobs[self.name] = fake_blob(self.name, content, etag=f"0x{len(self.container.calls)}")
+
+
+class FakeDownloader:
+    def __init__(self, content, chunk_size, etag):
+        self.content = content
+        self.chunk_size = chunk_size
+        self.properties = SimpleNamespace(etag=etag)
+
+    async def readall(self):
+        return self.content
+
+    async def chunks(self):
+        for position in range(0, len(self.content), self.chunk_size):
+            yield self.content[position:position + self.chunk_size]
+
+
+class FakeContainerClient:
+    """In-memory stand-in for azure.storage.blob.aio.ContainerClient (Azurite-style URL)."""
+
+    url = "http://127.0.0.1:10000/devstoreaccount1/lessons"
+    chunk_size = 4
+
+    def __init__(self, names):
+        self.calls = []
+        self.staged = {}
+        self.fail_stage_block = None
+        self.blobs = {
+            name: fake_blob(name)
+            for name in names
+        }
+
+    def get_blob_client(self, name):
+        return FakeBlobClient(self, name)
+
+    async def list_blobs(self, name_starts_with=None):
+        self.calls.append(("list_blobs", name_starts_with))
+        for name in sorted(self.blobs):
+            if name.startswith(name_starts_with or ""):
+                yield self.blobs[name]
+
+    async def walk_blobs(self, name_starts_with=None, delimiter="/"):
+        self.calls.append(("walk_blobs", name_starts_with))
+        prefix = name_starts_with or ""
+        seen = set()
+        for name in sorted(self.blobs):
+            if not name.startswith(prefix):
+                continue
+            rest = name[len(prefix):]
+            if delimiter in rest:
+                folder = prefix + rest.split(delimiter)[0] + delimiter
+                if folder not in seen:
+                    seen.add(folder)
+                    yield SimpleNamespace(name=folder)
+            else:
+                yield self.blobs[name]
+
+    async def close(self):
+        pass
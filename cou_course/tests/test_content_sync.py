@@ -0,0 +1,114 @@
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, select
+from fastapi.testclient import TestClient
+from main import app
+from common.database import get_session
+from cou_course.models.course import Course
+from cou_course.models.lesson import Lesson
+from cou_course.models.question import Question
+from cou_course.repositories.course_import_repository import CourseImportRepository
+from cou_course.repositories.lesson_repository import LessonRepository
+from cou_course.repositories.question_repository import QuestionRepository
+from cou_course.schemas.lesson_schema import LessonUpdate
+from cou_course.services import content_sync
+from cou_course.tests.test_course_import_repository import sample_document
+
+URL = "/api/v1/course-learning/courses"
+
+
+@pytest.fixture
+def client(engine, monkeypatch):
+    """Courses 1 and 2 with the same imported content; changes settle immediately."""
+    monkeypatch.setattr(content_sync, "CONTENT_SYNC_SETTLE_SECONDS", 0)
+    with Session(engine) as session:
+        session.add_all([Course(id=1, title="A"), Course(id=2, title="B")])
+        CourseImportRepository.import_course_content(session, 1, sample_document())
+        CourseImportRepository.import_course_content(session, 2, sample_document())
+        session.commit()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    app.dependency_overrides[get_session] = session_override
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_session, None)
+
+
+def sizes(result):
+    return {kind: len(rows) for kind, rows in result["changes"].items() if rows}
+
+
+def test_snapshot_then_deltas_with_tombstones(client, engine):
+    snapshot = client.get(f"{URL}/1/changes").json()
+    assert snapshot["since"] is None
+    assert sizes(snapshot) == {
+        "topics": 2, "lessons": 2, "quizzes": 2, "questions": 3, "flashcards": 1,
+        "mindmaps": 1, "memory_games": 1, "memory_game_pairs": 2,
+    }
+    assert not any(snapshot["deleted"].values())
+
+    with Session(engine) as session:
+        lesson_id = session.exec(select(Lesson.id).where(Lesson.course_id == 1, Lesson.title == "Intro")).one()
+        other_course_lesson = session.exec(select(Lesson.id).where(Lesson.course_id == 2)).first()
+        question_id = session.exec(select(Question.id).order_by(Question.id)).first()
+        LessonRepository.update_lesson(session, lesson_id, LessonUpdate(title="Welcome"))
+        LessonRepository.update_lesson(session, other_course_lesson, LessonUpdate(title="Elsewhere"))
+        QuestionRepository.delete_question(session, question_id)
+        session.commit()
+
+    delta = client.get(f"{URL}/1/changes", params={"since": snapshot["watermark"]}).json()
+    assert sizes(delta) == {"lessons": 1}
+    assert delta["changes"]["lessons"][0]["title"] == "Welcome"
+    assert delta["deleted"]["questions"] == [question_id]
+
+    assert not sizes(client.get(f"{URL}/1/changes", params={"since": delta["watermark"]}).json())
+    assert client.get(f"{URL}/9/changes").status_code == 404
+
+
+def test_questions_are_synced_without_the_answer_key(client, engine):
+    with Session(engine) as session:
+        question = session.exec(select(Question).where(Question.question_text == "Q2")).first()
+        question.answers = [{"text": "True", "is_correct": True}, {"text": "False", "is_correct": False}]
+        session.add(question)
+        session.commit()
+
+    questions = client.get(f"{URL}/1/changes").json()["changes"]["questions"]
+    assert next(q for q in questions if q["question_text"] == "Q2")["answers"] == [{"text": "True"}, {"text": "False"}]
+
+
+def test_unsettled_changes_wait_for_the_next_sync(client, engine, monkeypatch):
+    watermark = client.get(f"{URL}/1/changes").json()["watermark"]
+    monkeypatch.setattr(content_sync, "CONTENT_SYNC_SETTLE_SECONDS", 60)
+    with Session(engine) as session:
+        LessonRepository.update_lesson(session, session.exec(select(Lesson.id)).first(), LessonUpdate(title="Just now"))
+        session.commit()
+
+    result = client.get(f"{URL}/1/changes", params={"since": watermark}).json()
+    assert not sizes(result)
+    assert result["watermark"] == result["since"] == watermark
+
+
+def test_invalid_watermark_is_rejected(client):
+    assert client.get(f"{URL}/1/changes", params={"since": "yesterday"}).status_code == 400
+
+
+def test_postgres_watermark_is_the_oldest_transaction_in_flight():
+    """On Postgres the watermark is read first, and rows are matched by the id of their last writing transaction."""
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.exec.return_value.one.return_value = 1200
+    session.exec.return_value.__iter__.return_value = iter([])
+
+    result = content_sync.get_changes(session, 1, "1100")
+
+    statements = [str(call.args[0].compile(dialect=postgresql.dialect())) for call in session.exec.call_args_list]
+    assert "txid_snapshot_xmin(txid_current_snapshot())" in statements[0]
+    assert all("change_xid >=" in statement and "updated_at >" not in statement for statement in statements[1:])
+    assert "cou_course.question.change_xid" in next(statement for statement in statements if "FROM cou_course.question" in statement)
+    assert (result["since"], result["watermark"]) == ("1100", "1200")
+    with pytest.raises(ValueError):
+        content_sync.get_changes(session, 1, "2024-01-01T00:00:00")
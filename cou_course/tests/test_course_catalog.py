@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from sqlmodel import Session
+from fastapi.testclient import TestClient
+from main import app
+from common.database import get_session
+from cou_course.models.course import Course
+from cou_course.models.course_catalog import course_catalog
+from cou_course.models.coursecategory import CourseCategory
+from cou_course.models.coursesubcategory import CourseSubcategory
+from cou_course.models.topic import Topic
+from cou_course.models.lesson import Lesson
+from cou_course.repositories.course_catalog_repository import CourseCatalogRepository
+from cou_course.repositories.course_repository import CourseRepository
+from cou_course.services.course_catalog import CourseCatalogRefresher, course_catalog_refresher
+from cou_mentor.models.mentor import Mentor
+from cou_user.models.user import User
+
+URL = "/api/v1/courses"
+
+
+@pytest.fixture
+def client(engine):
+    """Course 1 (Programming > Python, taught by user 7) with content; course 2 in another category without a mentor."""
+    now = datetime.now(timezone.utc)  # CourseCategory defaults to naive timestamps
+    with Session(engine) as session:
+        session.add_all([
+            CourseCategory(id=1, name="Programming", created_at=now, updated_at=now),
+            CourseCategory(id=2, name="Design", created_at=now, updated_at=now),
+        ])
+        session.add(CourseSubcategory(id=10, category_id=1, name="Python"))
+        session.add(User(id=7, display_name="", first_name="Ada", last_name="Lovelace", created_by=1, updated_by=1))
+        session.add(Mentor(id=1, user_id=7, designation="Engineer"))
+        session.add_all([
+            Course(id=1, title="Python 101", category_id=1, subcategory_id=10, mentor_id=7, Course_level="beginner", price=0),
+            Course(id=2, title="Color", category_id=2, Course_level="advanced", price=30),
+        ])
+        session.add_all([Topic(id=1, course_id=1, title="Basics", created_by=1), Topic(id=2, course_id=1, title="Old", created_by=1, active=False)])
+        session.add_all([Lesson(id=i, course_id=1, topic_id=1, title=f"L{i}", created_by=1) for i in range(1, 4)])
+        session.commit()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    app.dependency_overrides[get_session] = session_override
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_session, None)
+
+
+def test_live_query_has_the_view_columns(engine):
+    with Session(engine) as session:
+        assert list(CourseCatalogRepository.source(session).c.keys()) == list(course_catalog.c.keys())
+
+
+def test_catalog_cards_carry_instructor_names_and_counts(client):
+    cards = client.get(f"{URL}/").json()
+    assert [card["id"] for card in cards] == [1, 2]
+    python = cards[0]
+    assert python["instructor"] == {"id": 7, "name": "Ada Lovelace", "profession": "Engineer"}
+    assert (python["category_name"], python["subcategory_name"]) == ("Programming", "Python")
+    assert (python["topic_count"], python["lesson_count"], python["total_enrollments"]) == (1, 3, 0)
+    assert cards[1]["instructor"] is None
+
+    assert [card["title"] for card in client.get(f"{URL}/categories/2").json()] == ["Color"]
+    assert client.get(f"{URL}/?skip=1&limit=1").json()[0]["id"] == 2
+
+
+def test_filters_read_the_catalog(client, engine):
+    with Session(engine) as session:
+        assert [c["id"] for c in CourseRepository.filter_courses(session, price_type="free")] == [1]
+        assert [c["id"] for c in CourseRepository.filter_courses(session, level="Advanced", min_price=10)] == [2]
+        assert CourseRepository.filter_courses(session, subcategory_id=10)[0]["category_name"] == "Programming"
+
+
+def test_committed_course_writes_schedule_a_refresh(client, engine):
+    course_catalog_refresher.dirty = False
+    with Session(engine) as session:
+        session.get(Course, 2).title = "Colour"
+        session.flush()
+        session.rollback()
+    assert course_catalog_refresher.dirty is False
+
+    with Session(engine) as session:
+        session.get(Course, 2).title = "Colour"
+        session.commit()
+    assert course_catalog_refresher.dirty is True
+
+    refresher = CourseCatalogRefresher(session_factory=lambda: Session(engine))
+    assert refresher.seconds_until_due() == 0
+    assert asyncio.run(refresher.run_if_due()) is False  # No materialized view on SQLite; reads are live
+    assert refresher.seconds_until_due() > 290
+    refresher.mark_dirty()
+    assert refresher.seconds_until_due() == 0
+    course_catalog_refresher.dirty = False
@@ -0,0 +1,99 @@
+import pytest
+from sqlmodel import Session, update
+from fastapi.testclient import TestClient
+from main import app
+from common.database import get_session
+from cou_course.models.course import Course
+from cou_course.models.lesson import Lesson
+from cou_course.models.course_content_counter import CourseContentCounter
+from cou_course.repositories.course_content_counter_repository import CourseContentCounterRepository
+from cou_course.repositories.course_import_repository import CourseImportRepository
+from cou_course.repositories.lesson_repository import LessonRepository
+from cou_course.repositories.topic_repository import TopicRepository
+from cou_course.schemas.lesson_schema import LessonCreate, LessonUpdate
+from cou_course.schemas.topic_schema import TopicCreate
+from cou_course.services.course_content_counters import CourseContentCounterRepair
+from cou_course.tests.test_course_import_repository import sample_document
+
+URL = "/api/v1/course-learning/courses"
+
+
+@pytest.fixture
+def client(engine):
+    """Course 1 with two lessons written before counters existed; course 2 empty."""
+    with Session(engine) as session:
+        session.add_all([Course(id=1, title="A"), Course(id=2, title="B")])
+        session.add_all([Lesson(id=i, course_id=1, topic_id=1, title=f"L{i}", created_by=1) for i in (1, 2)])
+        session.commit()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    app.dependency_overrides[get_session] = session_override
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_session, None)
+
+
+def summary(engine, course_id):
+    with Session(engine) as session:
+        counts = CourseContentCounterRepository.get_summary(session, course_id)
+        session.commit()
+    return counts
+
+
+def lesson(course_id, **fields):
+    return LessonCreate(topic_id=1, course_id=course_id, title="New", created_by=1, **fields)
+
+
+def test_first_write_counts_then_increments(client, engine):
+    with Session(engine) as session:
+        created = LessonRepository.create_lesson(session, lesson(1)).id
+        LessonRepository.create_lesson(session, lesson(1, active=False))
+        TopicRepository.create_topic(session, TopicCreate(course_id=1, title="T", created_by=1))
+        session.commit()
+    assert summary(engine, 1) == {
+        "total_lessons": 3, "total_quizzes": 0, "total_flashcards": 0,
+        "total_mindmaps": 0, "total_memory_games": 0, "total_topics": 1,
+    }
+
+    with Session(engine) as session:
+        assert LessonRepository.delete_lesson(session, created) is True
+        assert LessonRepository.delete_lesson(session, created) is True  # Already deleted: not counted twice
+        assert LessonRepository.delete_lesson(session, 999) is False
+        LessonRepository.update_lesson(session, 1, LessonUpdate(active=False))
+        LessonRepository.update_lesson(session, 2, LessonUpdate(title="Renamed"))
+        session.commit()
+    assert summary(engine, 1)["total_lessons"] == 1
+
+    with Session(engine) as session:
+        LessonRepository.update_lesson(session, 1, LessonUpdate(active=True))
+        session.commit()
+    assert summary(engine, 1)["total_lessons"] == 2
+
+
+def test_import_and_summary_endpoint(client, engine):
+    assert client.get(f"{URL}/2/content-summary").json()["total_lessons"] == 0
+    with Session(engine) as session:
+        CourseImportRepository.import_course_content(session, 2, sample_document())
+        session.commit()
+
+    assert client.get(f"{URL}/2/content-summary").json() == {
+        "total_lessons": 2, "total_quizzes": 2, "total_flashcards": 1,
+        "total_mindmaps": 1, "total_memory_games": 1, "total_topics": 2,
+    }
+    assert client.get(f"{URL}/9/content-summary").status_code == 404
+
+
+def test_repair_corrects_drift(client, engine):
+    summary(engine, 1)
+    with Session(engine) as session:
+        session.exec(update(CourseContentCounter).where(CourseContentCounter.course_id == 1).values(total_lessons=40))
+        session.exec(update(Lesson).where(Lesson.id == 2).values(active=False))
+        session.commit()
+
+    repair = CourseContentCounterRepair(session_factory=lambda: Session(engine))
+    assert repair.run_now() == 1
+    assert summary(engine, 1)["total_lessons"] == 1
+    assert repair.run_now() == 0
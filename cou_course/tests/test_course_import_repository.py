@@ -0,0 +1,74 @@
+from sqlalchemy import event
+from sqlmodel import Session, select
+from cou_course.models.topic import Topic
+from cou_course.models.question import Question
+from cou_course.models.memory_game import MemoryGame
+from cou_course.models.memory_game_pair import MemoryGamePair
+from cou_course.repositories.course_import_repository import CourseImportRepository
+from cou_course.schemas.course_import_schema import CourseContentImport
+
+
+def sample_document():
+    return CourseContentImport(
+        created_by=7,
+        topics=[
+            {
+                "title": "Basics",
+                "lessons": [{"title": "Intro"}, {"title": "Setup"}],
+                "quizzes": [{"title": "Quiz 1", "questions": [
+                    {"question_text": "Q1"}, {"question_text": "Q2", "type": "TRUE_FALSE"}
+                ]}],
+                "flashcards": [{"flashcard_set_id": 1, "front": "f", "back": "b"}],
+            },
+            {
+                "title": "Advanced",
+                "quizzes": [{"title": "Quiz 2", "questions": [{"question_text": "Q3"}]}],
+                "mindmaps": [{"mindmap_mermaid": "graph TD; A-->B"}],
+                "memory_games": [{"description": "Match", "pairs": [
+                    {"term": "a", "term_description": "A"}, {"term": "b", "term_description": "B"}
+                ]}],
+            },
+        ],
+    )
+
+
+def test_import_resolves_foreign_keys(engine):
+    """Children are attached to the ids returned for their parents."""
+    with Session(engine) as session:
+        result = CourseImportRepository.import_course_content(session, 3, sample_document())
+        session.commit()
+
+        topics = session.exec(select(Topic).order_by(Topic.id)).all()
+        assert [t.id for t in topics] == result.topic_ids
+        assert [(t.title, t.topic_order, t.course_id) for t in topics] == [("Basics", 1, 3), ("Advanced", 2, 3)]
+
+        basics, advanced = topics
+        assert [l.title for l in basics.lessons] == ["Intro", "Setup"]
+        assert [q.title for q in advanced.quizzes] == ["Quiz 2"]
+        assert [q.question_text for q in advanced.quizzes[0].questions] == ["Q3"]
+
+        questions = session.exec(select(Question).order_by(Question.id)).all()
+        assert [(q.question_text, q.question_order) for q in questions] == [("Q1", 1), ("Q2", 2), ("Q3", 1)]
+
+        game = session.exec(select(MemoryGame)).one()
+        assert game.topic_id == advanced.id
+        pairs = session.exec(select(MemoryGamePair).order_by(MemoryGamePair.pair_order)).all()
+        assert [(p.term, p.memory_game_id) for p in pairs] == [("a", game.id), ("b", game.id)]
+
+        assert (result.total_lessons, result.total_questions, result.total_memory_game_pairs) == (2, 3, 2)
+
+
+def test_import_batches_leaf_tables(engine):
+    """Tables whose ids are not needed are written with one executemany each."""
+    tables = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        tables.append(statement.split()[2])
+
+    with Session(engine) as session:
+        CourseImportRepository.import_course_content(session, 3, sample_document())
+
+    # SQLite runs ordered RETURNING inserts row by row; PostgreSQL batches those too
+    for table in ("lesson", "flashcard", "mindmap", "question", "memory_game_pair"):
+        assert tables.count(f"cou_course.{table}") == 1
@@ -0,0 +1,70 @@
+from sqlalchemy import event
+from sqlmodel import Session, select
+from cou_course.models.lesson import Lesson
+from cou_course.models.topic import Topic
+from cou_course.repositories.lesson_repository import LessonRepository
+from cou_course.schemas.lesson_schema import LessonUpdate
+from cou_course.services.course_outline import CourseOutlineCache
+from cou_course.tests.test_course_sequence import course  # noqa: F401 - fixture
+
+
+def count_selects(engine):
+    selects = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        selects.append(statement)
+
+    return selects
+
+
+def test_outline_tree_follows_lesson_order(course):
+    """Topics come by topic_order and their components by LessonOrder.sort_order."""
+    response = course.get("/api/v1/course-learning/courses/3/outline")
+    outline = response.json()
+
+    assert response.headers["etag"] == f'"{outline["version"]}"'
+    basics, advanced = outline["topics"]
+    assert [(c["component_type"], c["title"]) for c in basics["components"]] == [
+        ("lesson", "Intro"), ("flashcards", None), ("quiz", "Quiz 1"), ("lesson", "Setup")
+    ]
+    assert basics["components"][1]["item_count"] == 1
+    assert [c["component_type"] for c in advanced["components"]] == ["memory_game", "mindmap", "quiz"]
+    assert course.get(
+        "/api/v1/course-learning/courses/3/outline", headers={"If-None-Match": response.headers["etag"]}
+    ).status_code == 304
+
+
+def test_outline_uses_fixed_query_count_and_cache(course, engine):
+    """The outline is built from a fixed number of queries, then served while the version holds."""
+    cache = CourseOutlineCache()
+    with Session(engine) as session:
+        selects = count_selects(engine)
+        first = cache.get(session, 3)
+        # version, topics, LessonOrder, four component tables, flashcard sets
+        assert len(selects) == 8
+
+        selects.clear()
+        assert cache.get(session, 3) is first
+        assert len(selects) == 1
+
+        lesson_id = session.exec(select(Lesson.id).where(Lesson.title == "Setup")).one()
+        LessonRepository.update_lesson(session, lesson_id, LessonUpdate(title="Install"))
+        session.commit()
+        renamed = cache.get(session, 3)
+
+    assert renamed is not first
+    assert "Install" in [c.title for c in renamed.outline.topics[0].components]
+    assert b'"Install"' in renamed.body
+
+
+def test_unplaced_components_are_listed_after_ordered_ones(course, engine):
+    """Content missing from LessonOrder still appears under its topic."""
+    with Session(engine) as session:
+        topic_id = session.exec(select(Topic.id).where(Topic.title == "Advanced")).one()
+        session.add(Lesson(topic_id=topic_id, course_id=3, title="Extra", created_by=7))
+        session.commit()
+        outline = CourseOutlineCache().get(session, 3).outline
+
+    assert outline.topics[1].components[-1].title == "Extra"
+    assert outline.topics[1].components[-1].order_id is None
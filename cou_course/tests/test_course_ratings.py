@@ -0,0 +1,102 @@
+import pytest
+from sqlmodel import Session, select, update
+from fastapi.testclient import TestClient
+from main import app
+from common.database import get_session
+from auth_bl.utils import get_current_user
+from cou_course.models.course import Course
+from cou_course.repositories.course_repository import CourseRepository
+from cou_course.services.course_ratings import CourseRatingReconciler
+
+URL = "/api/v1/courses"
+
+
+@pytest.fixture
+def client(engine):
+    """Courses 1-3 (course 3 carries a rating entered before ratings were collected)."""
+    with Session(engine) as session:
+        session.add_all([Course(id=1, title="A"), Course(id=2, title="B"), Course(id=3, title="C", ratings=4, rating_average=4.0)])
+        session.commit()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    app.dependency_overrides[get_session] = session_override
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_session, None)
+
+
+@pytest.fixture(autouse=True)
+def learner():
+    """The signed-in learner (5 unless a test switches it)"""
+    signed_in = {"user_id": 5}
+    app.dependency_overrides[get_current_user] = lambda: signed_in["user_id"]
+    yield signed_in
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def rate(client, learner, course_id, user_id, **submission):
+    learner["user_id"] = user_id
+    return client.put(f"{URL}/{course_id}/ratings", json=submission)
+
+
+def unrate(client, learner, course_id, user_id):
+    learner["user_id"] = user_id
+    return client.delete(f"{URL}/{course_id}/ratings")
+
+
+def aggregates(engine, course_id):
+    with Session(engine) as session:
+        return session.exec(
+            select(Course.rating_sum, Course.rating_count, Course.rating_average, Course.ratings).where(Course.id == course_id)
+        ).one()
+
+
+def test_submissions_update_running_aggregates(client, engine, learner):
+    """New ratings add to sum and count; a changed rating only moves the sum; withdrawing removes it."""
+    assert rate(client, learner, 1, 5, rating=5).json() == {
+        "course_id": 1, "rating_average": 5.0, "rating_count": 1, "user_rating": 5
+    }
+    rate(client, learner, 1, 6, rating=2, review="Too fast")
+    summary = rate(client, learner, 1, 5, rating=4).json()
+
+    assert (summary["rating_average"], summary["rating_count"]) == (3.0, 2)
+    assert aggregates(engine, 1) == (6, 2, 3.0, 3)
+
+    assert unrate(client, learner, 1, 6).json()["rating_average"] == 4.0
+    assert unrate(client, learner, 1, 6).status_code == 404
+    assert rate(client, learner, 9, 5, rating=3).status_code == 404
+    assert rate(client, learner, 1, 5, rating=6).status_code == 422
+
+
+def test_catalog_filters_and_sorts_on_average(client, engine, learner):
+    rate(client, learner, 1, 5, rating=5)
+    rate(client, learner, 2, 5, rating=3)
+
+    with Session(engine) as session:
+        ranked = CourseRepository.filter_courses(session, sort_by_rating=True)
+        rated = CourseRepository.filter_courses(session, min_ratings=3.5)
+    assert [course["id"] for course in ranked] == [1, 3, 2]
+    assert sorted(course["id"] for course in rated) == [1, 3]
+
+
+def test_reconciliation_repairs_drift(client, engine, learner):
+    rate(client, learner, 1, 5, rating=4)
+    rate(client, learner, 1, 6, rating=2)
+    with Session(engine) as session:
+        session.execute(update(Course).where(Course.id == 1).values(rating_sum=99, rating_count=7))
+        session.commit()
+
+    reconciler = CourseRatingReconciler(lambda: Session(engine))
+    assert reconciler.run_now() == 1
+    assert aggregates(engine, 1) == (6, 2, 3.0, 3)
+    assert aggregates(engine, 3)[2:] == (4.0, 4)  # Unrated courses are left alone
+    assert reconciler.run_now() == 0
+
+
+def test_rating_requires_a_signed_in_learner(client):
+    app.dependency_overrides.pop(get_current_user, None)
+    assert client.put(f"{URL}/1/ratings", json={"rating": 5}).status_code == 401
+    assert client.delete(f"{URL}/1/ratings").status_code == 401
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from sqlmodel import Session, update
+from fastapi.testclient import TestClient
+from main import app
+from common.database import get_session
+from cou_course.models.course import Course
+from cou_course.services.course_recommendations import CourseRecommendationJob, build_features, top_k
+
+URL = "/api/v1/courses"
+
+
+@pytest.fixture
+def client(engine):
+    """Two near-identical beginner coding courses, an advanced coding course, a beginner art course and an empty one."""
+    with Session(engine) as session:
+        session.add_all([
+            Course(id=1, title="Python", Course_level="beginner", IT=True, Coding_Required=True, price=10),
+            Course(id=2, title="Java", Course_level="beginner", IT=True, Coding_Required=True, price=15),
+            Course(id=3, title="Rust", Course_level="advanced", IT=True, Coding_Required=True, price=150),
+            Course(id=4, title="Painting", Course_level="beginner", IT=False, Coding_Required=False, price=12),
+            Course(id=5, title="Untitled", IT=None, Coding_Required=None, price=None),
+        ])
+        session.commit()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    app.dependency_overrides[get_session] = session_override
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_session, None)
+
+
+def test_top_k_matches_brute_force():
+    rng = np.random.default_rng(7)
+    features = rng.random((300, 12), dtype=np.float32)
+    features /= np.linalg.norm(features, axis=1, keepdims=True)
+
+    neighbours, scores = top_k(features, 5)
+
+    sims = features @ features.T
+    np.fill_diagonal(sims, -np.inf)
+    expected = np.argsort(-sims, axis=1, kind="stable")[:, :5]
+    assert (neighbours == expected).all()
+    assert np.allclose(scores, np.take_along_axis(sims, expected, axis=1))
+
+
+def test_features_are_normalized_weighted_one_hots():
+    empty = dict(subcategory_id=None, course_type_id=None, language_id=None, IT=None, Coding_Required=None, price=None)
+    rows = [
+        SimpleNamespace(id=1, category_id=1, Course_level="beginner", **empty),
+        SimpleNamespace(id=2, category_id=1, Course_level="advanced", **empty),
+        SimpleNamespace(id=3, category_id=None, Course_level=None, **empty),
+    ]
+    features = build_features(rows)
+    assert np.allclose(np.linalg.norm(features[:2], axis=1), 1.0)
+    assert not features[2].any()
+    # Shared category (weight 2) out of category + level (2 + 1)
+    assert features[0] @ features[1] == pytest.approx(2 / 3)
+
+
+def test_job_stores_and_endpoint_serves_neighbours(client, engine):
+    job = CourseRecommendationJob(session_factory=lambda: Session(engine, expire_on_commit=False), k=3)
+    assert job.run_now()["courses"] == 5
+    assert job.seconds_until_due() > 86000  # Due again once the stored set is a day old
+
+    related = client.get(f"{URL}/1/recommendations").json()
+    assert [course["id"] for course in related] == [2, 4, 3]
+    assert related[0]["score"] == pytest.approx(1.0)
+    assert related[0]["score"] > related[1]["score"] > related[2]["score"] > 0
+    assert [course["id"] for course in client.get(f"{URL}/1/recommendations?limit=1").json()] == [2]
+    # A course sharing nothing with the catalog gets no recommendations
+    assert client.get(f"{URL}/5/recommendations").json() == []
+
+    # Rebuilding replaces the previous set; inactive courses drop out
+    with Session(engine) as session:
+        session.exec(update(Course).where(Course.id == 2).values(active=False))
+        session.commit()
+    job.run_now()
+    assert [course["id"] for course in client.get(f"{URL}/1/recommendations").json()] == [4, 3]
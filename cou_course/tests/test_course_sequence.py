@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+from fastapi.testclient import TestClient
+from main import app
+from common.database import get_session
+from cou_course.models.lesson import Lesson
+from cou_course.models.quiz import Quiz
+from cou_course.models.question import Question
+from cou_course.models.mindmap import Mindmap
+from cou_course.models.memory_game import MemoryGame
+from cou_course.models.lesson_order import LessonOrder, ComponentType
+from cou_course.repositories.course_import_repository import CourseImportRepository
+from cou_course.tests.test_course_import_repository import sample_document
+
+
+@pytest.fixture
+def course(engine):
+    """Imported sample course with a LessonOrder sequence; topic 2 comes first by topic_order."""
+    with Session(engine) as session:
+        result = CourseImportRepository.import_course_content(session, 3, sample_document())
+        basics, advanced = result.topic_ids
+        intro, setup = session.exec(select(Lesson.id).order_by(Lesson.id)).all()
+        quiz_1, quiz_2 = session.exec(select(Quiz.id).order_by(Quiz.id)).all()
+        mindmap = session.exec(select(Mindmap.id)).one()
+        game = session.exec(select(MemoryGame.id)).one()
+        rows = [
+            (basics, ComponentType.QUIZ, quiz_1, 3),
+            (basics, ComponentType.LESSON, intro, 1),
+            (basics, ComponentType.FLASHCARDS, 1, 2),
+            (basics, ComponentType.LESSON, setup, None),
+            (advanced, ComponentType.MINDMAP, mindmap, 2),
+            (advanced, ComponentType.MEMORY_GAME, game, 1),
+            (advanced, ComponentType.QUIZ, quiz_2, 3),
+        ]
+        session.add_all([
+            LessonOrder(course_id=3, topic_id=topic_id, component_type=component_type, lesson_ref_id=ref_id,
+                        sort_order=sort_order, created_by=7)
+            for topic_id, component_type, ref_id, sort_order in rows
+        ])
+        session.commit()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    app.dependency_overrides[get_session] = session_override
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_session, None)
+
+
+def test_sequence_follows_topic_and_sort_order(course):
+    """Components are ordered by topic_order, then sort_order (unordered last)."""
+    response = course.get("/api/v1/course-learning/courses/3/sequence?count=20").json()
+
+    assert [c["component_type"] for c in response["components"]] == [
+        "lesson", "flashcards", "quiz", "lesson", "memory_game", "mindmap", "quiz"
+    ]
+    assert response["next_after"] is None
+
+
+def test_prefetch_window_is_hydrated_with_batched_queries(course, engine):
+    """A window of components is hydrated with one query per component type and child table."""
+    first = course.get("/api/v1/course-learning/courses/3/sequence?count=2").json()
+    assert first["next_after"] == first["components"][1]["order_id"]
+
+    selects = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    window = course.get(f"/api/v1/course-learning/courses/3/sequence?after={first['next_after']}&count=3").json()
+    quiz, lesson, game = window["components"]
+
+    assert [q["question_text"] for q in quiz["content"]["questions"]] == ["Q1", "Q2"]
+    assert lesson["content"]["title"] == "Setup"
+    assert [p["term"] for p in game["content"]["pairs"]] == ["a", "b"]
+    # Sequence, lessons, quizzes, memory games, questions, pairs
+    assert len(selects) == 6
+
+    flashcards = first["components"][1]["content"]
+    assert [card["front"] for card in flashcards["cards"]] == ["f"]
+
+
+def test_prefetched_questions_hide_the_answer_key(course, engine):
+    with Session(engine) as session:
+        question = session.exec(select(Question).where(Question.question_text == "Q2")).one()
+        question.answers = [{"text": "True", "is_correct": True}, {"text": "False", "is_correct": False}]
+        session.add(question)
+        session.commit()
+
+    response = course.get("/api/v1/course-learning/courses/3/sequence?count=20").json()
+    quiz = next(c for c in response["components"] if c["component_type"] == "quiz" and c["content"]["questions"])
+    q2 = next(q for q in quiz["content"]["questions"] if q["question_text"] == "Q2")
+
+    assert q2["answers"] == [{"text": "True"}, {"text": "False"}]
+
+
+def test_unknown_position_is_404(course):
+    assert course.get("/api/v1/course-learning/courses/3/sequence?after=999").status_code == 404
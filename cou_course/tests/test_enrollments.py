@@ -0,0 +1,133 @@
+import pytest
+from sqlmodel import Session, select, update
+from fastapi.testclient import TestClient
+from main import app
+from common.database import get_session
+from auth_bl.utils import get_current_user
+from cou_course.models.course import Course
+from cou_course.models.enrollment import EnrollmentCounterShard
+from cou_course.services.enrollments import EnrollmentCounterRollup, EnrollmentCounterRecount
+from cou_mentor.models.mentor import Mentor
+
+URL = "/api/v1/courses"
+
+
+@pytest.fixture
+def client(engine):
+    """Courses 1 and 2 taught by mentor 7, course 3 without a mentor."""
+    with Session(engine) as session:
+        session.add(Mentor(id=1, user_id=7))
+        session.add_all([Course(id=1, title="A", mentor_id=7), Course(id=2, title="B", mentor_id=7), Course(id=3, title="C")])
+        session.commit()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    app.dependency_overrides[get_session] = session_override
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_session, None)
+
+
+@pytest.fixture(autouse=True)
+def learner():
+    """The signed-in learner (5 unless a test switches it)"""
+    signed_in = {"user_id": 5}
+    app.dependency_overrides[get_current_user] = lambda: signed_in["user_id"]
+    yield signed_in
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def enroll(client, learner, course_id, user_id):
+    learner["user_id"] = user_id
+    return client.put(f"{URL}/{course_id}/enrollments")
+
+
+def unenroll(client, learner, course_id, user_id):
+    learner["user_id"] = user_id
+    return client.delete(f"{URL}/{course_id}/enrollments")
+
+
+@pytest.fixture
+def rollup(engine):
+    return EnrollmentCounterRollup(session_factory=lambda: Session(engine, expire_on_commit=False))
+
+
+def totals(engine):
+    with Session(engine) as session:
+        courses = dict(session.exec(select(Course.id, Course.total_enrollments)).all())
+        return courses, session.exec(select(Mentor.total_students)).one()
+
+
+def test_enrollment_is_idempotent_and_counted_exactly(client, engine, learner):
+    assert enroll(client, learner, 1, 5).json() == {
+        "course_id": 1, "user_id": 5, "enrolled": True, "changed": True, "total_enrollments": 1
+    }
+    assert enroll(client, learner, 1, 5).json()["changed"] is False
+    for user_id in range(6, 40):
+        enroll(client, learner, 1, user_id)
+
+    assert client.get(f"{URL}/1/enrollments/count").json()["total_enrollments"] == 35
+    with Session(engine) as session:
+        # Writers were spread over counter shards instead of one hot course row
+        assert len(session.exec(select(EnrollmentCounterShard)).all()) == 16
+        assert session.get(Course, 1).total_enrollments == 0
+
+    assert unenroll(client, learner, 1, 5).json()["total_enrollments"] == 34
+    assert unenroll(client, learner, 1, 5).status_code == 404
+    assert enroll(client, learner, 1, 5).json()["changed"] is True
+    assert enroll(client, learner, 9, 5).status_code == 404
+
+
+def test_rollup_feeds_course_and_mentor_totals(client, engine, rollup, learner):
+    for user_id in range(10):
+        enroll(client, learner, 1, user_id)
+        enroll(client, learner, 3, user_id)
+    for user_id in range(4):
+        enroll(client, learner, 2, user_id)
+    unenroll(client, learner, 2, 0)
+
+    assert rollup.run_now() == {"courses": 3, "mentors": 1}
+    assert totals(engine) == ({1: 10, 2: 3, 3: 10}, 13)
+    assert client.get(f"{URL}/2/enrollments/count").json()["total_enrollments"] == 3
+
+    # Only courses with pending changes are touched by the next rollup
+    unenroll(client, learner, 1, 3)
+    assert rollup.run_now() == {"courses": 1, "mentors": 1}
+    assert totals(engine) == ({1: 9, 2: 3, 3: 10}, 12)
+    assert rollup.run_now() == {"courses": 0, "mentors": 0}
+
+
+def test_recount_repairs_drifted_counters(client, engine, rollup, learner):
+    for user_id in range(5):
+        enroll(client, learner, 2, user_id)
+    with Session(engine) as session:
+        session.exec(update(Course).where(Course.id == 1).values(total_enrollments=40))
+        session.commit()
+
+    assert EnrollmentCounterRecount(rollup.session_factory).run_now() == {"courses": 2, "mentors": 1}
+    assert totals(engine) == ({1: 0, 2: 5, 3: 0}, 5)
+    assert rollup.run_now() == {"courses": 0, "mentors": 0}
+
+
+def test_recount_moves_students_with_a_course_changing_mentor(client, engine, rollup, learner):
+    with Session(engine) as session:
+        session.add(Mentor(id=2, user_id=8))
+        session.commit()
+    for user_id in range(3):
+        enroll(client, learner, 2, user_id)
+    rollup.run_now()
+    with Session(engine) as session:
+        session.exec(update(Course).where(Course.id == 2).values(mentor_id=8))
+        session.commit()
+
+    assert EnrollmentCounterRecount(rollup.session_factory).run_now() == {"courses": 0, "mentors": 2}
+    with Session(engine) as session:
+        assert dict(session.exec(select(Mentor.user_id, Mentor.total_students)).all()) == {7: 0, 8: 3}
+
+
+def test_enrollment_requires_a_signed_in_learner(client):
+    app.dependency_overrides.pop(get_current_user, None)
+    assert client.put(f"{URL}/1/enrollments").status_code == 401
+    assert client.delete(f"{URL}/1/enrollments").status_code == 401
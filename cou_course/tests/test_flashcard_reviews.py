@@ -0,0 +1,103 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlmodel import Session, select
+from fastapi.testclient import TestClient
+from main import app
+from common.database import get_session
+from auth_bl.utils import get_current_user
+from cou_course.models.flashcard import Flashcard
+from cou_course.models.flashcard_review import FlashcardReviewLog, FlashcardReviewState
+from cou_course.repositories.flashcard_review_repository import FlashcardReviewRepository
+from cou_course.services.spaced_repetition import Schedule, sm2
+
+URL = "/api/v1/course-learning/reviews"
+
+
+@pytest.fixture
+def cards(engine):
+    """Five cards of course 3 in one set, and an API client on the test engine with learner 5 signed in."""
+    with Session(engine) as session:
+        flashcards = [
+            Flashcard(course_id=3, topic_id=1, flashcard_set_id=1, front=f"F{i}", back=f"B{i}", card_order=i, created_by=7)
+            for i in range(5)
+        ]
+        session.add_all(flashcards)
+        session.commit()
+        ids = [card.id for card in flashcards]
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    signed_in = {"user_id": 5}
+    app.dependency_overrides[get_session] = session_override
+    app.dependency_overrides[get_current_user] = lambda: signed_in["user_id"]
+    yield TestClient(app), ids, signed_in
+    app.dependency_overrides.pop(get_session, None)
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_sm2_intervals():
+    """1 day, 6 days, then interval x ease; a lapse starts over and lowers the ease."""
+    schedule = Schedule()
+    intervals = []
+    for grade in (5, 4, 4, 2, 3):
+        schedule = sm2(schedule, grade)
+        intervals.append(schedule.interval_days)
+    assert intervals == [1, 6, 16, 1, 1]
+    assert (schedule.repetitions, schedule.lapses) == (1, 1)
+    assert sm2(Schedule(ease_factor=1.3), 0).ease_factor == 1.3
+
+
+def test_batched_reviews_schedule_due_cards(cards, engine):
+    client, ids, signed_in = cards
+    day_ago = (datetime.utcnow() - timedelta(days=2)).isoformat()
+    response = client.post(URL, json={"reviews": [
+        {"flashcard_id": ids[0], "grade": 5, "reviewed_at": day_ago},
+        {"flashcard_id": ids[1], "grade": 1},
+        {"flashcard_id": ids[0], "grade": 4, "reviewed_at": day_ago},
+    ]})
+    schedules = {s["flashcard_id"]: s for s in response.json()["schedules"]}
+
+    assert response.status_code == 200
+    assert (schedules[ids[0]]["repetitions"], schedules[ids[0]]["interval_days"]) == (2, 6)
+    assert (schedules[ids[1]]["lapses"], schedules[ids[1]]["interval_days"]) == (1, 1)
+    with Session(engine) as session:
+        assert len(session.exec(select(FlashcardReviewLog)).all()) == 3
+
+    # Card 1 was due a day ago; card 0 is 4 days out; cards 2-4 are new
+    client.post(URL, json={"reviews": [{"flashcard_id": ids[1], "grade": 3, "reviewed_at": day_ago}]})
+    due = client.get(f"{URL}/due", params={"course_id": 3, "new_count": 2}).json()
+    assert [card["flashcard_id"] for card in due["due"]] == [ids[1]]
+    assert [card["flashcard_id"] for card in due["new"]] == ids[2:4]
+    signed_in["user_id"] = 6
+    assert client.get(f"{URL}/due", params={"course_id": 3}).json()["due"] == []
+
+
+def test_unknown_cards_are_rejected(cards):
+    client, _, _ = cards
+    assert client.post(URL, json={"reviews": [{"flashcard_id": 999, "grade": 3}]}).status_code == 400
+    assert client.post(URL, json={"reviews": [{"flashcard_id": 1, "grade": 6}]}).status_code == 422
+
+
+def test_reviews_require_a_signed_in_learner(cards):
+    client, ids, _ = cards
+    app.dependency_overrides.pop(get_current_user, None)
+    assert client.post(URL, json={"reviews": [{"flashcard_id": ids[0], "grade": 3}]}).status_code == 401
+    assert client.get(f"{URL}/due").status_code == 401
+
+
+def test_first_review_of_a_card_does_not_race_on_the_state_key(cards, engine):
+    """A state created by a concurrent batch is kept (ON CONFLICT DO NOTHING) and then updated."""
+    client, ids, _ = cards
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        FlashcardReviewRepository.create_missing_states(session, 5, {ids[0]: 3}, now)
+        FlashcardReviewRepository.create_missing_states(session, 5, {ids[0]: 3, ids[1]: 3}, now)
+        session.commit()
+
+    assert client.post(URL, json={"reviews": [{"flashcard_id": ids[0], "grade": 5}]}).status_code == 200
+    with Session(engine) as session:
+        states = session.exec(select(FlashcardReviewState).order_by(FlashcardReviewState.flashcard_id)).all()
+        assert [(state.flashcard_id, state.repetitions, state.ease_factor) for state in states] == [(ids[0], 1, 2.6), (ids[1], 0, 2.5)]
@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from cou_course.services.blob_storage import BlobStorage, get_blob_storage
+from cou_course.services.hls_manifest import HlsManifestService, get_hls_manifest_service, rewrite_playlist
+from cou_course.services.sas_signing import SasUrlSigner
+from cou_course.tests.fakes import FakeContainerClient, fake_blob
+
+ACCOUNT_KEY = "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+
+MASTER = b"""#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360
+360p/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=2800000,RESOLUTION=1280x720
+720p/index.m3u8
+"""
+
+VARIANT = b"""#EXTM3U
+#EXT-X-TARGETDURATION:6
+#EXT-X-MAP:URI="init.mp4"
+#EXTINF:6.0,
+seg0.ts
+#EXTINF:6.0,
+seg1.ts
+#EXT-X-ENDLIST
+"""
+
+
+@pytest.fixture
+def container():
+    container = FakeContainerClient([])
+    container.blobs["lesson-1/master.m3u8"] = fake_blob("lesson-1/master.m3u8", MASTER)
+    container.blobs["lesson-1/360p/index.m3u8"] = fake_blob("lesson-1/360p/index.m3u8", VARIANT)
+    container.blobs["lesson-1/720p/index.m3u8"] = fake_blob("lesson-1/720p/index.m3u8", VARIANT)
+    return container
+
+
+@pytest.fixture
+def storage(container):
+    return BlobStorage(container, signer=SasUrlSigner("devstoreaccount1", ACCOUNT_KEY, "lessons"))
+
+
+def test_rewrite_playlist_covers_uri_lines_and_attributes():
+    """URI lines and URI attributes are rewritten; tags are kept."""
+    rewritten = rewrite_playlist(VARIANT.decode(), lambda uri: f"X/{uri}")
+
+    assert 'URI="X/init.mp4"' in rewritten
+    assert "\nX/seg0.ts\n" in rewritten
+    assert "#EXT-X-TARGETDURATION:6" in rewritten
+
+
+def test_master_and_variants_are_built_together(storage, container):
+    """Variant playlists are warmed with the master and served from memory afterwards."""
+    service = HlsManifestService()
+    master = asyncio.run(service.get(storage, "lesson-1/master.m3u8"))
+
+    assert "/api/v1/course-learning/hls/lesson-1/playlist/360p/index.m3u8" in master.text
+    downloads = [call for call in container.calls if call[0] == "download_blob"]
+    assert len(downloads) == 3
+
+    variant = asyncio.run(service.get(storage, "lesson-1/360p/index.m3u8"))
+    assert f"{FakeContainerClient.url}/lesson-1/360p/seg0.ts?" in variant.text
+    assert len([call for call in container.calls if call[0] == "download_blob"]) == 3
+
+
+def test_changed_blob_is_rebuilt_after_revalidation(storage, container):
+    """Entries are revalidated by ETag and rebuilt when the blob changed."""
+    service = HlsManifestService(revalidate_seconds=0)
+    first = asyncio.run(service.get(storage, "lesson-1/720p/index.m3u8"))
+
+    assert asyncio.run(service.get(storage, "lesson-1/720p/index.m3u8")) is first
+
+    container.blobs["lesson-1/720p/index.m3u8"] = fake_blob(
+        "lesson-1/720p/index.m3u8", VARIANT.replace(b"seg1.ts", b"seg2.ts"), etag="0x2"
+    )
+    assert "seg2.ts" in asyncio.run(service.get(storage, "lesson-1/720p/index.m3u8")).text
+
+
+def test_cdn_prefix_and_cache_headers(container):
+    """With a CDN base URL segments are not signed; responses carry ETag and support 304."""
+    service = HlsManifestService(cdn_base_url="https://cdn.example.com/lessons", max_age_seconds=600)
+    app.dependency_overrides[get_blob_storage] = lambda: BlobStorage(container)
+    app.dependency_overrides[get_hls_manifest_service] = lambda: service
+    try:
+        client = TestClient(app)
+        url = "/api/v1/course-learning/hls/lesson-1/playlist/360p/index.m3u8"
+        response = client.get(url)
+        cached = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+        missing = client.get("/api/v1/course-learning/hls/lesson-9/playlist/master.m3u8")
+    finally:
+        app.dependency_overrides.pop(get_blob_storage, None)
+        app.dependency_overrides.pop(get_hls_manifest_service, None)
+
+    assert response.status_code == 200
+    assert "https://cdn.example.com/lessons/lesson-1/360p/seg0.ts" in response.text
+    assert response.headers["cache-control"] == "public, max-age=600"
+    assert response.headers["content-type"] == "application/vnd.apple.mpegurl"
+    assert cached.status_code == 304
+    assert missing.status_code == 404
@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+from main import app
+from auth_bl.utils import get_current_user
+from cou_course.models.learner_progress import LearnerProgress
+from cou_course.models.lesson_order import LessonOrder
+from cou_course.tests.test_course_sequence import course  # noqa: F401 - fixture
+
+URL = "/api/v1/course-learning/progress"
+
+
+@pytest.fixture(autouse=True)
+def learner():
+    """Learner 5 is signed in; tests switch by setting user_id."""
+    signed_in = {"user_id": 5}
+    app.dependency_overrides[get_current_user] = lambda: signed_in["user_id"]
+    yield signed_in
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def order_ids(engine):
+    with Session(engine) as session:
+        return session.exec(select(LessonOrder.id).order_by(LessonOrder.id)).all()
+
+
+def test_batched_update_sets_bits_per_learner(course, engine, learner):
+    """Completions are stored per signed-in learner as one bitset row per course."""
+    ids = order_ids(engine)
+    first = course.put(f"{URL}/courses/3", json={"completed": ids[:3]}).json()
+    learner["user_id"] = 6
+    other = course.get(f"{URL}/courses/3").json()
+    learner["user_id"] = 5
+
+    assert first["completed_order_ids"] == ids[:3]
+    assert (first["completed_count"], first["total_components"], first["completion_percentage"]) == (3, 7, 42.86)
+    assert other["completed_count"] == 0
+
+    updated = course.put(f"{URL}/courses/3", json={"completed": [ids[6]], "uncompleted": [ids[0]]}).json()
+    assert updated["completed_order_ids"] == [ids[1], ids[2], ids[6]]
+
+    with Session(engine) as session:
+        rows = session.exec(select(LearnerProgress)).all()
+        assert [(row.user_id, row.completed_bits) for row in rows] == [(5, bytes([0b1000110]))]
+
+
+def test_bits_are_stable_and_removed_components_are_ignored(course, engine):
+    """Deactivating a component keeps the other bits and drops it from the percentage."""
+    ids = order_ids(engine)
+    course.put(f"{URL}/courses/3", json={"completed": ids[:2]})
+
+    with Session(engine) as session:
+        bits = dict(session.exec(select(LessonOrder.id, LessonOrder.progress_bit)).all())
+        session.get(LessonOrder, ids[0]).active = False
+        session.add(LessonOrder(course_id=3, topic_id=1, component_type="quiz", lesson_ref_id=1, created_by=7))
+        session.commit()
+
+    progress = course.get(f"{URL}/courses/3").json()
+    assert progress["completed_order_ids"] == [ids[1]]
+    assert progress["total_components"] == 7
+
+    course.put(f"{URL}/courses/3", json={"completed": []})
+    with Session(engine) as session:
+        reassigned = dict(session.exec(select(LessonOrder.id, LessonOrder.progress_bit)).all())
+    assert all(reassigned[order_id] == bit for order_id, bit in bits.items())
+    assert max(reassigned.values()) == 7
+
+
+def test_reads_do_not_write(course, engine):
+    """GETs leave LessonOrder alone; components without a bit count as not completed."""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.lstrip().upper())
+
+    progress = course.get(f"{URL}/courses/3").json()
+    summaries = course.get(f"{URL}?course_ids=3").json()
+    event.remove(engine, "before_cursor_execute", record)
+
+    assert (progress["completed_count"], progress["total_components"]) == (0, 7)
+    assert summaries["courses"][0]["total_components"] == 7
+    assert all(statement.startswith("SELECT") for statement in statements)
+    with Session(engine) as session:
+        assert session.exec(select(LessonOrder.progress_bit)).all() == [None] * 7
+
+
+def test_summaries_for_many_courses(course, engine):
+    ids = order_ids(engine)
+    course.put(f"{URL}/courses/3", json={"completed": ids})
+
+    response = course.get(f"{URL}?course_ids=3&course_ids=4").json()
+    assert [(c["course_id"], c["completion_percentage"]) for c in response["courses"]] == [(3, 100.0), (4, 0.0)]
+
+
+def test_unknown_component_is_rejected(course):
+    assert course.put(f"{URL}/courses/3", json={"completed": [999]}).status_code == 400
+
+
+def test_progress_requires_a_signed_in_learner(course):
+    app.dependency_overrides.pop(get_current_user, None)
+    assert course.get(f"{URL}/courses/3").status_code == 401
+    assert course.put(f"{URL}/courses/3", json={"completed": []}).status_code == 401
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+from cou_course.models.course_content_counter import CourseContentCounter
+from cou_course.repositories.lesson_repository import LessonRepository
+from cou_course.schemas.lesson_schema import LessonCreate, LessonUpdate
+
+
+@pytest.fixture
+def statements(engine):
+    """Records the first keyword of every SQL statement sent to the database (course 1 already has counters)."""
+    with Session(engine) as session:
+        session.add(CourseContentCounter(course_id=1))
+        session.commit()
+    sent = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        sent.append(statement.split()[0])
+
+    return sent
+
+
+def new_lesson():
+    return LessonCreate(topic_id=1, course_id=1, title="Intro", created_by=1)
+
+
+def test_create_flushes_without_commit(engine, statements):
+    """Creating a lesson issues its INSERT and the course counter UPDATE, and leaves the commit to the caller."""
+    with Session(engine, expire_on_commit=False) as session:
+        lesson = LessonRepository.create_lesson(session, new_lesson())
+
+        assert lesson.id is not None
+        assert statements == ["INSERT", "UPDATE"]
+        assert session.in_transaction()
+
+
+def test_update_uses_single_statement(engine, statements):
+    """Updates return the row from UPDATE ... RETURNING without a reload."""
+    with Session(engine, expire_on_commit=False) as session:
+        lesson = LessonRepository.create_lesson(session, new_lesson())
+        updated = LessonRepository.update_lesson(session, lesson.id, LessonUpdate(title="Renamed"))
+        session.commit()
+
+        assert updated.title == "Renamed"
+        assert statements == ["INSERT", "UPDATE", "UPDATE"]
+
+
+def test_delete_reports_missing_rows(engine):
+    """Soft delete returns False when no lesson matched."""
+    with Session(engine, expire_on_commit=False) as session:
+        lesson = LessonRepository.create_lesson(session, new_lesson())
+
+        assert LessonRepository.delete_lesson(session, lesson.id) is True
+        assert LessonRepository.delete_lesson(session, lesson.id + 1) is False
+        assert lesson.active is False
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from sqlmodel import Session
+from fastapi.testclient import TestClient
+from main import app
+from cou_course.models.job_run import JobRun
+from cou_course.services import background_jobs
+from cou_course.services.periodic_job import PeriodicJob
+
+
+class CountingJob(PeriodicJob):
+    name = "counting"
+
+    def __init__(self, session_factory, interval_seconds=3600):
+        super().__init__(interval_seconds, session_factory)
+        self.runs = 0
+        self.wanted = False
+
+    def pending(self):
+        return self.wanted
+
+    def run_now(self):
+        self.runs += 1
+        self.wanted = False
+        return self.runs
+
+
+@pytest.fixture
+def job(engine):
+    return CountingJob(lambda: Session(engine, expire_on_commit=False))
+
+
+def test_a_job_must_implement_run_now():
+    class Incomplete(PeriodicJob):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete(3600)
+
+
+def test_runs_once_per_interval_across_workers(job, engine):
+    """A second worker sharing the job_run table skips the run until the interval is up."""
+    other_worker = CountingJob(lambda: Session(engine, expire_on_commit=False))
+
+    assert asyncio.run(job.run_if_due()) == 1
+    assert asyncio.run(other_worker.run_if_due()) is None
+    assert other_worker.runs == 0
+    assert 3590 < other_worker.seconds_until_due() <= 3600
+    with Session(engine) as session:
+        assert session.get(JobRun, "counting").last_duration_seconds is not None
+
+
+def test_pending_work_runs_early(job):
+    asyncio.run(job.run_if_due())
+    job.wanted = True
+
+    assert job.seconds_until_due() == 0
+    assert asyncio.run(job.run_if_due()) == 2
+
+
+def test_skips_while_another_worker_holds_the_lock(job):
+    with patch("cou_course.services.periodic_job.JobLock.acquire", return_value=False):
+        assert asyncio.run(job.run_if_due()) is None
+    assert job.runs == 0
+
+
+def test_failed_run_is_not_recorded(job):
+    def fail():
+        raise RuntimeError("boom")
+    job.run_now = fail
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(job.run_if_due())
+    assert job.seconds_until_due() == 0
+
+
+def test_cron_endpoint_requires_secret():
+    client = TestClient(app)
+    with patch.object(background_jobs, "CRON_SECRET", "s3cret"), \
+            patch.object(background_jobs, "run_due_jobs", return_value={"counting": 1}) as run_due_jobs:
+        assert client.get("/api/v1/jobs/run-due").status_code == 401
+        assert client.get("/api/v1/jobs/run-due", headers={"Authorization": "Bearer nope"}).status_code == 401
+        response = client.get("/api/v1/jobs/run-due", headers={"Authorization": "Bearer s3cret"})
+
+    assert response.json() == {"counting": 1}
+    run_due_jobs.assert_called_once()
@@ -0,0 +1,208 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event
+from sqlmodel import Session
+from fastapi.testclient import TestClient
+from main import app
+from common.database import get_session
+from auth_bl.utils import get_current_user
+from cou_course.models.quiz import Quiz
+from cou_course.models.question import Question, QuestionType
+from cou_course.models.quiz_attempt import QuizAttempt
+from cou_course.repositories.question_repository import QuestionRepository
+from cou_course.repositories.quiz_repository import QuizRepository
+from cou_course.schemas.question_schema import QuestionCreate, QuestionUpdate
+from cou_course.schemas.quiz_schema import QuizUpdate
+from cou_course.services.quiz_attempts import QUIZ_SUBMIT_GRACE_SECONDS
+from cou_course.services.quiz_engine import QuizCache, compile_answer_key, get_quiz_cache, grade, MANUAL
+
+QUESTIONS = [
+    (QuestionType.SINGLE, 1, [{"id": "a", "text": "Paris", "is_correct": True}, {"id": "b", "text": "Rome"}]),
+    (QuestionType.MULTIPLE, 2, {"options": [{"id": 1, "is_correct": True}, {"id": 2}, {"id": 3, "is_correct": True}]}),
+    (QuestionType.TRUE_FALSE, 1, {"correct": False}),
+    (QuestionType.FILL_BLANK, 1, {"blanks": [["New York", "NYC"], "Hudson"]}),
+    (QuestionType.SORT_ANSWER, 2, [{"text": "second", "order": 2}, {"text": "first", "order": 1}]),
+    (QuestionType.MATCHING_TEXT, 2, {"pairs": [{"left": "H2O", "right": "water"}, {"left": "NaCl", "right": "salt"}]}),
+    (QuestionType.OPEN_ENDED, 5, None),
+]
+
+
+URL = "/api/v1/course-learning/quizzes"
+
+
+@pytest.fixture
+def quiz(engine):
+    """Quiz with one question of every type; the API uses a fresh compiled-quiz cache and learner 5 is signed in."""
+    with Session(engine) as session:
+        quiz = Quiz(topic_id=1, course_id=1, title="Mixed", passing_grade_percent=60, created_by=7)
+        session.add(quiz)
+        session.flush()
+        questions = [
+            Question(quiz_id=quiz.id, type=question_type, question_text=f"Q{order}", points=points,
+                     answers=answers, question_order=order, created_by=7)
+            for order, (question_type, points, answers) in enumerate(QUESTIONS)
+        ]
+        session.add_all(questions)
+        session.commit()
+        ids = [question.id for question in questions]
+        quiz_id = quiz.id
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    cache = QuizCache()
+    signed_in = {"user_id": 5}
+    app.dependency_overrides[get_session] = session_override
+    app.dependency_overrides[get_quiz_cache] = lambda: cache
+    app.dependency_overrides[get_current_user] = lambda: signed_in["user_id"]
+    yield TestClient(app), quiz_id, ids, cache, signed_in
+    for dependency in (get_session, get_quiz_cache, get_current_user):
+        app.dependency_overrides.pop(dependency, None)
+
+
+def start(client, quiz_id):
+    return client.post(f"{URL}/{quiz_id}/attempts").json()
+
+
+def submit(client, quiz_id, attempt_id, answers):
+    return client.post(f"{URL}/{quiz_id}/attempts/{attempt_id}/submit", json={"answers": answers})
+
+
+def test_whole_submission_graded_in_one_pass(quiz, engine):
+    client, quiz_id, ids, _, _ = quiz
+    attempt = start(client, quiz_id)
+    answers = {
+        ids[0]: "A",
+        ids[1]: [3, 1],
+        ids[2]: "false",
+        ids[3]: ["nyc", " hudson "],
+        ids[4]: ["first", "second"],
+        ids[5]: {"NaCl": "salt", "H2O": "steam"},
+        ids[6]: "An essay",
+    }
+    response = submit(client, quiz_id, attempt["attempt_id"], answers)
+    result = response.json()
+
+    assert response.status_code == 200
+    assert [r["correct"] for r in result["results"]] == [True, True, True, True, True, False, None]
+    assert (result["score"], result["max_score"], result["percent"], result["passed"]) == (7, 9, 77.78, True)
+    assert result["user_id"] == 5
+    with Session(engine) as session:
+        stored = session.get(QuizAttempt, attempt["attempt_id"])
+        assert (stored.user_id, stored.score, stored.question_ids) == (5, 7, ids)
+        assert stored.submitted_at is not None
+
+
+def test_unknown_questions_quizzes_and_attempts_are_rejected(quiz):
+    client, quiz_id, ids, _, _ = quiz
+    attempt_id = start(client, quiz_id)["attempt_id"]
+    assert submit(client, quiz_id, attempt_id, {"999": "a"}).status_code == 400
+    assert submit(client, quiz_id, 999, {}).status_code == 404
+    assert client.post(f"{URL}/999/attempts").status_code == 404
+
+
+def test_attempts_are_final_and_private(quiz):
+    """Correctness is only returned once an attempt is submitted, only once, and only to its learner."""
+    client, quiz_id, ids, _, signed_in = quiz
+    attempt_id = start(client, quiz_id)["attempt_id"]
+
+    in_progress = client.get(f"{URL}/{quiz_id}/attempts/{attempt_id}").json()
+    assert [q["id"] for q in in_progress["questions"]] == ids
+    assert (in_progress["submitted_at"], in_progress["score"], in_progress["results"]) == (None, None, None)
+
+    assert submit(client, quiz_id, attempt_id, {ids[0]: "a"}).status_code == 200
+    assert submit(client, quiz_id, attempt_id, {ids[0]: "b"}).status_code == 409
+    final = client.get(f"{URL}/{quiz_id}/attempts/{attempt_id}").json()
+    assert final["results"][0]["correct"] is True and final["score"] == 1
+
+    signed_in["user_id"] = 6
+    assert client.get(f"{URL}/{quiz_id}/attempts/{attempt_id}").status_code == 404
+    assert submit(client, quiz_id, attempt_id, {}).status_code == 404
+
+
+def test_answer_keys_are_cached_by_quiz_version(quiz, engine):
+    client, quiz_id, ids, cache, _ = quiz
+    first = start(client, quiz_id)["attempt_id"]
+    assert submit(client, quiz_id, first, {ids[0]: "a"}).json()["results"][0]["correct"] is True
+    assert (cache.hits, cache.builds) == (1, 1)
+
+    with Session(engine) as session:
+        QuestionRepository.update_question(session, ids[0], QuestionUpdate(answers=[{"id": "b", "is_correct": True}]))
+        session.commit()
+
+    second = start(client, quiz_id)["attempt_id"]
+    assert submit(client, quiz_id, second, {ids[0]: "a"}).json()["results"][0]["correct"] is False
+    assert cache.builds == 2
+
+
+def test_server_drawn_sample_from_cached_pool(quiz, engine):
+    """max_questions are drawn by the server per attempt; the answer keys never leave the server."""
+    client, quiz_id, ids, cache, _ = quiz
+    with Session(engine) as session:
+        QuizRepository.update_quiz(session, quiz_id, QuizUpdate(max_questions=3, time_limit_minutes=10))
+        session.commit()
+
+    attempts = [start(client, quiz_id) for _ in range(20)]
+    first = attempts[0]
+    assert (first["time_limit_minutes"], len(first["questions"])) == (10, 3)
+    assert "seed" not in first
+    assert len({tuple(q["id"] for q in attempt["questions"]) for attempt in attempts}) > 1
+
+    questions = {q["id"]: q for attempt in attempts for q in attempt["questions"]}
+    assert questions[ids[0]]["answers"] == [{"id": "a", "text": "Paris"}, {"id": "b", "text": "Rome"}]
+    assert questions[ids[3]]["answers"] == {"blanks": 2}
+    assert questions[ids[4]]["answers"] == [{"text": "first"}, {"text": "second"}]
+    assert questions[ids[5]]["answers"] == {"left": ["H2O", "NaCl"], "right": ["salt", "water"]}
+    assert questions[ids[6]]["answers"] is None
+    assert cache.builds == 1
+
+    drawn = [q["id"] for q in first["questions"]]
+    outside = next(question_id for question_id in ids if question_id not in drawn)
+    assert submit(client, quiz_id, first["attempt_id"], {outside: "a"}).status_code == 400
+    result = submit(client, quiz_id, first["attempt_id"], {}).json()
+    assert [r["question_id"] for r in result["results"]] == drawn
+
+
+def test_submissions_past_the_time_limit_are_rejected(quiz, engine):
+    """The deadline runs from the start stored with the attempt, plus a short grace."""
+    client, quiz_id, ids, _, _ = quiz
+    with Session(engine) as session:
+        QuizRepository.update_quiz(session, quiz_id, QuizUpdate(time_limit_minutes=10))
+        session.commit()
+    on_time, late = start(client, quiz_id), start(client, quiz_id)
+    assert on_time["expires_at"] is not None
+
+    with Session(engine) as session:
+        attempt = session.get(QuizAttempt, late["attempt_id"])
+        attempt.started_at = datetime.now(timezone.utc) - timedelta(minutes=10, seconds=QUIZ_SUBMIT_GRACE_SECONDS + 5)
+        session.commit()
+
+    assert submit(client, quiz_id, late["attempt_id"], {ids[0]: "a"}).status_code == 409
+    assert submit(client, quiz_id, on_time["attempt_id"], {ids[0]: "a"}).status_code == 200
+
+
+def test_question_writes_bump_the_quiz_version(quiz, engine):
+    """The version check reads the quiz row only; question writes through the repository invalidate it."""
+    _, quiz_id, ids, _, _ = quiz
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with Session(engine) as session:
+        assert QuizRepository.get_grading_settings(session, quiz_id).questions_version == 0
+        QuestionRepository.delete_question(session, ids[6])
+        QuestionRepository.create_question(session, QuestionCreate(quiz_id=quiz_id, question_text="Q7", created_by=7))
+        session.commit()
+        assert QuizRepository.get_grading_settings(session, quiz_id).questions_version == 2
+    event.remove(engine, "before_cursor_execute", record)
+
+    assert "cou_course.question" not in statements[0]
+
+
+def test_questions_without_a_key_are_manual():
+    assert compile_answer_key(1, QuestionType.SINGLE, 1, [{"id": "a"}]).kind == MANUAL
+    assert compile_answer_key(1, QuestionType.FILL_BLANK, 1, ["Ottawa"]).expected == (frozenset({"ottawa"}),)
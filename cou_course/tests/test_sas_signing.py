@@ -0,0 +1,56 @@
+from urllib.parse import parse_qs
+import pytest
+from cou_course.services import sas_signing
+from cou_course.services.blob_storage import BlobStorage
+from cou_course.services.sas_signing import SasUrlSigner
+from cou_course.tests.fakes import FakeContainerClient
+
+ACCOUNT_KEY = "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+
+
+@pytest.fixture
+def signer():
+    return SasUrlSigner("devstoreaccount1", ACCOUNT_KEY, "lessons", ttl_seconds=3600, refresh_margin_seconds=300)
+
+
+def test_tokens_are_read_only_blob_sas(signer):
+    """Tokens grant read access to a single blob."""
+    query = parse_qs(signer.token("lesson-1/master.m3u8"))
+
+    assert query["sp"] == ["r"]
+    assert query["sr"] == ["b"]
+    assert "sig" in query and "se" in query
+
+
+def test_tokens_are_cached_until_near_expiry(signer, monkeypatch):
+    """The same token is reused until the refresh margin, then re-minted."""
+    now = 1_700_000_000.0
+    monkeypatch.setattr(sas_signing.time, "time", lambda: now)
+    first = signer.token("lesson-1/master.m3u8")
+
+    now += 3000
+    assert signer.token("lesson-1/master.m3u8") == first
+
+    now += 400
+    assert signer.token("lesson-1/master.m3u8") != first
+    assert signer.stats() == {"entries": 1, "minted": 2, "hits": 1}
+
+
+def test_batch_signing_mints_only_missing(signer):
+    """A batch reuses cached tokens and mints the rest together."""
+    signer.token("a/master.m3u8")
+    tokens = signer.tokens(["a/master.m3u8", "b/master.m3u8", "c/master.m3u8"])
+
+    assert len(tokens) == 3
+    assert signer.stats()["minted"] == 3
+    assert signer.stats()["hits"] == 1
+
+
+def test_storage_signed_urls(signer):
+    """Signed URLs append the SAS token; without a signer the plain URL is returned."""
+    container = FakeContainerClient([])
+
+    signed = BlobStorage(container, signer=signer).signed_urls(["a/master.m3u8"])[0]
+    assert signed.startswith(f"{FakeContainerClient.url}/a/master.m3u8?")
+
+    assert BlobStorage(container).signed_url("a/master.m3u8") == f"{FakeContainerClient.url}/a/master.m3u8"
@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from cou_course.services.blob_storage import BlobStorage, close_blob_storage, init_blob_storage
+from cou_course.services.local_storage import LocalFileStorage
+from cou_course.services.storage_backend import StorageBackend
+from cou_course.tests.fakes import FakeContainerClient
+
+CONTENT = bytes(range(256)) * 8  # 2 KiB
+
+
+@pytest.fixture(params=["azure", "local"])
+def backend(request, tmp_path):
+    """Every StorageBackend implementation, seeded with the same lesson layout."""
+    if request.param == "azure":
+        storage = BlobStorage(FakeContainerClient([]))
+    else:
+        storage = LocalFileStorage(str(tmp_path), chunk_size=4)
+
+    async def seed():
+        await storage.put("lesson-1/master.m3u8", b"#EXTM3U\n")
+        await storage.put("lesson-1/720p/seg0.ts", CONTENT)
+        await storage.put("lesson-2/master.m3u8", b"#EXTM3U\n")
+
+    asyncio.run(seed())
+    return storage
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_implements_protocol(backend):
+    assert isinstance(backend, StorageBackend)
+    assert backend.source in ("azure", "local")
+
+
+def test_stat_and_download(backend):
+    properties = run(backend.get_properties("lesson-1/720p/seg0.ts"))
+    content, etag = run(backend.download("lesson-1/720p/seg0.ts"))
+
+    assert properties.size == len(CONTENT)
+    assert content == CONTENT and etag == properties.etag
+    assert run(backend.get_properties("lesson-9/master.m3u8")) is None
+    assert run(backend.download("lesson-9/master.m3u8")) is None
+
+
+def test_put_replaces_content_and_etag(backend):
+    before = run(backend.get_properties("lesson-2/master.m3u8")).etag
+    etag = run(backend.put("lesson-2/master.m3u8", b"#EXTM3U\n#EXT-X-VERSION:3\n"))
+
+    assert etag != before
+    assert run(backend.download("lesson-2/master.m3u8")) == (b"#EXTM3U\n#EXT-X-VERSION:3\n", etag)
+
+
+def test_listing(backend):
+    names = [blob.name for blob in run(collect(backend.list_blobs()))]
+
+    assert names == ["lesson-1/720p/seg0.ts", "lesson-1/master.m3u8", "lesson-2/master.m3u8"]
+    assert [blob.name for blob in run(collect(backend.list_blobs("lesson-2/")))] == ["lesson-2/master.m3u8"]
+    assert run(collect(backend.list_prefixes())) == ["lesson-1/", "lesson-2/"]
+    assert run(collect(backend.list_prefixes("lesson-1/"))) == ["lesson-1/720p/"]
+    assert [blob.name for blob in run(collect(backend.list_folder("lesson-1/")))] == ["lesson-1/master.m3u8"]
+    assert run(collect(backend.list_folder())) == []
+
+
+def test_open_range(backend):
+    chunks = run(collect(backend.open_range("lesson-1/720p/seg0.ts", 100, 50)))
+
+    assert b"".join(chunks) == CONTENT[100:150]
+    assert max(len(chunk) for chunk in chunks) <= 4
+
+
+def test_signed_urls_follow_blob_names(backend):
+    urls = backend.signed_urls(["lesson-1/master.m3u8", "lesson-2/master.m3u8"])
+
+    assert urls[0].split("?")[0].endswith("/lesson-1/master.m3u8")
+    assert backend.signed_url("lesson-2/master.m3u8") == urls[1]
+
+
+def test_staged_blocks_commit_atomically(backend):
+    run(backend.stage_block("lesson-3/video.mp4", "b-0", CONTENT[:1000]))
+    run(backend.stage_block("lesson-3/video.mp4", "b-1", CONTENT[1000:]))
+
+    assert run(backend.get_staged_blocks("lesson-3/video.mp4")) == {"b-0": 1000, "b-1": len(CONTENT) - 1000}
+    assert run(backend.get_properties("lesson-3/video.mp4")) is None
+
+    run(backend.commit_blocks("lesson-3/video.mp4", ["b-0", "b-1"], "video/mp4"))
+    assert run(backend.download("lesson-3/video.mp4"))[0] == CONTENT
+    assert run(backend.get_staged_blocks("lesson-3/video.mp4")) == {}
+    assert run(collect(backend.list_prefixes())) == ["lesson-1/", "lesson-2/", "lesson-3/"]
+
+
+@pytest.fixture
+def shared_storage_reset():
+    yield
+    run(close_blob_storage())
+
+
+def test_backend_selection(tmp_path, shared_storage_reset):
+    """VIDEO_STORAGE_BACKEND picks the implementation; an unusable choice disables video storage."""
+    local = run(init_blob_storage(connection_string=None, backend="auto", local_root=str(tmp_path)))
+    forced = run(init_blob_storage(connection_string="UseDevelopmentStorage=true", backend="local", local_root=str(tmp_path)))
+
+    assert isinstance(local, LocalFileStorage) and isinstance(forced, LocalFileStorage)
+    assert run(init_blob_storage(connection_string=None, backend="azure", local_root=str(tmp_path))) is None
+    assert run(init_blob_storage(connection_string=None, backend="local", local_root=None)) is None
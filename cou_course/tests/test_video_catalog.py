@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from main import app
+from common.database import get_session
+from cou_course.models.lesson import Lesson
+from cou_course.models.video_asset import VideoAsset
+from cou_course.repositories.video_asset_repository import VideoAssetRepository
+from cou_course.services.blob_storage import BlobStorage, get_blob_storage
+from cou_course.services.video_catalog import VideoCatalogReconciler
+from cou_course.tests.fakes import FakeContainerClient, fake_blob
+
+
+@pytest.fixture
+def reconciler(engine):
+    return VideoCatalogReconciler(session_factory=lambda: Session(engine, expire_on_commit=False))
+
+
+@pytest.fixture
+def container():
+    return FakeContainerClient([
+        "intro.mp4", "lesson-1/master.m3u8", "lesson-1/360p/index.m3u8", "lesson-1/360p/seg0.ts", "lesson-2/talk.mp4"
+    ])
+
+
+def test_reconcile_inserts_and_links_lessons(engine, reconciler, container):
+    """New blobs are inserted and linked to the lesson whose video_path matches."""
+    with Session(engine) as session:
+        session.add(Lesson(id=5, topic_id=1, course_id=2, title="L", video_path="intro.mp4", created_by=1))
+        session.commit()
+
+    assert asyncio.run(reconciler.reconcile(BlobStorage(container))) == {"inserted": 3, "updated": 0, "deactivated": 0}
+
+    with Session(engine) as session:
+        intro = session.exec(select(VideoAsset).where(VideoAsset.name == "intro.mp4")).one()
+        assert (intro.lesson_id, intro.course_id, intro.etag) == (5, 2, "0x1")
+
+
+def test_run_now_reconciles_outside_the_event_loop(reconciler, container):
+    reconciler.storage = BlobStorage(container)
+    assert reconciler.run_now() == {"inserted": 3, "updated": 0, "deactivated": 0}
+
+
+def test_reconcile_writes_only_changes(engine, reconciler, container):
+    """Unchanged blobs are skipped; changed ETags update and removed blobs deactivate."""
+    storage = BlobStorage(container)
+    asyncio.run(reconciler.reconcile(storage))
+
+    assert asyncio.run(reconciler.reconcile(storage)) == {"inserted": 0, "updated": 0, "deactivated": 0}
+
+    container.blobs["intro.mp4"] = fake_blob("intro.mp4", b"new bytes", etag="0x2")
+    del container.blobs["lesson-2/talk.mp4"]
+    assert asyncio.run(reconciler.reconcile(storage)) == {"inserted": 0, "updated": 1, "deactivated": 1}
+
+    with Session(engine) as session:
+        assert [a.name for a in VideoAssetRepository.list_videos(session)] == ["intro.mp4", "lesson-1/master.m3u8"]
+
+
+def test_reconcile_lists_only_video_levels(reconciler, container):
+    """Rendition folders holding HLS segments are never listed, and non-video blobs are skipped."""
+    container.blobs["notes.txt"] = fake_blob("notes.txt")
+
+    videos = asyncio.run(reconciler.list_videos(BlobStorage(container)))
+
+    assert sorted(videos) == ["intro.mp4", "lesson-1/master.m3u8", "lesson-2/talk.mp4"]
+    assert sorted(name or "" for call, name in container.calls) == ["", "", "lesson-1/", "lesson-2/"]
+
+
+def test_list_videos_cursor_pagination(engine, reconciler, container):
+    """Pages continue after the last id of the previous page."""
+    asyncio.run(reconciler.reconcile(BlobStorage(container)))
+
+    with Session(engine) as session:
+        first = VideoAssetRepository.list_videos(session, limit=2)
+        rest = VideoAssetRepository.list_videos(session, cursor=first[-1].id, limit=2)
+
+    assert len(first) == 2
+    assert [a.name for a in first + rest] == ["intro.mp4", "lesson-1/master.m3u8", "lesson-2/talk.mp4"]
+
+
+def test_fetch_videos_serves_from_catalog(engine, reconciler, container):
+    """The listing route reads the catalog and returns a cursor for the next page."""
+    asyncio.run(reconciler.reconcile(BlobStorage(container)))
+    container.calls.clear()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_blob_storage] = lambda: BlobStorage(container)
+    try:
+        page = TestClient(app).get("/api/v1/course-learning/videos/?limit=2").json()
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+        app.dependency_overrides.pop(get_blob_storage, None)
+
+    assert [video["name"] for video in page["videos"]] == ["intro.mp4", "lesson-1/master.m3u8"]
+    assert page["next_cursor"] is not None
+    assert container.calls == []
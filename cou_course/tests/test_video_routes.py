@@ -0,0 +1,84 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from cou_course.services.blob_storage import BlobStorage, get_blob_storage
+from cou_course.services.hls_lesson_index import LessonFolderIndex, get_lesson_folder_index
+from cou_course.tests.fakes import FakeContainerClient
+
+
+@pytest.fixture
+def container():
+    return FakeContainerClient([
+        "lesson-1/master.m3u8", "lesson-1/seg0.ts", "lesson-2/master.m3u8", "intro.mp4"
+    ])
+
+
+@pytest.fixture
+def index():
+    return LessonFolderIndex(max_age_seconds=300)
+
+
+@pytest.fixture
+def client(container, index):
+    """Test client with the shared blob storage replaced by the in-memory container."""
+    app.dependency_overrides[get_blob_storage] = lambda: BlobStorage(container)
+    app.dependency_overrides[get_lesson_folder_index] = lambda: index
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_blob_storage, None)
+    app.dependency_overrides.pop(get_lesson_folder_index, None)
+
+
+def test_get_video_uses_single_properties_call(client, container):
+    """Existing videos are resolved with one get_blob_properties request."""
+    response = client.get("/api/v1/course-learning/videos/lesson-1/master.m3u8")
+
+    assert response.status_code == 200
+    assert response.json()["url"] == f"{FakeContainerClient.url}/lesson-1/master.m3u8"
+    assert container.calls == [("get_blob_properties", "lesson-1/master.m3u8")]
+
+
+def test_missing_video_returns_404(client):
+    """A not-found error from storage is reported as 404."""
+    response = client.get("/api/v1/course-learning/videos/missing.mp4")
+
+    assert response.status_code == 404
+
+
+def test_master_playlist_and_lessons(client):
+    """HLS routes work against the async client."""
+    master = client.get("/api/v1/course-learning/hls/lesson-2/master.m3u8")
+    assert master.status_code == 200
+    assert client.get("/api/v1/course-learning/hls/lesson-3/master.m3u8").status_code == 404
+
+    lessons = client.get("/api/v1/course-learning/hls/lessons/").json()
+    assert [lesson["lesson_folder"] for lesson in lessons["lessons"]] == ["lesson-1", "lesson-2"]
+    # Players are pointed at the rewritten playlist, whose segment URIs are signed one by one
+    playback_url = "/api/v1/course-learning/hls/lesson-2/playlist/master.m3u8"
+    assert master.json()["url"] == playback_url
+    assert lessons["lessons"][1]["hls_player_url"] == lessons["lessons"][1]["playback_url"] == playback_url
+
+
+def test_lesson_index_lists_folders_once(client, container):
+    """Folders come from one delimiter listing that is cached between requests."""
+    client.get("/api/v1/course-learning/hls/lessons/")
+    client.get("/api/v1/course-learning/hls/lessons/")
+
+    assert container.calls == [("walk_blobs", None)]
+
+
+def test_lesson_index_paging_and_uploads(client, index):
+    """skip/limit page through the index and uploaded folders show up immediately."""
+    client.get("/api/v1/course-learning/hls/lessons/")
+    index.add_folder("lesson-0")
+
+    page = client.get("/api/v1/course-learning/hls/lessons/?skip=1&limit=2").json()
+    assert [lesson["lesson_folder"] for lesson in page["lessons"]] == ["lesson-1", "lesson-2"]
+    assert page["total_lessons"] == 3
+
+
+def test_routes_report_unavailable_without_storage():
+    """Without Azure configured the routes degrade as before."""
+    client = TestClient(app)
+
+    assert client.get("/api/v1/course-learning/videos/").json()["videos"] == []
+    assert client.get("/api/v1/course-learning/videos/intro.mp4").status_code == 503
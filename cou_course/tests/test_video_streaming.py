@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from main import app
+from cou_course.services.blob_storage import BlobStorage, get_blob_storage
+from cou_course.services.local_storage import LocalFileStorage
+from cou_course.services.video_streaming import parse_byte_range
+from cou_course.tests.fakes import FakeContainerClient, fake_blob
+
+CONTENT = bytes(range(256)) * 40  # 10 KiB
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 10239)),
+    ("bytes=-100", (10140, 10239)),
+    ("bytes=10000-20000", (10000, 10239)),
+    ("bytes=0-1,5-6", None),
+    ("bytes=500-100", None),
+    ("bytes=20000-100", None),
+])
+def test_parse_byte_range(header, expected):
+    """Single ranges are parsed; absent, multi-range or invalid (last < first) headers mean the whole file."""
+    assert parse_byte_range(header, len(CONTENT)) == expected
+
+
+def test_parse_byte_range_unsatisfiable():
+    """Ranges starting past the end are rejected with 416."""
+    with pytest.raises(HTTPException) as exc:
+        parse_byte_range("bytes=20000-", len(CONTENT))
+    assert exc.value.status_code == 416
+    assert exc.value.headers["Content-Range"] == "bytes */10240"
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    (tmp_path / "lesson-1").mkdir()
+    (tmp_path / "lesson-1" / "video.mp4").write_bytes(CONTENT)
+    return LocalFileStorage(str(tmp_path), chunk_size=1024)
+
+
+@pytest.fixture
+def client_for():
+    def make(storage):
+        app.dependency_overrides[get_blob_storage] = lambda: storage
+        return TestClient(app)
+    yield make
+    app.dependency_overrides.pop(get_blob_storage, None)
+
+
+def test_local_stream_full_and_range(local_storage, client_for):
+    """The local backend serves whole files and byte ranges."""
+    client = client_for(local_storage)
+
+    full = client.get("/api/v1/course-learning/stream/lesson-1/video.mp4")
+    assert full.status_code == 200
+    assert full.content == CONTENT
+    assert full.headers["content-type"] == "video/mp4"
+
+    partial = client.get("/api/v1/course-learning/stream/lesson-1/video.mp4", headers={"Range": "bytes=1000-3047"})
+    assert partial.status_code == 206
+    assert partial.content == CONTENT[1000:3048]
+    assert partial.headers["content-range"] == "bytes 1000-3047/10240"
+
+    # An invalid range-spec is ignored: the whole file with 200
+    ignored = client.get("/api/v1/course-learning/stream/lesson-1/video.mp4", headers={"Range": "bytes=3047-1000"})
+    assert ignored.status_code == 200
+    assert ignored.content == CONTENT
+
+
+def test_local_stream_reads_bounded_chunks(local_storage):
+    """Ranges are produced in chunks no larger than chunk_size."""
+    async def collect():
+        return [chunk async for chunk in local_storage.open_range("lesson-1/video.mp4", 100, 5000)]
+
+    chunks = asyncio.run(collect())
+    assert max(len(chunk) for chunk in chunks) == 1024
+    assert b"".join(chunks) == CONTENT[100:5100]
+
+
+def test_local_stream_rejects_paths_outside_root(local_storage, client_for):
+    """Names resolving outside the root are reported as missing."""
+    response = client_for(local_storage).get("/api/v1/course-learning/stream/..%2F..%2Fetc%2Fpasswd")
+    assert response.status_code == 404
+
+
+def test_blob_stream_proxies_range(client_for):
+    """The Azure backend downloads only the requested range."""
+    container = FakeContainerClient([])
+    container.blobs["intro.mp4"] = fake_blob("intro.mp4", CONTENT)
+    client = client_for(BlobStorage(container))
+
+    response = client.get("/api/v1/course-learning/stream/intro.mp4", headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[10:20]
+    assert ("download_blob", "intro.mp4", 10, 10) in container.calls
@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from main import app
+from common.database import get_session, get_session_factory
+from cou_course.models.lesson import Lesson
+from cou_course.services.blob_storage import BlobStorage, get_blob_storage
+from cou_course.services.hls_lesson_index import LessonFolderIndex, get_lesson_folder_index
+from cou_course.services.local_storage import LocalFileStorage
+from cou_course.services.video_upload import (
+    UploadOffsetError, VideoUploader, block_id, get_video_uploader, rechunk, upload_id
+)
+from cou_course.tests.fakes import FakeContainerClient
+
+CONTENT = bytes(range(256)) * 10  # 2560 bytes -> 10 blocks of 256
+
+
+async def body(content, piece=100):
+    for position in range(0, len(content), piece):
+        yield content[position:position + piece]
+
+
+def test_rechunk_emits_fixed_size_blocks():
+    """Arbitrary body chunks are regrouped into full blocks plus a short tail."""
+    async def collect():
+        return [block async for block in rechunk(body(CONTENT[:1000], piece=70), 256)]
+
+    assert [len(block) for block in asyncio.run(collect())] == [256, 256, 256, 232]
+
+
+class SlowStorage(BlobStorage):
+    """Tracks how many blocks are being staged at once."""
+
+    def __init__(self, container):
+        super().__init__(container)
+        self.active = self.peak = 0
+
+    async def stage_block(self, blob_name, block_id, data):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        await super().stage_block(blob_name, block_id, data)
+        self.active -= 1
+
+
+def test_blocks_are_staged_concurrently_and_committed_in_order():
+    """Blocks upload in parallel up to the limit and commit as one block list."""
+    container = FakeContainerClient([])
+    storage = SlowStorage(container)
+    result = asyncio.run(VideoUploader(block_size=256, concurrency=3).upload(storage, "lesson-1/v.mp4", body(CONTENT)))
+
+    assert result.committed and result.blocks_staged == 10
+    assert storage.peak == 3
+    assert container.blobs["lesson-1/v.mp4"].content == CONTENT
+    assert [call for call in container.calls if call[0] == "commit_block_list"] == [("commit_block_list", "lesson-1/v.mp4", 10)]
+
+
+def test_failed_upload_resumes_from_staged_blocks():
+    """After a failed block the upload resumes at the staged prefix without re-sending it."""
+    container = FakeContainerClient([])
+    storage = BlobStorage(container)
+    uploader = VideoUploader(block_size=256, concurrency=1)
+    container.fail_stage_block = block_id(upload_id("lesson-1/v.mp4", len(CONTENT), "token-a1"), 4)
+
+    with pytest.raises(IOError):
+        asyncio.run(uploader.upload(storage, "lesson-1/v.mp4", body(CONTENT), total_size=len(CONTENT), upload_token="token-a1"))
+    assert "lesson-1/v.mp4" not in container.blobs
+
+    container.fail_stage_block = None
+    offset = asyncio.run(uploader.resume_offset(storage, "lesson-1/v.mp4", len(CONTENT), "token-a1"))
+    assert offset == 1024
+    assert asyncio.run(uploader.resume_offset(storage, "lesson-1/v.mp4", len(CONTENT), None)) == 0
+    with pytest.raises(UploadOffsetError):
+        asyncio.run(uploader.upload(
+            storage, "lesson-1/v.mp4", body(CONTENT[1280:]), total_size=len(CONTENT), offset=1280, upload_token="token-a1"
+        ))
+
+    result = asyncio.run(uploader.upload(
+        storage, "lesson-1/v.mp4", body(CONTENT[offset:]), total_size=len(CONTENT), offset=offset, upload_token="token-a1"
+    ))
+    assert result.committed and result.blocks_staged == 6
+    assert container.blobs["lesson-1/v.mp4"].content == CONTENT
+
+
+def test_another_file_of_the_same_name_and_size_does_not_reuse_staged_blocks():
+    """Blocks left by an interrupted upload are only picked up again with that upload's token."""
+    container = FakeContainerClient([])
+    storage = BlobStorage(container)
+    uploader = VideoUploader(block_size=256, concurrency=1)
+    other = bytes(reversed(CONTENT))
+    asyncio.run(uploader.upload(storage, "lesson-1/v.mp4", body(CONTENT[:1024]), total_size=len(CONTENT), upload_token="token-a1"))
+
+    for upload_token in ("token-b2", None):
+        result = asyncio.run(uploader.upload(storage, "lesson-1/v.mp4", body(other), total_size=len(other), upload_token=upload_token))
+        assert result.committed and (result.blocks_staged, result.blocks_skipped) == (10, 0)
+        assert container.blobs["lesson-1/v.mp4"].content == other
+
+
+@pytest.fixture
+def upload_client(engine, tmp_path):
+    with Session(engine) as session:
+        session.add(Lesson(id=7, topic_id=1, course_id=1, title="Intro", created_by=1))
+        session.commit()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    storage = LocalFileStorage(str(tmp_path))
+    index = LessonFolderIndex()
+    app.dependency_overrides[get_session] = session_override
+    app.dependency_overrides[get_session_factory] = lambda: (lambda: Session(engine, expire_on_commit=False))
+    app.dependency_overrides[get_blob_storage] = lambda: storage
+    app.dependency_overrides[get_video_uploader] = lambda: VideoUploader(block_size=256, concurrency=2)
+    app.dependency_overrides[get_lesson_folder_index] = lambda: index
+    yield TestClient(app), tmp_path, index
+    for dependency in (get_session, get_session_factory, get_blob_storage, get_video_uploader, get_lesson_folder_index):
+        app.dependency_overrides.pop(dependency, None)
+
+
+def test_upload_route_commits_file_and_updates_lesson(upload_client, engine):
+    """A partial upload is not visible; completing it writes the file and points the lesson at it."""
+    client, root, index = upload_client
+    url = f"/api/v1/course-learning/lessons/7/video?filename=intro.mp4&total_size={len(CONTENT)}&upload_token=token-a1"
+
+    partial = client.put(url, content=CONTENT[:1100])
+    assert partial.json()["committed"] is False
+    assert partial.json()["offset"] == 1024
+    assert not (root / "lesson-7" / "intro.mp4").exists()
+
+    status = client.get(f"/api/v1/course-learning/lessons/7/video/upload?filename=intro.mp4&total_size={len(CONTENT)}&upload_token=token-a1")
+    assert status.json()["offset"] == 1024
+    status = client.get(f"/api/v1/course-learning/lessons/7/video/upload?filename=intro.mp4&total_size={len(CONTENT)}&upload_token=token-b2")
+    assert status.json()["offset"] == 0
+
+    done = client.put(f"{url}&offset=1024", content=CONTENT[1024:])
+    assert done.status_code == 200 and done.json()["committed"] is True
+    assert (root / "lesson-7" / "intro.mp4").read_bytes() == CONTENT
+    assert not any((root / ".uploads").iterdir())
+    assert index._folders == []  # Not an HLS master playlist
+
+    with Session(engine) as session:
+        lesson = session.get(Lesson, 7)
+        assert (lesson.video_path, lesson.video_filename, lesson.video_source) == ("lesson-7/intro.mp4", "intro.mp4", "local")
+
+    assert client.put("/api/v1/course-learning/lessons/7/video?filename=master.m3u8", content=b"#EXTM3U\n").json()["committed"] is True
+    assert index._folders == ["lesson-7"]
+
+    assert client.put("/api/v1/course-learning/lessons/7/video?filename=../x.mp4", content=b"x").status_code == 400
+    assert client.put("/api/v1/course-learning/lessons/7/video?filename=x.mp4&upload_token=a/b", content=b"x").status_code == 400
+    assert client.put("/api/v1/course-learning/lessons/8/video?filename=x.mp4", content=b"x").status_code == 404
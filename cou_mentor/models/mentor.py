@@ -15,6 +15,8 @@ class Mentor(SQLModel, table=True):
     # is_available column does not exist in DB; removed to match schema
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Sum of the mentor's course enrollments, maintained by the enrollment counter rollup
+    total_students: int = Field(default=0)
     user: Optional["User"] = Relationship(back_populates="mentor")
     courses: List["Course"] = Relationship(
         back_populates="mentor",
@@ -23,7 +25,3 @@ class Mentor(SQLModel, table=True):
             "lazy": "selectin"
         }
     )
-    
-    @property
-    def total_students(self) -> int:
-        return sum(course.total_enrollments for course in self.courses) if self.courses else 0
\ No newline at end of file
@@ -18,7 +18,7 @@ class User(SQLModel, table=True):
     last_name: Optional[str] = Field(default=None, max_length=500)
     role_id: Optional[int] = Field(default=None, foreign_key="cou_user.role.id")
     work_email: Optional[str] = Field(default=None, max_length=500)
-    personal_email: Optional[str] = Field(default=None, max_length=500)
+    personal_email: Optional[str] = Field(default=None, max_length=500, unique=True)  # conflict target for OAuth upserts
     login_type_id: Optional[int] = Field(default=None, foreign_key="cou_user.login_type.id")
     mobile: Optional[str] = Field(default=None)
     affiliate_id: Optional[int] = Field(default=None)
@@ -0,0 +1,34 @@
+from typing import Dict
+from sqlmodel import Session, select
+from cou_user.models.logintype import LoginType
+
+# Login types are a handful of static rows that are never renamed or deleted,
+# so their ids are cached for the lifetime of the process.
+_login_type_ids: Dict[str, int] = {}
+
+def get_login_type_id(session: Session, name: str) -> int:
+    """
+    Return the id of the login type with the given name, creating it on first use.
+    Only the first call per name and process touches the database.
+    """
+    login_type_id = _login_type_ids.get(name)
+    if login_type_id is not None:
+        return login_type_id
+
+    login_type = session.exec(select(LoginType).where(LoginType.name == name)).first()
+    if not login_type:
+        login_type = LoginType(
+            name=name,
+            created_by=0,
+            updated_by=0
+        )
+        session.add(login_type)
+        session.commit()
+        session.refresh(login_type)
+
+    _login_type_ids[name] = login_type.id
+    return login_type.id
+
+def clear_login_type_cache() -> None:
+    """Forget cached login type ids (used by tests and after manual data fixes)."""
+    _login_type_ids.clear()
@@ -1,4 +1,7 @@
+from typing import Iterable, Optional
+from sqlalchemy import exists, update
 from sqlmodel import Session, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from fastapi import HTTPException
 from cou_user.models.user import User
 
@@ -33,3 +36,55 @@ def delete_user(session: Session, user_id: int):
         raise HTTPException(status_code=404, detail="User not found")
     session.delete(user)
     session.commit()
+
+def update_user_by_work_email(session: Session, user: User, update_fields: Iterable[str], extra_updates: dict = None) -> Optional[User]:
+    """
+    Overwrite `update_fields` on the oldest account registered with `user.personal_email`
+    as its work email, unless another account has it as its personal email (that one is
+    the upsert's conflict target and wins). Returns the updated User, or None.
+    """
+    table = User.__table__
+    email = user.personal_email
+    personal = table.alias("personal")
+    values = user.model_dump(include=set(update_fields))
+    values.update(extra_updates or {})
+    statement = (
+        update(table)
+        .where(table.c.id == select(table.c.id).where(table.c.work_email == email).order_by(table.c.id).limit(1).scalar_subquery())
+        .where(~exists().where(personal.c.personal_email == email))
+        .values(**values)
+        .returning(*table.c)
+    )
+    row = session.execute(statement).first()
+    return User(**row._mapping) if row is not None else None
+
+def upsert_user_by_email(session: Session, user: User, update_fields: Iterable[str], extra_updates: dict = None, match_work_email: bool = False) -> User:
+    """
+    Insert the user or, when a row with the same personal_email already exists,
+    overwrite `update_fields` on it - all in one INSERT ... ON CONFLICT ... RETURNING.
+    With `match_work_email`, an account registered under that email as its work email
+    is updated instead (see update_user_by_work_email).
+
+    `extra_updates` maps column names to SQL expressions evaluated against the existing
+    row (e.g. `{"updated_by": User.__table__.c.id}`). The returned User is built from the
+    RETURNING row and is not attached to the session, so reading it never reloads.
+    The request's unit of work (`get_session`) commits it.
+    """
+    if match_work_email:
+        existing = update_user_by_work_email(session, user, update_fields, extra_updates)
+        if existing is not None:
+            return existing
+
+    table = User.__table__
+    values = user.model_dump(exclude={"id"})
+    statement = pg_insert(table).values(**values)
+    update_set = {field: statement.excluded[field] for field in update_fields}
+    update_set.update(extra_updates or {})
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.personal_email],
+        set_=update_set
+    ).returning(*table.c)
+
+    row = session.execute(statement).one()
+    return User(**row._mapping)
+
@@ -0,0 +1,30 @@
+from scripts.dedupe_personal_emails import Account, plan_dedupe
+
+
+def test_the_account_with_a_password_keeps_the_shared_email():
+    """Credentials logins keep working; the others move the email to an empty or matching work email."""
+    plan = plan_dedupe([
+        Account(1, "ada@example.com", None, False),
+        Account(2, "ada@example.com", "", True),
+        Account(3, "ada@example.com", "ADA@example.com", False),
+        Account(4, "bob@example.com", None, False),
+        Account(5, "bob@example.com", None, False),
+    ])
+
+    assert [account.id for account in plan.moves] == [1, 3, 5]
+    assert plan.flagged == []
+
+
+def test_groups_that_would_lose_an_address_are_flagged():
+    """A work email holding another address, or several passwords, is left for a manual merge."""
+    plan = plan_dedupe([
+        Account(1, "ada@example.com", None, False),
+        Account(2, "ada@example.com", "ada@work.example.com", False),
+        Account(3, "eve@example.com", None, True),
+        Account(4, "eve@example.com", None, True),
+    ])
+
+    assert plan.moves == []
+    assert [(account.id, "work email ada@work.example.com" in reason) for account, reason in plan.flagged] == [
+        (2, True), (3, False), (4, False)
+    ]
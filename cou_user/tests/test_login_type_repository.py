@@ -0,0 +1,36 @@
+import pytest
+from unittest.mock import MagicMock
+from cou_user.repositories.login_type_repository import get_login_type_id, clear_login_type_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Each test starts without cached login type ids."""
+    clear_login_type_cache()
+    yield
+    clear_login_type_cache()
+
+
+@pytest.fixture
+def mock_session():
+    """Fixture to provide a mocked session that finds an existing login type."""
+    session = MagicMock()
+    session.exec.return_value.first.return_value = MagicMock(id=4)
+    return session
+
+
+def test_get_login_type_id_queries_once_per_name(mock_session):
+    """Repeated lookups for the same login type are served from the process cache."""
+    assert get_login_type_id(mock_session, "GITHUB") == 4
+    assert get_login_type_id(mock_session, "GITHUB") == 4
+
+    mock_session.exec.assert_called_once()
+    mock_session.commit.assert_not_called()
+
+
+def test_get_login_type_id_caches_per_name(mock_session):
+    """Different login type names are looked up separately."""
+    get_login_type_id(mock_session, "GITHUB")
+    get_login_type_id(mock_session, "GOOGLE")
+
+    assert mock_session.exec.call_count == 2
@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql
+from cou_user.models.user import User
+import main  # noqa: F401 - registers every model the User relationships refer to
+from cou_user.repositories.user_repository import upsert_user_by_email
+
+
+def make_user():
+    return User(display_name="ada", personal_email="ada@example.com", created_by=0, updated_by=0)
+
+
+def returned_row(**values):
+    row = MagicMock()
+    row._mapping = {"display_name": "ada", "created_by": 0, "updated_by": 0, **values}
+    return row
+
+
+def compiled(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_upsert_user_by_email_prefers_work_email_account():
+    """An account registered under the email as its work email is updated, not duplicated."""
+    session = MagicMock()
+    session.execute.return_value.first.return_value = returned_row(id=7, work_email="ada@example.com")
+
+    user = upsert_user_by_email(session, make_user(), ["display_name"], match_work_email=True)
+
+    assert user.id == 7
+    session.execute.assert_called_once()
+    sql = compiled(session.execute.call_args.args[0])
+    assert sql.startswith("UPDATE cou_user.\"user\"")
+    assert "work_email" in sql and "NOT (EXISTS" in sql
+
+
+def test_upsert_user_by_email_falls_back_to_upsert():
+    """Without a work email match the personal_email upsert runs."""
+    session = MagicMock()
+    session.execute.return_value.first.return_value = None
+    session.execute.return_value.one.return_value = returned_row(id=8, personal_email="ada@example.com")
+
+    user = upsert_user_by_email(session, make_user(), ["display_name"], match_work_email=True)
+
+    assert user.id == 8
+    assert session.execute.call_count == 2
+    assert "ON CONFLICT (personal_email)" in compiled(session.execute.call_args.args[0])
+
+
+def test_upsert_user_by_email_only_matches_personal_email_by_default():
+    session = MagicMock()
+    session.execute.return_value.one.return_value = returned_row(id=9)
+
+    upsert_user_by_email(session, make_user(), ["display_name"])
+
+    session.execute.assert_called_once()
@@ -1,8 +1,10 @@
 import uvicorn
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from sqlmodel import SQLModel
-from common.database import engine, create_db_and_tables
+from common.database import create_db_and_tables
+from cou_course.services.blob_storage import init_blob_storage, close_blob_storage
+from cou_course.services.hls_lesson_index import lesson_folder_index
+from cou_course.services.background_jobs import start_background_jobs, stop_background_jobs
 from cou_admin.api.country_routes import router as country_router
 from cou_admin.api.currency_routes import router as currency_router
 from cou_user.api.user_routes import router as user_router
@@ -11,6 +13,7 @@ from cou_course.api.coursecategory_routes import router as coursecategory_router
 from cou_course.api.coursesubcategory_routes import router as coursesubcategory_router
 from cou_course.api.memory_game_pair_routes import router as memory_game_pair_router
 from cou_course.api.course_learning import router as course_learning_router
+from cou_course.api.job_routes import router as job_router
 from fastapi.middleware.cors import CORSMiddleware
 from auth_bl import auth_router
 import logging
@@ -26,6 +29,8 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+SKIP_DB_INIT = os.getenv("SKIP_DB_INIT", "false").lower() == "true"
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Actions to run at startup
@@ -35,10 +40,24 @@ async def lifespan(app: FastAPI):
     from cou_user.models.logintype import LoginType
     from cou_user.models.loginhistory import LoginHistory
     
-    SQLModel.metadata.create_all(engine)
+    # Create missing tables, then bring existing ones up to date (SCHEMA_PATCHES).
+    # A failure here stops the startup instead of serving a mismatched schema.
+    if SKIP_DB_INIT:
+        logging.warning("Skipping DB init at startup")
+    else:
+        create_db_and_tables()
+    
+    # Shared async Azure Blob client for the video/HLS routes
+    blob_storage = await init_blob_storage()
+    if blob_storage:
+        lesson_folder_index.start(blob_storage)
+    start_background_jobs()
     
     yield  # Allows FastAPI to proceed after startup
-    # Add any shutdown actions here if needed
+    
+    await stop_background_jobs()
+    await lesson_folder_index.stop()
+    await close_blob_storage()
 
 # Create FastAPI app with the lifespan context
 app = FastAPI(
@@ -52,19 +71,6 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc"
 )
-SKIP_DB_INIT = os.getenv("SKIP_DB_INIT", "false").lower() == "true"
-
-# Create database tables on startup
-@app.on_event("startup")
-async def on_startup():
-    if SKIP_DB_INIT:
-        logging.warning("Skipping DB init at startup")
-        return
-    try:
-        create_db_and_tables()
-    except Exception:
-        logging.exception("DB init failed")
-
 # Add health check endpoint
 @app.get("/health")
 async def health_check():
@@ -88,6 +94,7 @@ app.include_router(coursecategory_router, prefix="/api/v1")
 app.include_router(coursesubcategory_router, prefix="/api/v1")
 app.include_router(memory_game_pair_router, prefix="/api/v1")
 app.include_router(course_learning_router, prefix="/api/v1")
+app.include_router(job_router, prefix="/api/v1")
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(mentor_router, prefix="/api/v1")
 
@@ -0,0 +1,130 @@
+"""
+One-off cleanup before the `user_personal_email_key` unique index can be created:
+accounts that share a `personal_email` (credentials and OAuth logins look accounts up
+by it) are reported, and with --apply the unambiguous ones are resolved. No address is
+dropped and no account is deleted:
+
+- blank personal emails become NULL (nobody can sign in with one);
+- in each group of accounts sharing an email, the account with a password keeps it
+  (the oldest one when none has a password), so credentials logins keep working;
+- every other account of the group moves the email to its work email, but only when
+  its work email is empty or already the same address.
+
+Groups where several accounts have a password, and accounts whose work email holds
+another address, are left untouched and listed for a manual merge. The application
+refuses to start while duplicates remain.
+
+Usage:
+    python scripts/dedupe_personal_emails.py [--apply]
+"""
+import sys
+from dataclasses import dataclass
+from itertools import groupby
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import func, update  # noqa: E402
+from sqlmodel import Session, select  # noqa: E402
+import main  # noqa: E402,F401 - registers every model the User relationships refer to
+from common.database import engine  # noqa: E402
+from cou_user.models.user import User  # noqa: E402
+
+
+@dataclass
+class Account:
+    id: int
+    personal_email: str
+    work_email: Optional[str]
+    has_password: bool
+
+
+@dataclass
+class Plan:
+    moves: List[Account]  # personal_email -> work_email, personal_email = NULL
+    flagged: List[Tuple[Account, str]]  # Left untouched, with the reason
+
+
+def plan_group(accounts: List[Account]) -> Plan:
+    """Which accounts of one group sharing a personal email give it up, and which need a manual merge"""
+    accounts = sorted(accounts, key=lambda account: account.id)
+    with_password = [account for account in accounts if account.has_password]
+    if len(with_password) > 1:
+        return Plan([], [(account, "several accounts of this email have a password") for account in accounts])
+
+    keeper = with_password[0] if with_password else accounts[0]
+    plan = Plan([], [])
+    for account in accounts:
+        if account is keeper:
+            continue
+        work_email = (account.work_email or "").strip()
+        if not work_email or work_email.lower() == account.personal_email.lower():
+            plan.moves.append(account)
+        else:
+            plan.flagged.append((account, f"work email {work_email} would be overwritten (keeper is {keeper.id})"))
+    return plan
+
+
+def plan_dedupe(accounts: Iterable[Account]) -> Plan:
+    """Plan every group; `accounts` are the accounts whose personal email is shared"""
+    plan = Plan([], [])
+    ordered = sorted(accounts, key=lambda account: (account.personal_email, account.id))
+    for _, group in groupby(ordered, key=lambda account: account.personal_email):
+        group_plan = plan_group(list(group))
+        plan.moves += group_plan.moves
+        plan.flagged += group_plan.flagged
+    return plan
+
+
+def shared_email_accounts(session: Session) -> List[Account]:
+    shared = (
+        select(User.personal_email)
+        .where(User.personal_email.is_not(None), User.personal_email != "")
+        .group_by(User.personal_email)
+        .having(func.count() > 1)
+    )
+    rows = session.exec(
+        select(User.id, User.personal_email, User.work_email, User.key.is_not(None))
+        .where(User.personal_email.in_(shared))
+    ).all()
+    return [Account(*row) for row in rows]
+
+
+def blank_email_count(session: Session) -> int:
+    return session.exec(select(func.count()).where(User.personal_email == "")).one()
+
+
+def apply_plan(session: Session, plan: Plan) -> int:
+    """Clear blank personal emails and move the planned ones; returns the number of blanks cleared"""
+    blanks = session.execute(update(User).where(User.personal_email == "").values(personal_email=None)).rowcount
+    for account in plan.moves:
+        session.execute(
+            update(User)
+            .where(User.id == account.id, User.personal_email == account.personal_email)
+            .values(work_email=account.personal_email, personal_email=None)
+        )
+    return blanks
+
+
+def run(apply: bool) -> int:
+    with Session(engine) as session:
+        plan = plan_dedupe(shared_email_accounts(session))
+        for account in plan.moves:
+            print(f"move    user {account.id}: {account.personal_email} -> work email")
+        for account, reason in plan.flagged:
+            print(f"flagged user {account.id} ({account.personal_email}): {reason}")
+        if not apply:
+            blanks = blank_email_count(session)
+            print(f"Dry run: {blanks} blank personal emails to clear, {len(plan.moves)} to move, {len(plan.flagged)} flagged. "
+                  "Re-run with --apply to clear and move them.")
+            return 1 if blanks or plan.moves or plan.flagged else 0
+
+        blanks = apply_plan(session, plan)
+        session.commit()
+        print(f"Cleared {blanks} blank personal emails, moved {len(plan.moves)}; {len(plan.flagged)} flagged for a manual merge.")
+        return 1 if plan.flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run("--apply" in sys.argv[1:]))